@@ -423,6 +423,10 @@ class ObservabilitySettings:
         default_factory=get_env("OBSERVABILITY_TRACES_MAX_EXPORT_BATCH_SIZE", 100)
     )
     """Maximum batch size for traces export."""
+    TRACES_EXPORT_POOL_SIZE: int = field(
+        default_factory=get_env("OBSERVABILITY_TRACES_EXPORT_POOL_SIZE", 2)
+    )
+    """Maximum number of database connections used by the internal traces exporter."""
     USAGE_SHOW_USERS: bool = field(
         default_factory=get_env("OBSERVABILITY_USAGE_SHOW_USERS", True)
     )
@@ -438,6 +442,48 @@ class ObservabilitySettings:
     """Metrics export interval in milliseconds."""
 
 
+### EMBEDDING CACHE SETTINGS ###
+
+
+@dataclass
+class EmbeddingCacheSettings:
+    """Embedding cache and query embedding memo configuration"""
+
+    ENABLED: bool = field(default_factory=get_env("EMBEDDING_CACHE_ENABLED", True))
+    """Enable the embedding cache."""
+    PERSISTENT_ENABLED: bool = field(
+        default_factory=get_env("EMBEDDING_CACHE_PERSISTENT_ENABLED", True)
+    )
+    """Enable the database tier of the embedding cache (PostgreSQL only)."""
+    MEMORY_MAX_SIZE: int = field(
+        default_factory=get_env("EMBEDDING_CACHE_MEMORY_MAX_SIZE", 20000)
+    )
+    """Maximum number of vectors kept in memory per worker."""
+    MEMORY_TTL_SECONDS: int = field(
+        default_factory=get_env("EMBEDDING_CACHE_MEMORY_TTL_SECONDS", 3600)
+    )
+    """Time-to-live of in-memory entries."""
+    TTL_DAYS: int = field(default_factory=get_env("EMBEDDING_CACHE_TTL_DAYS", 30))
+    """Entries in the database not written for this many days are ignored and purged."""
+    CLEANUP_INTERVAL_MINUTES: int = field(
+        default_factory=get_env("EMBEDDING_CACHE_CLEANUP_INTERVAL_MINUTES", 360)
+    )
+    """How often (in minutes) expired database entries are purged."""
+
+    QUERY_MEMO_ENABLED: bool = field(
+        default_factory=get_env("QUERY_EMBEDDING_MEMO_ENABLED", True)
+    )
+    """Enable the query embedding memo."""
+    QUERY_MEMO_MAX_SIZE: int = field(
+        default_factory=get_env("QUERY_EMBEDDING_MEMO_MAX_SIZE", 4096)
+    )
+    """Maximum number of memoized query vectors per worker."""
+    QUERY_MEMO_TTL_SECONDS: int = field(
+        default_factory=get_env("QUERY_EMBEDDING_MEMO_TTL_SECONDS", 900)
+    )
+    """Time-to-live of memoized query vectors."""
+
+
 @dataclass
 class AzureSettings:
     """Azure services configuration"""
@@ -498,6 +544,22 @@ class VectorDatabaseSettings:
     """PGVector database password."""
     PGVECTOR_POOL_SIZE: int = field(default_factory=get_env("PGVECTOR_POOL_SIZE", 5))
     """PGVector connection pool size."""
+    PGVECTOR_COLLECTION_CACHE_TTL_SECONDS: int = field(
+        default_factory=get_env("PGVECTOR_COLLECTION_CACHE_TTL_SECONDS", 60)
+    )
+    """Time-to-live of cached collection descriptors (metadata, table state) per worker."""
+    PGVECTOR_BULK_INSERT_MIN_ROWS: int = field(
+        default_factory=get_env("PGVECTOR_BULK_INSERT_MIN_ROWS", 100)
+    )
+    """Batches with at least this many documents are loaded with COPY instead of row-by-row inserts."""
+    PGVECTOR_BULK_REBUILD_INDEX_MIN_ROWS: int = field(
+        default_factory=get_env("PGVECTOR_BULK_REBUILD_INDEX_MIN_ROWS", 10000)
+    )
+    """Bulk loads of at least this many documents into an empty collection drop and rebuild the vector index."""
+    PGVECTOR_MULTI_COLLECTION_SINGLE_QUERY: bool = field(
+        default_factory=get_env("PGVECTOR_MULTI_COLLECTION_SINGLE_QUERY", True)
+    )
+    """Search collections sharing an embedding model with one UNION ALL statement of per-collection top-k branches."""
 
     PGVECTOR_CONNECTION_STRING: str = field(
         default_factory=get_env("PGVECTOR_CONNECTION_STRING", "")
@@ -529,6 +591,14 @@ class VectorDatabaseSettings:
         default_factory=get_env("ORACLE_MONGO_CONNECTION_STRING", "")
     )
     """Oracle MongoDB connection string."""
+    ORACLE_INSERT_BATCH_SIZE: int = field(
+        default_factory=get_env("ORACLE_INSERT_BATCH_SIZE", 500)
+    )
+    """Documents are inserted with one executemany and committed per this many rows."""
+    ORACLE_KEYWORD_EXTRACTION_CACHE_SIZE: int = field(
+        default_factory=get_env("ORACLE_KEYWORD_EXTRACTION_CACHE_SIZE", 1024)
+    )
+    """Number of recent queries whose extracted keywords are cached per worker."""
 
     # MongoDB configuration
     MONGO_DB_CONNECTION_STRING: str = field(
@@ -587,6 +657,12 @@ class VectorDatabaseSettings:
 class KnowledgeSourceSettings:
     """Knowledge source configuration"""
 
+    # Source sync configuration
+    SOURCE_SYNC_EMBEDDING_BATCH_SIZE: int = field(
+        default_factory=get_env("SOURCE_SYNC_EMBEDDING_BATCH_SIZE", 256)
+    )
+    """Chunks of several documents are embedded together, up to this many per batch."""
+
     # HubSpot configuration
     HUBSPOT: str = field(default_factory=get_env("KNOWLEDGE_SOURCE_HUBSPOT", ""))
     """HubSpot knowledge source token."""
@@ -666,6 +742,9 @@ class Settings:
     log: LogSettings = field(default_factory=LogSettings)
     observability: ObservabilitySettings = field(default_factory=ObservabilitySettings)
     azure: AzureSettings = field(default_factory=AzureSettings)
+    embedding_cache: EmbeddingCacheSettings = field(
+        default_factory=EmbeddingCacheSettings
+    )
     knowledge_sources: KnowledgeSourceSettings = field(
         default_factory=KnowledgeSourceSettings
     )
@@ -739,6 +818,11 @@ def get_azure_settings() -> AzureSettings:
     return get_settings().azure
 
 
+@lru_cache(maxsize=1, typed=True)
+def get_embedding_cache_settings() -> EmbeddingCacheSettings:
+    return get_settings().embedding_cache
+
+
 @lru_cache(maxsize=1, typed=True)
 def get_vector_database_settings() -> VectorDatabaseSettings:
     return get_settings().db_connections
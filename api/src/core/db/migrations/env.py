@@ -29,7 +29,7 @@ from core.db.models.deep_research import (  # noqa: F401
     DeepResearchConfig,
     DeepResearchRun,
 )
-from core.db.models.evaluation import Evaluation  # noqa: F401
+from core.db.models.evaluation import Evaluation, EvaluationResult  # noqa: F401
 from core.db.models.evaluation_set import EvaluationSet  # noqa: F401
 from core.db.models.knowledge_graph import (  # noqa: F401
     KnowledgeGraph,
@@ -38,7 +38,7 @@ from core.db.models.knowledge_graph import (  # noqa: F401
 )
 from core.db.models.mcp_server import MCPServer  # noqa: F401
 from core.db.models.mcp_server.mcp_server import EncryptedJsonB  # noqa: F401
-from core.db.models.metric import Metric  # noqa: F401
+from core.db.models.metric import Metric, MetricRollup  # noqa: F401
 from core.db.models.prompt import Prompt  # noqa: F401
 from core.db.models.provider import Provider  # noqa: F401
 from core.db.models.rag_tool.rag_tool import RagTool  # noqa: F401
@@ -46,7 +46,7 @@ from core.db.models.retrieval_tool import RetrievalTool  # noqa: F401
 from core.db.models.slack import SlackInstallation, SlackOAuthState  # noqa: F401
 from core.db.models.teams import TeamsMeeting  # noqa: F401
 from core.db.models.teams.note_taker_settings import NoteTakerSettings  # noqa: F401
-from core.db.models.trace import Trace  # noqa: F401
+from core.db.models.trace import Trace, TraceSpan  # noqa: F401
 from core.db.models.transcription.transcription import Transcription  # noqa: F401
 
 # Add the src directory to the Python path
@@ -0,0 +1,101 @@
+# type: ignore
+"""add config_cache_versions table
+
+Revision ID: 7b4e2a9c6d13
+Revises: 3c7d9e1f5b28
+Create Date: 2026-10-17 18:00:00.000000+00:00
+
+"""
+
+from __future__ import annotations
+
+import warnings
+from typing import TYPE_CHECKING
+
+import sqlalchemy as sa
+from advanced_alchemy.types import (
+    GUID,
+    ORA_JSONB,
+    DateTimeUTC,
+    EncryptedString,
+    EncryptedText,
+)
+from alembic import op
+from sqlalchemy import Text  # noqa: F401
+
+if TYPE_CHECKING:
+    pass
+
+__all__ = [
+    "downgrade",
+    "upgrade",
+    "schema_upgrades",
+    "schema_downgrades",
+    "data_upgrades",
+    "data_downgrades",
+]
+
+sa.GUID = GUID
+sa.DateTimeUTC = DateTimeUTC
+sa.ORA_JSONB = ORA_JSONB
+sa.EncryptedString = EncryptedString
+sa.EncryptedText = EncryptedText
+sa.Text = Text
+
+
+# revision identifiers, used by Alembic.
+revision = "7b4e2a9c6d13"
+down_revision = "3c7d9e1f5b28"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", category=UserWarning)
+        with op.get_context().autocommit_block():
+            schema_upgrades()
+            data_upgrades()
+
+
+def downgrade() -> None:
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", category=UserWarning)
+        with op.get_context().autocommit_block():
+            data_downgrades()
+            schema_downgrades()
+
+
+def schema_upgrades() -> None:
+    """schema upgrade migrations go here."""
+    op.create_table(
+        "config_cache_versions",
+        sa.Column(
+            "namespace",
+            sa.String(length=64),
+            nullable=False,
+            comment="Cached configuration namespace (e.g. agents, prompt_templates)",
+        ),
+        sa.Column(
+            "version",
+            sa.BigInteger(),
+            nullable=False,
+            comment="Incremented on every change of the namespace",
+        ),
+        sa.Column("created_at", sa.DateTimeUTC(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTimeUTC(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("namespace", name=op.f("config_cache_versions_pkey")),
+    )
+
+
+def schema_downgrades() -> None:
+    """schema downgrade migrations go here."""
+    op.drop_table("config_cache_versions")
+
+
+def data_upgrades() -> None:
+    """Add any optional data upgrade migrations here!"""
+
+
+def data_downgrades() -> None:
+    """Add any optional data downgrade migrations here!"""
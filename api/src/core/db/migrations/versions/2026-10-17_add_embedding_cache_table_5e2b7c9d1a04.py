@@ -0,0 +1,123 @@
+# type: ignore
+"""add embedding_cache table
+
+Revision ID: 5e2b7c9d1a04
+Revises: c9d0e1f2a3b4
+Create Date: 2026-10-17 09:00:00.000000+00:00
+
+"""
+
+from __future__ import annotations
+
+import warnings
+from typing import TYPE_CHECKING
+
+import sqlalchemy as sa
+from advanced_alchemy.types import (
+    GUID,
+    ORA_JSONB,
+    DateTimeUTC,
+    EncryptedString,
+    EncryptedText,
+)
+from alembic import op
+from sqlalchemy import Text  # noqa: F401
+from sqlalchemy.dialects import postgresql
+
+if TYPE_CHECKING:
+    pass
+
+__all__ = [
+    "downgrade",
+    "upgrade",
+    "schema_upgrades",
+    "schema_downgrades",
+    "data_upgrades",
+    "data_downgrades",
+]
+
+sa.GUID = GUID
+sa.DateTimeUTC = DateTimeUTC
+sa.ORA_JSONB = ORA_JSONB
+sa.EncryptedString = EncryptedString
+sa.EncryptedText = EncryptedText
+sa.Text = Text
+
+
+# revision identifiers, used by Alembic.
+revision = "5e2b7c9d1a04"
+down_revision = "c9d0e1f2a3b4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", category=UserWarning)
+        with op.get_context().autocommit_block():
+            schema_upgrades()
+            data_upgrades()
+
+
+def downgrade() -> None:
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", category=UserWarning)
+        with op.get_context().autocommit_block():
+            data_downgrades()
+            schema_downgrades()
+
+
+def schema_upgrades() -> None:
+    """schema upgrade migrations go here."""
+    op.create_table(
+        "embedding_cache",
+        sa.Column(
+            "model_system_name",
+            sa.String(length=255),
+            nullable=False,
+            comment="System name of the embedding model",
+        ),
+        sa.Column(
+            "text_hash",
+            sa.String(length=64),
+            nullable=False,
+            comment="sha256 hex digest of the embedded text",
+        ),
+        sa.Column(
+            "model_fingerprint",
+            sa.String(length=64),
+            nullable=False,
+            comment="Digest of the model settings (ai_model, provider, vector size) used to produce the vector",
+        ),
+        sa.Column(
+            "embedding",
+            postgresql.ARRAY(sa.Float(precision=24)),
+            nullable=False,
+            comment="Embedding vector",
+        ),
+        sa.Column("created_at", sa.DateTimeUTC(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTimeUTC(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint(
+            "model_system_name", "text_hash", name=op.f("embedding_cache_pkey")
+        ),
+    )
+    op.create_index(
+        op.f("ix_embedding_cache_updated_at"),
+        "embedding_cache",
+        ["updated_at"],
+        unique=False,
+    )
+
+
+def schema_downgrades() -> None:
+    """schema downgrade migrations go here."""
+    op.drop_index(op.f("ix_embedding_cache_updated_at"), table_name="embedding_cache")
+    op.drop_table("embedding_cache")
+
+
+def data_upgrades() -> None:
+    """Add any optional data upgrade migrations here!"""
+
+
+def data_downgrades() -> None:
+    """Add any optional data downgrade migrations here!"""
@@ -0,0 +1,283 @@
+# type: ignore
+"""add evaluation_results table and evaluation summary columns
+
+Revision ID: 9d4f2b7e1c60
+Revises: 7b4e2a9c6d13
+Create Date: 2026-10-17 20:00:00.000000+00:00
+
+"""
+
+from __future__ import annotations
+
+import warnings
+from typing import TYPE_CHECKING
+
+import sqlalchemy as sa
+from advanced_alchemy.types import (
+    GUID,
+    ORA_JSONB,
+    DateTimeUTC,
+    EncryptedString,
+    EncryptedText,
+)
+from alembic import op
+from sqlalchemy import Text  # noqa: F401
+from sqlalchemy.dialects import postgresql
+
+if TYPE_CHECKING:
+    pass
+
+__all__ = [
+    "downgrade",
+    "upgrade",
+    "schema_upgrades",
+    "schema_downgrades",
+    "data_upgrades",
+    "data_downgrades",
+]
+
+sa.GUID = GUID
+sa.DateTimeUTC = DateTimeUTC
+sa.ORA_JSONB = ORA_JSONB
+sa.EncryptedString = EncryptedString
+sa.EncryptedText = EncryptedText
+sa.Text = Text
+
+
+# revision identifiers, used by Alembic.
+revision = "9d4f2b7e1c60"
+down_revision = "7b4e2a9c6d13"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", category=UserWarning)
+        with op.get_context().autocommit_block():
+            schema_upgrades()
+            data_upgrades()
+
+
+def downgrade() -> None:
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", category=UserWarning)
+        with op.get_context().autocommit_block():
+            data_downgrades()
+            schema_downgrades()
+
+
+# Summary columns of evaluations (see the Evaluation model)
+SUMMARY_COLUMNS = [
+    ("records_count", sa.Integer),
+    ("latency_sum", sa.Float),
+    ("latency_count", sa.Integer),
+    ("score_sum", sa.Float),
+    ("results_with_score", sa.Integer),
+    ("completion_tokens_sum", sa.Float),
+    ("completion_tokens_count", sa.Integer),
+    ("prompt_tokens_sum", sa.Float),
+    ("prompt_tokens_count", sa.Integer),
+    ("cached_tokens_sum", sa.Float),
+    ("cached_tokens_count", sa.Integer),
+]
+
+
+def _json_type():
+    return (
+        sa.JSON()
+        .with_variant(postgresql.JSONB(astext_type=sa.Text()), "cockroachdb")
+        .with_variant(sa.ORA_JSONB(), "oracle")
+        .with_variant(postgresql.JSONB(astext_type=sa.Text()), "postgresql")
+    )
+
+
+def schema_upgrades() -> None:
+    """schema upgrade migrations go here."""
+    op.create_table(
+        "evaluation_results",
+        sa.Column("id", sa.GUID(length=16), nullable=False),
+        sa.Column("sa_orm_sentinel", sa.Integer(), nullable=True),
+        sa.Column(
+            "evaluation_id",
+            sa.GUID(length=16),
+            nullable=False,
+            comment="Evaluation the result belongs to",
+        ),
+        sa.Column(
+            "position",
+            sa.Integer(),
+            nullable=False,
+            comment="Order of the result in the evaluation",
+        ),
+        sa.Column(
+            "result_id",
+            sa.String(length=255),
+            nullable=False,
+            comment="Result identifier used by the API (the 'id' of the result data)",
+        ),
+        sa.Column("latency", sa.Float(), nullable=True),
+        sa.Column("score", sa.Float(), nullable=True),
+        sa.Column("completion_tokens", sa.Float(), nullable=True),
+        sa.Column("prompt_tokens", sa.Float(), nullable=True),
+        sa.Column("cached_tokens", sa.Float(), nullable=True),
+        sa.Column(
+            "data",
+            _json_type(),
+            nullable=False,
+            comment="Result with answer, latency, score, usage data",
+        ),
+        sa.Column("created_at", sa.DateTimeUTC(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTimeUTC(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["evaluation_id"],
+            ["evaluations.id"],
+            name=op.f("fk_evaluation_results_evaluation_id_evaluations"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_evaluation_results")),
+    )
+    op.create_index(
+        op.f("ix_evaluation_results_evaluation_id_position"),
+        "evaluation_results",
+        ["evaluation_id", "position"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_evaluation_results_evaluation_id_result_id"),
+        "evaluation_results",
+        ["evaluation_id", "result_id"],
+        unique=False,
+    )
+
+    for name, column_type in SUMMARY_COLUMNS:
+        op.add_column(
+            "evaluations",
+            sa.Column(name, column_type(), nullable=False, server_default="0"),
+        )
+    op.create_index(
+        op.f("ix_evaluations_started_at"), "evaluations", ["started_at"], unique=False
+    )
+
+
+def schema_downgrades() -> None:
+    """schema downgrade migrations go here."""
+    op.drop_index(op.f("ix_evaluations_started_at"), table_name="evaluations")
+    for name, _ in SUMMARY_COLUMNS:
+        op.drop_column("evaluations", name)
+
+    op.drop_index(
+        op.f("ix_evaluation_results_evaluation_id_result_id"),
+        table_name="evaluation_results",
+    )
+    op.drop_index(
+        op.f("ix_evaluation_results_evaluation_id_position"),
+        table_name="evaluation_results",
+    )
+    op.drop_table("evaluation_results")
+
+
+def data_upgrades() -> None:
+    """Move the results arrays of evaluations to evaluation_results."""
+    connection = op.get_bind()
+
+    # Results were only written by PostgreSQL specific statements
+    if connection.dialect.name == "postgresql":
+        connection.execute(
+            sa.text("""
+                INSERT INTO evaluation_results (
+                    id, evaluation_id, position, result_id,
+                    latency, score, completion_tokens, prompt_tokens, cached_tokens,
+                    data, created_at, updated_at
+                )
+                SELECT
+                    md5(e.id::text || ':' || elem.position::text)::uuid,
+                    e.id,
+                    elem.position - 1,
+                    coalesce(elem.value->>'id', ''),
+                    CASE WHEN jsonb_typeof(elem.value->'latency') = 'number'
+                        THEN (elem.value->>'latency')::float END,
+                    CASE WHEN jsonb_typeof(elem.value->'score') = 'number'
+                        THEN (elem.value->>'score')::float END,
+                    CASE WHEN jsonb_typeof(elem.value->'usage'->'completion_tokens') = 'number'
+                        THEN (elem.value->'usage'->>'completion_tokens')::float END,
+                    CASE WHEN jsonb_typeof(elem.value->'usage'->'prompt_tokens') = 'number'
+                        THEN (elem.value->'usage'->>'prompt_tokens')::float END,
+                    CASE WHEN jsonb_typeof(elem.value->'usage'->'cached_tokens') = 'number'
+                        THEN (elem.value->'usage'->>'cached_tokens')::float END,
+                    elem.value,
+                    now(),
+                    now()
+                FROM evaluations e,
+                    jsonb_array_elements(
+                        CASE WHEN jsonb_typeof(e.results) = 'array'
+                            THEN e.results ELSE '[]'::jsonb END
+                    ) WITH ORDINALITY AS elem(value, position)
+            """)
+        )
+        connection.execute(
+            sa.text("""
+                UPDATE evaluations e
+                SET
+                    records_count = s.records_count,
+                    latency_sum = s.latency_sum,
+                    latency_count = s.latency_count,
+                    score_sum = s.score_sum,
+                    results_with_score = s.results_with_score,
+                    completion_tokens_sum = s.completion_tokens_sum,
+                    completion_tokens_count = s.completion_tokens_count,
+                    prompt_tokens_sum = s.prompt_tokens_sum,
+                    prompt_tokens_count = s.prompt_tokens_count,
+                    cached_tokens_sum = s.cached_tokens_sum,
+                    cached_tokens_count = s.cached_tokens_count
+                FROM (
+                    SELECT
+                        evaluation_id,
+                        count(*) AS records_count,
+                        coalesce(sum(latency) FILTER (WHERE latency > 0), 0) AS latency_sum,
+                        count(*) FILTER (WHERE latency > 0) AS latency_count,
+                        coalesce(sum(score) FILTER (WHERE score > 0), 0) AS score_sum,
+                        count(*) FILTER (WHERE score > 0) AS results_with_score,
+                        coalesce(sum(completion_tokens), 0) AS completion_tokens_sum,
+                        count(completion_tokens) AS completion_tokens_count,
+                        coalesce(sum(prompt_tokens), 0) AS prompt_tokens_sum,
+                        count(prompt_tokens) AS prompt_tokens_count,
+                        coalesce(sum(cached_tokens), 0) AS cached_tokens_sum,
+                        count(cached_tokens) AS cached_tokens_count
+                    FROM evaluation_results
+                    GROUP BY evaluation_id
+                ) s
+                WHERE e.id = s.evaluation_id
+            """)
+        )
+
+    op.drop_column("evaluations", "results")
+
+
+def data_downgrades() -> None:
+    """Move evaluation_results back to the results arrays of evaluations."""
+    op.add_column(
+        "evaluations",
+        sa.Column(
+            "results",
+            _json_type(),
+            nullable=True,
+            comment="Evaluation results with latency, score, usage data",
+        ),
+    )
+
+    connection = op.get_bind()
+    if connection.dialect.name == "postgresql":
+        connection.execute(
+            sa.text("""
+                UPDATE evaluations e
+                SET results = coalesce(
+                    (
+                        SELECT jsonb_agg(r.data ORDER BY r.position)
+                        FROM evaluation_results r
+                        WHERE r.evaluation_id = e.id
+                    ),
+                    '[]'::jsonb
+                )
+            """)
+        )
@@ -0,0 +1,102 @@
+# type: ignore
+"""add evaluation run lease columns
+
+Revision ID: 6a1e8d3f4c92
+Revises: 9d4f2b7e1c60
+Create Date: 2026-10-17 22:00:00.000000+00:00
+
+"""
+
+from __future__ import annotations
+
+import warnings
+from typing import TYPE_CHECKING
+
+import sqlalchemy as sa
+from advanced_alchemy.types import (
+    GUID,
+    ORA_JSONB,
+    DateTimeUTC,
+    EncryptedString,
+    EncryptedText,
+)
+from alembic import op
+from sqlalchemy import Text  # noqa: F401
+
+if TYPE_CHECKING:
+    pass
+
+__all__ = [
+    "downgrade",
+    "upgrade",
+    "schema_upgrades",
+    "schema_downgrades",
+    "data_upgrades",
+    "data_downgrades",
+]
+
+sa.GUID = GUID
+sa.DateTimeUTC = DateTimeUTC
+sa.ORA_JSONB = ORA_JSONB
+sa.EncryptedString = EncryptedString
+sa.EncryptedText = EncryptedText
+sa.Text = Text
+
+
+# revision identifiers, used by Alembic.
+revision = "6a1e8d3f4c92"
+down_revision = "9d4f2b7e1c60"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", category=UserWarning)
+        with op.get_context().autocommit_block():
+            schema_upgrades()
+            data_upgrades()
+
+
+def downgrade() -> None:
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", category=UserWarning)
+        with op.get_context().autocommit_block():
+            data_downgrades()
+            schema_downgrades()
+
+
+def schema_upgrades() -> None:
+    """schema upgrade migrations go here."""
+    op.add_column(
+        "evaluations",
+        sa.Column(
+            "owner",
+            sa.String(length=64),
+            nullable=True,
+            comment="Run evaluating the records",
+        ),
+    )
+    op.add_column(
+        "evaluations",
+        sa.Column(
+            "heartbeat_at",
+            sa.DateTimeUTC(timezone=True),
+            nullable=True,
+            comment="Last heartbeat of the owner",
+        ),
+    )
+
+
+def schema_downgrades() -> None:
+    """schema downgrade migrations go here."""
+    op.drop_column("evaluations", "heartbeat_at")
+    op.drop_column("evaluations", "owner")
+
+
+def data_upgrades() -> None:
+    """Add any optional data upgrade migrations here!"""
+
+
+def data_downgrades() -> None:
+    """Add any optional data downgrade migrations here!"""
@@ -0,0 +1,159 @@
+# type: ignore
+"""add metric_rollups table
+
+Revision ID: 3c7d9e1f5b28
+Revises: 8a3f1c6e2d57
+Create Date: 2026-10-17 15:00:00.000000+00:00
+
+"""
+
+from __future__ import annotations
+
+import warnings
+from typing import TYPE_CHECKING
+
+import sqlalchemy as sa
+from advanced_alchemy.types import (
+    GUID,
+    ORA_JSONB,
+    DateTimeUTC,
+    EncryptedString,
+    EncryptedText,
+)
+from alembic import op
+from sqlalchemy import Text  # noqa: F401
+from sqlalchemy.dialects import postgresql
+
+if TYPE_CHECKING:
+    pass
+
+__all__ = [
+    "downgrade",
+    "upgrade",
+    "schema_upgrades",
+    "schema_downgrades",
+    "data_upgrades",
+    "data_downgrades",
+]
+
+sa.GUID = GUID
+sa.DateTimeUTC = DateTimeUTC
+sa.ORA_JSONB = ORA_JSONB
+sa.EncryptedString = EncryptedString
+sa.EncryptedText = EncryptedText
+sa.Text = Text
+
+
+# revision identifiers, used by Alembic.
+revision = "3c7d9e1f5b28"
+down_revision = "8a3f1c6e2d57"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", category=UserWarning)
+        with op.get_context().autocommit_block():
+            schema_upgrades()
+            data_upgrades()
+
+
+def downgrade() -> None:
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", category=UserWarning)
+        with op.get_context().autocommit_block():
+            data_downgrades()
+            schema_downgrades()
+
+
+def schema_upgrades() -> None:
+    """schema upgrade migrations go here."""
+    op.create_table(
+        "metric_rollups",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column(
+            "granularity",
+            sa.String(length=10),
+            nullable=False,
+            comment="Bucket size ('hour' or 'day')",
+        ),
+        sa.Column(
+            "bucket_start",
+            sa.DateTimeUTC(timezone=True),
+            nullable=False,
+            comment="Start of the bucket (metric start_time truncated to the bucket size)",
+        ),
+        sa.Column("feature_type", sa.String(length=100), nullable=True),
+        sa.Column("feature_system_name", sa.String(length=255), nullable=True),
+        sa.Column("channel", sa.String(length=255), nullable=True),
+        sa.Column("status", sa.String(length=255), nullable=True),
+        sa.Column("source", sa.String(length=255), nullable=True),
+        sa.Column("consumer_name", sa.String(length=255), nullable=True),
+        sa.Column("call_count", sa.Integer(), nullable=False),
+        sa.Column("error_count", sa.Integer(), nullable=False),
+        sa.Column("latency_sum", sa.Float(), nullable=False),
+        sa.Column("latency_count", sa.Integer(), nullable=False),
+        sa.Column(
+            "latency_histogram",
+            postgresql.ARRAY(sa.Integer()),
+            nullable=False,
+            comment="Call counts per latency bucket (see LATENCY_HISTOGRAM_BOUNDS_MS)",
+        ),
+        sa.Column("cost_sum", sa.Float(), nullable=False),
+        sa.Column("cost_count", sa.Integer(), nullable=False),
+        sa.Column(
+            "user_sketch",
+            sa.LargeBinary(),
+            nullable=False,
+            comment="HyperLogLog registers of user IDs",
+        ),
+        sa.Column(
+            "breakdowns",
+            sa.JSON()
+            .with_variant(postgresql.JSONB(astext_type=sa.Text()), "cockroachdb")
+            .with_variant(sa.ORA_JSONB(), "oracle")
+            .with_variant(postgresql.JSONB(astext_type=sa.Text()), "postgresql"),
+            nullable=False,
+            comment="Call counts per value of extra_data / conversation_data fields",
+        ),
+        sa.Column(
+            "sums",
+            sa.JSON()
+            .with_variant(postgresql.JSONB(astext_type=sa.Text()), "cockroachdb")
+            .with_variant(sa.ORA_JSONB(), "oracle")
+            .with_variant(postgresql.JSONB(astext_type=sa.Text()), "postgresql"),
+            nullable=False,
+            comment="[sum, count] of numeric extra_data / conversation_data fields",
+        ),
+        sa.Column("created_at", sa.DateTimeUTC(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTimeUTC(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id", name=op.f("metric_rollups_pkey")),
+    )
+    op.create_index(
+        op.f("ix_metric_rollups_granularity_bucket"),
+        "metric_rollups",
+        ["granularity", "bucket_start"],
+        unique=False,
+    )
+    # Lets the rollup job find metrics updated since its last run
+    op.create_index(
+        op.f("ix_metrics_updated_at"), "metrics", ["updated_at"], unique=False
+    )
+
+
+def schema_downgrades() -> None:
+    """schema downgrade migrations go here."""
+    op.drop_index(op.f("ix_metrics_updated_at"), table_name="metrics")
+    op.drop_index(
+        op.f("ix_metric_rollups_granularity_bucket"), table_name="metric_rollups"
+    )
+    op.drop_table("metric_rollups")
+
+
+def data_upgrades() -> None:
+    """Add any optional data upgrade migrations here!"""
+
+
+def data_downgrades() -> None:
+    """Add any optional data downgrade migrations here!"""
@@ -0,0 +1,139 @@
+# type: ignore
+"""add trace_spans table
+
+Revision ID: 8a3f1c6e2d57
+Revises: 5e2b7c9d1a04
+Create Date: 2026-10-17 12:00:00.000000+00:00
+
+"""
+
+from __future__ import annotations
+
+import warnings
+from typing import TYPE_CHECKING
+
+import sqlalchemy as sa
+from advanced_alchemy.types import (
+    GUID,
+    ORA_JSONB,
+    DateTimeUTC,
+    EncryptedString,
+    EncryptedText,
+)
+from alembic import op
+from sqlalchemy import Text  # noqa: F401
+from sqlalchemy.dialects import postgresql
+
+if TYPE_CHECKING:
+    pass
+
+__all__ = [
+    "downgrade",
+    "upgrade",
+    "schema_upgrades",
+    "schema_downgrades",
+    "data_upgrades",
+    "data_downgrades",
+]
+
+sa.GUID = GUID
+sa.DateTimeUTC = DateTimeUTC
+sa.ORA_JSONB = ORA_JSONB
+sa.EncryptedString = EncryptedString
+sa.EncryptedText = EncryptedText
+sa.Text = Text
+
+
+# revision identifiers, used by Alembic.
+revision = "8a3f1c6e2d57"
+down_revision = "5e2b7c9d1a04"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", category=UserWarning)
+        with op.get_context().autocommit_block():
+            schema_upgrades()
+            data_upgrades()
+
+
+def downgrade() -> None:
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", category=UserWarning)
+        with op.get_context().autocommit_block():
+            data_downgrades()
+            schema_downgrades()
+
+
+def schema_upgrades() -> None:
+    """schema upgrade migrations go here."""
+    op.create_table(
+        "trace_spans",
+        sa.Column(
+            "trace_id",
+            sa.String(length=30),
+            nullable=False,
+            comment="Trace the span belongs to",
+        ),
+        sa.Column(
+            "id", sa.String(length=32), nullable=False, comment="Span identifier"
+        ),
+        sa.Column(
+            "parent_id",
+            sa.String(length=32),
+            nullable=True,
+            comment="Parent span identifier (the trace ID for top-level spans)",
+        ),
+        sa.Column(
+            "start_time",
+            sa.DateTimeUTC(timezone=True),
+            nullable=True,
+            comment="Span start time",
+        ),
+        sa.Column(
+            "end_time",
+            sa.DateTimeUTC(timezone=True),
+            nullable=True,
+            comment="Span end time",
+        ),
+        sa.Column(
+            "data",
+            sa.JSON()
+            .with_variant(postgresql.JSONB(astext_type=sa.Text()), "cockroachdb")
+            .with_variant(sa.ORA_JSONB(), "oracle")
+            .with_variant(postgresql.JSONB(astext_type=sa.Text()), "postgresql"),
+            nullable=False,
+            comment="Span details as returned by the traces API",
+        ),
+        sa.Column("created_at", sa.DateTimeUTC(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTimeUTC(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["trace_id"],
+            ["traces.id"],
+            name=op.f("trace_spans_trace_id_fkey"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("trace_id", "id", name=op.f("trace_spans_pkey")),
+    )
+    op.create_index(
+        op.f("ix_trace_spans_trace_id_start_time"),
+        "trace_spans",
+        ["trace_id", "start_time"],
+        unique=False,
+    )
+
+
+def schema_downgrades() -> None:
+    """schema downgrade migrations go here."""
+    op.drop_index(op.f("ix_trace_spans_trace_id_start_time"), table_name="trace_spans")
+    op.drop_table("trace_spans")
+
+
+def data_upgrades() -> None:
+    """Add any optional data upgrade migrations here!"""
+
+
+def data_downgrades() -> None:
+    """Add any optional data downgrade migrations here!"""
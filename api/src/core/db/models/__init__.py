@@ -9,16 +9,18 @@ from .api_key import APIKey
 # from .api_tool import APITool
 from .base import UUIDAuditEntityBase, UUIDAuditSimpleBase
 from .collection import Collection
+from .config_cache import ConfigCacheVersion
 from .deep_research import DeepResearchConfig, DeepResearchRun
+from .embedding_cache import EmbeddingCacheEntry
 from .prompt_queue import PromptQueueConfig
 
 # from .evaluation import Evaluation
-from .evaluation import Evaluation
+from .evaluation import Evaluation, EvaluationResult
 from .job import Job
-from .metric import Metric
+from .metric import Metric, MetricRollup
 from .provider import Provider
 from .teams.note_taker_settings import NoteTakerSettings
-from .trace import Trace
+from .trace import Trace, TraceSpan
 
 __all__ = [
     "UUIDAuditEntityBase",
@@ -27,19 +29,24 @@ __all__ = [
     "AIModel",
     "APIKey",
     "Collection",
+    "ConfigCacheVersion",
     "DeepResearchConfig",
     "DeepResearchRun",
+    "EmbeddingCacheEntry",
     "PromptQueueConfig",
     "Job",
     "Metric",
+    "MetricRollup",
     "Provider",
     "NoteTakerSettings",
     "Trace",
+    "TraceSpan",
     # "AgentConversation",
     # "Agent",
     # "APITool",
     # "EvaluationSet",
     "Evaluation",
+    "EvaluationResult",
     # "Prompt",
     # "RagTool",
     # "RetrievalTools",
@@ -0,0 +1,7 @@
+"""
+Config cache models package.
+"""
+
+from .config_cache_version import ConfigCacheVersion
+
+__all__ = ["ConfigCacheVersion"]
@@ -0,0 +1,41 @@
+"""
+Config cache version table definition.
+"""
+
+from __future__ import annotations
+
+from advanced_alchemy.base import AdvancedDeclarativeBase, CommonTableAttributes
+from advanced_alchemy.mixins import (
+    AuditColumns,
+)
+from sqlalchemy import BigInteger, String
+from sqlalchemy.ext.asyncio import AsyncAttrs
+from sqlalchemy.orm import Mapped, mapped_column
+
+
+class ConfigCacheVersion(
+    CommonTableAttributes, AdvancedDeclarativeBase, AsyncAttrs, AuditColumns
+):
+    """
+    Version counter of a cached configuration namespace.
+
+    The counter is incremented whenever an entity of the namespace (agents, prompt
+    templates, ...) is changed. Workers compare it with the version their in-process
+    entries were loaded at, so a change made through one worker invalidates the
+    entries cached by all of them.
+    """
+
+    __tablename__ = "config_cache_versions"
+
+    namespace: Mapped[str] = mapped_column(
+        String(64),
+        primary_key=True,
+        comment="Cached configuration namespace (e.g. agents, prompt_templates)",
+    )
+
+    version: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        default=0,
+        comment="Incremented on every change of the namespace",
+    )
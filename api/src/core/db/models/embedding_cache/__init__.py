@@ -0,0 +1,7 @@
+"""
+Embedding cache models package.
+"""
+
+from .embedding_cache import EmbeddingCacheEntry
+
+__all__ = ["EmbeddingCacheEntry"]
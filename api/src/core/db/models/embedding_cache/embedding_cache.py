@@ -0,0 +1,53 @@
+"""
+Embedding cache table definition.
+"""
+
+from __future__ import annotations
+
+from advanced_alchemy.base import AdvancedDeclarativeBase, CommonTableAttributes
+from advanced_alchemy.mixins import (
+    AuditColumns,
+)
+from sqlalchemy import Float, Index, String
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncAttrs
+from sqlalchemy.orm import Mapped, mapped_column
+
+
+class EmbeddingCacheEntry(
+    CommonTableAttributes, AdvancedDeclarativeBase, AsyncAttrs, AuditColumns
+):
+    """
+    Content-addressed embedding cache entry.
+
+    Rows are keyed by the embedding model system name and the sha256 digest of the
+    embedded text. The model fingerprint captures the provider model and vector size
+    the vector was produced with, so entries become stale as soon as the model changes.
+    """
+
+    __tablename__ = "embedding_cache"
+    __table_args__ = (Index("ix_embedding_cache_updated_at", "updated_at"),)
+
+    model_system_name: Mapped[str] = mapped_column(
+        String(255),
+        primary_key=True,
+        comment="System name of the embedding model",
+    )
+
+    text_hash: Mapped[str] = mapped_column(
+        String(64),
+        primary_key=True,
+        comment="sha256 hex digest of the embedded text",
+    )
+
+    model_fingerprint: Mapped[str] = mapped_column(
+        String(64),
+        nullable=False,
+        comment="Digest of the model settings (ai_model, provider, vector size) used to produce the vector",
+    )
+
+    embedding: Mapped[list[float]] = mapped_column(
+        ARRAY(Float(precision=24)),
+        nullable=False,
+        comment="Embedding vector",
+    )
@@ -1,5 +1,6 @@
 """Evaluation model package."""
 
 from .evaluation import Evaluation
+from .evaluation_result import EvaluationResult
 
-__all__ = ["Evaluation"]
+__all__ = ["Evaluation", "EvaluationResult"]
@@ -4,7 +4,7 @@ from typing import Any, Optional
 
 from advanced_alchemy.base import UUIDv7AuditBase
 from advanced_alchemy.types import DateTimeUTC, JsonB
-from sqlalchemy import String
+from sqlalchemy import Float, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 
@@ -24,7 +24,10 @@ class Evaluation(UUIDv7AuditBase):
         JsonB, nullable=True, comment="List of test sets used in evaluation"
     )
     started_at: Mapped[Optional[DateTimeUTC]] = mapped_column(
-        DateTimeUTC(timezone=True), nullable=True, comment="Evaluation start time"
+        DateTimeUTC(timezone=True),
+        nullable=True,
+        index=True,
+        comment="Evaluation start time",
     )
     finished_at: Mapped[Optional[DateTimeUTC]] = mapped_column(
         DateTimeUTC(timezone=True), nullable=True, comment="Evaluation finish time"
@@ -38,8 +41,49 @@ class Evaluation(UUIDv7AuditBase):
     tool: Mapped[Optional[dict[str, Any]]] = mapped_column(
         JsonB, nullable=True, comment="Tool configuration used"
     )
-    results: Mapped[Optional[list[dict[str, Any]]]] = mapped_column(
-        JsonB,
-        nullable=True,
-        comment="Evaluation results with latency, score, usage data",
+
+    # Lease of the run evaluating the records: the owner renews the heartbeat while
+    # it runs, an in-progress evaluation is only resumed once the lease expired
+    owner: Mapped[Optional[str]] = mapped_column(
+        String(64), nullable=True, comment="Run evaluating the records"
+    )
+    heartbeat_at: Mapped[Optional[DateTimeUTC]] = mapped_column(
+        DateTimeUTC(timezone=True), nullable=True, comment="Last heartbeat of the owner"
+    )
+
+    # Summary of the rows in ``evaluation_results``, maintained as batches of results
+    # are appended so that the evaluations list does not scan the results.
+    # Averages are sum / count; latency and score count only values > 0.
+    records_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    latency_sum: Mapped[float] = mapped_column(
+        Float, nullable=False, default=0.0, server_default="0"
+    )
+    latency_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    score_sum: Mapped[float] = mapped_column(
+        Float, nullable=False, default=0.0, server_default="0"
+    )
+    results_with_score: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    completion_tokens_sum: Mapped[float] = mapped_column(
+        Float, nullable=False, default=0.0, server_default="0"
+    )
+    completion_tokens_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    prompt_tokens_sum: Mapped[float] = mapped_column(
+        Float, nullable=False, default=0.0, server_default="0"
+    )
+    prompt_tokens_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    cached_tokens_sum: Mapped[float] = mapped_column(
+        Float, nullable=False, default=0.0, server_default="0"
+    )
+    cached_tokens_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
     )
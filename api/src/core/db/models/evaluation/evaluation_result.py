@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from typing import Any, Optional
+from uuid import UUID
+
+from advanced_alchemy.base import UUIDv7AuditBase
+from advanced_alchemy.types import GUID, JsonB
+from sqlalchemy import Float, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+
+class EvaluationResult(UUIDv7AuditBase):
+    """Result of one evaluated test set record.
+
+    Appended by the evaluation job; the evaluation row keeps the summary of its
+    results (see ``Evaluation.records_count`` and the ``*_sum`` / ``*_count`` columns).
+    """
+
+    __tablename__ = "evaluation_results"
+    __table_args__ = (
+        Index(
+            "ix_evaluation_results_evaluation_id_position", "evaluation_id", "position"
+        ),
+        Index(
+            "ix_evaluation_results_evaluation_id_result_id",
+            "evaluation_id",
+            "result_id",
+        ),
+    )
+
+    evaluation_id: Mapped[UUID] = mapped_column(
+        GUID(),
+        ForeignKey("evaluations.id", ondelete="CASCADE"),
+        nullable=False,
+        comment="Evaluation the result belongs to",
+    )
+    position: Mapped[int] = mapped_column(
+        Integer, nullable=False, comment="Order of the result in the evaluation"
+    )
+    result_id: Mapped[str] = mapped_column(
+        String(255),
+        nullable=False,
+        comment="Result identifier used by the API (the 'id' of the result data)",
+    )
+
+    # Values of the result data summarized on the evaluation
+    latency: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    score: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    completion_tokens: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    prompt_tokens: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    cached_tokens: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+
+    data: Mapped[dict[str, Any]] = mapped_column(
+        JsonB,
+        nullable=False,
+        comment="Result with answer, latency, score, usage data",
+    )
@@ -1,5 +1,6 @@
 """Metric model exports."""
 
 from .metric import Metric
+from .metric_rollup import MetricRollup
 
-__all__ = ["Metric"]
+__all__ = ["Metric", "MetricRollup"]
@@ -11,7 +11,7 @@ from advanced_alchemy.mixins import (
     AuditColumns,
 )
 from advanced_alchemy.types import DateTimeUTC, JsonB
-from sqlalchemy import Float, String
+from sqlalchemy import Float, Index, String
 from sqlalchemy.ext.asyncio import AsyncAttrs
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -24,6 +24,7 @@ class Metric(CommonTableAttributes, AdvancedDeclarativeBase, AsyncAttrs, AuditCo
     """
 
     __tablename__ = "metrics"
+    __table_args__ = (Index("ix_metrics_updated_at", "updated_at"),)
 
     id: Mapped[str] = mapped_column(
         String(30),
@@ -0,0 +1,85 @@
+"""
+Metric rollups table definition.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from advanced_alchemy.base import AdvancedDeclarativeBase, CommonTableAttributes
+from advanced_alchemy.mixins import (
+    AuditColumns,
+)
+from advanced_alchemy.types import DateTimeUTC, JsonB
+from sqlalchemy import BigInteger, Float, Index, Integer, LargeBinary, String
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncAttrs
+from sqlalchemy.orm import Mapped, mapped_column
+
+
+class MetricRollup(
+    CommonTableAttributes, AdvancedDeclarativeBase, AsyncAttrs, AuditColumns
+):
+    """
+    Pre-aggregated metrics of one hour or day per feature, channel, status and consumer.
+
+    Rows are rebuilt from the ``metrics`` table by the metrics rollup job and read by
+    the monitoring dashboards instead of scanning raw metrics.
+    """
+
+    __tablename__ = "metric_rollups"
+    __table_args__ = (
+        Index("ix_metric_rollups_granularity_bucket", "granularity", "bucket_start"),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+
+    granularity: Mapped[str] = mapped_column(
+        String(10),
+        nullable=False,
+        comment="Bucket size ('hour' or 'day')",
+    )
+
+    bucket_start: Mapped[DateTimeUTC] = mapped_column(
+        DateTimeUTC,
+        nullable=False,
+        comment="Start of the bucket (metric start_time truncated to the bucket size)",
+    )
+
+    # Dimensions (same names as in the metrics table)
+    feature_type: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    feature_system_name: Mapped[Optional[str]] = mapped_column(
+        String(255), nullable=True
+    )
+    channel: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    status: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    source: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    consumer_name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+
+    # Measures
+    call_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    error_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    latency_sum: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    latency_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    latency_histogram: Mapped[list[int]] = mapped_column(
+        ARRAY(Integer),
+        nullable=False,
+        comment="Call counts per latency bucket (see LATENCY_HISTOGRAM_BOUNDS_MS)",
+    )
+    cost_sum: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    cost_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    user_sketch: Mapped[bytes] = mapped_column(
+        LargeBinary,
+        nullable=False,
+        comment="HyperLogLog registers of user IDs",
+    )
+    breakdowns: Mapped[dict] = mapped_column(
+        JsonB,
+        nullable=False,
+        comment="Call counts per value of extra_data / conversation_data fields",
+    )
+    sums: Mapped[dict] = mapped_column(
+        JsonB,
+        nullable=False,
+        comment="[sum, count] of numeric extra_data / conversation_data fields",
+    )
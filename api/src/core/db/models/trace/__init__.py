@@ -3,5 +3,6 @@ Trace models package.
 """
 
 from .trace import Trace
+from .trace_span import TraceSpan
 
-__all__ = ["Trace"]
+__all__ = ["Trace", "TraceSpan"]
@@ -0,0 +1,72 @@
+"""
+Trace spans table definition.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from advanced_alchemy.base import AdvancedDeclarativeBase, CommonTableAttributes
+from advanced_alchemy.mixins import (
+    AuditColumns,
+)
+from advanced_alchemy.types import DateTimeUTC, JsonB
+from sqlalchemy import ForeignKey, Index, String
+from sqlalchemy.ext.asyncio import AsyncAttrs
+from sqlalchemy.orm import Mapped, mapped_column
+
+
+class TraceSpan(
+    CommonTableAttributes, AdvancedDeclarativeBase, AsyncAttrs, AuditColumns
+):
+    """
+    Append-only span log of a trace.
+
+    The span exporter inserts new spans here instead of rewriting the trace's
+    ``spans`` array, which only holds spans exported before this table existed.
+    """
+
+    __tablename__ = "trace_spans"
+    __table_args__ = (
+        Index("ix_trace_spans_trace_id_start_time", "trace_id", "start_time"),
+    )
+
+    trace_id: Mapped[str] = mapped_column(
+        String(30),
+        ForeignKey("traces.id", ondelete="CASCADE"),
+        primary_key=True,
+        comment="Trace the span belongs to",
+    )
+
+    id: Mapped[str] = mapped_column(
+        String(32),
+        primary_key=True,
+        comment="Span identifier",
+    )
+
+    parent_id: Mapped[Optional[str]] = mapped_column(
+        String(32),
+        nullable=True,
+        comment="Parent span identifier (the trace ID for top-level spans)",
+    )
+
+    start_time: Mapped[Optional[DateTimeUTC]] = mapped_column(
+        DateTimeUTC,
+        nullable=True,
+        comment="Span start time",
+    )
+
+    end_time: Mapped[Optional[DateTimeUTC]] = mapped_column(
+        DateTimeUTC,
+        nullable=True,
+        comment="Span end time",
+    )
+
+    data: Mapped[dict] = mapped_column(
+        JsonB,
+        nullable=False,
+        comment="Span details as returned by the traces API",
+    )
+
+    def __repr__(self) -> str:
+        return f"<TraceSpan(trace_id='{self.trace_id}', id='{self.id}')>"
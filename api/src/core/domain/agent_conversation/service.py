@@ -5,10 +5,55 @@ Service for agent conversation operations.
 from __future__ import annotations
 
 from typing import Any
+from uuid import UUID
 
 from advanced_alchemy.extensions.litestar import repository, service
+from sqlalchemy import bindparam, func, text, update
+from sqlalchemy.dialects.postgresql import JSONB
 
 from core.db.models.agent_conversation import AgentConversation
+from utils.datetime_utils import utc_now
+
+# Sets one field of the message with the given id, without sending the messages
+_SET_MESSAGE_FIELD_SQL = text(
+    """
+    UPDATE agent_conversations AS conversation
+    SET messages = jsonb_set(
+            conversation.messages, ARRAY[target.position::text, :field], :value
+        ),
+        updated_at = :updated_at
+    FROM (
+        SELECT message.position - 1 AS position
+        FROM agent_conversations,
+            jsonb_array_elements(messages) WITH ORDINALITY AS message(value, position)
+        WHERE id = :conversation_id AND message.value ->> 'id' = :message_id
+        LIMIT 1
+    ) AS target
+    WHERE conversation.id = :conversation_id
+    """
+).bindparams(bindparam("value", type_=JSONB))
+
+# Messages after the first `offset` ones (at most `limit`), and the total count
+_MESSAGES_PAGE_SQL = text(
+    """
+    SELECT
+        conversation.message_processing_status,
+        COALESCE(jsonb_array_length(conversation.messages), 0) AS total_count,
+        COALESCE(
+            (
+                SELECT jsonb_agg(message.value ORDER BY message.position)
+                FROM jsonb_array_elements(conversation.messages)
+                    WITH ORDINALITY AS message(value, position)
+                WHERE message.position > :offset
+                    AND (CAST(:limit AS integer) IS NULL
+                        OR message.position <= :offset + CAST(:limit AS integer))
+            ),
+            '[]'::jsonb
+        ) AS messages
+    FROM agent_conversations AS conversation
+    WHERE conversation.id = :conversation_id
+    """
+).columns(messages=JSONB)
 
 
 class AgentConversationService(
@@ -33,6 +78,16 @@ class AgentConversationService(
             f"[update_message_feedback] Called with conversation_id={conversation_id}, message_id={message_id}"
         )
 
+        if db_session.bind.dialect.name == "postgresql":
+            updated = await self._set_message_field(
+                db_session, conversation_id, message_id, "feedback", feedback_data
+            )
+            if not updated:
+                logger.warning(
+                    f"[update_message_feedback] Message {message_id} not found in conversation {conversation_id}"
+                )
+            return updated
+
         conversation = await db_session.get(AgentConversation, conversation_id)
         if not conversation:
             logger.warning(
@@ -91,6 +146,20 @@ class AgentConversationService(
             f"[update_message_custom_feedback] Called with conversation_id={conversation_id}, message_id={message_id}"
         )
 
+        if db_session.bind.dialect.name == "postgresql":
+            updated = await self._set_message_field(
+                db_session,
+                conversation_id,
+                message_id,
+                "custom_feedback",
+                custom_feedback_data,
+            )
+            if not updated:
+                logger.warning(
+                    f"[update_message_custom_feedback] Message {message_id} not found in conversation {conversation_id}"
+                )
+            return updated
+
         conversation = await db_session.get(AgentConversation, conversation_id)
         if not conversation:
             logger.warning(
@@ -149,6 +218,16 @@ class AgentConversationService(
             f"[update_message_copied_status] Called with conversation_id={conversation_id}, message_id={message_id}, copied={copied}"
         )
 
+        if db_session.bind.dialect.name == "postgresql":
+            updated = await self._set_message_field(
+                db_session, conversation_id, message_id, "copied", copied
+            )
+            if not updated:
+                logger.warning(
+                    f"[update_message_copied_status] Message {message_id} not found in conversation {conversation_id}"
+                )
+            return updated
+
         conversation = await db_session.get(AgentConversation, conversation_id)
         if not conversation:
             logger.warning(
@@ -224,6 +303,123 @@ class AgentConversationService(
         await db_session.commit()
         return True
 
+    async def append_messages(
+        self,
+        db_session,
+        conversation_id: str | UUID,
+        messages: list[dict[str, Any]],
+        **values: Any,
+    ) -> bool:
+        """
+        Append messages to a conversation and set other columns (``values``).
+
+        On PostgreSQL only the new messages are sent and concatenated to the stored
+        ``jsonb`` array, so a turn costs the same whatever the conversation length.
+        """
+        conversation_id = UUID(str(conversation_id))
+
+        if db_session.bind.dialect.name != "postgresql":
+            conversation = await db_session.get(AgentConversation, conversation_id)
+            if not conversation:
+                return False
+            conversation.messages = [*(conversation.messages or []), *messages]
+            for key, value in values.items():
+                setattr(conversation, key, value)
+            await db_session.commit()
+            return True
+
+        new_messages = bindparam("new_messages", messages, type_=JSONB)
+        result = await db_session.execute(
+            update(AgentConversation)
+            .where(AgentConversation.id == conversation_id)
+            .values(
+                messages=func.coalesce(
+                    AgentConversation.messages, text("'[]'::jsonb")
+                ).op("||")(new_messages),
+                updated_at=utc_now(),
+                **values,
+            )
+        )
+        await db_session.commit()
+        return bool(result.rowcount)
+
+    async def update_fields(
+        self,
+        db_session,
+        conversation_id: str | UUID,
+        **values: Any,
+    ) -> bool:
+        """
+        Update columns of a conversation without loading its messages.
+        """
+        result = await db_session.execute(
+            update(AgentConversation)
+            .where(AgentConversation.id == UUID(str(conversation_id)))
+            .values(updated_at=utc_now(), **values)
+        )
+        await db_session.commit()
+        return bool(result.rowcount)
+
+    async def get_messages_page(
+        self,
+        db_session,
+        conversation_id: str | UUID,
+        offset: int = 0,
+        limit: int | None = None,
+    ) -> tuple[list[dict[str, Any]], int, str | None] | None:
+        """
+        Messages after the first ``offset`` ones (at most ``limit``), the total
+        message count and the message processing status of a conversation.
+
+        On PostgreSQL only the requested messages are read from the database.
+        """
+        conversation_id = UUID(str(conversation_id))
+
+        if db_session.bind.dialect.name != "postgresql":
+            conversation = await db_session.get(AgentConversation, conversation_id)
+            if not conversation:
+                return None
+            messages = (
+                conversation.messages if isinstance(conversation.messages, list) else []
+            )
+            end = None if limit is None else offset + limit
+            return (
+                messages[offset:end],
+                len(messages),
+                conversation.message_processing_status,
+            )
+
+        row = (
+            await db_session.execute(
+                _MESSAGES_PAGE_SQL,
+                {"conversation_id": conversation_id, "offset": offset, "limit": limit},
+            )
+        ).one_or_none()
+        if not row:
+            return None
+        return row.messages, row.total_count, row.message_processing_status
+
+    async def _set_message_field(
+        self,
+        db_session,
+        conversation_id: str,
+        message_id: str,
+        field: str,
+        value: Any,
+    ) -> bool:
+        result = await db_session.execute(
+            _SET_MESSAGE_FIELD_SQL,
+            {
+                "conversation_id": UUID(str(conversation_id)),
+                "message_id": str(message_id),
+                "field": field,
+                "value": value,
+                "updated_at": utc_now(),
+            },
+        )
+        await db_session.commit()
+        return bool(result.rowcount)
+
     class Repo(repository.SQLAlchemyAsyncRepository[AgentConversation]):
         """Agent conversation repository."""
 
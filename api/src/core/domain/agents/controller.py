@@ -12,6 +12,7 @@ from core.config.constants import DEFAULT_PAGINATION_SIZE
 from core.domain.agents.service import (
     AgentsService,
 )
+from services.config_cache import ConfigNamespace, config_cache
 
 from .schemas import Agent, AgentCreate, AgentUpdate
 
@@ -60,7 +61,8 @@ class AgentsController(Controller):
         """Create a new agent."""
         data.created_by = audit_username
         data.updated_by = audit_username
-        obj = await agents_service.create(data)
+        obj = await agents_service.create(data, auto_commit=True)
+        await config_cache.invalidate(ConfigNamespace.AGENTS)
         await _sync_runtime_caches(
             request=request,
             previous_channels=None,
@@ -109,6 +111,7 @@ class AgentsController(Controller):
         obj = await agents_service.update(
             update_data, item_id=agent_id, auto_commit=True
         )
+        await config_cache.invalidate(ConfigNamespace.AGENTS)
         await _sync_runtime_caches(
             request=request,
             previous_channels=previous_channels,
@@ -126,7 +129,8 @@ class AgentsController(Controller):
         ),
     ) -> None:
         """Delete an agent from the system."""
-        _ = await agents_service.delete(agent_id)
+        _ = await agents_service.delete(agent_id, auto_commit=True)
+        await config_cache.invalidate(ConfigNamespace.AGENTS)
 
 
 async def _sync_runtime_caches(
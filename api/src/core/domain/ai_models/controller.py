@@ -16,7 +16,12 @@ from core.domain.ai_models.service import (
     AIModelsService,
 )
 from core.domain.providers.service import ProvidersService
-from openai_model.utils import clear_model_cache
+from services.ai_services.embedding_cache import (
+    embedding_cache,
+    get_model_fingerprint,
+    query_embedding_memo,
+)
+from services.config_cache import ConfigNamespace, config_cache
 
 from .schemas import AIModel, AIModelCreate, AIModelSetDefaultRequest, AIModelUpdate
 
@@ -26,6 +31,17 @@ if TYPE_CHECKING:
 logger = getLogger(__name__)
 
 
+def _get_fingerprint(obj) -> str:
+    """Fingerprint of the settings of a model that determine its vectors."""
+    return get_model_fingerprint(
+        {
+            "ai_model": obj.ai_model,
+            "provider_system_name": obj.provider_system_name,
+            "configs": obj.configs,
+        }
+    )
+
+
 class ModelTestResult(BaseModel):
     """Result of model test."""
 
@@ -148,8 +164,8 @@ class AIModelsController(Controller):
 
         data.created_by = audit_username
         data.updated_by = audit_username
-        obj = await ai_models_service.create(data)
-        clear_model_cache()
+        obj = await ai_models_service.create(data, auto_commit=True)
+        await config_cache.invalidate(ConfigNamespace.AI_MODELS)
         await refresh_router()  # Refresh LiteLLM router with new model
         return ai_models_service.to_schema(obj, schema_type=AIModel)
 
@@ -190,10 +206,17 @@ class AIModelsController(Controller):
 
         update_data = data.model_dump(exclude_unset=True)
         update_data["updated_by"] = audit_username
+        previous_fingerprint = _get_fingerprint(
+            await ai_models_service.get(ai_model_id)
+        )
         obj = await ai_models_service.update(
             update_data, item_id=ai_model_id, auto_commit=True
         )
-        clear_model_cache()
+        await config_cache.invalidate(ConfigNamespace.AI_MODELS)
+        # Cached vectors are keyed by the fingerprint, so entries of the previous
+        # settings are never returned again and are left to the TTL purge
+        if _get_fingerprint(obj) != previous_fingerprint:
+            query_embedding_memo.invalidate_model(obj.system_name)
         await refresh_router()  # Refresh LiteLLM router with updated model
         return ai_models_service.to_schema(obj, schema_type=AIModel)
 
@@ -209,8 +232,10 @@ class AIModelsController(Controller):
         """Delete an AI model from the system."""
         from services.ai_services.router import refresh_router
 
-        _ = await ai_models_service.delete(ai_model_id)
-        clear_model_cache()
+        obj = await ai_models_service.delete(ai_model_id, auto_commit=True)
+        await config_cache.invalidate(ConfigNamespace.AI_MODELS)
+        await embedding_cache.invalidate_model(obj.system_name)
+        query_embedding_memo.invalidate_model(obj.system_name)
         await refresh_router()  # Refresh LiteLLM router after model deletion
 
     @post("/set_default", status_code=HTTP_204_NO_CONTENT)
@@ -220,6 +245,7 @@ class AIModelsController(Controller):
         """Set default model handler."""
         try:
             await ai_models_service.set_default(data.type, data.system_name)
+            await config_cache.invalidate(ConfigNamespace.AI_MODELS)
         except LookupError as e:
             logger.warning(str(e))
             raise NotFoundException(str(e))
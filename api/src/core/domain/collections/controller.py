@@ -11,6 +11,7 @@ from core.config.constants import DEFAULT_PAGINATION_SIZE
 from core.domain.collections.service import (
     CollectionsService,
 )
+from services.config_cache import ConfigNamespace, config_cache
 
 from .schemas import Collection, CollectionCreate, CollectionUpdate
 
@@ -58,7 +59,10 @@ class CollectionsController(Controller):
         """Create a new Collection, or update if one with the same system_name exists."""
         data.created_by = audit_username
         data.updated_by = audit_username
-        obj = await collections_service.upsert(data, match_fields=["system_name"])
+        obj = await collections_service.upsert(
+            data, match_fields=["system_name"], auto_commit=True
+        )
+        await config_cache.invalidate(ConfigNamespace.COLLECTIONS)
         return collections_service.to_schema(obj, schema_type=Collection)
 
     @get("/code/{code:str}")
@@ -100,6 +104,7 @@ class CollectionsController(Controller):
         obj = await collections_service.update(
             update_data, item_id=collection_id, auto_commit=True
         )
+        await config_cache.invalidate(ConfigNamespace.COLLECTIONS)
         return collections_service.to_schema(obj, schema_type=Collection)
 
     @delete("/{collection_id:uuid}")
@@ -112,4 +117,5 @@ class CollectionsController(Controller):
         ),
     ) -> None:
         """Delete a Collection from the system."""
-        _ = await collections_service.delete(collection_id)
+        _ = await collections_service.delete(collection_id, auto_commit=True)
+        await config_cache.invalidate(ConfigNamespace.COLLECTIONS)
@@ -10,6 +10,7 @@ from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.config.constants import DEFAULT_PAGINATION_SIZE
+from core.db.models.evaluation import Evaluation as EvaluationModel
 from core.domain.evaluations.service import EvaluationsService
 from services.evaluation.services import (
     list_evaluations_with_aggregations,
@@ -76,9 +77,11 @@ class EvaluationsController(Controller):
     ) -> service.OffsetPagination[Evaluation]:
         """List evaluations with pagination and filtering."""
         results, total = await evaluations_service.list_and_count(*filters)
-        return evaluations_service.to_schema(
+        paginated = evaluations_service.to_schema(
             results, total, filters=filters, schema_type=Evaluation
         )
+        paginated.items = await _to_evaluation_schemas(evaluations_service, results)
+        return paginated
 
     @post()
     async def create_evaluation(
@@ -86,7 +89,7 @@ class EvaluationsController(Controller):
     ) -> Evaluation:
         """Create a new evaluation."""
         obj = await evaluations_service.create(data)
-        return evaluations_service.to_schema(obj, schema_type=Evaluation)
+        return (await _to_evaluation_schemas(evaluations_service, [obj]))[0]
 
     @get("/job/{job_id:str}")
     async def get_evaluations_by_job_id(
@@ -94,9 +97,7 @@ class EvaluationsController(Controller):
     ) -> list[Evaluation]:
         """Get evaluations by job ID."""
         objs = await evaluations_service.list(job_id=job_id)
-        return [
-            evaluations_service.to_schema(obj, schema_type=Evaluation) for obj in objs
-        ]
+        return await _to_evaluation_schemas(evaluations_service, objs)
 
     @get("/status/{status:str}")
     async def get_evaluations_by_status(
@@ -104,9 +105,7 @@ class EvaluationsController(Controller):
     ) -> list[Evaluation]:
         """Get evaluations by status."""
         objs = await evaluations_service.list(status=status)
-        return [
-            evaluations_service.to_schema(obj, schema_type=Evaluation) for obj in objs
-        ]
+        return await _to_evaluation_schemas(evaluations_service, objs)
 
     @get("/type/{eval_type:str}")
     async def get_evaluations_by_type(
@@ -114,9 +113,7 @@ class EvaluationsController(Controller):
     ) -> list[Evaluation]:
         """Get evaluations by type."""
         objs = await evaluations_service.list(type=eval_type)
-        return [
-            evaluations_service.to_schema(obj, schema_type=Evaluation) for obj in objs
-        ]
+        return await _to_evaluation_schemas(evaluations_service, objs)
 
     @get("/{evaluation_id:uuid}")
     async def get_evaluation(
@@ -129,7 +126,7 @@ class EvaluationsController(Controller):
     ) -> Evaluation:
         """Get an evaluation by its ID."""
         obj = await evaluations_service.get(evaluation_id)
-        return evaluations_service.to_schema(obj, schema_type=Evaluation)
+        return (await _to_evaluation_schemas(evaluations_service, [obj]))[0]
 
     @patch("/{evaluation_id:uuid}")
     async def update_evaluation(
@@ -145,7 +142,7 @@ class EvaluationsController(Controller):
         obj = await evaluations_service.update(
             data, item_id=evaluation_id, auto_commit=True
         )
-        return evaluations_service.to_schema(obj, schema_type=Evaluation)
+        return (await _to_evaluation_schemas(evaluations_service, [obj]))[0]
 
     @delete("/{evaluation_id:uuid}")
     async def delete_evaluation(
@@ -158,3 +155,17 @@ class EvaluationsController(Controller):
     ) -> None:
         """Delete an evaluation."""
         await evaluations_service.delete(evaluation_id)
+
+
+async def _to_evaluation_schemas(
+    evaluations_service: EvaluationsService, objs: list[EvaluationModel]
+) -> list[Evaluation]:
+    """Build evaluation responses; results are read from the evaluation results table."""
+    objs = list(objs)
+    results = await evaluations_service.get_results(objs)
+    return [
+        evaluations_service.to_schema(obj, schema_type=Evaluation).model_copy(
+            update={"results": results[obj.id]}
+        )
+        for obj in objs
+    ]
@@ -60,9 +60,6 @@ class EvaluationCreate(BaseModel):
     tool: Optional[Dict[str, Any]] = Field(
         default=None, description="Tool configuration used"
     )
-    results: Optional[List[Dict[str, Any]]] = Field(
-        default=None, description="Evaluation results with latency, score, usage data"
-    )
 
 
 class EvaluationUpdate(BaseModel):
@@ -86,6 +83,3 @@ class EvaluationUpdate(BaseModel):
     tool: Optional[Dict[str, Any]] = Field(
         default=None, description="Tool configuration used"
     )
-    results: Optional[List[Dict[str, Any]]] = Field(
-        default=None, description="Evaluation results with latency, score, usage data"
-    )
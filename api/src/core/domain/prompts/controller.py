@@ -13,6 +13,7 @@ from core.domain.prompts.service import (
     PromptsService,
 )
 from prompt_templates.prompt_templates import get_prompt_template_by_system_name_flat
+from services.config_cache import ConfigNamespace, config_cache
 from services.observability import observability_context, observe
 from services.prompt_templates import execute_prompt_template
 from services.prompt_templates.models import (
@@ -71,7 +72,8 @@ class PromptsController(Controller):
         """Create a new prompt."""
         data.created_by = audit_username
         data.updated_by = audit_username
-        obj = await prompts_service.create(data)
+        obj = await prompts_service.create(data, auto_commit=True)
+        await config_cache.invalidate(ConfigNamespace.PROMPT_TEMPLATES)
         return prompts_service.to_schema(obj, schema_type=Prompt)
 
     @get("/code/{code:str}")
@@ -112,6 +114,7 @@ class PromptsController(Controller):
         obj = await prompts_service.update(
             update_data, item_id=prompt_id, auto_commit=True
         )
+        await config_cache.invalidate(ConfigNamespace.PROMPT_TEMPLATES)
         return prompts_service.to_schema(obj, schema_type=Prompt)
 
     @delete("/{prompt_id:uuid}")
@@ -124,7 +127,8 @@ class PromptsController(Controller):
         ),
     ) -> None:
         """Delete a prompt from the system."""
-        _ = await prompts_service.delete(prompt_id)
+        _ = await prompts_service.delete(prompt_id, auto_commit=True)
+        await config_cache.invalidate(ConfigNamespace.PROMPT_TEMPLATES)
 
     @observe(name="Previewing Prompt Template", channel="preview", source="preview")
     @post("/test", status_code=HTTP_200_OK)
@@ -7,13 +7,15 @@ from advanced_alchemy.extensions.litestar import filters, providers, service
 from litestar import Controller, delete, get, patch, post
 from litestar.connection import Request
 from litestar.params import Dependency, Parameter
+from litestar.response import ServerSentEvent
 from litestar.status_codes import HTTP_200_OK
 
 from core.config.constants import DEFAULT_PAGINATION_SIZE
 from core.domain.rag_tools.schemas import RagTool, RagToolCreate, RagToolUpdate
 from core.domain.rag_tools.service import RagToolsService
+from services.config_cache import ConfigNamespace, config_cache
 from services.observability import observability_context, observe
-from services.rag_tools import execute_rag_tool
+from services.rag_tools import execute_rag_tool, stream_rag_tool_execution
 from services.rag_tools.models import RagToolTestResult
 from services.rag_tools.services import get_rag_by_system_name_flat
 from validation.rag_tools import RagToolExecute, RagToolTest
@@ -62,7 +64,8 @@ class RagToolsController(Controller):
         """Create a new RAG tool."""
         data.created_by = audit_username
         data.updated_by = audit_username
-        obj = await rag_tools_service.create(data)
+        obj = await rag_tools_service.create(data, auto_commit=True)
+        await config_cache.invalidate(ConfigNamespace.RAG_TOOLS)
         return rag_tools_service.to_schema(obj, schema_type=RagTool)
 
     @get("/code/{code:str}")
@@ -103,6 +106,7 @@ class RagToolsController(Controller):
         obj = await rag_tools_service.update(
             update_data, item_id=rag_tool_id, auto_commit=True
         )
+        await config_cache.invalidate(ConfigNamespace.RAG_TOOLS)
         return rag_tools_service.to_schema(obj, schema_type=RagTool)
 
     @delete("/{rag_tool_id:uuid}")
@@ -115,7 +119,8 @@ class RagToolsController(Controller):
         ),
     ) -> None:
         """Delete a RAG tool from the system."""
-        _ = await rag_tools_service.delete(rag_tool_id)
+        _ = await rag_tools_service.delete(rag_tool_id, auto_commit=True)
+        await config_cache.invalidate(ConfigNamespace.RAG_TOOLS)
 
     @observe(name="Previewing RAG Tool", channel="preview")
     @post("/test", status_code=HTTP_200_OK)
@@ -168,3 +173,20 @@ class RagToolsController(Controller):
         return await execute_rag_tool(
             system_name_or_config=rag_tool_config, user_message=data.user_message
         )
+
+    @post("/execute/stream", status_code=HTTP_200_OK)
+    async def execute_stream(
+        self,
+        data: RagToolExecute,
+        user_id: str | None,
+        request: Request,
+    ) -> ServerSentEvent:
+        """Execute a RAG tool in production channel, streaming the retrieval results and the answer."""
+        rag_tool_config = await get_rag_by_system_name_flat(data.system_name)
+
+        return stream_rag_tool_execution(
+            rag_tool_config=rag_tool_config,
+            user_message=data.user_message,
+            user_id=user_id,
+            request=request,
+        )
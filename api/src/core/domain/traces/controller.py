@@ -8,7 +8,9 @@ from advanced_alchemy.extensions.litestar import filters, providers, service
 from advanced_alchemy.filters import BeforeAfter, CollectionFilter
 from litestar import Controller, delete, get, patch, post
 from litestar.params import Dependency, Parameter
+from sqlalchemy.orm import defer
 
+from core.db.models.trace import Trace as TraceModel
 from core.domain.traces.service import TracesService
 
 from .schemas import Trace, TraceCreate, TraceListItem, TraceUpdate
@@ -157,8 +159,8 @@ class TracesController(Controller):
         self, traces_service: TracesService, name: str
     ) -> Trace:
         """Get a trace by its name."""
-        obj = await traces_service.get_one(name=name)
-        return traces_service.to_schema(obj, schema_type=Trace)
+        obj = await traces_service.get_one(name=name, load=[defer(TraceModel.spans)])
+        return await _to_trace_schema(traces_service, obj)
 
     @get("/{trace_id:str}")
     async def get_trace(
@@ -168,10 +170,38 @@ class TracesController(Controller):
             title="Trace ID",
             description="The trace to retrieve.",
         ),
+        include_spans: bool = Parameter(
+            query="includeSpans",
+            default=True,
+            description="Include all spans; use the spans endpoint to page them.",
+        ),
     ) -> Trace:
         """Get a trace by its ID."""
-        obj = await traces_service.get(trace_id)
-        return traces_service.to_schema(obj, schema_type=Trace)
+        obj = await traces_service.get(trace_id, load=[defer(TraceModel.spans)])
+        return await _to_trace_schema(traces_service, obj, include_spans)
+
+    @get("/{trace_id:str}/spans")
+    async def list_trace_spans(
+        self,
+        traces_service: TracesService,
+        trace_id: str = Parameter(
+            title="Trace ID",
+            description="The trace to list spans of.",
+        ),
+        current_page: int = Parameter(
+            query="currentPage", ge=1, default=1, required=False
+        ),
+        page_size: int = Parameter(
+            query="pageSize", ge=1, le=1000, default=100, required=False
+        ),
+    ) -> service.OffsetPagination[dict]:
+        """List spans of a trace in export order, page by page."""
+        offset = page_size * (current_page - 1)
+        spans = await traces_service.get_spans(trace_id, limit=page_size, offset=offset)
+        total = await traces_service.count_spans(trace_id)
+        return service.OffsetPagination[dict](
+            items=spans, limit=page_size, offset=offset, total=total
+        )
 
     @patch("/{trace_id:str}")
     async def update_trace(
@@ -198,3 +228,12 @@ class TracesController(Controller):
     ) -> None:
         """Delete a trace from the system."""
         _ = await traces_service.delete(trace_id)
+
+
+async def _to_trace_schema(
+    traces_service: TracesService, obj: TraceModel, include_spans: bool = True
+) -> Trace:
+    """Build the trace response; spans are read from the span log, not the trace row."""
+    item = traces_service.to_schema(obj, schema_type=TraceListItem)
+    spans = await traces_service.get_spans(obj.id) if include_spans else None
+    return Trace(**item.model_dump(), spans=spans)
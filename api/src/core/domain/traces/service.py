@@ -2,10 +2,43 @@ from __future__ import annotations
 
 from advanced_alchemy.extensions.litestar import repository, service
 from advanced_alchemy.filters import FilterTypes
-from sqlalchemy import text
+from sqlalchemy import case, func, select, text
 from sqlalchemy.orm import defer
 
-from core.db.models.trace import Trace
+from core.db.models.trace import Trace, TraceSpan
+
+# Spans of a trace: the legacy ``traces.spans`` array (spans exported before the
+# ``trace_spans`` table existed) followed by the appended span rows.
+# PostgreSQL only; other databases page through both in `_get_spans_portable`
+TRACE_SPANS_SQL = text(
+    """
+    SELECT data FROM (
+        SELECT legacy.span AS data, 0 AS source, legacy.position, NULL::timestamptz AS start_time, '' AS id
+        FROM traces,
+            jsonb_array_elements(coalesce(traces.spans, '[]'::jsonb))
+            WITH ORDINALITY AS legacy(span, position)
+        WHERE traces.id = :trace_id
+        UNION ALL
+        SELECT data, 1, 0, start_time, id
+        FROM trace_spans
+        WHERE trace_id = :trace_id
+    ) AS spans
+    ORDER BY source, position, start_time NULLS FIRST, id
+    LIMIT :limit OFFSET :offset
+    """
+)
+
+TRACE_SPANS_COUNT_SQL = text(
+    """
+    SELECT
+        (
+            SELECT coalesce(jsonb_array_length(spans), 0)
+            FROM traces
+            WHERE id = :trace_id
+        )
+        + (SELECT count(*) FROM trace_spans WHERE trace_id = :trace_id)
+    """
+)
 
 
 class JsonbPathFilter:
@@ -95,3 +128,63 @@ class TracesService(service.SQLAlchemyAsyncRepositoryService[Trace]):
         results, total = await self.list_and_count(*all_filters, load=load_options)
 
         return list(results), total
+
+    def _is_postgresql(self) -> bool:
+        return self.repository.session.get_bind().dialect.name == "postgresql"
+
+    async def _get_legacy_spans(self, trace_id: str) -> list[dict]:
+        result = await self.repository.session.execute(
+            select(Trace.spans).where(Trace.id == trace_id)
+        )
+        return result.scalar() or []
+
+    async def get_spans(
+        self, trace_id: str, limit: int | None = None, offset: int = 0
+    ) -> list[dict]:
+        """Get spans of a trace in export order, optionally a page of them."""
+        if not self._is_postgresql():
+            return await self._get_spans_portable(trace_id, limit, offset)
+        result = await self.repository.session.execute(
+            TRACE_SPANS_SQL,
+            {"trace_id": trace_id, "limit": limit, "offset": offset},
+        )
+        return list(result.scalars())
+
+    async def _get_spans_portable(
+        self, trace_id: str, limit: int | None, offset: int
+    ) -> list[dict]:
+        """Same page as `TRACE_SPANS_SQL`, without PostgreSQL JSON functions."""
+        legacy_spans = await self._get_legacy_spans(trace_id)
+        spans = legacy_spans[offset : offset + limit if limit is not None else None]
+        if limit is not None and len(spans) >= limit:
+            return spans
+
+        statement = (
+            select(TraceSpan.data)
+            .where(TraceSpan.trace_id == trace_id)
+            .order_by(
+                case((TraceSpan.start_time.is_(None), 0), else_=1),
+                TraceSpan.start_time,
+                TraceSpan.id,
+            )
+            .offset(max(offset - len(legacy_spans), 0))
+        )
+        if limit is not None:
+            statement = statement.limit(limit - len(spans))
+        result = await self.repository.session.execute(statement)
+        return spans + list(result.scalars())
+
+    async def count_spans(self, trace_id: str) -> int:
+        """Count spans of a trace."""
+        if not self._is_postgresql():
+            result = await self.repository.session.execute(
+                select(func.count())
+                .select_from(TraceSpan)
+                .where(TraceSpan.trace_id == trace_id)
+            )
+            legacy_spans = await self._get_legacy_spans(trace_id)
+            return (result.scalar() or 0) + len(legacy_spans)
+        result = await self.repository.session.execute(
+            TRACE_SPANS_COUNT_SQL, {"trace_id": trace_id}
+        )
+        return result.scalar() or 0
@@ -39,6 +39,12 @@ class ShutdownPlugin(InitPluginProtocol):
         # Give a brief moment for any ongoing operations to complete
         await asyncio.sleep(0.5)
 
+        # Write spans still queued in the trace exporters
+        await self._flush_traces()
+
+        # Stop content extraction worker processes
+        self._shutdown_content_extraction_pool()
+
         # Close database connection pools
         await self._close_database_connections()
 
@@ -60,6 +66,27 @@ class ShutdownPlugin(InitPluginProtocol):
         else:
             logger.info("No scheduler to shut down")
 
+    async def _flush_traces(self) -> None:
+        """Flush span processors while the event loop can still run exports."""
+        try:
+            from services.observability.otel.config import otel_tracer_provider
+
+            # force_flush blocks until exports complete, so keep it off the loop
+            await asyncio.to_thread(otel_tracer_provider.force_flush)
+        except Exception as e:
+            logger.error(f"Error flushing traces: {e}")
+
+    def _shutdown_content_extraction_pool(self) -> None:
+        """Stop the content extraction worker processes."""
+        try:
+            from services.knowledge_graph.extraction_pool import (
+                content_extraction_pool,
+            )
+
+            content_extraction_pool.shutdown()
+        except Exception as e:
+            logger.error(f"Error shutting down content extraction pool: {e}")
+
     async def _close_database_connections(self) -> None:
         """Close database connection pools based on VECTOR_DB_TYPE."""
         if self.db_type == "ORACLE":
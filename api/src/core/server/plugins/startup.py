@@ -77,6 +77,12 @@ class StartupPlugin(InitPluginProtocol):
 
             # Register periodic cleanup of temporary uploaded files
             self._register_upload_cleanup_job(scheduler)
+
+            # Register periodic purge of expired embedding cache entries
+            self._register_embedding_cache_cleanup_job(scheduler)
+
+            # Register periodic rollup of metrics for the monitoring dashboards
+            self._register_metrics_rollup_job(scheduler)
         except Exception as e:
             logger.error(f"Failed to start scheduler: {e}")
             # Set scheduler to None so we can handle it in shutdown
@@ -114,6 +120,76 @@ class StartupPlugin(InitPluginProtocol):
         except Exception as e:
             logger.warning("Failed to register upload cleanup job: %s", e)
 
+    @staticmethod
+    def _register_embedding_cache_cleanup_job(scheduler) -> None:
+        """Register a periodic job that purges expired embedding cache entries."""
+        try:
+            from apscheduler.triggers.interval import IntervalTrigger
+
+            from core.config.base import get_embedding_cache_settings
+            from services.ai_services.embedding_cache import (
+                purge_expired_embedding_cache,
+            )
+
+            settings = get_embedding_cache_settings()
+            if not settings.PERSISTENT_ENABLED:
+                return
+
+            job_id = "embedding_cache_cleanup"
+
+            # Remove stale job definition if it already exists (e.g. after restart)
+            if scheduler.get_job(job_id):
+                scheduler.remove_job(job_id)
+
+            scheduler.add_job(
+                purge_expired_embedding_cache,
+                trigger=IntervalTrigger(minutes=settings.CLEANUP_INTERVAL_MINUTES),
+                id=job_id,
+                name="Purge expired embedding cache entries",
+                replace_existing=True,
+            )
+            logger.info(
+                "Registered embedding_cache_cleanup job (every %d min)",
+                settings.CLEANUP_INTERVAL_MINUTES,
+            )
+        except Exception as e:
+            logger.warning("Failed to register embedding cache cleanup job: %s", e)
+
+    @staticmethod
+    def _register_metrics_rollup_job(scheduler) -> None:
+        """Register a periodic job that rolls up metrics into hour and day buckets."""
+        try:
+            from apscheduler.triggers.interval import IntervalTrigger
+
+            from services.observability.rollups import (
+                METRICS_ROLLUP_ENABLED,
+                METRICS_ROLLUP_INTERVAL_MINUTES,
+                rollup_metrics,
+            )
+
+            if not METRICS_ROLLUP_ENABLED:
+                return
+
+            job_id = "metrics_rollup"
+
+            # Remove stale job definition if it already exists (e.g. after restart)
+            if scheduler.get_job(job_id):
+                scheduler.remove_job(job_id)
+
+            scheduler.add_job(
+                rollup_metrics,
+                trigger=IntervalTrigger(minutes=METRICS_ROLLUP_INTERVAL_MINUTES),
+                id=job_id,
+                name="Roll up metrics for monitoring dashboards",
+                replace_existing=True,
+            )
+            logger.info(
+                "Registered metrics_rollup job (every %d min)",
+                METRICS_ROLLUP_INTERVAL_MINUTES,
+            )
+        except Exception as e:
+            logger.warning("Failed to register metrics rollup job: %s", e)
+
     async def _refresh_api_keys(self) -> None:
         """Refresh API keys cache."""
         try:
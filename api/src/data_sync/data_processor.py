@@ -1,4 +1,5 @@
 from abc import abstractmethod
+from collections.abc import AsyncIterable
 
 from kreuzberg import ExtractionConfig, extract_bytes
 from langchain.schema import Document
@@ -38,16 +39,46 @@ class DataProcessor:
         self,
         source_basic_metadata: list[SourceBasicMetadata],
         existing_documents: list[dict],
+    ) -> IncrementalUpdateData:
+        grouped_documents_by_record_id = {}
+        for document in existing_documents:
+            self.__add_document_to_group(grouped_documents_by_record_id, document)
+
+        return self.__get_incremental_update_data(
+            source_basic_metadata,
+            [document.get("id", "") for document in existing_documents],
+            grouped_documents_by_record_id,
+        )
+
+    async def get_incremental_update_data_from_manifest(
+        self,
+        source_basic_metadata: list[SourceBasicMetadata],
+        manifest: AsyncIterable[dict],
+    ) -> IncrementalUpdateData:
+        """Same as `get_incremental_update_data`, grouping the chunks of a document
+        manifest as they are streamed instead of holding all documents."""
+        document_ids = []
+        grouped_documents_by_record_id = {}
+        async for document in manifest:
+            document_ids.append(document.get("id", ""))
+            self.__add_document_to_group(grouped_documents_by_record_id, document)
+
+        return self.__get_incremental_update_data(
+            source_basic_metadata,
+            document_ids,
+            grouped_documents_by_record_id,
+        )
+
+    def __get_incremental_update_data(
+        self,
+        source_basic_metadata: list[SourceBasicMetadata],
+        document_ids: list[str],
+        grouped_documents_by_record_id: dict,
     ) -> IncrementalUpdateData:
         source_records_by_id = {
             metadata.source_id: metadata for metadata in source_basic_metadata
         }
 
-        document_ids = [document.get("id", "") for document in existing_documents]
-        grouped_documents_by_record_id = self.__group_documents_by_source_id(
-            existing_documents,
-        )
-
         unchanged_record_ids = self.__get_unchanged_record_ids(
             source_records_by_id,
             grouped_documents_by_record_id,
@@ -141,30 +172,25 @@ class DataProcessor:
 
         return document_chunks
 
-    def __group_documents_by_source_id(self, documents: list[dict]) -> dict:
-        grouped_documents = {}
-
-        for document in documents:
-            metadata = document.get("metadata", {})
-            title = metadata.get("title")
-            source_id = metadata.get("sourceId")
-
-            if not source_id:
-                continue
-
-            modified_time = metadata.get("modifiedTime")
-            document_id = document.get("id")
-
-            if source_id not in grouped_documents:
-                grouped_documents[source_id] = {
-                    "ids": [document_id],
-                    "title": title,
-                    "modifiedTime": modified_time,
-                }
-            else:
-                grouped_documents[source_id]["ids"].append(document_id)
-
-        return grouped_documents
+    def __add_document_to_group(self, grouped_documents: dict, document: dict):
+        metadata = document.get("metadata", {})
+        title = metadata.get("title")
+        source_id = metadata.get("sourceId")
+
+        if not source_id:
+            return
+
+        modified_time = metadata.get("modifiedTime")
+        document_id = document.get("id")
+
+        if source_id not in grouped_documents:
+            grouped_documents[source_id] = {
+                "ids": [document_id],
+                "title": title,
+                "modifiedTime": modified_time,
+            }
+        else:
+            grouped_documents[source_id]["ids"].append(document_id)
 
     def __get_unchanged_record_ids(
         self,
@@ -3,9 +3,11 @@ import os
 import traceback
 from logging import getLogger
 
+from core.config.base import get_knowledge_source_settings
 from data_sources.types.incremental_update_data import IncrementalUpdateData
 from data_sync.data_processor import DataProcessor
 from models import DocumentData
+from open_ai.utils_new import get_embeddings_batch
 from services.observability import observability_context, observe
 from services.observability.models import SpanExportMethod
 from stores.document_store import DocumentStore
@@ -31,13 +33,8 @@ class Synchronizer:
         try:
             await self.__load_data_from_data_source()
 
-            existing_documents = await self.__get_existing_chunks(collection_id)
-            logger.info(
-                f"Existing documents in {collection_id=}: {len(existing_documents)}",
-            )
-
             incremental_update_data: IncrementalUpdateData = (
-                self.__get_incremental_changes(existing_documents)
+                await self.__get_incremental_changes(collection_id)
             )
 
             # Incremental document sync TODO - refactor
@@ -83,12 +80,39 @@ class Synchronizer:
         )
 
     @observe(
-        name="Get existing chunks",
-        description="Get existing chunks, stored in Magnet AI database.",
+        name="Calculate incremental changes",
+        description="Compare the manifest of existing chunks with documents in the source and calculate incremental changes.",
     )
-    async def __get_existing_chunks(self, collection_id: str):
+    async def __get_incremental_changes(
+        self,
+        collection_id: str,
+    ) -> IncrementalUpdateData:
+        source_basic_metadata = self.data_processor.get_all_records_basic_metadata()
+
+        observability_context.update_current_span(
+            input={
+                f"Number of documents in {self.data_processor.data_source.name}": len(
+                    source_basic_metadata,
+                ),
+            },
+        )
+
+        # Only IDs and source metadata of the existing chunks are streamed, not content
+        existing_chunks_count = 0
+
+        async def count_existing_chunks(manifest):
+            nonlocal existing_chunks_count
+            async for document in manifest:
+                existing_chunks_count += 1
+                yield document
+
         try:
-            documents = await self.data_store.list_documents(collection_id)
+            delta = await self.data_processor.get_incremental_update_data_from_manifest(
+                source_basic_metadata,
+                count_existing_chunks(
+                    self.data_store.iterate_document_manifest(collection_id)
+                ),
+            )
         except asyncio.CancelledError:
             logger.info(
                 "Get existing chunks operation was cancelled for collection '%s'",
@@ -103,38 +127,13 @@ class Synchronizer:
             )
             raise
 
-        observability_context.update_current_span(
-            output={"Number of chunks in Magnet AI database": len(documents)}
-        )
-
-        return documents
-
-    @observe(
-        name="Calculate incremental changes",
-        description="Compare existing chunks with documents in the source and calculate incremental changes.",
-    )
-    def __get_incremental_changes(
-        self,
-        existing_documents: list[dict],
-    ) -> IncrementalUpdateData:
-        source_basic_metadata = self.data_processor.get_all_records_basic_metadata()
-
-        observability_context.update_current_span(
-            input={
-                f"Number of documents in {self.data_processor.data_source.name}": len(
-                    source_basic_metadata,
-                ),
-                "Number of chunks in Magnet AI database": len(existing_documents),
-            },
-        )
-
-        delta = self.data_processor.get_incremental_update_data(
-            source_basic_metadata,
-            existing_documents,
+        logger.info(
+            f"Existing documents in {collection_id=}: {existing_chunks_count}",
         )
 
         observability_context.update_current_span(
             output={
+                "Number of chunks in Magnet AI database": existing_chunks_count,
                 "Number of documents to sync": len(delta.source_record_ids_to_add),
                 "Number of chunks to delete": len(delta.document_ids_to_delete),
             },
@@ -175,6 +174,7 @@ class Synchronizer:
         collection_id: str,
         docs_to_add: list[DocumentData],
         doc_ids_to_delete: list[str],
+        embeddings: list[list[float]] | None = None,
     ):
         observability_context.update_current_span(
             input={
@@ -185,7 +185,9 @@ class Synchronizer:
         )
 
         if docs_to_add:
-            await self.data_store.create_documents(docs_to_add, collection_id)
+            await self.data_store.create_documents(
+                docs_to_add, collection_id, embeddings=embeddings
+            )
 
         if doc_ids_to_delete:
             await self.data_store.delete_documents(
@@ -223,34 +225,63 @@ class Synchronizer:
 
         logger.info(f"Source records to add: {source_records_total}")
 
-        # Create a queue with a max size to apply backpressure
-        # The size is a multiple of max_workers to ensure workers don't wait unnecessarily.
+        # Pipeline of overlapping stages: chunk workers -> embedding batches -> save
+        # workers. Queues have a max size to apply backpressure, so a large source
+        # never has more than a few documents in memory. The size is a multiple of
+        # max_workers to ensure workers don't wait unnecessarily.
+        # Each document is saved (and committed) on its own, an interrupted sync
+        # keeps the documents saved so far.
         max_workers = min(
             max(len(incremental_update_data.source_record_ids_to_add), 1),
             SOURCE_SYNC_PARALLEL_THREADS_NUM,
         )
         queue = asyncio.Queue(maxsize=max_workers * 2)
+        chunks_queue = asyncio.Queue(maxsize=max_workers * 2)
+        save_queue = asyncio.Queue(maxsize=max_workers * 2)
+
+        embedding_model = await self.data_store.get_collection_embedding_model(
+            collection_id
+        )
+
+        def document_failed(doc_id: str, stage: str):
+            source_records_failed[0] += 1
+            logger.error(f"Failed to {stage} document {doc_id}")
+            traceback.print_exc()
 
         @observe(
             name="Process document",
-            description="Process document from data source, create chunks, transform if needed and save to database.",
+            description="Process document from data source, create chunks and transform if needed.",
         )
-        async def __process_document(doc_id: str) -> bool:
+        async def __process_document(doc_id: str) -> list[DocumentData]:
+            observability_context.update_current_span(input={"Document ID": doc_id})
+            observability_context.update_current_config(
+                span_export_method=SpanExportMethod.IGNORE_BUT_USE_FOR_TOTALS
+            )
+
+            return await self.__create_chunks(doc_id)
+
+        @observe(
+            name="Save document",
+            description="Save chunks of a document with their embeddings to database.",
+        )
+        async def __save_document(
+            doc_id: str, docs_to_add: list[DocumentData], embeddings: list[list[float]]
+        ):
             observability_context.update_current_span(input={"Document ID": doc_id})
             observability_context.update_current_config(
                 span_export_method=SpanExportMethod.IGNORE_BUT_USE_FOR_TOTALS
             )
 
-            docs_to_add = await self.__create_chunks(doc_id)
             await self.__sync_to_store(
                 collection_id=collection_id,
                 docs_to_add=docs_to_add,
                 doc_ids_to_delete=[],
+                embeddings=embeddings,
             )
 
-            return True
-
-        @observe(description="Document worker that processes documents from the queue.")
+        @observe(
+            description="Document worker that creates chunks of documents from the queue.",
+        )
         async def worker(worker_id: int):
             observability_context.update_current_span(
                 name=f"Document worker #{worker_id}"
@@ -262,42 +293,111 @@ class Synchronizer:
                     doc_id = await queue.get()
 
                     try:
-                        success = await __process_document(doc_id)
+                        chunks = await __process_document(doc_id)
                         logger.info(f"Worker #{worker_id} processed document {doc_id}")
+                        await chunks_queue.put((doc_id, chunks))
                     except Exception:
-                        success = False
-                        logger.error(
-                            f"Worker #{worker_id} failed to process document {doc_id}"
-                        )
-                        traceback.print_exc()
+                        document_failed(doc_id, "process")
                     finally:
-                        if success:
-                            source_records_synced[0] += 1
-                        else:
-                            source_records_failed[0] += 1
-
                         # Notify the queue that the item has been processed
                         queue.task_done()
                 except asyncio.CancelledError:
                     logger.info(f"Worker #{worker_id} cancelled")
                     break
 
-        # Create and start the worker tasks
-        worker_tasks = [asyncio.create_task(worker(i)) for i in range(max_workers)]
+        @observe(
+            description="Embedding worker that embeds chunks of documents in batches.",
+        )
+        async def embedding_worker():
+            observability_context.update_current_span(name="Embedding worker")
+            observability_context.update_current_config(
+                span_export_method=SpanExportMethod.IGNORE_BUT_USE_FOR_TOTALS
+            )
+
+            batch_size = (
+                get_knowledge_source_settings().SOURCE_SYNC_EMBEDDING_BATCH_SIZE
+            )
+            while True:
+                try:
+                    # Take the documents chunked so far, without waiting for more
+                    batch = [await chunks_queue.get()]
+                    chunks_count = len(batch[0][1])
+                    while not chunks_queue.empty() and chunks_count < batch_size:
+                        batch.append(chunks_queue.get_nowait())
+                        chunks_count += len(batch[-1][1])
+
+                    try:
+                        embeddings = await get_embeddings_batch(
+                            texts=[
+                                chunk.content for _, chunks in batch for chunk in chunks
+                            ],
+                            model_system_name=embedding_model,
+                        )
+                        offset = 0
+                        for doc_id, chunks in batch:
+                            await save_queue.put(
+                                (
+                                    doc_id,
+                                    chunks,
+                                    embeddings[offset : offset + len(chunks)],
+                                )
+                            )
+                            offset += len(chunks)
+                    except Exception:
+                        for doc_id, _ in batch:
+                            document_failed(doc_id, "embed")
+                    finally:
+                        for _ in batch:
+                            chunks_queue.task_done()
+                except asyncio.CancelledError:
+                    logger.info("Embedding worker cancelled")
+                    break
+
+        @observe(
+            description="Save worker that saves embedded documents from the queue.",
+        )
+        async def save_worker(worker_id: int):
+            observability_context.update_current_span(name=f"Save worker #{worker_id}")
 
-        # Producer: Add document IDs to the queue
-        for doc_id in incremental_update_data.source_record_ids_to_add:
-            await queue.put(doc_id)
+            while True:
+                try:
+                    doc_id, chunks, embeddings = await save_queue.get()
 
-        # Wait for the queue to be empty (all docs processed)
-        await queue.join()
+                    try:
+                        await __save_document(doc_id, chunks, embeddings)
+                        source_records_synced[0] += 1
+                        logger.info(f"Worker #{worker_id} saved document {doc_id}")
+                    except Exception:
+                        document_failed(doc_id, "save")
+                    finally:
+                        save_queue.task_done()
+                except asyncio.CancelledError:
+                    logger.info(f"Save worker #{worker_id} cancelled")
+                    break
 
-        # Stop the worker tasks gracefully
-        for task in worker_tasks:
-            task.cancel()
+        # Create and start the worker tasks of all stages
+        worker_tasks = [
+            *(asyncio.create_task(worker(i)) for i in range(max_workers)),
+            asyncio.create_task(embedding_worker()),
+            *(asyncio.create_task(save_worker(i)) for i in range(max_workers)),
+        ]
 
-        # Wait for all workers to finish cancelling
-        await asyncio.gather(*worker_tasks, return_exceptions=True)
+        try:
+            # Producer: Add document IDs to the queue
+            for doc_id in incremental_update_data.source_record_ids_to_add:
+                await queue.put(doc_id)
+
+            # Wait for the stages to be drained in order (all docs processed)
+            await queue.join()
+            await chunks_queue.join()
+            await save_queue.join()
+        finally:
+            # Stop the worker tasks gracefully
+            for task in worker_tasks:
+                task.cancel()
+
+            # Wait for all workers to finish cancelling
+            await asyncio.gather(*worker_tasks, return_exceptions=True)
 
         observability_context.update_current_span(
             output={
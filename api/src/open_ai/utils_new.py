@@ -1,4 +1,6 @@
+import asyncio
 import json
+import logging
 import time
 from collections.abc import AsyncIterator
 from typing import BinaryIO
@@ -7,6 +9,12 @@ from openai.types.chat import ChatCompletionChunk, ChatCompletionMessageParam
 
 from open_ai.models import ChatCompletionWithMetrics
 from openai_model.utils import get_model_by_system_name
+from services.ai_services.embedding_cache import (
+    embedding_cache,
+    get_model_fingerprint,
+    hash_text,
+    query_embedding_memo,
+)
 from services.ai_services.factory import get_ai_provider
 from services.ai_services.router import get_model_system_name_by_deployment_id
 from services.observability import observability_context
@@ -19,6 +27,8 @@ from services.observability.models import (
 )
 from services.observability.utils import get_usage_and_cost_details
 
+logger = logging.getLogger(__name__)
+
 
 def _get_observability_level_from_config(config: dict | None) -> ObservabilityLevel:
     """Extract observability level from prompt template config."""
@@ -277,14 +287,11 @@ async def create_chat_completion(
         return result
 
 
-async def create_chat_completion_from_prompt_template(
+def _prepare_prompt_template_messages(
     prompt_template_config: dict,
     prompt_template_values: dict | None = None,
     additional_messages: list[ChatCompletionMessageParam] | None = None,
-    tools: list[dict] | None = None,
-    tool_choice: str | dict | None = None,
-    parallel_tool_calls: bool | None = None,
-) -> tuple[ChatCompletionWithMetrics, list[ChatCompletionMessageParam]]:
+) -> tuple[list[ChatCompletionMessageParam], dict | None]:
     system_message: str = prompt_template_config.get("text", "")
     response_format: dict | None = prompt_template_config.get("response_format")
 
@@ -311,6 +318,21 @@ async def create_chat_completion_from_prompt_template(
         *(additional_messages or []),
     ]
 
+    return messages, response_format
+
+
+async def create_chat_completion_from_prompt_template(
+    prompt_template_config: dict,
+    prompt_template_values: dict | None = None,
+    additional_messages: list[ChatCompletionMessageParam] | None = None,
+    tools: list[dict] | None = None,
+    tool_choice: str | dict | None = None,
+    parallel_tool_calls: bool | None = None,
+) -> tuple[ChatCompletionWithMetrics, list[ChatCompletionMessageParam]]:
+    messages, response_format = _prepare_prompt_template_messages(
+        prompt_template_config, prompt_template_values, additional_messages
+    )
+
     # Call the LLM
     chat_completion = await create_chat_completion(
         messages=messages,
@@ -329,14 +351,50 @@ async def create_chat_completion_from_prompt_template(
     return chat_completion, messages
 
 
-async def get_embeddings(text: str, model_system_name: str):
-    llm = None
-    provider_system_name = None
+def create_chat_completion_stream_from_prompt_template(
+    prompt_template_config: dict,
+    prompt_template_values: dict | None = None,
+    additional_messages: list[ChatCompletionMessageParam] | None = None,
+) -> tuple[AsyncIterator[str], list[ChatCompletionMessageParam]]:
+    """Stream the answer of a prompt template as content deltas.
 
-    observed_feature = ObservedFeature(
-        type=FeatureType.EMBEDDING, system_name=FeatureType.EMBEDDING.value
+    Returns the delta iterator and the messages sent to the model. The model is
+    called when the iterator is first consumed.
+    """
+    messages, response_format = _prepare_prompt_template_messages(
+        prompt_template_config, prompt_template_values, additional_messages
     )
 
+    async def deltas() -> AsyncIterator[str]:
+        async for chunk in create_chat_completion_stream(
+            model_system_name=prompt_template_config.get("system_name_for_model"),
+            messages=messages,
+            temperature=prompt_template_config.get("temperature"),
+            top_p=prompt_template_config.get("topP"),
+            max_tokens=prompt_template_config.get("maxTokens"),
+            response_format=response_format,
+        ):
+            # The usage chunk closing the stream has no choices
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    return deltas(), messages
+
+
+# Defaults used when the embedding model does not declare its own limits in
+# `configs` (max_batch_size / max_batch_tokens / max_concurrent_batches).
+EMBEDDING_BATCH_MAX_INPUTS = 96
+EMBEDDING_BATCH_MAX_TOKENS = 200_000
+EMBEDDING_BATCH_MAX_CONCURRENCY = 4
+
+
+async def _get_embedding_model_details(
+    model_system_name: str,
+) -> tuple[str | None, str, dict, ObservationModelDetails]:
+    """Resolve llm, provider and observability details for an embedding model."""
+    llm = None
+    provider_system_name = None
+
     # Prepare model details for traces and metrics
     call_model = ObservationModelDetails()
     call_model.update(name=model_system_name)
@@ -367,12 +425,82 @@ async def get_embeddings(text: str, model_system_name: str):
             f"Model '{model_system_name}' does not have a provider_system_name configured"
         )
 
-    # Prepare provider details for traces and metrics
-    provider_display_name = provider_system_name  # Default to system_name
-
     # Prepare model parameters for traces and metrics
     call_model.update(parameters={"llm": llm})
 
+    return llm, provider_system_name, model_config, call_model
+
+
+def _estimate_embedding_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token) used for batch packing."""
+    return len(text) // 4 + 1
+
+
+def _get_embedding_batch_limits(model_config: dict) -> tuple[int, int, int]:
+    """Read per-model batch limits from `configs`, falling back to defaults."""
+    configs = model_config.get("configs") or {}
+    if not isinstance(configs, dict):
+        configs = {}
+
+    def _positive_int(key: str, default: int) -> int:
+        value = configs.get(key)
+        if isinstance(value, int) and value > 0:
+            return value
+        return default
+
+    return (
+        _positive_int("max_batch_size", EMBEDDING_BATCH_MAX_INPUTS),
+        _positive_int("max_batch_tokens", EMBEDDING_BATCH_MAX_TOKENS),
+        _positive_int("max_concurrent_batches", EMBEDDING_BATCH_MAX_CONCURRENCY),
+    )
+
+
+def split_into_embedding_batches(
+    texts: list[str],
+    max_inputs: int,
+    max_tokens: int,
+) -> list[list[str]]:
+    """Pack texts into consecutive batches within input-count and token limits.
+
+    A single text larger than `max_tokens` still gets its own batch, so the
+    provider (not the packer) decides whether to truncate or reject it.
+    """
+    batches: list[list[str]] = []
+    current: list[str] = []
+    current_tokens = 0
+
+    for text in texts:
+        tokens = _estimate_embedding_tokens(text)
+        if current and (
+            len(current) >= max_inputs or current_tokens + tokens > max_tokens
+        ):
+            batches.append(current)
+            current = []
+            current_tokens = 0
+        current.append(text)
+        current_tokens += tokens
+
+    if current:
+        batches.append(current)
+
+    return batches
+
+
+async def get_embeddings(text: str, model_system_name: str):
+    observed_feature = ObservedFeature(
+        type=FeatureType.EMBEDDING, system_name=FeatureType.EMBEDDING.value
+    )
+
+    (
+        llm,
+        provider_system_name,
+        model_config,
+        call_model,
+    ) = await _get_embedding_model_details(model_system_name)
+
+    # Prepare provider details for traces and metrics
+    provider_display_name = provider_system_name  # Default to system_name
+
     # Prepare input for traces and metrics
     call_input = text
 
@@ -431,6 +559,153 @@ async def get_embeddings(text: str, model_system_name: str):
         return embeddings.data
 
 
+async def get_query_embedding(query: str, model_system_name: str) -> list[float]:
+    """
+    Create the embedding of a search query, memoized per model.
+
+    Repeated queries within the memo TTL are answered without a provider call, and
+    concurrent identical queries share a single in-flight `get_embeddings` call.
+    """
+    return await query_embedding_memo.get_or_compute(
+        model_system_name,
+        query,
+        lambda: get_embeddings(query, model_system_name),
+    )
+
+
+async def get_embeddings_batch(
+    texts: list[str],
+    model_system_name: str,
+    use_cache: bool = True,
+) -> list[list[float]]:
+    """
+    Create embeddings for many texts, packing them into as few provider requests as possible.
+
+    Vectors for texts embedded before with the same model are served from the
+    content-addressed embedding cache; duplicate texts are embedded once.
+    The remaining texts are split into batches that respect the model's
+    input-count and token limits (`configs.max_batch_size` /
+    `configs.max_batch_tokens`); up to `configs.max_concurrent_batches` batches
+    are sent at once. Each provider request is recorded as one observability span.
+
+    Returns:
+        One vector per input text, in the same order as `texts`.
+    """
+    if not texts:
+        return []
+
+    (
+        llm,
+        provider_system_name,
+        model_config,
+        call_model,
+    ) = await _get_embedding_model_details(model_system_name)
+
+    text_hashes = [hash_text(text) for text in texts]
+    model_fingerprint = get_model_fingerprint(model_config)
+    vectors_by_hash: dict[str, list[float]] = {}
+    if use_cache:
+        vectors_by_hash = await embedding_cache.get_many(
+            model_system_name, model_fingerprint, set(text_hashes)
+        )
+
+    missing_texts: dict[str, str] = {}
+    for text_hash, text in zip(text_hashes, texts):
+        if text_hash not in vectors_by_hash:
+            missing_texts.setdefault(text_hash, text)
+
+    if use_cache:
+        logger.debug(
+            "Embedding cache for model '%s': %d of %d unique texts cached",
+            model_system_name,
+            len(vectors_by_hash),
+            len(vectors_by_hash) + len(missing_texts),
+        )
+
+    if not missing_texts:
+        return [vectors_by_hash[text_hash] for text_hash in text_hashes]
+
+    max_inputs, max_tokens, max_concurrency = _get_embedding_batch_limits(model_config)
+
+    provider = await get_ai_provider(provider_system_name)
+
+    # Enrich call_model with provider-level observability details
+    otel_system = getattr(provider, "otel_gen_ai_system", None)
+    if otel_system:
+        call_model.update(otel_gen_ai_system=otel_system)
+    provider_label = getattr(provider, "config", {}).get("label")
+    if provider_label:
+        call_model.update(provider_display_name=provider_label)
+
+    provider_display_name = provider_label or provider_system_name
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _embed_batch(batch: list[str]) -> list[list[float]]:
+        observed_feature = ObservedFeature(
+            type=FeatureType.EMBEDDING, system_name=FeatureType.EMBEDDING.value
+        )
+        async with semaphore:
+            with observability_context.observe_feature(observed_feature):
+                observability_context.update_current_span(
+                    name="Convert texts to vectors",
+                    description=f'Creating vectors for a batch of {len(batch)} texts using "{llm}" LLM, provided by {provider_display_name}.',
+                    model=call_model,
+                    input={"texts_count": len(batch)},
+                )
+
+                call_start_time = time.time()
+                embeddings = await provider.get_embeddings_batch(
+                    texts=batch,
+                    llm=llm,
+                    model_config=model_config,
+                )
+                call_duration = time.time() - call_start_time
+
+                if len(embeddings.data) != len(batch):
+                    raise ValueError(
+                        f"Embedding provider returned {len(embeddings.data)} vectors for {len(batch)} inputs"
+                    )
+
+                call_usage, call_cost = await get_usage_and_cost_details(
+                    embeddings.usage, model_system_name
+                )
+
+                observability_context.update_current_span(
+                    usage_details=call_usage,
+                    cost_details=call_cost,
+                    output=None,  # skip vector data
+                )
+
+                observability_context.record_llm_metrics(
+                    llm_type=LLMType.EMBEDDING,
+                    model=call_model,
+                    duration=call_duration,
+                    usage=call_usage,
+                    cost=call_cost,
+                )
+
+                return embeddings.data
+
+    batches = split_into_embedding_batches(
+        list(missing_texts.values()), max_inputs, max_tokens
+    )
+    batch_results = await asyncio.gather(*[_embed_batch(batch) for batch in batches])
+
+    new_vectors = dict(
+        zip(
+            missing_texts.keys(),
+            (vector for batch_vectors in batch_results for vector in batch_vectors),
+        )
+    )
+    if use_cache:
+        await embedding_cache.set_many(
+            model_system_name, model_fingerprint, new_vectors
+        )
+    vectors_by_hash.update(new_vectors)
+
+    return [vectors_by_hash[text_hash] for text_hash in text_hashes]
+
+
 async def create_chat_completion_stream(
     *,
     model_system_name: str,
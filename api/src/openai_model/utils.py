@@ -3,18 +3,20 @@ from logging import getLogger
 from core.config.app import alchemy
 from core.domain.ai_models.schemas import AIModel
 from core.domain.ai_models.service import AIModelsService
+from services.config_cache import ConfigNamespace, config_cache
 
 logger = getLogger(__name__)
 
-# Cache for model configurations to reduce database calls
-_model_cache = {}
-
 
 async def get_model_by_system_name(system_name_for_model: str) -> dict:
-    # Check cache first to avoid database call
-    if system_name_for_model in _model_cache:
-        return _model_cache[system_name_for_model]
+    return await config_cache.get_or_load(
+        ConfigNamespace.AI_MODELS,
+        system_name_for_model,
+        lambda: _load_model_by_system_name(system_name_for_model),
+    )
+
 
+async def _load_model_by_system_name(system_name_for_model: str) -> dict:
     async with alchemy.get_session() as session:
         try:
             service = AIModelsService(session=session)
@@ -26,19 +28,8 @@ async def get_model_by_system_name(system_name_for_model: str) -> dict:
                 )
 
             model_schema = service.to_schema(model, schema_type=AIModel)
-            model_dict = model_schema.model_dump()
-
-            # Cache the result for future use
-            _model_cache[system_name_for_model] = model_dict
-
-            return model_dict
+            return model_schema.model_dump()
 
         except Exception as err:
             logger.warning("Failed to get model: '%s': %s", system_name_for_model, err)
             raise
-
-
-def clear_model_cache():
-    """Clear the model cache - useful for testing or when models are updated"""
-    global _model_cache
-    _model_cache.clear()
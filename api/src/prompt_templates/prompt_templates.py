@@ -7,6 +7,7 @@ from bson import ObjectId
 from core.config.app import alchemy
 from core.domain.prompts.schemas import Prompt
 from core.domain.prompts.service import PromptsService
+from services.config_cache import ConfigNamespace, config_cache
 
 logger = getLogger(__name__)
 
@@ -24,6 +25,16 @@ async def get_prompt_template(prompt_template_id: str) -> dict:
 
 
 async def get_prompt_template_by_system_name(prompt_template_system_name: str) -> dict:
+    return await config_cache.get_or_load(
+        ConfigNamespace.PROMPT_TEMPLATES,
+        prompt_template_system_name,
+        lambda: _load_prompt_template_by_system_name(prompt_template_system_name),
+    )
+
+
+async def _load_prompt_template_by_system_name(
+    prompt_template_system_name: str,
+) -> dict:
     async with alchemy.get_session() as session:
         service = PromptsService(session=session)
         prompt_template = await service.get_one_or_none(
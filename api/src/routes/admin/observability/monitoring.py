@@ -1,15 +1,17 @@
+from datetime import datetime
 from logging import getLogger
 from typing import Annotated
 
 from litestar import Controller, post, put
 from litestar.params import Parameter
-from litestar.response import File
+from litestar.response import Stream
 from litestar.status_codes import HTTP_200_OK
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from services.agents.conversations.services import set_message_custom_feedback
 from services.common.models import ConversationMessageFeedback, EmptyDictionary
+from services.observability.export import EXPORT_MEDIA_TYPES
 from services.observability.models import (
     AgentMetricSummary,
     FeatureType,
@@ -22,8 +24,6 @@ from services.observability.models import (
     RagMetricsSummary,
 )
 from services.observability.services import (
-    create_file_with_agent_metrics_for_export,
-    create_file_with_rag_metrics_for_export,
     get_metrics_by_feature_type,
     get_options_agent,
     get_options_llm,
@@ -31,6 +31,9 @@ from services.observability.services import (
     get_top_metrics_agent,
     get_top_metrics_llm,
     get_top_metrics_rag,
+    stream_agent_metrics_export,
+    stream_metrics_by_feature_type,
+    stream_rag_metrics_export,
     summarize_agent_metrics,
     summarize_llm_metrics,
     summarize_rag_tool_metrics,
@@ -67,6 +70,15 @@ MonitoringTopResponse = list[MetricsTopList]
 MonitoringListResponse = MetricsQueryResult
 
 
+def _export_response(content, name: str, format: str) -> Stream:
+    filename = f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{format}"
+    return Stream(
+        content,
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 class MetricsController(Controller):
     path = "/monitoring"
     tags = ["Admin / Observability"]
@@ -122,20 +134,15 @@ class MetricsController(Controller):
     )
     async def rag_tool_export(
         self,
-        db_session: AsyncSession,
         data: OffsetPaginationRequest | None = None,
         format: str = "csv",
-    ) -> File | None:
+    ) -> Stream | None:
         try:
-            metrics = await get_metrics_by_feature_type(
-                db_session, FeatureType.RAG_TOOL, data
-            )
-            filename = await create_file_with_rag_metrics_for_export(
-                metrics["items"],
+            content = stream_rag_metrics_export(
+                stream_metrics_by_feature_type(FeatureType.RAG_TOOL, data),
                 format,
             )
-            # Optionally use aiofiles for file existence check or manipulation
-            return File(path=filename)
+            return _export_response(content, "rag_metrics", format)
         except Exception as e:
             logger.error(f"Error in rag_tool_export: {e}")
             return None
@@ -257,19 +264,15 @@ class MetricsController(Controller):
     )
     async def agent_export(
         self,
-        db_session: AsyncSession,
         data: OffsetPaginationRequest | None = None,
         format: str = "csv",
-    ) -> File | None:
+    ) -> Stream | None:
         try:
-            metrics = await get_metrics_by_feature_type(
-                db_session, FeatureType.AGENT, data
-            )
-            filename = await create_file_with_agent_metrics_for_export(
-                metrics["items"],
+            content = stream_agent_metrics_export(
+                stream_metrics_by_feature_type(FeatureType.AGENT, data),
                 format,
             )
-            return File(path=filename)
+            return _export_response(content, "agent_metrics", format)
         except Exception as e:
             logger.error(f"Error in agent_export: {e}")
             return None
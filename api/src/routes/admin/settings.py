@@ -17,6 +17,7 @@ from sqlalchemy import select
 from core.config.app import alchemy
 from core.db.types import EncryptedJsonB
 from core.fixtures.loader import FixtureLoader
+from services.config_cache import CONFIG_NAMESPACES_BY_ENTITY_TYPE, config_cache
 
 # Fields excluded from both export and import.
 # - Auto-generated by advanced-alchemy: id (UUIDv7PrimaryKey), created_at / updated_at
@@ -272,12 +273,14 @@ class SettingsController(Controller):
             if existing:
                 for key, value in payload.items():
                     setattr(existing, key, value)
-                await session.commit()
-                return True
-
-            session.add(model_class(**payload))
+            else:
+                session.add(model_class(**payload))
             await session.commit()
-            return False
+
+        namespace = CONFIG_NAMESPACES_BY_ENTITY_TYPE.get(entity_type)
+        if namespace:
+            await config_cache.invalidate(namespace)
+        return existing is not None
 
     @get("/seed/preview")
     async def seed_preview(self) -> SeedPreviewResponse:
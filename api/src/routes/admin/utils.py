@@ -2,7 +2,7 @@ from typing import Annotated
 
 from cryptography.fernet import Fernet
 from kreuzberg import ExtractionConfig, PageConfig, extract_bytes
-from litestar import Controller, post
+from litestar import Controller, get, post
 from litestar.datastructures import UploadFile
 from litestar.enums import RequestEncodingType
 from litestar.exceptions import ClientException
@@ -10,6 +10,10 @@ from litestar.params import Body
 from litestar.status_codes import HTTP_200_OK
 from pydantic import BaseModel
 
+from services.ai_services.embedding_cache import (
+    embedding_cache,
+    query_embedding_memo,
+)
 from services.knowledge_graph.readers.kreuzberg_reader import mime_type_from_filename
 
 
@@ -65,3 +69,15 @@ class UtilsController(Controller):
         secret_encryption_key = Fernet.generate_key().decode()
 
         return {"key": secret_encryption_key}
+
+    @get("/embedding-cache/stats", status_code=HTTP_200_OK)
+    async def get_embedding_cache_stats(self) -> dict:
+        """
+        Returns hit/miss counters of the embedding caches of this worker:
+        the content-addressed document embedding cache and the query embedding memo.
+        """
+
+        return {
+            "embedding_cache": embedding_cache.get_stats(),
+            "query_embedding_memo": query_embedding_memo.get_stats(),
+        }
@@ -375,10 +375,17 @@ class AgentConversationsController(Controller):
                 ge=0,
             ),
         ],
+        limit: Annotated[
+            int | None,
+            Parameter(
+                description="The maximum number of messages to return. Returns all missing messages if omitted.",
+                ge=1,
+            ),
+        ] = None,
     ) -> dict[str, Any]:
         try:
             missing_messages = await get_missing_messages(
-                conversation_id, message_count
+                conversation_id, message_count, limit
             )
             return missing_messages
         except RecordNotFoundError:
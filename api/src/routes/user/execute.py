@@ -3,6 +3,7 @@ from typing import Annotated
 from litestar import Controller, post
 from litestar.connection import Request
 from litestar.params import Body
+from litestar.response import ServerSentEvent
 from litestar.status_codes import HTTP_200_OK
 
 from api.tags import TagNames
@@ -18,7 +19,7 @@ from services.prompt_templates.models import (
     PromptTemplateExecuteRequest,
     PromptTemplateExecutionResponse,
 )
-from services.rag_tools import execute_rag_tool
+from services.rag_tools import execute_rag_tool, stream_rag_tool_execution
 from services.rag_tools.models import RagToolTestResult
 from services.rag_tools.services import get_rag_by_system_name_flat
 from validation.rag_tools import RagToolExecute
@@ -107,6 +108,33 @@ class UserExecuteController(Controller):
             metadata_filter=data.metadata_filter,
         )
 
+    @post(
+        "/rag_tool/stream",
+        status_code=HTTP_200_OK,
+        summary="Execute a RAG tool with a streamed answer",
+        description=(
+            "Executes a RAG tool and streams server-sent events: `results` with the retrieved chunks, "
+            "`answer_delta` with parts of the answer, then `answer` with the same payload as the "
+            "non-streaming endpoint (or `error`)."
+        ),
+    )
+    async def rag_tool_execute_stream(
+        self,
+        data: RagToolExecute,
+        user_id: str | None,
+        request: Request,
+    ) -> ServerSentEvent:
+        rag_tool_config = await get_rag_by_system_name_flat(data.system_name)
+
+        return stream_rag_tool_execution(
+            rag_tool_config=rag_tool_config,
+            user_message=data.user_message,
+            user_id=user_id,
+            request=request,
+            metadata_filter=data.metadata_filter,
+            default_source="Runtime API",
+        )
+
     @observe(name="Executing Retrieval Tool", channel="production")
     @post(
         "/retrieval_tool",
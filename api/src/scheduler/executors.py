@@ -326,6 +326,8 @@ async def execute_evaluation(**kwargs):
             "iteration_count": params.get("iteration_count", 1),
             "config": config,
             "result_entity": params.get("result_entity"),
+            # Continue the job's interrupted evaluations instead of starting new ones
+            "resume": params.get("resume", False),
         }
 
         # Execute the evaluation
@@ -443,10 +445,11 @@ async def execute_cleanup_logs(**kwargs):
         deleted_traces = 0
         deleted_metrics = 0
 
-        from sqlalchemy import delete
+        from sqlalchemy import and_, delete, or_
 
         from core.config.app import alchemy
         from core.db.models.metric.metric import Metric
+        from core.db.models.metric.metric_rollup import MetricRollup
         from core.db.models.trace.trace import Trace
 
         async with alchemy.get_session() as session:
@@ -470,6 +473,24 @@ async def execute_cleanup_logs(**kwargs):
                     f"Deleted {deleted_metrics} metrics older than {retention_days} days"
                 )
 
+                # Delete rollup buckets that end before the cutoff
+                await session.execute(
+                    delete(MetricRollup).where(
+                        or_(
+                            and_(
+                                MetricRollup.granularity == "hour",
+                                MetricRollup.bucket_start
+                                < cutoff_date - timedelta(hours=1),
+                            ),
+                            and_(
+                                MetricRollup.granularity == "day",
+                                MetricRollup.bucket_start
+                                < cutoff_date - timedelta(days=1),
+                            ),
+                        )
+                    )
+                )
+
             await session.commit()
 
         observability_context.update_current_trace(
@@ -131,7 +131,7 @@ async def _execute_find_documents_by_summary(
 ) -> AgentActionCallResponse:
     """Execute findDocumentsBySummarySimilarity and return document summaries."""
     from core.domain.knowledge_graph.services import KnowledgeGraphDocumentService
-    from open_ai.utils_new import get_embeddings
+    from open_ai.utils_new import get_query_embedding
 
     query = arguments.get("query")
     if not query:
@@ -142,7 +142,7 @@ async def _execute_find_documents_by_summary(
     limit = int(arguments.get("limit", DEFAULT_LIMIT))
     min_score = float(arguments.get("min_score", DEFAULT_MIN_SCORE))
 
-    vec = await get_embeddings(query, embedding_model)
+    vec = await get_query_embedding(query, embedding_model)
     docs = await KnowledgeGraphDocumentService().search_documents(
         db_session,
         graph_id=graph_id,
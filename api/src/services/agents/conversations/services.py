@@ -4,8 +4,9 @@ from logging import getLogger
 from typing import Any, Type, Union
 from uuid import UUID
 
-from sqlalchemy import desc, or_, func
+from sqlalchemy import desc, or_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer
 from typing_extensions import TypeVar
 
 from core.config.app import alchemy
@@ -15,6 +16,7 @@ from services.agents.models import (
     Agent,
     AgentActionCallConfirmation,
     AgentConversationAddUserMessageResponse,
+    AgentConversationData,
     AgentConversationDataWithMessages,
     AgentConversationMessage,
     AgentConversationMessageAssistantPublic,
@@ -170,6 +172,19 @@ async def get_conversation_by_id(conversation_id: str) -> dict[str, Any]:
         ).model_dump()
 
 
+async def get_conversation_data_by_id(conversation_id: str) -> AgentConversationData:
+    """Conversation without its messages."""
+    async with alchemy.get_session() as session:
+        record = await session.scalar(
+            select(AgentConversation)
+            .where(AgentConversation.id == UUID(str(conversation_id)))
+            .options(defer(AgentConversation.messages))
+        )
+        if not record:
+            raise RecordNotFoundError()
+        return AgentConversationData.model_validate(record, from_attributes=True)
+
+
 ConversationType = TypeVar(
     "ConversationType",
     bound=Union["AgentConversationWithMessages", "AgentConversationWithMessagesPublic"],
@@ -272,19 +287,16 @@ async def add_user_message(
         async with alchemy.get_session() as session:
             service = AgentConversationService(session=session)
 
-            # Update conversation with new messages
-            conversation.last_user_message_at = utc_now()
-            conversation.messages.append(user_message)
-            conversation.messages.append(assistant_message)
-            conversation.message_processing_status = (
-                AgentConversationMessageProcessingStatus.COMPLETED
-            )
-            # Update the conversation in the database
-            await service.update(
-                item_id=conversation_id,
-                data=conversation.model_dump(),
-                auto_commit=True,
+            # Append only the new messages, the stored ones are not rewritten
+            appended = await service.append_messages(
+                db_session=session,
+                conversation_id=conversation_id,
+                messages=[user_message.model_dump(), assistant_message.model_dump()],
+                last_user_message_at=utc_now(),
+                message_processing_status=AgentConversationMessageProcessingStatus.COMPLETED,
             )
+            if not appended:
+                raise RecordNotFoundError()
 
         response = AgentConversationAddUserMessageResponse(
             user_message=AgentConversationMessageUserPublic(
@@ -337,8 +349,7 @@ async def set_message_feedback(
         if not updated:
             raise RecordNotFoundError()
 
-    conversation_document = await get_conversation_by_id(conversation_id)
-    conversation = AgentConversationDataWithMessages(**conversation_document)
+    conversation = await get_conversation_data_by_id(conversation_id)
     payload = data.model_dump()
 
     await _record_feedback_observability(
@@ -352,7 +363,7 @@ async def set_message_feedback(
 
 async def _record_feedback_observability(
     *,
-    conversation: AgentConversationDataWithMessages,
+    conversation: AgentConversationData,
     conversation_id: str,
     message_id: str,
     payload: dict[str, Any],
@@ -435,8 +446,7 @@ async def set_message_custom_feedback(
 
 
 async def copy_message(conversation_id: str, message_id: str):
-    conversation_document = await get_conversation_by_id(conversation_id)
-    conversation = AgentConversationDataWithMessages(**conversation_document)
+    conversation = await get_conversation_data_by_id(conversation_id)
 
     if message_id:
         async with alchemy.get_session() as session:
@@ -493,42 +503,33 @@ async def add_assistant_message(
         messages=conversation.messages,
         variables=conversation.variables,
     )
-    conversation.messages.append(assistant_message)
-    conversation.message_processing_status = (
-        AgentConversationMessageProcessingStatus.COMPLETED
-    )
     async with alchemy.get_session() as session:
         service = AgentConversationService(session=session)
-        await service.update(
-            item_id=conversation_id,
-            data=conversation.model_dump(),
-            auto_commit=True,
+        await service.append_messages(
+            db_session=session,
+            conversation_id=conversation_id,
+            messages=[assistant_message.model_dump()],
+            message_processing_status=AgentConversationMessageProcessingStatus.COMPLETED,
         )
     return assistant_message
 
 
 async def get_missing_messages(
-    conversation_id: str, message_count: int
+    conversation_id: str, message_count: int, limit: int | None = None
 ) -> dict[str, Any]:
     """Get messages that are missing based on the provided message count."""
     async with alchemy.get_session() as session:
         service = AgentConversationService(session=session)
-        record = await service.get_one_or_none(id=conversation_id)
-        if not record:
-            raise RecordNotFoundError()
-
-        # Get all messages from JSONB
-        all_messages = (
-            record.messages
-            if record.messages and isinstance(record.messages, list)
-            else []
-        )
-        total_count = len(all_messages)
-
-        # Get only missing messages (after the provided count)
-        missing_messages = (
-            all_messages[message_count:] if message_count < total_count else []
+        # Only the messages after the provided count are read
+        page = await service.get_messages_page(
+            db_session=session,
+            conversation_id=conversation_id,
+            offset=message_count,
+            limit=limit,
         )
+        if page is None:
+            raise RecordNotFoundError()
+        missing_messages, total_count, message_processing_status = page
 
         # Convert to public format
         messages_public: list[AgentConversationMessagePublic] = []
@@ -563,7 +564,7 @@ async def get_missing_messages(
                 )
         return {
             "messages": [msg.model_dump() for msg in messages_public],
-            "message_processing_status": record.message_processing_status,
+            "message_processing_status": message_processing_status,
             "total_count": total_count,
             "returned_count": len(messages_public),
         }
@@ -572,8 +573,7 @@ async def get_missing_messages(
 async def get_message_processing_status(
     conversation_id: str,
 ) -> AgentConversationMessageProcessingStatus:
-    conversation_record = await get_conversation_by_id(conversation_id)
-    conversation = AgentConversationDataWithMessages(**conversation_record)
+    conversation = await get_conversation_data_by_id(conversation_id)
     return conversation.message_processing_status
 
 
@@ -581,15 +581,12 @@ async def update_message_processing_status(
     conversation_id: str,
     message_processing_status: AgentConversationMessageProcessingStatus,
 ):
-    conversation_record = await get_conversation_by_id(conversation_id)
-    conversation = AgentConversationDataWithMessages(**conversation_record)
-    conversation.message_processing_status = message_processing_status
     async with alchemy.get_session() as session:
         service = AgentConversationService(session=session)
-        updated = await service.update(
-            item_id=conversation_id,
-            data=conversation.model_dump(),
-            auto_commit=True,
+        updated = await service.update_fields(
+            db_session=session,
+            conversation_id=conversation_id,
+            message_processing_status=message_processing_status,
         )
     if not updated:
         raise RecordNotFoundError()
@@ -2,20 +2,99 @@
 
 Provides pluggable strategies to control how many / which messages
 are passed to the LLM as context within the agent loop.
+
+Environment variables:
+    AGENT_MEMORY_DEFAULT_CONTEXT_WINDOW_TOKENS: Context window assumed for models
+        whose limits are unknown (default: 8192)
+    AGENT_MEMORY_CONTEXT_WINDOW_SHARE: Share of the model's context window used by
+        the token budget strategy for conversation history (default: 0.5)
 """
 
 from __future__ import annotations
 
-from typing import Protocol
+import json
+import os
+import uuid
+from collections.abc import Awaitable, Callable
+from functools import lru_cache
+from logging import getLogger
+from typing import Final, Protocol
+
+from services.agents.message_builder import generate_completion_messages
+from services.agents.models import (
+    AgentConversationMemorySummary,
+    AgentConversationMessage,
+    AgentConversationMessageAssistant,
+    AgentConversationMessageRole,
+    AgentConversationRunStepType,
+    MemoryStrategyType,
+)
 
-from services.agents.models import AgentConversationMessage, MemoryStrategyType
+logger = getLogger(__name__)
 
 DEFAULT_LAST_N_MESSAGES = 10
 
+DEFAULT_CONTEXT_WINDOW_TOKENS: Final[int] = int(
+    os.environ.get("AGENT_MEMORY_DEFAULT_CONTEXT_WINDOW_TOKENS", "8192")
+)
+MEMORY_CONTEXT_WINDOW_SHARE: Final[float] = float(
+    os.environ.get("AGENT_MEMORY_CONTEXT_WINDOW_SHARE", "0.5")
+)
+# Lower bound of the token budget, whatever the model and settings
+MIN_MEMORY_MAX_TOKENS = 1024
+# Share of the budget a single tool output may use before it is dropped
+MAX_TOOL_OUTPUT_SHARE = 0.25
+# Share of the budget kept free for the steps of the running turn
+RUN_RESERVE_SHARE = 0.25
+# Tokens added by the chat format for each message
+MESSAGE_OVERHEAD_TOKENS = 4
+
+OMITTED_TOOL_OUTPUT = (
+    "[Tool output omitted to fit the context window ({tokens} tokens)]"
+)
+SUMMARY_MESSAGE_PREFIX = "Summary of the earlier conversation:\n"
+SUMMARY_SYSTEM_PROMPT = (
+    "You maintain a running summary of a conversation between a user and an AI "
+    "agent. Update the current summary with the new messages. Keep the user's goals, "
+    "facts, decisions, open questions and tool results that may be needed later. "
+    "Reply with the updated summary only."
+)
+
+# Folds evicted messages into the previous summary: (summary, messages) -> summary
+Summarizer = Callable[[str | None, list[AgentConversationMessage]], Awaitable[str]]
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding("o200k_base")
+    except Exception as err:
+        logger.warning("Tokenizer is not available, estimating token counts: %s", err)
+        return None
+
+
+def count_tokens(text: str | None) -> int:
+    """Number of tokens in the text (approximate for non-OpenAI models)."""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is None:
+        return len(text) // 4 + 1
+    return len(encoding.encode(text, disallowed_special=()))
+
 
 class MemoryStrategy(Protocol):
     """Interface for conversation memory strategies."""
 
+    async def prepare(
+        self,
+        messages: list[AgentConversationMessage],
+    ) -> AgentConversationMemorySummary | None:
+        """Prepare the strategy for a new turn; return the summary to cache, if any."""
+        ...
+
     def select_messages(
         self,
         messages: list[AgentConversationMessage],
@@ -34,6 +113,12 @@ class LastNMessagesStrategy:
     def __init__(self, n: int = DEFAULT_LAST_N_MESSAGES) -> None:
         self.n = n
 
+    async def prepare(
+        self,
+        messages: list[AgentConversationMessage],
+    ) -> AgentConversationMemorySummary | None:
+        return None
+
     def select_messages(
         self,
         messages: list[AgentConversationMessage],
@@ -46,6 +131,12 @@ class LastNMessagesStrategy:
 class AllMessagesStrategy:
     """Pass all messages to the LLM without any truncation."""
 
+    async def prepare(
+        self,
+        messages: list[AgentConversationMessage],
+    ) -> AgentConversationMemorySummary | None:
+        return None
+
     def select_messages(
         self,
         messages: list[AgentConversationMessage],
@@ -53,10 +144,270 @@ class AllMessagesStrategy:
         return messages
 
 
+class TokenBudgetStrategy:
+    """Fit the conversation into a token budget.
+
+    When the messages exceed the budget, oversized tool outputs of earlier turns
+    are replaced with a placeholder first, then the oldest turns are evicted.
+    ``prepare`` folds the turns evicted since the last turn into a rolling summary
+    (one LLM call), which is cached on the assistant message and sent in place of
+    the evicted turns. The current turn is never evicted.
+    """
+
+    def __init__(self, max_tokens: int, summarize: Summarizer | None = None) -> None:
+        self.max_tokens = max_tokens
+        self.summarize = summarize
+        self.summary: AgentConversationMemorySummary | None = None
+        self._token_counts: dict[tuple[uuid.UUID, bool], int] = {}
+        self._trimmed_messages: dict[uuid.UUID, AgentConversationMessage] = {}
+
+    async def prepare(
+        self,
+        messages: list[AgentConversationMessage],
+    ) -> AgentConversationMemorySummary | None:
+        self.summary = _find_summary(messages)
+        turns = _split_turns(self._drop_tool_outputs(self._after_summary(messages)))
+
+        # Leave room for the steps the current turn is about to add
+        history_budget = int(self.max_tokens * (1 - RUN_RESERVE_SHARE))
+        evicted: list[AgentConversationMessage] = []
+        while len(turns) > 1 and self._count_turns(turns) > history_budget:
+            evicted.extend(turns.pop(0))
+
+        if evicted and self.summarize:
+            try:
+                content = await self.summarize(
+                    self.summary.content if self.summary else None, evicted
+                )
+            except Exception as err:
+                # Evicted turns are dropped without a summary
+                logger.warning("Failed to summarize conversation history: %s", err)
+            else:
+                self.summary = AgentConversationMemorySummary(
+                    content=content, last_message_id=evicted[-1].id
+                )
+
+        return self.summary
+
+    def select_messages(
+        self,
+        messages: list[AgentConversationMessage],
+    ) -> list[AgentConversationMessage]:
+        messages = self._after_summary(messages)
+        if self._count(messages) > self.max_tokens:
+            turns = _split_turns(self._drop_tool_outputs(messages))
+            while len(turns) > 1 and self._count_turns(turns) > self.max_tokens:
+                turns.pop(0)
+            messages = [message for turn in turns for message in turn]
+            if self._count(messages) > self.max_tokens:
+                messages = self._drop_tool_outputs(messages, keep_last_turn=False)
+
+        if self.summary:
+            messages = [
+                AgentConversationMessageAssistant(
+                    id=uuid.uuid4(),
+                    content=SUMMARY_MESSAGE_PREFIX + self.summary.content,
+                ),
+                *messages,
+            ]
+        return messages
+
+    def _after_summary(
+        self, messages: list[AgentConversationMessage]
+    ) -> list[AgentConversationMessage]:
+        if not self.summary:
+            return messages
+        for index, message in enumerate(messages):
+            if message.id == self.summary.last_message_id:
+                return messages[index + 1 :]
+        # The summarized messages are gone, so is the summary
+        self.summary = None
+        return messages
+
+    def _drop_tool_outputs(
+        self,
+        messages: list[AgentConversationMessage],
+        keep_last_turn: bool = True,
+    ) -> list[AgentConversationMessage]:
+        """Replace the tool outputs larger than their share of the budget."""
+        max_output_tokens = int(self.max_tokens * MAX_TOOL_OUTPUT_SHARE)
+        last_turn_start = (
+            _last_turn_start(messages) if keep_last_turn else len(messages)
+        )
+        result = []
+        for index, message in enumerate(messages):
+            if index >= last_turn_start:
+                result.append(message)
+                continue
+            if index == len(messages) - 1:
+                # The running turn keeps changing and is not cached
+                message = _drop_message_tool_outputs(message, max_output_tokens)
+            else:
+                if message.id not in self._trimmed_messages:
+                    self._trimmed_messages[message.id] = _drop_message_tool_outputs(
+                        message, max_output_tokens
+                    )
+                message = self._trimmed_messages[message.id]
+            result.append(message)
+        return result
+
+    def _count(self, messages: list[AgentConversationMessage]) -> int:
+        tokens = count_tokens(self.summary.content) if self.summary else 0
+        last = messages[-1] if messages else None
+        for message in messages:
+            # The last message is the running turn, which keeps changing
+            if message is last:
+                tokens += _count_message_tokens(message)
+                continue
+            key = (message.id, message is self._trimmed_messages.get(message.id))
+            if key not in self._token_counts:
+                self._token_counts[key] = _count_message_tokens(message)
+            tokens += self._token_counts[key]
+        return tokens
+
+    def _count_turns(self, turns: list[list[AgentConversationMessage]]) -> int:
+        return self._count([message for turn in turns for message in turn])
+
+
+def _find_summary(
+    messages: list[AgentConversationMessage],
+) -> AgentConversationMemorySummary | None:
+    for message in reversed(messages):
+        if (
+            message.role == AgentConversationMessageRole.ASSISTANT
+            and message.memory_summary
+        ):
+            return message.memory_summary
+    return None
+
+
+def _split_turns(
+    messages: list[AgentConversationMessage],
+) -> list[list[AgentConversationMessage]]:
+    """Group the messages into turns, each starting with a user message."""
+    turns: list[list[AgentConversationMessage]] = []
+    for message in messages:
+        if message.role == AgentConversationMessageRole.USER or not turns:
+            turns.append([])
+        turns[-1].append(message)
+    return turns
+
+
+def _last_turn_start(messages: list[AgentConversationMessage]) -> int:
+    for index in range(len(messages) - 1, -1, -1):
+        if messages[index].role == AgentConversationMessageRole.USER:
+            return index
+    return 0
+
+
+def _count_message_tokens(message: AgentConversationMessage) -> int:
+    return sum(
+        MESSAGE_OVERHEAD_TOKENS
+        + count_tokens(json.dumps(completion_message, ensure_ascii=False))
+        for completion_message in generate_completion_messages([message])
+    )
+
+
+def _drop_message_tool_outputs(
+    message: AgentConversationMessageAssistant, max_tokens: int
+) -> AgentConversationMessageAssistant:
+    if message.role != AgentConversationMessageRole.ASSISTANT or not message.run:
+        return message
+
+    steps = []
+    dropped = False
+    for step in message.run.steps:
+        if step.type == AgentConversationRunStepType.TOPIC_ACTION_CALL:
+            tokens = count_tokens(
+                json.dumps(step.details.response.content, ensure_ascii=False)
+            )
+            if tokens > max_tokens:
+                step = step.model_copy(deep=True)
+                step.details.response.content = OMITTED_TOOL_OUTPUT.format(
+                    tokens=tokens
+                )
+                dropped = True
+        steps.append(step)
+
+    if not dropped:
+        return message
+    return message.model_copy(
+        update={"run": message.run.model_copy(update={"steps": steps})}
+    )
+
+
+def create_summarizer(prompt_template_config: dict) -> Summarizer:
+    """Summarize with the model of the prompt template."""
+
+    async def summarize(
+        summary: str | None, messages: list[AgentConversationMessage]
+    ) -> str:
+        from open_ai.utils_new import create_chat_completion
+
+        transcript = json.dumps(
+            generate_completion_messages(messages), ensure_ascii=False
+        )
+        chat_completion = await create_chat_completion(
+            model_system_name=prompt_template_config.get("system_name_for_model"),
+            llm=prompt_template_config.get("model"),
+            messages=[
+                {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+                {
+                    "role": "user",
+                    "content": f"Current summary:\n{summary or '(empty)'}\n\n"
+                    f"New messages:\n{transcript}",
+                },
+            ],
+            temperature=0,
+        )
+        return chat_completion.choices[0].message.content or ""
+
+    return summarize
+
+
+async def get_memory_max_tokens(
+    prompt_template_config: dict, max_tokens: int | None = None
+) -> int:
+    """Token budget for the conversation history of the prompt template's model.
+
+    A share of the model's input context window (from the model configs, or from
+    LiteLLM's model info), capped by ``max_tokens`` when it is set.
+    """
+    from openai_model.utils import get_model_by_system_name
+    from services.ai_services.capabilities import detect_model_capabilities
+
+    context_window = None
+    model_system_name = prompt_template_config.get("system_name_for_model")
+    if model_system_name:
+        try:
+            model = await get_model_by_system_name(model_system_name)
+        except Exception:
+            model = {}
+        context_window = (model.get("configs") or {}).get("max_input_tokens")
+        if not context_window and model.get("ai_model"):
+            context_window = detect_model_capabilities(
+                model["ai_model"], model.get("provider_system_name") or ""
+            ).get("max_input_tokens")
+
+    budget = int(
+        (context_window or DEFAULT_CONTEXT_WINDOW_TOKENS) * MEMORY_CONTEXT_WINDOW_SHARE
+    )
+    if max_tokens:
+        budget = min(budget, max_tokens)
+    return max(budget, MIN_MEMORY_MAX_TOKENS)
+
+
 def create_memory_strategy(
     strategy_type: MemoryStrategyType,
     last_n: int = DEFAULT_LAST_N_MESSAGES,
+    max_tokens: int | None = None,
+    summarize: Summarizer | None = None,
 ) -> MemoryStrategy:
     if strategy_type == MemoryStrategyType.ALL:
         return AllMessagesStrategy()
+    if strategy_type == MemoryStrategyType.TOKEN_BUDGET:
+        return TokenBudgetStrategy(
+            max_tokens=max_tokens or DEFAULT_CONTEXT_WINDOW_TOKENS,
+            summarize=summarize,
+        )
     return LastNMessagesStrategy(n=last_n)
@@ -93,6 +93,7 @@ class SampleQuestions(BaseModel):
 class MemoryStrategyType(StrEnum):
     LAST_N = "last_n"
     ALL = "all"
+    TOKEN_BUDGET = "token_budget"
 
 
 class AgentSettings(BaseModel):
@@ -107,6 +108,7 @@ class AgentSettings(BaseModel):
     notes: str | None = None
     memory_strategy: MemoryStrategyType | None = None
     memory_last_n_messages: int | None = None
+    memory_max_tokens: int | None = None
 
 
 class AgentVariantValue(BaseModel):
@@ -289,10 +291,18 @@ AgentConversationRunSteps = list[AgentConversationRunStep]
 AgentConversationRunStepTypeAdapter = TypeAdapter(AgentConversationRunSteps)
 
 
+class AgentConversationMemorySummary(BaseModel):
+    """Rolling summary of the messages evicted from the LLM context."""
+
+    content: str
+    last_message_id: UUID
+
+
 class AgentConversationExecuteTopicResult(BaseModel):
     content: str | None = None
     action_call_requests: list[AgentActionCallRequestPublic] | None = None
     steps: AgentConversationRunSteps
+    memory_summary: AgentConversationMemorySummary | None = None
 
 
 class AgentConversationMessageRole(StrEnum):
@@ -332,6 +342,7 @@ class AgentConversationMessageAssistant(AgentConversationMessageBase):
     topic: str | None = None
     copied: bool | None = False
     custom_feedback: ConversationMessageFeedback | None = None
+    memory_summary: AgentConversationMemorySummary | None = None
 
 
 AgentConversationMessage = Union[
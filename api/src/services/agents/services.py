@@ -37,6 +37,7 @@ from services.agents.models import (
     ConversationIntent,
 )
 from services.agents.topic_execution import execute_topic
+from services.config_cache import ConfigNamespace, config_cache
 from services.observability import observe
 from utils.datetime_utils import utc_now
 
@@ -217,6 +218,8 @@ async def execute_agent(
         memory_kwargs["memory_strategy_type"] = settings.memory_strategy
     if settings and settings.memory_last_n_messages is not None:
         memory_kwargs["memory_last_n_messages"] = settings.memory_last_n_messages
+    if settings and settings.memory_max_tokens is not None:
+        memory_kwargs["memory_max_tokens"] = settings.memory_max_tokens
 
     try:
         topic_execute_result = await execute_topic(
@@ -242,6 +245,7 @@ async def execute_agent(
         content=topic_execute_result.content,
         action_call_requests=topic_execute_result.action_call_requests,
         run=run,
+        memory_summary=topic_execute_result.memory_summary,
     )
 
     # Guarantee: if there are no action_call_requests (confirmation buttons),
@@ -253,6 +257,14 @@ async def execute_agent(
 
 
 async def get_agent_by_system_name(system_name: str) -> Agent:
+    return await config_cache.get_or_load(
+        ConfigNamespace.AGENTS,
+        system_name,
+        lambda: _load_agent_by_system_name(system_name),
+    )
+
+
+async def _load_agent_by_system_name(system_name: str) -> Agent:
     async with alchemy.get_session() as session:
         service = AgentsService(session=session)
         agent_entity = await service.get_one_or_none(system_name=system_name)
@@ -16,7 +16,12 @@ from services.agents.exceptions import (
     AgentLoopExhaustedError,
     AgentTimeoutError,
 )
-from services.agents.memory import DEFAULT_LAST_N_MESSAGES, create_memory_strategy
+from services.agents.memory import (
+    DEFAULT_LAST_N_MESSAGES,
+    create_memory_strategy,
+    create_summarizer,
+    get_memory_max_tokens,
+)
 from services.agents.models import MemoryStrategyType
 from services.agents.message_builder import generate_completion_messages
 from services.agents.models import (
@@ -53,6 +58,10 @@ EXECUTE_TOPIC_TIMEOUT_SECONDS: Final[int] = int(
 EXECUTE_ACTION_TIMEOUT_SECONDS: Final[int] = int(
     os.environ.get("AGENT_ACTION_TIMEOUT_SECONDS", "120")
 )
+# Maximum number of tool calls of one LLM turn executed concurrently
+EXECUTE_ACTION_MAX_CONCURRENCY: Final[int] = max(
+    1, int(os.environ.get("AGENT_ACTION_MAX_CONCURRENCY", "4"))
+)
 
 
 def _sanitize_action_error(e: Exception) -> str:
@@ -60,6 +69,48 @@ def _sanitize_action_error(e: Exception) -> str:
     return "The tool encountered an error. Please try again or rephrase your request."
 
 
+async def _execute_action_call(
+    action_call_request: AgentActionCallRequest,
+    semaphore: asyncio.Semaphore,
+) -> AgentConversationRunStepTopicActionCall:
+    """Execute one tool call and record it as a step; failures become the response."""
+    async with semaphore:
+        action_call_step_started_at = utc_now()
+
+        try:
+            async with asyncio.timeout(EXECUTE_ACTION_TIMEOUT_SECONDS):
+                action_call_response = await execute_agent_action(
+                    action_call_request,
+                )
+        except TimeoutError:
+            logger.error(
+                "Action '%s' (type=%s) timed out after %ds",
+                action_call_request.action_system_name,
+                action_call_request.action_type,
+                EXECUTE_ACTION_TIMEOUT_SECONDS,
+            )
+            action_call_response = AgentActionCallResponse(
+                content=_sanitize_action_error(TimeoutError("Action timed out")),
+            )
+        except Exception as e:
+            logger.exception(
+                "Action '%s' (type=%s) failed",
+                action_call_request.action_system_name,
+                action_call_request.action_type,
+            )
+            action_call_response = AgentActionCallResponse(
+                content=_sanitize_action_error(e),
+            )
+
+    return AgentConversationRunStepTopicActionCall(
+        started_at=action_call_step_started_at,
+        details=AgentTopicActionCall(
+            request=action_call_request,
+            response=action_call_response,
+        ),
+    )
+
+
 @observe(
     name="Main agent loop",
     description="Agent processes user prompt and returns a result. It may call available tools (APIs, RAGs, Prompt Templates) to fulfill user request.",
@@ -72,6 +123,7 @@ async def execute_topic(
     variables: dict[str, str] | None = None,
     memory_strategy_type: MemoryStrategyType = MemoryStrategyType.LAST_N,
     memory_last_n_messages: int = DEFAULT_LAST_N_MESSAGES,
+    memory_max_tokens: int | None = None,
 ) -> AgentConversationExecuteTopicResult:
     selected_topic_data = AgentConversationSelectedTopic(
         name=topic.name,
@@ -91,9 +143,19 @@ async def execute_topic(
 
     steps = steps_initial.copy() if steps_initial else []
 
+    if memory_strategy_type == MemoryStrategyType.TOKEN_BUDGET:
+        memory_max_tokens = await get_memory_max_tokens(
+            prompt_template_config, memory_max_tokens
+        )
     memory_strategy = create_memory_strategy(
-        memory_strategy_type, memory_last_n_messages
+        memory_strategy_type,
+        memory_last_n_messages,
+        max_tokens=memory_max_tokens,
+        summarize=create_summarizer(prompt_template_config),
     )
+    memory_summary = await memory_strategy.prepare(messages)
+
+    action_semaphore = asyncio.Semaphore(EXECUTE_ACTION_MAX_CONCURRENCY)
 
     try:
         async with asyncio.timeout(EXECUTE_TOPIC_TIMEOUT_SECONDS):
@@ -171,6 +233,7 @@ async def execute_topic(
                             )
                             for request in action_call_requests_to_confirm
                         ],
+                        memory_summary=memory_summary,
                     )
 
                     return result
@@ -179,6 +242,7 @@ async def execute_topic(
                     result = AgentConversationExecuteTopicResult(
                         content=topic_completion_step.details.assistant_message,
                         steps=steps,
+                        memory_summary=memory_summary,
                     )
                     return result
 
@@ -192,45 +256,16 @@ async def execute_topic(
                     )
                     continue
 
-                for action_call_request in action_call_requests:
-                    action_call_step_started_at = utc_now()
-
-                    try:
-                        async with asyncio.timeout(EXECUTE_ACTION_TIMEOUT_SECONDS):
-                            action_call_response = await execute_agent_action(
-                                action_call_request,
-                            )
-                    except TimeoutError:
-                        logger.error(
-                            "Action '%s' (type=%s) timed out after %ds",
-                            action_call_request.action_system_name,
-                            action_call_request.action_type,
-                            EXECUTE_ACTION_TIMEOUT_SECONDS,
-                        )
-                        action_call_response = AgentActionCallResponse(
-                            content=_sanitize_action_error(
-                                TimeoutError("Action timed out")
-                            ),
+                # Tool calls of one turn are independent: run them concurrently and
+                # record their steps in the order the LLM requested them
+                steps.extend(
+                    await asyncio.gather(
+                        *(
+                            _execute_action_call(action_call_request, action_semaphore)
+                            for action_call_request in action_call_requests
                         )
-                    except Exception as e:
-                        logger.exception(
-                            "Action '%s' (type=%s) failed",
-                            action_call_request.action_system_name,
-                            action_call_request.action_type,
-                        )
-                        action_call_response = AgentActionCallResponse(
-                            content=_sanitize_action_error(e),
-                        )
-
-                    action_call_step = AgentConversationRunStepTopicActionCall(
-                        started_at=action_call_step_started_at,
-                        details=AgentTopicActionCall(
-                            request=action_call_request,
-                            response=action_call_response,
-                        ),
                     )
-
-                    steps.append(action_call_step)
+                )
 
                 # Experimental feature. Allows to skip topic processing and use action response as assistant message.
                 if (
@@ -252,6 +287,7 @@ async def execute_topic(
                     result = AgentConversationExecuteTopicResult(
                         content=action_call_response_content,
                         steps=steps,
+                        memory_summary=memory_summary,
                     )
                     return result
 
@@ -282,6 +318,7 @@ async def execute_topic(
         return AgentConversationExecuteTopicResult(
             content=last_content,
             steps=steps,
+            memory_summary=memory_summary,
         )
 
     raise AgentLoopExhaustedError(
@@ -0,0 +1,441 @@
+"""
+Content-addressed embedding cache.
+
+Embeddings are keyed by the embedding model system name and the sha256 digest of
+the embedded text, so unchanged chunks are not re-embedded when a knowledge source
+is synced again. The cache has two tiers:
+
+- an in-process LRU with TTL (fast path, per worker)
+- the ``embedding_cache`` table in the application database (shared by all workers)
+
+Every entry also stores a fingerprint of the model settings (``ai_model``, provider,
+vector size). Lookups only return entries produced with the current fingerprint, so
+changing a model's underlying LLM or dimensions implicitly invalidates its vectors.
+
+Environment variables (read through ``EmbeddingCacheSettings``)
+---------------------------------------------------------------
+EMBEDDING_CACHE_ENABLED
+    Enable the embedding cache. Default: ``true``
+
+EMBEDDING_CACHE_PERSISTENT_ENABLED
+    Enable the database tier (PostgreSQL only). Default: ``true``
+
+EMBEDDING_CACHE_MEMORY_MAX_SIZE
+    Maximum number of vectors kept in memory per worker. Default: ``20000``
+
+EMBEDDING_CACHE_MEMORY_TTL_SECONDS
+    Time-to-live of in-memory entries. Default: ``3600``
+
+EMBEDDING_CACHE_TTL_DAYS
+    Entries in the database not written for this many days are ignored and purged.
+    Default: ``30``
+
+EMBEDDING_CACHE_CLEANUP_INTERVAL_MINUTES
+    How often (in minutes) expired database entries are purged. Default: ``360``
+
+Search queries are memoized separately (``query_embedding_memo``): a small
+in-process TTL map keyed by model and normalized query text, with single-flight
+de-duplication so concurrent identical queries share one provider call.
+
+QUERY_EMBEDDING_MEMO_ENABLED
+    Enable the query embedding memo. Default: ``true``
+
+QUERY_EMBEDDING_MEMO_MAX_SIZE
+    Maximum number of memoized query vectors per worker. Default: ``4096``
+
+QUERY_EMBEDDING_MEMO_TTL_SECONDS
+    Time-to-live of memoized query vectors. Default: ``900``
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+
+from cachetools import TTLCache
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from core.config.base import get_embedding_cache_settings
+
+logger = logging.getLogger(__name__)
+
+
+# Rows per SELECT ... IN / INSERT statement, keeps bind parameter counts bounded
+_DB_CHUNK_SIZE = 500
+
+
+def hash_text(text: str) -> str:
+    """Return the sha256 hex digest used as the content address of a text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def get_model_fingerprint(model_config: dict) -> str:
+    """Digest of the model settings that determine the produced vectors."""
+    configs = model_config.get("configs") or {}
+    vector_size = configs.get("vector_size") if isinstance(configs, dict) else None
+    payload = json.dumps(
+        {
+            "ai_model": model_config.get("ai_model"),
+            "provider_system_name": model_config.get("provider_system_name"),
+            "vector_size": vector_size,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class EmbeddingCacheStats:
+    memory_hits: int = 0
+    persistent_hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    persistent_errors: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.memory_hits + self.persistent_hits + self.misses
+        if not lookups:
+            return 0.0
+        return (self.memory_hits + self.persistent_hits) / lookups
+
+
+class EmbeddingCache:
+    """Two-tier (memory + database) cache of embedding vectors."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        persistent_enabled: bool = True,
+        memory_max_size: int = 20000,
+        memory_ttl_seconds: int = 3600,
+        ttl_days: int = 30,
+    ):
+        self.enabled = enabled
+        self.persistent_enabled = persistent_enabled
+        self._ttl_days = ttl_days
+        # Keys: (model_system_name, model_fingerprint, text_hash)
+        self._memory: TTLCache = TTLCache(
+            maxsize=memory_max_size, ttl=memory_ttl_seconds
+        )
+        self.stats = EmbeddingCacheStats()
+
+    def _cutoff(self) -> datetime:
+        return datetime.now(timezone.utc) - timedelta(days=self._ttl_days)
+
+    async def get_many(
+        self,
+        model_system_name: str,
+        model_fingerprint: str,
+        text_hashes: set[str],
+    ) -> dict[str, list[float]]:
+        """Return cached vectors for the given text hashes (missing hashes are omitted)."""
+        if not self.enabled or not text_hashes:
+            return {}
+
+        found: dict[str, list[float]] = {}
+        for text_hash in text_hashes:
+            vector = self._memory.get((model_system_name, model_fingerprint, text_hash))
+            if vector is not None:
+                found[text_hash] = vector
+        self.stats.memory_hits += len(found)
+
+        remaining = [text_hash for text_hash in text_hashes if text_hash not in found]
+        if remaining and self.persistent_enabled:
+            persisted = await self._load_persisted(
+                model_system_name, model_fingerprint, remaining
+            )
+            for text_hash, vector in persisted.items():
+                self._memory[(model_system_name, model_fingerprint, text_hash)] = vector
+            found.update(persisted)
+            self.stats.persistent_hits += len(persisted)
+
+        self.stats.misses += len(text_hashes) - len(found)
+        return found
+
+    async def set_many(
+        self,
+        model_system_name: str,
+        model_fingerprint: str,
+        vectors: dict[str, list[float]],
+    ) -> None:
+        """Store vectors by text hash in both tiers."""
+        if not self.enabled or not vectors:
+            return
+
+        for text_hash, vector in vectors.items():
+            self._memory[(model_system_name, model_fingerprint, text_hash)] = vector
+        self.stats.writes += len(vectors)
+
+        if self.persistent_enabled:
+            await self._store_persisted(model_system_name, model_fingerprint, vectors)
+
+    async def invalidate_model(self, model_system_name: str) -> None:
+        """Drop all cached vectors of a model (e.g. after the model was changed)."""
+        for key in [key for key in self._memory.keys() if key[0] == model_system_name]:
+            self._memory.pop(key, None)
+
+        if not self.persistent_enabled:
+            return
+
+        from core.config.app import alchemy
+        from core.db.models.embedding_cache import EmbeddingCacheEntry
+
+        try:
+            async with alchemy.get_session() as session:
+                if session.get_bind().dialect.name != "postgresql":
+                    return
+                await session.execute(
+                    delete(EmbeddingCacheEntry).where(
+                        EmbeddingCacheEntry.model_system_name == model_system_name
+                    )
+                )
+                await session.commit()
+            logger.info("Invalidated embedding cache for model '%s'", model_system_name)
+        except Exception as err:  # noqa: BLE001
+            self.stats.persistent_errors += 1
+            logger.warning(
+                "Failed to invalidate embedding cache for model '%s': %s",
+                model_system_name,
+                err,
+            )
+
+    async def purge_expired(self) -> None:
+        """Remove database entries older than the configured TTL."""
+        if not self.persistent_enabled:
+            return
+
+        from core.config.app import alchemy
+        from core.db.models.embedding_cache import EmbeddingCacheEntry
+
+        try:
+            async with alchemy.get_session() as session:
+                if session.get_bind().dialect.name != "postgresql":
+                    return
+                result = await session.execute(
+                    delete(EmbeddingCacheEntry).where(
+                        EmbeddingCacheEntry.updated_at < self._cutoff()
+                    )
+                )
+                await session.commit()
+            if result.rowcount:
+                logger.info(
+                    "Embedding cache cleanup: removed %d expired entries",
+                    result.rowcount,
+                )
+        except Exception as err:  # noqa: BLE001
+            self.stats.persistent_errors += 1
+            logger.warning("Failed to purge expired embedding cache entries: %s", err)
+
+    def clear_memory(self) -> None:
+        """Clear the in-process tier."""
+        self._memory.clear()
+
+    def get_stats(self) -> dict:
+        """Return hit/miss counters and memory tier occupancy."""
+        return {
+            **asdict(self.stats),
+            "hit_rate": round(self.stats.hit_rate, 4),
+            "memory_size": len(self._memory),
+            "memory_max_size": self._memory.maxsize,
+            "enabled": self.enabled,
+            "persistent_enabled": self.persistent_enabled,
+        }
+
+    async def _load_persisted(
+        self,
+        model_system_name: str,
+        model_fingerprint: str,
+        text_hashes: list[str],
+    ) -> dict[str, list[float]]:
+        from core.config.app import alchemy
+        from core.db.models.embedding_cache import EmbeddingCacheEntry
+
+        found: dict[str, list[float]] = {}
+        try:
+            async with alchemy.get_session() as session:
+                if session.get_bind().dialect.name != "postgresql":
+                    return found
+                for i in range(0, len(text_hashes), _DB_CHUNK_SIZE):
+                    chunk = text_hashes[i : i + _DB_CHUNK_SIZE]
+                    result = await session.execute(
+                        select(
+                            EmbeddingCacheEntry.text_hash,
+                            EmbeddingCacheEntry.embedding,
+                        ).where(
+                            EmbeddingCacheEntry.model_system_name == model_system_name,
+                            EmbeddingCacheEntry.model_fingerprint == model_fingerprint,
+                            EmbeddingCacheEntry.text_hash.in_(chunk),
+                            EmbeddingCacheEntry.updated_at >= self._cutoff(),
+                        )
+                    )
+                    for text_hash, embedding in result.all():
+                        found[text_hash] = list(embedding)
+        except Exception as err:  # noqa: BLE001
+            self.stats.persistent_errors += 1
+            logger.warning("Failed to read embedding cache: %s", err)
+        return found
+
+    async def _store_persisted(
+        self,
+        model_system_name: str,
+        model_fingerprint: str,
+        vectors: dict[str, list[float]],
+    ) -> None:
+        from core.config.app import alchemy
+        from core.db.models.embedding_cache import EmbeddingCacheEntry
+
+        now = datetime.now(timezone.utc)
+        rows = [
+            {
+                "model_system_name": model_system_name,
+                "text_hash": text_hash,
+                "model_fingerprint": model_fingerprint,
+                "embedding": vector,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for text_hash, vector in vectors.items()
+        ]
+        try:
+            async with alchemy.get_session() as session:
+                if session.get_bind().dialect.name != "postgresql":
+                    return
+                for i in range(0, len(rows), _DB_CHUNK_SIZE):
+                    stmt = pg_insert(EmbeddingCacheEntry).values(
+                        rows[i : i + _DB_CHUNK_SIZE]
+                    )
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=["model_system_name", "text_hash"],
+                        set_={
+                            "model_fingerprint": stmt.excluded.model_fingerprint,
+                            "embedding": stmt.excluded.embedding,
+                            "updated_at": stmt.excluded.updated_at,
+                        },
+                    )
+                    await session.execute(stmt)
+                await session.commit()
+        except Exception as err:  # noqa: BLE001
+            self.stats.persistent_errors += 1
+            logger.warning("Failed to write embedding cache: %s", err)
+
+
+# Global embedding cache instance — shared by all embedding calls in the worker
+_settings = get_embedding_cache_settings()
+embedding_cache = EmbeddingCache(
+    enabled=_settings.ENABLED,
+    persistent_enabled=_settings.PERSISTENT_ENABLED,
+    memory_max_size=_settings.MEMORY_MAX_SIZE,
+    memory_ttl_seconds=_settings.MEMORY_TTL_SECONDS,
+    ttl_days=_settings.TTL_DAYS,
+)
+
+
+@dataclass
+class QueryEmbeddingMemoStats:
+    hits: int = 0
+    coalesced: int = 0
+    misses: int = 0
+    errors: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.coalesced + self.misses
+        if not lookups:
+            return 0.0
+        return (self.hits + self.coalesced) / lookups
+
+
+class QueryEmbeddingMemo:
+    """Bounded TTL memo of query vectors with single-flight de-duplication."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        max_size: int = 4096,
+        ttl_seconds: int = 900,
+    ):
+        self.enabled = enabled
+        # Keys: (model_system_name, normalized query)
+        self._memo: TTLCache = TTLCache(maxsize=max_size, ttl=ttl_seconds)
+        self._in_flight: dict[tuple[str, str], asyncio.Task] = {}
+        self.stats = QueryEmbeddingMemoStats()
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """Collapse whitespace so trivially different spellings share an entry."""
+        return " ".join(query.split())
+
+    async def get_or_compute(
+        self,
+        model_system_name: str,
+        query: str,
+        compute: Callable[[], Awaitable[list[float]]],
+    ) -> list[float]:
+        """Return the memoized vector or run `compute` once for all concurrent callers."""
+        if not self.enabled:
+            return await compute()
+
+        key = (model_system_name, self.normalize_query(query))
+        vector = self._memo.get(key)
+        if vector is not None:
+            self.stats.hits += 1
+            return vector
+
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.stats.coalesced += 1
+        else:
+            self.stats.misses += 1
+            task = asyncio.ensure_future(compute())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._on_computed(key, done))
+
+        # Shield so a cancelled caller does not cancel the call shared with others
+        return await asyncio.shield(task)
+
+    def _on_computed(self, key: tuple[str, str], task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            self.stats.errors += 1
+            return
+        self._memo[key] = task.result()
+
+    def invalidate_model(self, model_system_name: str) -> None:
+        """Drop memoized vectors of a model."""
+        for key in [key for key in self._memo.keys() if key[0] == model_system_name]:
+            self._memo.pop(key, None)
+
+    def clear(self) -> None:
+        self._memo.clear()
+
+    def get_stats(self) -> dict:
+        """Return hit/miss counters and memo occupancy."""
+        return {
+            **asdict(self.stats),
+            "hit_rate": round(self.stats.hit_rate, 4),
+            "size": len(self._memo),
+            "max_size": self._memo.maxsize,
+            "in_flight": len(self._in_flight),
+            "enabled": self.enabled,
+        }
+
+
+# Global query embedding memo instance — shared by retrieval paths in the worker
+query_embedding_memo = QueryEmbeddingMemo(
+    enabled=_settings.QUERY_MEMO_ENABLED,
+    max_size=_settings.QUERY_MEMO_MAX_SIZE,
+    ttl_seconds=_settings.QUERY_MEMO_TTL_SECONDS,
+)
+
+
+async def purge_expired_embedding_cache() -> None:
+    """Scheduler job entry point: purge expired entries of the global cache."""
+    await embedding_cache.purge_expired()
@@ -1,3 +1,4 @@
+import asyncio
 from abc import ABC, abstractmethod
 from collections.abc import AsyncIterator
 from typing import BinaryIO
@@ -10,8 +11,10 @@ from openai.types.chat import (
 
 from models import DocumentSearchResult
 from services.ai_services.models import (
+    EmbeddingBatchResponse,
     EmbeddingResponse,
     ImageGenerationResult,
+    ModelUsage,
     RerankResponse,
     ResponsesAPIResult,
     TranscriptionResponse,
@@ -63,6 +66,30 @@ class AIProviderInterface(ABC):
     ) -> EmbeddingResponse:
         raise NotImplementedError("get_embeddings is optional for this provider")
 
+    # Optional: Override to send many inputs in a single provider request.
+    # The default implementation falls back to one get_embeddings call per text.
+    async def get_embeddings_batch(
+        self,
+        texts: list[str],
+        llm: str | None = None,
+        model_config: dict | None = None,
+    ) -> EmbeddingBatchResponse:
+        responses = await asyncio.gather(
+            *[
+                self.get_embeddings(text=text, llm=llm, model_config=model_config)
+                for text in texts
+            ]
+        )
+        input_units = responses[0].usage.input_units if responses else "tokens"
+        return EmbeddingBatchResponse(
+            data=[response.data for response in responses],
+            usage=ModelUsage(
+                input_units=input_units,
+                input=sum(response.usage.input for response in responses),
+                total=sum(response.usage.total for response in responses),
+            ),
+        )
+
     # Optional: Implement this method only if rerank are supported
     async def rerank(
         self,
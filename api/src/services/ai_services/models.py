@@ -17,6 +17,14 @@ class EmbeddingResponse:
     usage: ModelUsage
 
 
+@dataclass
+class EmbeddingBatchResponse:
+    """Embeddings for a batch of inputs, in the same order as the inputs."""
+
+    data: list[list[float]]
+    usage: ModelUsage
+
+
 @dataclass
 class RerankResponse:
     data: DocumentSearchResult
@@ -40,6 +40,7 @@ from models import DocumentSearchResult
 from services.ai_services.cache import response_cache
 from services.ai_services.interface import AIProviderInterface
 from services.ai_services.models import (
+    EmbeddingBatchResponse,
     EmbeddingResponse,
     ImageGenerationResult,
     ModelUsage,
@@ -438,6 +439,24 @@ class BaseLiteLLMProvider(AIProviderInterface):
         Uses num_retries from routing_config when configured on the model,
         falling back to 2 retries by default for transient server errors.
         """
+        batch = await self.get_embeddings_batch(
+            texts=[text],
+            llm=llm,
+            model_config=model_config,
+        )
+        return EmbeddingResponse(data=batch.data[0], usage=batch.usage)
+
+    async def get_embeddings_batch(
+        self,
+        texts: list[str],
+        llm: str | None = None,
+        model_config: dict | None = None,
+    ) -> EmbeddingBatchResponse:
+        """Get embeddings for several texts in a single LiteLLM request.
+
+        Callers are responsible for keeping the batch within the provider's
+        input and token limits (see open_ai.utils_new.get_embeddings_batch).
+        """
         if llm is None:
             raise ValueError("Model name must be provided")
 
@@ -446,7 +465,7 @@ class BaseLiteLLMProvider(AIProviderInterface):
 
         params = self._build_litellm_params()
         params["model"] = full_model
-        params["input"] = [text]
+        params["input"] = texts
 
         if routing_config.num_retries is not None:
             params["num_retries"] = routing_config.num_retries
@@ -458,9 +477,27 @@ class BaseLiteLLMProvider(AIProviderInterface):
 
         response = await litellm.aembedding(**params)
 
+        return self._to_embedding_batch_response(response)
+
+    @staticmethod
+    def _to_embedding_batch_response(response: Any) -> EmbeddingBatchResponse:
+        """Convert a LiteLLM embedding response, restoring input order by index."""
+        items = sorted(
+            enumerate(response.data),
+            key=lambda pair: (
+                pair[1].get("index", pair[0])
+                if isinstance(pair[1], dict)
+                else getattr(pair[1], "index", pair[0])
+            ),
+        )
+        vectors = [
+            item["embedding"] if isinstance(item, dict) else item.embedding
+            for _, item in items
+        ]
+
         usage_data = response.usage
-        return EmbeddingResponse(
-            data=response.data[0]["embedding"],
+        return EmbeddingBatchResponse(
+            data=vectors,
             usage=ModelUsage(
                 input_units="tokens",
                 input=getattr(usage_data, "prompt_tokens", 0) if usage_data else 0,
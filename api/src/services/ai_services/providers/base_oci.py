@@ -22,7 +22,11 @@ from openai.types.chat.chat_completion_message import ChatCompletionMessage
 
 from services.ai_services.cache import response_cache
 from services.ai_services.interface import AIProviderInterface
-from services.ai_services.models import EmbeddingResponse, ModelUsage
+from services.ai_services.models import (
+    EmbeddingBatchResponse,
+    EmbeddingResponse,
+    ModelUsage,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -186,11 +190,25 @@ class BaseOCIProvider(AIProviderInterface):
         model_config: dict | None = None,
     ) -> EmbeddingResponse:
         """Get embeddings using the shared OCI client."""
+        batch = await self.get_embeddings_batch(
+            texts=[text],
+            llm=llm,
+            model_config=model_config,
+        )
+        return EmbeddingResponse(data=batch.data[0], usage=batch.usage)
+
+    async def get_embeddings_batch(
+        self,
+        texts: list[str],
+        llm: str | None = None,
+        model_config: dict | None = None,
+    ) -> EmbeddingBatchResponse:
+        """Get embeddings for several texts in a single OCI embed_text call."""
         embed_text_detail = oci.generative_ai_inference.models.EmbedTextDetails()
         embed_text_detail.serving_mode = (
             oci.generative_ai_inference.models.OnDemandServingMode(model_id=llm)
         )
-        embed_text_detail.inputs = [text]
+        embed_text_detail.inputs = texts
         embed_text_detail.truncate = "NONE"
         embed_text_detail.compartment_id = self.compartment_id
 
@@ -203,9 +221,9 @@ class BaseOCIProvider(AIProviderInterface):
         if not embed_text_response:
             raise Exception("No response from OCI for embeddings API")
 
-        usage_in_characters = len(text)
+        usage_in_characters = sum(len(text) for text in texts)
 
-        return EmbeddingResponse(
+        return EmbeddingBatchResponse(
             data=embed_text_response.data.embeddings,
             usage=ModelUsage(
                 input_units="characters",
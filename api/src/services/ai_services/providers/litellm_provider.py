@@ -70,7 +70,7 @@ from litellm import Router
 from litellm.types.utils import EmbeddingResponse as LiteLLMEmbeddingResponse
 from openai.types.chat import ChatCompletion, ChatCompletionMessageParam
 
-from services.ai_services.models import EmbeddingResponse, ModelUsage, RoutingConfig
+from services.ai_services.models import EmbeddingBatchResponse, RoutingConfig
 from services.ai_services.providers.base_litellm import BaseLiteLLMProvider
 
 logger = logging.getLogger(__name__)
@@ -223,13 +223,13 @@ class LiteLLMProvider(BaseLiteLLMProvider):
             model_config=merged_config,
         )
 
-    async def get_embeddings(
+    async def get_embeddings_batch(
         self,
-        text: str,
+        texts: list[str],
         llm: str | None = None,
         model_config: dict | None = None,
-    ) -> EmbeddingResponse:
-        """Get embeddings using LiteLLM, with Router support."""
+    ) -> EmbeddingBatchResponse:
+        """Get embeddings for several texts in one request, with Router support."""
         model = llm or self.embedding_model
         if model is None:
             raise ValueError(
@@ -239,10 +239,10 @@ class LiteLLMProvider(BaseLiteLLMProvider):
         if self.use_router and self.router:
             response: LiteLLMEmbeddingResponse = await self.router.aembedding(
                 model=model,
-                input=[text],
+                input=texts,
             )
         else:
-            kwargs: dict[str, Any] = {"model": model, "input": [text]}
+            kwargs: dict[str, Any] = {"model": model, "input": texts}
             if self.api_key:
                 kwargs["api_key"] = self.api_key
             if self.endpoint:
@@ -250,14 +250,7 @@ class LiteLLMProvider(BaseLiteLLMProvider):
 
             response = await litellm.aembedding(**kwargs)
 
-        return EmbeddingResponse(
-            data=response.data[0]["embedding"],
-            usage=ModelUsage(
-                input_units="tokens",
-                input=response.usage.prompt_tokens,
-                total=response.usage.total_tokens,
-            ),
-        )
+        return self._to_embedding_batch_response(response)
 
     async def batch_completions(
         self,
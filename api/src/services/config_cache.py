@@ -0,0 +1,258 @@
+"""
+Process-local cache of configuration entities.
+
+Agents, prompt templates, RAG tools, AI models and collection ids are read on every
+agent turn and RAG call. They are cached per worker, so hot-path lookups are memory
+reads instead of database round trips.
+
+Entries are grouped in namespaces. Each namespace has a version counter in the
+``config_cache_versions`` table, incremented by the admin routes after a change
+(``invalidate``). Workers re-read the counters at most every
+``CONFIG_CACHE_VERSION_CHECK_SECONDS`` and reload entries loaded at an older
+version, so a change made through one worker reaches all of them. Entries also
+expire after ``CONFIG_CACHE_TTL_SECONDS``, which bounds the staleness of changes
+made outside the admin routes.
+
+Cached values are deep-copied on read, callers may modify what they get.
+
+Environment variables
+---------------------
+CONFIG_CACHE_ENABLED
+    Enable the config cache. Default: ``true``
+
+CONFIG_CACHE_MAX_SIZE
+    Maximum number of entries kept per worker. Default: ``2048``
+
+CONFIG_CACHE_TTL_SECONDS
+    Time-to-live of entries. Default: ``300``
+
+CONFIG_CACHE_VERSION_CHECK_SECONDS
+    How often (in seconds) a worker reads the version counters. Default: ``5``
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections.abc import Awaitable, Callable, Hashable
+from copy import deepcopy
+from dataclasses import asdict, dataclass
+from enum import StrEnum
+from typing import Any, TypeVar
+
+from cachetools import TTLCache
+from sqlalchemy import select, update
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.environ.get(name, default).lower() in ("true", "1", "yes")
+
+
+CONFIG_CACHE_ENABLED: bool = _env_flag("CONFIG_CACHE_ENABLED", "true")
+CONFIG_CACHE_MAX_SIZE: int = int(os.environ.get("CONFIG_CACHE_MAX_SIZE", "2048"))
+CONFIG_CACHE_TTL_SECONDS: int = int(os.environ.get("CONFIG_CACHE_TTL_SECONDS", "300"))
+CONFIG_CACHE_VERSION_CHECK_SECONDS: float = float(
+    os.environ.get("CONFIG_CACHE_VERSION_CHECK_SECONDS", "5")
+)
+
+
+class ConfigNamespace(StrEnum):
+    AGENTS = "agents"
+    PROMPT_TEMPLATES = "prompt_templates"
+    RAG_TOOLS = "rag_tools"
+    AI_MODELS = "ai_models"
+    COLLECTIONS = "collections"
+
+
+# Fixture / transfer entity types whose records are cached
+CONFIG_NAMESPACES_BY_ENTITY_TYPE: dict[str, ConfigNamespace] = {
+    "agent": ConfigNamespace.AGENTS,
+    "ai_model": ConfigNamespace.AI_MODELS,
+    "collection": ConfigNamespace.COLLECTIONS,
+    "prompt": ConfigNamespace.PROMPT_TEMPLATES,
+    "rag_tool": ConfigNamespace.RAG_TOOLS,
+}
+
+
+@dataclass
+class ConfigCacheStats:
+    hits: int = 0
+    coalesced: int = 0
+    misses: int = 0
+    version_check_errors: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.coalesced + self.misses
+        if not lookups:
+            return 0.0
+        return (self.hits + self.coalesced) / lookups
+
+
+class ConfigCache:
+    """Versioned in-process cache of configuration entities."""
+
+    def __init__(
+        self,
+        enabled: bool = CONFIG_CACHE_ENABLED,
+        max_size: int = CONFIG_CACHE_MAX_SIZE,
+        ttl_seconds: int = CONFIG_CACHE_TTL_SECONDS,
+        version_check_seconds: float = CONFIG_CACHE_VERSION_CHECK_SECONDS,
+    ):
+        self.enabled = enabled
+        self._version_check_seconds = version_check_seconds
+        # Keys: (namespace, key), values: (namespace version, value)
+        self._entries: TTLCache = TTLCache(maxsize=max_size, ttl=ttl_seconds)
+        self._in_flight: dict[tuple[str, Hashable], asyncio.Task] = {}
+        self._versions: dict[str, int] = {}
+        self._versions_checked_at: float | None = None
+        self._versions_lock = asyncio.Lock()
+        self.stats = ConfigCacheStats()
+
+    async def get_or_load(
+        self,
+        namespace: ConfigNamespace,
+        key: Hashable,
+        load: Callable[[], Awaitable[T]],
+    ) -> T:
+        """Return a copy of the cached value or run `load` once for all concurrent callers.
+
+        Errors of `load` (e.g. ``LookupError`` for a missing entity) are not cached.
+        """
+        if not self.enabled:
+            return await load()
+
+        await self._check_versions()
+        version = self._versions.get(namespace, 0)
+        cache_key = (namespace.value, key)
+
+        entry = self._entries.get(cache_key)
+        if entry is not None and entry[0] == version:
+            self.stats.hits += 1
+            return deepcopy(entry[1])
+
+        task = self._in_flight.get(cache_key)
+        if task is not None:
+            self.stats.coalesced += 1
+        else:
+            self.stats.misses += 1
+            task = asyncio.ensure_future(load())
+            self._in_flight[cache_key] = task
+            task.add_done_callback(
+                lambda done: self._on_loaded(cache_key, version, done)
+            )
+
+        # Shield so a cancelled caller does not cancel the load shared with others
+        return deepcopy(await asyncio.shield(task))
+
+    def _on_loaded(
+        self, cache_key: tuple[str, Hashable], version: int, task: asyncio.Task
+    ) -> None:
+        if self._in_flight.get(cache_key) is task:
+            del self._in_flight[cache_key]
+        if task.cancelled() or task.exception() is not None:
+            return
+        # Loaded before an invalidation of the namespace: do not cache
+        if self._versions.get(cache_key[0], 0) != version:
+            return
+        self._entries[cache_key] = (version, task.result())
+
+    async def invalidate(self, namespace: ConfigNamespace) -> None:
+        """Drop the entries of a namespace in this worker and, via its version, in all workers."""
+        self._drop(namespace)
+        self._versions[namespace.value] = self._versions.get(namespace.value, 0) + 1
+        # In-flight loads may have read the entity before the change
+        for cache_key in [key for key in self._in_flight if key[0] == namespace.value]:
+            del self._in_flight[cache_key]
+
+        if not self.enabled:
+            return
+
+        try:
+            await self._publish_invalidation(namespace)
+        except Exception as err:
+            # Other workers pick the change up when their entries expire
+            logger.warning(
+                "Failed to publish config cache invalidation of '%s': %s",
+                namespace.value,
+                err,
+            )
+        # Re-read the versions on the next lookup
+        self._versions_checked_at = None
+
+    async def _check_versions(self) -> None:
+        checked_at = self._versions_checked_at
+        if (
+            checked_at is not None
+            and time.monotonic() - checked_at < self._version_check_seconds
+        ):
+            return
+
+        async with self._versions_lock:
+            if self._versions_checked_at != checked_at:
+                return  # Checked by a concurrent lookup
+
+            try:
+                versions = await self._read_versions()
+            except Exception as err:
+                # Keep the known versions, entries still expire by TTL
+                self.stats.version_check_errors += 1
+                logger.debug("Failed to read config cache versions: %s", err)
+            else:
+                for namespace, version in self._versions.items():
+                    if versions.get(namespace, 0) != version:
+                        self._drop(namespace)
+                self._versions = versions
+            self._versions_checked_at = time.monotonic()
+
+    @staticmethod
+    async def _read_versions() -> dict[str, int]:
+        from core.config.app import alchemy
+        from core.db.models.config_cache import ConfigCacheVersion
+
+        async with alchemy.get_session() as session:
+            rows = await session.execute(
+                select(ConfigCacheVersion.namespace, ConfigCacheVersion.version)
+            )
+            return {namespace: version for namespace, version in rows}
+
+    @staticmethod
+    async def _publish_invalidation(namespace: ConfigNamespace) -> None:
+        from core.config.app import alchemy
+        from core.db.models.config_cache import ConfigCacheVersion
+
+        async with alchemy.get_session() as session:
+            result = await session.execute(
+                update(ConfigCacheVersion)
+                .where(ConfigCacheVersion.namespace == namespace.value)
+                .values(version=ConfigCacheVersion.version + 1)
+            )
+            if not result.rowcount:
+                session.add(ConfigCacheVersion(namespace=namespace.value, version=1))
+            await session.commit()
+
+    def _drop(self, namespace: str) -> None:
+        for key in [key for key in self._entries.keys() if key[0] == namespace]:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Return hit/miss counters and cache occupancy."""
+        return {
+            **asdict(self.stats),
+            "hit_rate": round(self.stats.hit_rate, 4),
+            "size": len(self._entries),
+            "max_size": self._entries.maxsize,
+            "versions": dict(self._versions),
+            "enabled": self.enabled,
+        }
+
+
+# Global config cache instance — shared by the config lookups of the worker
+config_cache = ConfigCache()
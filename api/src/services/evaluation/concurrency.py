@@ -0,0 +1,190 @@
+"""
+Adaptive concurrency limits of evaluation runs.
+
+Evaluations call the same model for every test set record. Instead of a fixed number
+of parallel calls, each model gets an AIMD limiter: the limit grows by one per round
+of completed calls while latency stays close to the fastest observed latency, and is
+cut when latency rises (the provider is queueing) or a call is rate limited. After a
+rate limit, no new call starts until the backoff (or the provider's ``Retry-After``)
+has passed. Limiters are shared by all evaluations of the worker that use the model.
+
+Environment variables
+---------------------
+EVALUATION_MIN_CONCURRENCY
+    Lowest concurrency limit per model. Default: ``1``
+
+EVALUATION_MAX_CONCURRENCY
+    Highest concurrency limit per model. Default: ``10``
+
+EVALUATION_INITIAL_CONCURRENCY
+    Concurrency limit of a model before any call completed. Default: ``4``
+
+EVALUATION_LATENCY_TOLERANCE
+    Latency, as a multiple of the fastest recent latency, above which the limit is
+    decreased. Default: ``2.0``
+
+EVALUATION_RATE_LIMIT_BACKOFF_SECONDS
+    Pause after a rate-limited call when the provider does not send ``Retry-After``.
+    Default: ``10``
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+logger = logging.getLogger(__name__)
+
+EVALUATION_MIN_CONCURRENCY: int = int(os.environ.get("EVALUATION_MIN_CONCURRENCY", "1"))
+EVALUATION_MAX_CONCURRENCY: int = int(
+    os.environ.get("EVALUATION_MAX_CONCURRENCY", "10")
+)
+EVALUATION_INITIAL_CONCURRENCY: int = int(
+    os.environ.get("EVALUATION_INITIAL_CONCURRENCY", "4")
+)
+EVALUATION_LATENCY_TOLERANCE: float = float(
+    os.environ.get("EVALUATION_LATENCY_TOLERANCE", "2.0")
+)
+EVALUATION_RATE_LIMIT_BACKOFF_SECONDS: float = float(
+    os.environ.get("EVALUATION_RATE_LIMIT_BACKOFF_SECONDS", "10")
+)
+
+# Multiplicative decrease on congestion and on rate limits
+LATENCY_DECREASE_FACTOR = 0.75
+RATE_LIMIT_DECREASE_FACTOR = 0.5
+
+# Weight of a new latency sample when the baseline drifts up
+BASELINE_SMOOTHING = 0.05
+
+
+def is_rate_limit_error(err: BaseException) -> bool:
+    """Whether an error of a model call (OpenAI, LiteLLM, HTTP clients) is a rate limit."""
+    if getattr(err, "status_code", None) == 429:
+        return True
+    response = getattr(err, "response", None)
+    if getattr(response, "status_code", None) == 429:
+        return True
+    return "RateLimit" in type(err).__name__
+
+
+def get_retry_after(err: BaseException) -> float | None:
+    """Seconds to wait given by the ``Retry-After`` header of a rate-limited call."""
+    headers = getattr(getattr(err, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD concurrency limit driven by call latency and rate limits."""
+
+    def __init__(
+        self,
+        initial_limit: int = EVALUATION_INITIAL_CONCURRENCY,
+        min_limit: int = EVALUATION_MIN_CONCURRENCY,
+        max_limit: int = EVALUATION_MAX_CONCURRENCY,
+        latency_tolerance: float = EVALUATION_LATENCY_TOLERANCE,
+        rate_limit_backoff_seconds: float = EVALUATION_RATE_LIMIT_BACKOFF_SECONDS,
+    ):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self._limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self._latency_tolerance = latency_tolerance
+        self._rate_limit_backoff_seconds = rate_limit_backoff_seconds
+        self._in_flight = 0
+        self._baseline_latency: float | None = None
+        self._decreased_at = float("-inf")
+        self._paused_until = 0.0
+        self._changed = asyncio.Condition()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Wait for a free slot and run one call in it, recording its outcome."""
+        await self._acquire()
+        started_at = time.monotonic()
+        try:
+            yield
+        except Exception as err:
+            if is_rate_limit_error(err):
+                self.on_rate_limit(get_retry_after(err))
+            raise
+        else:
+            self.on_success(time.monotonic() - started_at)
+        finally:
+            async with self._changed:
+                self._in_flight -= 1
+                self._changed.notify_all()
+
+    async def _acquire(self) -> None:
+        async with self._changed:
+            while True:
+                pause = self._paused_until - time.monotonic()
+                if pause > 0:
+                    try:
+                        await asyncio.wait_for(self._changed.wait(), timeout=pause)
+                    except asyncio.TimeoutError:
+                        pass
+                elif self._in_flight < self.limit:
+                    self._in_flight += 1
+                    return
+                else:
+                    await self._changed.wait()
+
+    def on_success(self, latency: float) -> None:
+        baseline = self._baseline_latency
+        if baseline is None or latency < baseline:
+            self._baseline_latency = latency
+        else:
+            self._baseline_latency = baseline + BASELINE_SMOOTHING * (
+                latency - baseline
+            )
+
+        if baseline is not None and latency > baseline * self._latency_tolerance:
+            self._decrease(LATENCY_DECREASE_FACTOR, window=baseline)
+        else:
+            # Additive increase: about one more slot per round of `limit` calls
+            self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+
+    def on_rate_limit(self, retry_after: float | None = None) -> None:
+        backoff = retry_after or self._rate_limit_backoff_seconds
+        self._paused_until = max(self._paused_until, time.monotonic() + backoff)
+        self._decrease(RATE_LIMIT_DECREASE_FACTOR, window=backoff)
+        logger.warning(
+            "Evaluation call rate limited, concurrency limit is now %s, pausing %.1fs",
+            self.limit,
+            backoff,
+        )
+
+    def _decrease(self, factor: float, window: float) -> None:
+        # Calls that were in flight together report the same congestion: decrease
+        # once per window instead of once per call
+        now = time.monotonic()
+        if now - self._decreased_at < window:
+            return
+        self._decreased_at = now
+        self._limit = max(self.min_limit, self._limit * factor)
+
+
+# Global concurrency limiters — shared by the evaluation runs of the worker, by model
+_limiters: dict[str, AdaptiveConcurrencyLimiter] = {}
+
+
+def get_concurrency_limiter(key: str) -> AdaptiveConcurrencyLimiter:
+    """Get the limiter of a model (or another key identifying the called provider)."""
+    limiter = _limiters.get(key)
+    if limiter is None:
+        limiter = _limiters[key] = AdaptiveConcurrencyLimiter()
+    return limiter
@@ -1,148 +1,135 @@
+from datetime import datetime, timedelta, timezone
 from logging import getLogger
 import json
+from typing import Any
+from uuid import UUID
 
-from sqlalchemy import text
+from sqlalchemy import Row, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from core.db.models.evaluation import Evaluation, EvaluationResult
+
 logger = getLogger(__name__)
 
+# Summary columns of the evaluation: (sum column, count column) per averaged value
+_AVERAGED_VALUES = {
+    "latency": ("latency_sum", "latency_count"),
+    "score": ("score_sum", "results_with_score"),
+    "completion_tokens": ("completion_tokens_sum", "completion_tokens_count"),
+    "prompt_tokens": ("prompt_tokens_sum", "prompt_tokens_count"),
+    "cached_tokens": ("cached_tokens_sum", "cached_tokens_count"),
+}
+
+# Latency and score of 0 mean "not measured" and are left out of the averages
+_POSITIVE_ONLY_VALUES = {"latency", "score"}
+
+# Status of evaluations that are being evaluated (JobRunStatus.IN_PROGRESS)
+_IN_PROGRESS = "in_progress"
+
+
+def _to_float(value: Any) -> float | None:
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def get_result_values(result: dict) -> dict[str, float | None]:
+    """Values of a result that are averaged in the evaluation summary."""
+    usage = result.get("usage") or {}
+    return {
+        "latency": _to_float(result.get("latency")),
+        "score": _to_float(result.get("score")),
+        "completion_tokens": _to_float(usage.get("completion_tokens")),
+        "prompt_tokens": _to_float(usage.get("prompt_tokens")),
+        "cached_tokens": _to_float(usage.get("cached_tokens")),
+    }
+
+
+def _is_counted(name: str, value: float | None) -> bool:
+    if value is None:
+        return False
+    return value > 0 if name in _POSITIVE_ONLY_VALUES else True
+
+
+def _summary_increments(values: list[dict[str, float | None]]) -> dict[str, Any]:
+    increments: dict[str, Any] = {}
+    for name, (sum_column, count_column) in _AVERAGED_VALUES.items():
+        counted = [v[name] for v in values if _is_counted(name, v.get(name))]
+        increments[sum_column] = sum(counted)
+        increments[count_column] = len(counted)
+    return increments
+
+
+def _average(total: float | None, count: int | None) -> float:
+    return float(total or 0) / count if count else 0.0
+
 
 async def list_evaluations_with_aggregations(
     db_session: AsyncSession,
 ) -> list[dict]:
     """
-    List evaluations with aggregated metrics using raw SQL to match the original MongoDB aggregation.
-    """
+    List evaluations with aggregated metrics.
 
-    # Simplified SQL query that works with PostgreSQL
-    sql = """
-    WITH evaluation_results AS (
-        SELECT 
-            e.id,
-            e.job_id,
-            e.type,
-            e.test_sets,
-            e.started_at,
-            e.status,
-            e.errors,
-            e.finished_at,
-            e.tool,
-            -- Extract results array length
-            COALESCE(jsonb_array_length(
-                CASE 
-                    WHEN jsonb_typeof(e.results) = 'array' THEN e.results
-                    ELSE '[]'::jsonb
-                END
-            ), 0) as records_count,
-            -- Calculate averages directly from the JSONB array
-            (
-                SELECT COALESCE(AVG((elem->>'latency')::float), 0)
-                FROM jsonb_array_elements(
-                    CASE 
-                        WHEN jsonb_typeof(e.results) = 'array' THEN e.results
-                        ELSE '[]'::jsonb
-                    END
-                ) elem
-                WHERE (elem->>'latency')::float > 0
-            ) as average_latency,
-            (
-                SELECT COALESCE(AVG((elem->>'score')::float), 0)
-                FROM jsonb_array_elements(
-                    CASE 
-                        WHEN jsonb_typeof(e.results) = 'array' THEN e.results
-                        ELSE '[]'::jsonb
-                    END
-                ) elem
-                WHERE (elem->>'score')::float > 0
-            ) as average_score,
-            (
-                SELECT COALESCE(AVG((elem->'usage'->>'completion_tokens')::float), 0)
-                FROM jsonb_array_elements(
-                    CASE 
-                        WHEN jsonb_typeof(e.results) = 'array' THEN e.results
-                        ELSE '[]'::jsonb
-                    END
-                ) elem
-                WHERE elem->'usage'->>'completion_tokens' IS NOT NULL
-            ) as average_completion_tokens,
-            (
-                SELECT COALESCE(AVG((elem->'usage'->>'prompt_tokens')::float), 0)
-                FROM jsonb_array_elements(
-                    CASE 
-                        WHEN jsonb_typeof(e.results) = 'array' THEN e.results
-                        ELSE '[]'::jsonb
-                    END
-                ) elem
-                WHERE elem->'usage'->>'prompt_tokens' IS NOT NULL
-            ) as average_prompt_tokens,
-            (
-                SELECT COALESCE(AVG((elem->'usage'->>'cached_tokens')::float), 0)
-                FROM jsonb_array_elements(
-                    CASE 
-                        WHEN jsonb_typeof(e.results) = 'array' THEN e.results
-                        ELSE '[]'::jsonb
-                    END
-                ) elem
-                WHERE elem->'usage'->>'cached_tokens' IS NOT NULL
-            ) as average_cached_tokens,
-            (
-                SELECT COUNT(*)
-                FROM jsonb_array_elements(
-                    CASE 
-                        WHEN jsonb_typeof(e.results) = 'array' THEN e.results
-                        ELSE '[]'::jsonb
-                    END
-                ) elem
-                WHERE (elem->>'score')::float > 0
-            ) as results_with_score
-        FROM evaluations e
-    )
-    SELECT 
-        id::text as _id,
-        job_id,
-        type,
-        test_sets,
-        started_at,
-        status,
-        errors,
-        finished_at,
-        tool,
-        average_latency,
-        average_score,
-        average_completion_tokens,
-        average_prompt_tokens,
-        average_cached_tokens,
-        records_count,
-        results_with_score
-    FROM evaluation_results
-    ORDER BY started_at DESC
+    The averages are read from the summary columns of the evaluations, results are not scanned.
     """
+    evaluations = await db_session.scalars(
+        select(Evaluation).order_by(Evaluation.started_at.desc())
+    )
 
-    result = await db_session.execute(text(sql))
-    entities = []
-
-    for row in result.fetchall():
-        entity = {
-            "_id": row._id,
-            "job_id": row.job_id,
-            "type": row.type,
-            "test_sets": row.test_sets,
-            "started_at": row.started_at,
-            "status": row.status,
-            "errors": row.errors,
-            "finished_at": row.finished_at,
-            "tool": row.tool,
-            "average_latency": float(row.average_latency or 0),
-            "average_score": float(row.average_score or 0),
-            "average_completion_tokens": float(row.average_completion_tokens or 0),
-            "average_prompt_tokens": float(row.average_prompt_tokens or 0),
-            "average_cached_tokens": float(row.average_cached_tokens or 0),
-            "records_count": int(row.records_count or 0),
-            "results_with_score": int(row.results_with_score or 0),
+    return [
+        {
+            "_id": str(evaluation.id),
+            "job_id": evaluation.job_id,
+            "type": evaluation.type,
+            "test_sets": evaluation.test_sets,
+            "started_at": evaluation.started_at,
+            "status": evaluation.status,
+            "errors": evaluation.errors,
+            "finished_at": evaluation.finished_at,
+            "tool": evaluation.tool,
+            "average_latency": _average(
+                evaluation.latency_sum, evaluation.latency_count
+            ),
+            "average_score": _average(
+                evaluation.score_sum, evaluation.results_with_score
+            ),
+            "average_completion_tokens": _average(
+                evaluation.completion_tokens_sum, evaluation.completion_tokens_count
+            ),
+            "average_prompt_tokens": _average(
+                evaluation.prompt_tokens_sum, evaluation.prompt_tokens_count
+            ),
+            "average_cached_tokens": _average(
+                evaluation.cached_tokens_sum, evaluation.cached_tokens_count
+            ),
+            "records_count": evaluation.records_count or 0,
+            "results_with_score": evaluation.results_with_score or 0,
         }
-        entities.append(entity)
+        for evaluation in evaluations
+    ]
+
 
-    return entities
+async def get_evaluation_results(
+    db_session: AsyncSession,
+    evaluation_ids: list[UUID],
+) -> dict[UUID, list[dict]]:
+    """Get the results of evaluations in the order they were appended."""
+    results: dict[UUID, list[dict]] = {
+        evaluation_id: [] for evaluation_id in evaluation_ids
+    }
+    if not evaluation_ids:
+        return results
+
+    rows = await db_session.execute(
+        select(EvaluationResult.evaluation_id, EvaluationResult.data)
+        .where(EvaluationResult.evaluation_id.in_(evaluation_ids))
+        .order_by(EvaluationResult.evaluation_id, EvaluationResult.position)
+    )
+    for evaluation_id, data in rows:
+        results[evaluation_id].append(data)
+
+    return results
 
 
 async def update_evaluation_score(
@@ -153,78 +140,42 @@ async def update_evaluation_score(
     score_comment: str | None = None,
 ) -> bool:
     """
-    Update the score for a specific result in an evaluation's results array.
+    Update the score of a result and the score summary of its evaluation.
     """
-    sql = """
-    UPDATE evaluations
-    SET 
-        results = jsonb_set(
-            results,
-            array_append(
-                array(
-                    SELECT ordinality - 1
-                    FROM jsonb_array_elements(results) WITH ORDINALITY
-                    WHERE value->>'id' = :result_id
-                ),
-                'score'
-            )::text[],
-            to_jsonb(:score::float)
-        ),
-        results = jsonb_set(
-            results,
-            array_append(
-                array(
-                    SELECT ordinality - 1
-                    FROM jsonb_array_elements(results) WITH ORDINALITY
-                    WHERE value->>'id' = :result_id
-                ),
-                'score_comment'
-            )::text[],
-            to_jsonb(:score_comment)
-        ),
-        updated_at = CURRENT_TIMESTAMP
-    WHERE id = :evaluation_id::uuid
-    AND EXISTS (
-        SELECT 1 
-        FROM jsonb_array_elements(results) 
-        WHERE value->>'id' = :result_id
+    result = await db_session.scalar(
+        select(EvaluationResult)
+        .where(
+            EvaluationResult.evaluation_id == UUID(str(evaluation_id)),
+            EvaluationResult.result_id == str(result_id),
+        )
+        .with_for_update()
     )
-    """
+    if result is None:
+        logger.warning("Result %s not found in evaluation %s", result_id, evaluation_id)
+        return False
 
-    await db_session.execute(
-        text(sql),
-        {
-            "evaluation_id": evaluation_id,
-            "result_id": result_id,
-            "score": score,
-            "score_comment": score_comment,
-        },
-    )
-
-    await db_session.commit()
+    previous = _summary_increments([{"score": result.score}])
+    current = _summary_increments([{"score": score}])
 
-    # For UPDATE queries, we can check if any rows were affected
-    # by trying to fetch the updated row
-    check_sql = """
-    SELECT 1 FROM evaluations 
-    WHERE id = :evaluation_id::uuid
-    AND EXISTS (
-        SELECT 1 
-        FROM jsonb_array_elements(results) 
-        WHERE value->>'id' = :result_id
-        AND value->>'score' IS NOT NULL
-    )
-    """
+    result.score = score
+    result.data = {**result.data, "score": score, "score_comment": score_comment}
 
-    check_result = await db_session.execute(
-        text(check_sql),
-        {
-            "evaluation_id": evaluation_id,
-            "result_id": result_id,
-        },
+    await db_session.execute(
+        update(Evaluation)
+        .where(Evaluation.id == result.evaluation_id)
+        .values(
+            score_sum=Evaluation.score_sum
+            + current["score_sum"]
+            - previous["score_sum"],
+            results_with_score=Evaluation.results_with_score
+            + current["results_with_score"]
+            - previous["results_with_score"],
+            updated_at=datetime.now(timezone.utc),
+        )
     )
+    await db_session.commit()
 
-    return check_result.fetchone() is not None
+    return True
 
 
 async def append_evaluation_results(
@@ -232,25 +183,167 @@ async def append_evaluation_results(
     evaluation_id: str,
     new_results: list[dict],
     errors: list[str] | None = None,
+    owner: str | None = None,
 ) -> None:
     """
-    Append new results to an evaluation's results array.
+    Append new results to an evaluation and add them to its summary.
+
+    With an `owner`, results are only appended while that run holds the evaluation's
+    lease, which they also renew.
     """
-    sql = """
-    UPDATE evaluations
-    SET
-        results = COALESCE(results, '[]'::jsonb) || CAST(:new_results AS jsonb),
-        errors = COALESCE(CAST(:errors AS jsonb), errors),
-        updated_at = CURRENT_TIMESTAMP
-    WHERE id = CAST(:evaluation_id AS uuid)
+    # Stored as before in the results array (datetimes as strings)
+    new_results = json.loads(json.dumps(new_results, default=str))
+    values = [get_result_values(result) for result in new_results]
+    increments = _summary_increments(values)
+
+    summary_values: dict[str, Any] = {
+        column: getattr(Evaluation, column) + increment
+        for column, increment in increments.items()
+    }
+    if errors is not None:
+        summary_values["errors"] = errors
+
+    now = datetime.now(timezone.utc)
+    conditions = [Evaluation.id == UUID(str(evaluation_id))]
+    if owner is not None:
+        conditions.append(Evaluation.owner == owner)
+        summary_values["heartbeat_at"] = now
+
+    # The row lock taken by the update orders concurrent appends
+    records_count = await db_session.scalar(
+        update(Evaluation)
+        .where(*conditions)
+        .values(
+            records_count=Evaluation.records_count + len(new_results),
+            updated_at=now,
+            **summary_values,
+        )
+        .returning(Evaluation.records_count)
+    )
+    if records_count is None:
+        logger.warning(
+            "Evaluation %s not found or taken over by another run", evaluation_id
+        )
+        return
+
+    first_position = records_count - len(new_results)
+    db_session.add_all(
+        EvaluationResult(
+            evaluation_id=UUID(str(evaluation_id)),
+            position=first_position + index,
+            result_id=str(result.get("id")),
+            data=result,
+            **result_values,
+        )
+        for index, (result, result_values) in enumerate(zip(new_results, values))
+    )
+    await db_session.commit()
+
+
+async def claim_interrupted_evaluation(
+    db_session: AsyncSession,
+    job_id: str,
+    system_name: str,
+    variant: str,
+    owner: str,
+    lease_seconds: float,
+) -> Row | None:
     """
+    Take over the in-progress evaluation of a tool variant whose run stopped.
 
-    await db_session.execute(
-        text(sql),
-        {
-            "evaluation_id": evaluation_id,
-            "new_results": json.dumps(new_results, default=str),
-            "errors": json.dumps(errors, default=str) if errors is not None else None,
-        },
+    Only evaluations whose owner did not renew its lease for `lease_seconds` are
+    claimed, never the evaluation of a run that is still going. The claim is one
+    conditional update, so of several runs resuming a job only one gets it.
+    Returns the claimed evaluation's row or None.
+    """
+    now = datetime.now(timezone.utc)
+    lease_expired = or_(
+        Evaluation.heartbeat_at.is_(None),
+        Evaluation.heartbeat_at < now - timedelta(seconds=lease_seconds),
+    )
+    interrupted_id = (
+        select(Evaluation.id)
+        .where(
+            Evaluation.job_id == job_id,
+            Evaluation.status == _IN_PROGRESS,
+            Evaluation.tool["system_name"].as_string() == system_name,
+            Evaluation.tool["variant_name"].as_string() == variant,
+            lease_expired,
+        )
+        .order_by(Evaluation.started_at.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    row = (
+        await db_session.execute(
+            update(Evaluation)
+            .where(
+                Evaluation.id == interrupted_id,
+                Evaluation.status == _IN_PROGRESS,
+                lease_expired,
+            )
+            .values(owner=owner, heartbeat_at=now, updated_at=now)
+            .returning(
+                Evaluation.id,
+                Evaluation.job_id,
+                Evaluation.type,
+                Evaluation.tool,
+                Evaluation.test_sets,
+                Evaluation.started_at,
+                Evaluation.errors,
+            )
+        )
+    ).one_or_none()
+    await db_session.commit()
+
+    return row
+
+
+async def renew_evaluation_lease(
+    db_session: AsyncSession, evaluation_id: str, owner: str
+) -> bool:
+    """
+    Renew the lease of a run on an evaluation, False if another run took it over.
+    """
+    renewed = await db_session.scalar(
+        update(Evaluation)
+        .where(Evaluation.id == UUID(str(evaluation_id)), Evaluation.owner == owner)
+        .values(heartbeat_at=datetime.now(timezone.utc))
+        .returning(Evaluation.id)
     )
     await db_session.commit()
+
+    return renewed is not None
+
+
+async def finish_evaluation(
+    db_session: AsyncSession,
+    evaluation_id: str,
+    owner: str,
+    status: str,
+    finished_at: datetime,
+    errors: list[str],
+) -> bool:
+    """
+    Set the final status of an evaluation, unless another run took it over.
+    """
+    finished = await db_session.scalar(
+        update(Evaluation)
+        .where(Evaluation.id == UUID(str(evaluation_id)), Evaluation.owner == owner)
+        .values(
+            status=status,
+            finished_at=finished_at,
+            errors=errors,
+            heartbeat_at=None,
+            updated_at=datetime.now(timezone.utc),
+        )
+        .returning(Evaluation.id)
+    )
+    await db_session.commit()
+
+    if finished is None:
+        logger.warning(
+            "Evaluation %s was taken over by another run, its status is kept",
+            evaluation_id,
+        )
+    return finished is not None
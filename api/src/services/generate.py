@@ -2,12 +2,20 @@ import structlog
 
 from services.get_chat_completion_answer import (
     ChatCompletionResult,
+    ChatCompletionStreamResult,
     get_chat_completion_answer,
+    stream_chat_completion_answer,
 )
 
 logger = structlog.get_logger(__name__)
 
 
+# TODO - remove after document_search_result_item.score is already float
+def _convert_scores_to_float(document_search_result) -> None:
+    for document_search_result_item in document_search_result:
+        document_search_result_item.score = float(document_search_result_item.score)
+
+
 async def generate(
     prompt,
     document_search_result,
@@ -22,9 +30,31 @@ async def generate(
             system_prompt_template_code=system_prompt_template_system_name,
         )
 
-        # TODO - remove after document_search_result_item.score is already float
-        for document_search_result_item in document_search_result:
-            document_search_result_item.score = float(document_search_result_item.score)
+        _convert_scores_to_float(document_search_result)
+
+        return answer
+
+    except Exception as err:
+        logger.error("Failed to search: %s", err)
+        raise err
+
+
+async def generate_stream(
+    prompt,
+    document_search_result,
+    context_window,
+    system_prompt_template_system_name,
+) -> ChatCompletionStreamResult:
+    """Like `generate`, but the answer is streamed as content deltas."""
+    try:
+        answer = await stream_chat_completion_answer(
+            prompt=prompt,
+            document_search_result=document_search_result,
+            context_window=context_window,
+            system_prompt_template_code=system_prompt_template_system_name,
+        )
+
+        _convert_scores_to_float(document_search_result)
 
         return answer
 
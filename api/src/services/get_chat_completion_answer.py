@@ -1,8 +1,12 @@
 import os
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
 
 from models import DocumentSearchResult
-from open_ai.utils_new import create_chat_completion_from_prompt_template
+from open_ai.utils_new import (
+    create_chat_completion_from_prompt_template,
+    create_chat_completion_stream_from_prompt_template,
+)
 from prompt_templates.prompt_templates import get_prompt_template_by_system_name_flat
 from tools.rag.utils import get_chat_completion_input_documents
 
@@ -20,6 +24,12 @@ class ChatCompletionResult:
     resulting_prompt: dict | None = None
 
 
+@dataclass
+class ChatCompletionStreamResult:
+    answer_deltas: AsyncIterator[str]
+    resulting_prompt: dict | None = None
+
+
 async def get_chat_completion_answer(
     prompt: str,
     document_search_result: DocumentSearchResult,
@@ -29,19 +39,10 @@ async def get_chat_completion_answer(
     if not document_search_result:
         return ChatCompletionResult(answer=env.get("NO_ANSWER_TEXT", ""))
 
-    input_documents = await get_chat_completion_input_documents(
-        search_result=document_search_result,
-        context_window=context_window,
+    prompt_template_config, context = await _prepare_prompt_template(
+        document_search_result, context_window, system_prompt_template_code
     )
 
-    prompt_template_config = await get_prompt_template_by_system_name_flat(
-        system_prompt_template_code,
-    )
-    if "{context}" not in prompt_template_config.get("text", ""):
-        raise ValueError("Missing placeholder {context}")
-
-    context = "\n\n".join(get_document_context(doc) for doc in input_documents)
-
     chat_completion, messages = await create_chat_completion_from_prompt_template(
         prompt_template_config=prompt_template_config,
         prompt_template_values={
@@ -59,6 +60,65 @@ async def get_chat_completion_answer(
     return ChatCompletionResult(answer=answer, resulting_prompt={"messages": messages})
 
 
+async def stream_chat_completion_answer(
+    prompt: str,
+    document_search_result: DocumentSearchResult,
+    context_window: int,
+    system_prompt_template_code=SYSTEM_PROMPT_TEMPLATE_CODE,
+) -> ChatCompletionStreamResult:
+    if not document_search_result:
+        return ChatCompletionStreamResult(
+            answer_deltas=_single_delta(env.get("NO_ANSWER_TEXT", ""))
+        )
+
+    prompt_template_config, context = await _prepare_prompt_template(
+        document_search_result, context_window, system_prompt_template_code
+    )
+
+    answer_deltas, messages = create_chat_completion_stream_from_prompt_template(
+        prompt_template_config=prompt_template_config,
+        prompt_template_values={
+            "context": context,
+        },
+        additional_messages=[
+            {
+                "role": "user",
+                "content": prompt,
+            },
+        ],
+    )
+
+    return ChatCompletionStreamResult(
+        answer_deltas=answer_deltas, resulting_prompt={"messages": messages}
+    )
+
+
+async def _prepare_prompt_template(
+    document_search_result: DocumentSearchResult,
+    context_window: int,
+    system_prompt_template_code: str,
+) -> tuple[dict, str]:
+    input_documents = await get_chat_completion_input_documents(
+        search_result=document_search_result,
+        context_window=context_window,
+    )
+
+    prompt_template_config = await get_prompt_template_by_system_name_flat(
+        system_prompt_template_code,
+    )
+    if "{context}" not in prompt_template_config.get("text", ""):
+        raise ValueError("Missing placeholder {context}")
+
+    context = "\n\n".join(get_document_context(doc) for doc in input_documents)
+
+    return prompt_template_config, context
+
+
+async def _single_delta(text: str) -> AsyncIterator[str]:
+    if text:
+        yield text
+
+
 def get_document_context(doc):
     content = doc.page_content
 
@@ -5,7 +5,7 @@ from datetime import datetime, timezone
 from enum import Enum, StrEnum
 from typing import Optional
 
-from tenacity import retry, stop_after_attempt, wait_exponential_jitter
+from tenacity import AsyncRetrying, stop_after_attempt, wait_exponential_jitter
 
 from core.config.app import alchemy
 from core.domain.evaluation_sets.service import EvaluationSetsService
@@ -15,7 +15,17 @@ from core.domain.rag_tools.service import RagToolsService
 from open_ai.utils_new import create_chat_completion_from_prompt_template
 from prompt_templates.prompt_templates import get_prompt_template_by_system_name_flat
 from services.observability import observability_context, observe
-from services.evaluation.services import append_evaluation_results
+from services.evaluation.concurrency import (
+    get_concurrency_limiter,
+    is_rate_limit_error,
+)
+from services.evaluation.services import (
+    append_evaluation_results,
+    claim_interrupted_evaluation,
+    finish_evaluation,
+    get_evaluation_results,
+    renew_evaluation_lease,
+)
 from services.rag_tools import execute_rag_tool
 from services.utils.metadata_filtering import metadata_filter_to_filter_object
 
@@ -23,6 +33,11 @@ from services.utils.metadata_filtering import metadata_filter_to_filter_object
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# A run renews the lease on its evaluations while it runs; evaluations of a run that
+# did not renew its lease for this long are considered interrupted
+EVALUATION_HEARTBEAT_SECONDS = 60
+EVALUATION_LEASE_SECONDS = 600
+
 
 class JobRunStatus(Enum):
     IN_PROGRESS = "in_progress"
@@ -66,7 +81,7 @@ async def get_tool_config(
 
 
 async def create_evaluation_record(
-    job_id, job_type, system_name, variant, test_set_system_names
+    job_id, job_type, system_name, variant, test_set_system_names, owner
 ):
     # Retrieve particular variant of the tool config
     tool_variant_config = await get_tool_config(job_type, system_name, variant)
@@ -93,7 +108,8 @@ async def create_evaluation_record(
         "status": JobRunStatus.IN_PROGRESS.value,
         "errors": [],
         "finished_at": None,
-        "results": [],
+        "owner": owner,
+        "heartbeat_at": datetime.now(timezone.utc),
     }
 
     # Insert evaluation record in the database using SQLAlchemy
@@ -127,6 +143,46 @@ async def create_evaluation_record(
         raise
 
 
+# Claim an evaluation of the job whose run stopped before it finished, to continue it
+async def claim_interrupted_evaluation_record(job_id, system_name, variant, owner):
+    async with alchemy.get_session() as session:
+        evaluation = await claim_interrupted_evaluation(
+            session,
+            job_id=job_id,
+            system_name=system_name,
+            variant=variant,
+            owner=owner,
+            lease_seconds=EVALUATION_LEASE_SECONDS,
+        )
+        if evaluation is None:
+            return None
+
+        results = await get_evaluation_results(session, [evaluation.id])
+
+    # Results saved before the item index was recorded cannot be matched to items
+    completed_keys = {
+        get_checkpoint_key(
+            result.get("iteration"), result.get("test_set"), result.get("item_index")
+        )
+        for result in results[evaluation.id]
+        if result.get("item_index") is not None
+    }
+    evaluation_data = {
+        "job_id": evaluation.job_id,
+        "type": evaluation.type,
+        "tool": evaluation.tool,
+        "test_sets": evaluation.test_sets,
+        "started_at": evaluation.started_at,
+        "status": JobRunStatus.IN_PROGRESS.value,
+        "errors": list(evaluation.errors or []),
+        "finished_at": None,
+    }
+    logger.info(
+        f"Resuming evaluation {evaluation.id} after {len(completed_keys)} completed records"
+    )
+    return evaluation.id, evaluation_data, completed_keys
+
+
 # Function to execute RAG tool for test set item
 async def execute_test_set_item_rag_tool(
     rag_tool_config: dict, user_input: str, metadata_filter: Optional[dict] = None
@@ -141,7 +197,6 @@ async def execute_test_set_item_rag_tool(
 
 
 # Perform the actual evaluation based on job type
-@retry(stop=stop_after_attempt(3), wait=wait_exponential_jitter(initial=1, max=10))
 async def evaluate_record(
     job_type, system_name, variant, config, metadata_filter, user_message
 ) -> dict:
@@ -202,6 +257,31 @@ async def evaluate_record(
     return {}
 
 
+# Model whose concurrency limit applies to the evaluation of a variant
+async def get_concurrency_limiter_key(job_type, system_name, variant_object) -> str:
+    try:
+        if job_type == JobType.PROMPT_EVAL:
+            model = variant_object.get("system_name_for_model")
+        else:
+            prompt_template = (variant_object.get("generate") or {}).get(
+                "prompt_template"
+            )
+            prompt_template_config = await get_prompt_template_by_system_name_flat(
+                prompt_template
+            )
+            model = prompt_template_config.get("system_name_for_model")
+    except Exception as e:
+        logger.warning(f"Could not resolve the model of '{system_name}': {e}")
+        model = None
+
+    return model or system_name
+
+
+# Key of a test set item in an evaluation, used to resume interrupted evaluations
+def get_checkpoint_key(iteration, test_set, item_index) -> tuple:
+    return (iteration, test_set, item_index)
+
+
 # Function to handle individual variant evaluation
 @observe(name="Evaluate variant", description="Evaluate particular variant of a tool.")
 async def evaluate_variant(
@@ -211,13 +291,24 @@ async def evaluate_variant(
     system_name,
     test_set_system_names,
     iteration_count,
+    owner,
     batch_size=5,
-    max_concurrency=10,
+    completed_keys: set[tuple] | None = None,
 ):
+    """
+    Evaluate the test set items of a variant.
+
+    Items are taken from a work queue as soon as a call finishes, under the adaptive
+    concurrency limit of the model. Results are saved every `batch_size` items, and
+    items listed in `completed_keys` (saved by an interrupted run) are skipped.
+    The run `owner` renews its lease on the evaluation while it runs and stops if
+    another run took the evaluation over.
+    """
     variant = evaluation_record.get("tool").get("variant_name")
     variant_object = evaluation_record.get("tool").get("variant_object")
+    completed_keys = completed_keys or set()
 
-    total_records = 0
+    test_set_items = {}
     for test_set in test_set_system_names:
         async with alchemy.get_session() as session:
             evaluation_sets_service = EvaluationSetsService(session=session)
@@ -225,21 +316,26 @@ async def evaluate_variant(
                 system_name=test_set
             )
             if evaluation_set_configs:
-                evaluation_set_config = evaluation_set_configs[0]
-                total_records += len(evaluation_set_config.items or [])
+                test_set_items[test_set] = evaluation_set_configs[0].items or []
 
+    total_records = sum(len(items) for items in test_set_items.values())
     observability_context.update_current_span(
         input={
             "Variant": variant,
             "Number of iterations": iteration_count,
             "Number of test sets": len(test_set_system_names),
             "Total number of test set records": total_records,
+            **({"Resumed records": len(completed_keys)} if completed_keys else {}),
         }
     )
 
     any_errors = False
 
     try:
+        limiter = get_concurrency_limiter(
+            await get_concurrency_limiter_key(job_type, system_name, variant_object)
+        )
+
         # Function to evaluate a single test set item
         @observe(description="Evaluate a single record from a test set.")
         async def evaluate_test_set_item(
@@ -265,18 +361,26 @@ async def evaluate_variant(
                 },
             )
 
-            # Perform evaluation
+            # Perform evaluation, every attempt in its own slot of the model's limit.
+            # Rate limits are waited out by the limiter before the next attempt.
             logger.info(
                 f"Calling evaluate_record with job_type={job_type}, system_name={system_name}, variant={variant}"
             )
-            result = await evaluate_record(
-                job_type,
-                system_name,
-                variant,
-                variant_object,
-                metadata_filter,
-                user_message,
-            )
+            async for attempt in AsyncRetrying(
+                stop=stop_after_attempt(3),
+                wait=wait_exponential_jitter(initial=1, max=10),
+                reraise=True,
+            ):
+                with attempt:
+                    async with limiter.slot():
+                        result = await evaluate_record(
+                            job_type,
+                            system_name,
+                            variant,
+                            variant_object,
+                            metadata_filter,
+                            user_message,
+                        )
             logger.info(f"Evaluation result: {result}")
 
             generated_output = result.get("answer", "")
@@ -292,6 +396,7 @@ async def evaluate_variant(
                 "latency": latency,
                 "generated_output": generated_output,
                 "test_set": test_set,
+                "item_index": item_index,
                 "evaluated_at": datetime.now(timezone.utc),
                 "expected_output": expected_output,
                 "user_message": user_message,
@@ -299,75 +404,91 @@ async def evaluate_variant(
             }
 
             logger.info(f"Created result record with ID: {result_record['id']}")
-
-            # Return the result record instead of saving it immediately
-            logger.info("Returning result record for later batch save")
             return result_record
 
-        semaphore = asyncio.Semaphore(max_concurrency)
-
-        async def run_with_semaphore(coro):
-            async with semaphore:
-                return await coro
-
-        # Execute iterations with batch processing
+        # Work queue of the items that are not evaluated yet
+        queue = asyncio.Queue()
         for iteration in range(1, iteration_count + 1):
             for test_set_index, test_set in enumerate(test_set_system_names):
-                async with alchemy.get_session() as session:
-                    evaluation_sets_service = EvaluationSetsService(session=session)
-                    evaluation_set_configs = await evaluation_sets_service.list(
-                        system_name=test_set
-                    )
-
                 # Check if test set config exists
-                if not evaluation_set_configs:
+                if test_set not in test_set_items:
                     evaluation_record["errors"].append(
                         f"Test set '{test_set}' not found"
                     )
                     any_errors = True
                     continue
 
-                evaluation_set_config = evaluation_set_configs[0]
-                # Get test set items and process in batches
-                test_set_items = evaluation_set_config.items or []
-                for i in range(0, len(test_set_items), batch_size):
-                    batch = test_set_items[i : i + batch_size]
-                    tasks = []
-                    for item_index, item in enumerate(batch):
-                        tasks.append(
-                            run_with_semaphore(
-                                evaluate_test_set_item(
-                                    iteration,
-                                    test_set_index + 1,
-                                    i + item_index + 1,
-                                    test_set,
-                                    item,
-                                )
-                            )
+                for item_index, item in enumerate(test_set_items[test_set], start=1):
+                    key = get_checkpoint_key(iteration, test_set, item_index)
+                    if key not in completed_keys:
+                        queue.put_nowait(
+                            (iteration, test_set_index + 1, item_index, test_set, item)
                         )
 
-                    # Execute batch tasks concurrently and collect results
-                    results = await asyncio.gather(*tasks, return_exceptions=True)
-
-                    # Collect all successful results
-                    batch_result_records = []
-                    for result in results:
-                        if isinstance(result, dict) and "id" in result:
-                            batch_result_records.append(result)
-                        elif isinstance(result, Exception):
-                            logger.error(f"Task failed with exception: {result}")
-                            evaluation_record["errors"].append(str(result))
-                            any_errors = True
-
-                    # Incrementally update evaluation with batch results
-                    if batch_result_records or evaluation_record["errors"]:
-                        async with alchemy.get_session() as session:
-                            await append_evaluation_results(
-                                db_session=session,
-                                evaluation_id=str(evaluation_id),
-                                new_results=batch_result_records,
-                                errors=evaluation_record["errors"],
+        pending_results = []
+        save_lock = asyncio.Lock()
+
+        # Incrementally update evaluation with the finished results
+        async def save_results():
+            async with save_lock:
+                new_results = pending_results[:]
+                pending_results.clear()
+                async with alchemy.get_session() as session:
+                    await append_evaluation_results(
+                        db_session=session,
+                        evaluation_id=str(evaluation_id),
+                        new_results=new_results,
+                        errors=evaluation_record["errors"],
+                        owner=owner,
+                    )
+
+        lease_lost = asyncio.Event()
+
+        async def renew_lease():
+            while not lease_lost.is_set():
+                await asyncio.sleep(EVALUATION_HEARTBEAT_SECONDS)
+                try:
+                    async with alchemy.get_session() as session:
+                        if not await renew_evaluation_lease(
+                            session, str(evaluation_id), owner
+                        ):
+                            logger.warning(
+                                f"Evaluation {evaluation_id} was taken over by another run, stopping"
                             )
+                            lease_lost.set()
+                except Exception as e:
+                    logger.error(f"Failed to renew lease of evaluation: {e}")
+
+        async def worker():
+            nonlocal any_errors
+            while not queue.empty() and not lease_lost.is_set():
+                work_item = queue.get_nowait()
+                try:
+                    pending_results.append(await evaluate_test_set_item(*work_item))
+                except Exception as e:
+                    logger.error(f"Task failed with exception: {e}")
+                    if is_rate_limit_error(e):
+                        logger.error(
+                            f"Rate limit persisted, concurrency limit is {limiter.limit}"
+                        )
+                    evaluation_record["errors"].append(str(e))
+                    any_errors = True
+                if len(pending_results) >= batch_size:
+                    await save_results()
+
+        # Workers only run as many calls as the limiter allows at the moment
+        heartbeat = asyncio.create_task(renew_lease())
+        try:
+            await asyncio.gather(
+                *(worker() for _ in range(min(limiter.max_limit, queue.qsize())))
+            )
+        finally:
+            heartbeat.cancel()
+        if lease_lost.is_set():
+            evaluation_record["errors"].append("Evaluation taken over by another run")
+            any_errors = True
+        if pending_results or evaluation_record["errors"]:
+            await save_results()
 
         # Update evaluation status based on errors
         evaluation_record["finished_at"] = datetime.now(timezone.utc)
@@ -375,27 +496,17 @@ async def evaluate_variant(
             JobRunStatus.FAILED.value if any_errors else JobRunStatus.COMPLETED.value
         )
 
-        # Final update of the evaluation record using SQLAlchemy
+        # Final update of the evaluation record, unless another run took it over
         async with alchemy.get_session() as session:
-            evaluations_service = EvaluationsService(session=session)
-
-            # Get current evaluation to preserve any existing results
-            evaluation = await evaluations_service.get(evaluation_id)
-            if evaluation:
-                current_results = evaluation.results or []
-
-                await evaluations_service.update(
-                    item_id=str(evaluation_id),  # Convert UUID to string for item_id
-                    data={
-                        "status": evaluation_record["status"],
-                        "finished_at": evaluation_record["finished_at"],
-                        "errors": evaluation_record["errors"],
-                    },
-                )
-                await session.commit()
-                logger.info(
-                    f"Final update: evaluation {evaluation_id} now has {len(current_results)} results"
-                )
+            if await finish_evaluation(
+                session,
+                evaluation_id=str(evaluation_id),
+                owner=owner,
+                status=evaluation_record["status"],
+                finished_at=evaluation_record["finished_at"],
+                errors=evaluation_record["errors"],
+            ):
+                logger.info(f"Final update: evaluation {evaluation_id} finished")
         return {
             "evaluation_id": str(evaluation_id),
             "errors": evaluation_record["errors"],
@@ -407,34 +518,58 @@ async def evaluate_variant(
         evaluation_record["errors"].append(str(e))
 
         async with alchemy.get_session() as session:
-            evaluations_service = EvaluationsService(session=session)
-            await evaluations_service.update(
-                item_id=str(evaluation_id),
-                data={
-                    "status": evaluation_record["status"],
-                    "finished_at": evaluation_record["finished_at"],
-                    "errors": evaluation_record["errors"],
-                },
+            await finish_evaluation(
+                session,
+                evaluation_id=str(evaluation_id),
+                owner=owner,
+                status=evaluation_record["status"],
+                finished_at=evaluation_record["finished_at"],
+                errors=evaluation_record["errors"],
             )
-            await session.commit()
         raise
 
 
 # Main evaluation function
 async def evaluate(job_data) -> dict:
+    """
+    Evaluate the tool variants of an evaluation job.
+
+    Every call is a new run that owns the evaluations it creates. With `resume` set
+    in the job data, the run instead continues the evaluations of the job whose run
+    stopped (no lease renewal for `EVALUATION_LEASE_SECONDS`) from their last saved
+    result. Job IDs of recurring scheduler jobs are shared by all their runs, so
+    resuming is never implied.
+    """
     job_id = str(job_data.get("_id"))
     job_type = job_data.get("type")
     config = job_data.get("config")
     iteration_count = job_data.get("iteration_count")
+    resume = bool(job_data.get("resume"))
+    run_id = str(uuid.uuid4())
 
     async def start_new_thread(system_name: str, test_set_system_names, variants):
         try:
-            evaluation_records = [
-                await create_evaluation_record(
-                    job_id, job_type, system_name, variant, test_set_system_names
+            evaluation_records = []
+            for variant in variants:
+                interrupted = (
+                    await claim_interrupted_evaluation_record(
+                        job_id, system_name, variant, run_id
+                    )
+                    if resume
+                    else None
                 )
-                for variant in variants
-            ]
+                if interrupted:
+                    evaluation_records.append(interrupted)
+                else:
+                    evaluation_id, evaluation_data = await create_evaluation_record(
+                        job_id,
+                        job_type,
+                        system_name,
+                        variant,
+                        test_set_system_names,
+                        run_id,
+                    )
+                    evaluation_records.append((evaluation_id, evaluation_data, set()))
 
             # Execute the evaluation process directly
             await evaluate_tool(
@@ -443,7 +578,7 @@ async def evaluate(job_data) -> dict:
                 evaluation_records=evaluation_records,
             )
 
-            return [str(evaluation_id) for evaluation_id, _ in evaluation_records]
+            return [str(evaluation_id) for evaluation_id, _, _ in evaluation_records]
         except Exception as e:
             # Log error with line number and detailed information
             line_number = e.__traceback__.tb_lineno if e.__traceback__ else -1
@@ -473,7 +608,7 @@ async def evaluate(job_data) -> dict:
 
         # Use asyncio.gather to evaluate each variant in parallel
         tasks = []
-        for evaluation_id, record in evaluation_records:
+        for evaluation_id, record, completed_keys in evaluation_records:
             tasks.append(
                 evaluate_variant(
                     evaluation_id,
@@ -482,6 +617,8 @@ async def evaluate(job_data) -> dict:
                     system_name,
                     test_set_system_names,
                     iteration_count,
+                    owner=run_id,
+                    completed_keys=completed_keys,
                 )
             )
 
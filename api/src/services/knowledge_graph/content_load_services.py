@@ -1,5 +1,6 @@
 import os
 
+from .extraction_pool import content_extraction_pool
 from .models import (
     ContentConfig,
     ContentReaderContext,
@@ -60,7 +61,8 @@ async def load_content_from_bytes_async(
 ) -> LoadedContent:
     """Async content loader with kreuzberg support.
 
-    Falls back to synchronous readers for PDF/plain_text/sharepoint_page.
+    PDF and SharePoint page extraction is CPU-bound and runs in the content
+    extraction process pool; plain text is decoded inline.
     """
     reader_name = config.reader.get("name", "").lower() if config.reader else ""
 
@@ -77,5 +79,10 @@ async def load_content_from_bytes_async(
         )
         return {"raw_text": text, "text": text, "metadata": metadata}
 
-    # Delegate to synchronous loader for legacy readers
+    if reader_name in (ContentReaderName.PDF, ContentReaderName.SHAREPOINT_PAGE):
+        return await content_extraction_pool.run(
+            load_content_from_bytes, file_bytes, config, context=context
+        )
+
+    # Delegate to synchronous loader for the remaining legacy readers
     return load_content_from_bytes(file_bytes, config, context=context)
@@ -0,0 +1,207 @@
+"""Process pool for CPU-bound content extraction.
+
+The legacy PDF and SharePoint page readers are pure Python and hold the GIL for
+the whole document, so running them on the event loop stalls every request served
+by the worker. Extraction is instead submitted to a pool of worker processes:
+
+- the number of processes follows the CPU cores available to this process
+- at most ``CONTENT_EXTRACTION_MAX_QUEUE`` documents are submitted at once, further
+  callers wait (backpressure for large syncs)
+- every document has a timeout; a worker stuck on a document is terminated by
+  recycling the pool
+- worker processes run with an address-space limit and are replaced after a
+  number of documents, so memory cannot grow unbounded
+
+Environment variables
+---------------------
+CONTENT_EXTRACTION_WORKERS
+    Number of worker processes. ``0`` runs extraction in a thread instead.
+    Default: number of available CPU cores minus one (at least 1, at most 8)
+
+CONTENT_EXTRACTION_MAX_QUEUE
+    Maximum number of documents submitted to the pool at once.
+    Default: ``4 * CONTENT_EXTRACTION_WORKERS``
+
+CONTENT_EXTRACTION_TIMEOUT_SECONDS
+    Maximum extraction time per document. Default: ``300``
+
+CONTENT_EXTRACTION_MAX_MEMORY_MB
+    Address-space limit of a worker process (``0`` disables the limit). Default: ``2048``
+
+CONTENT_EXTRACTION_MAX_TASKS_PER_CHILD
+    Documents processed by a worker process before it is replaced. Default: ``50``
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def _available_cpu_count() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # Not available on macOS / Windows
+        return os.cpu_count() or 1
+
+
+CONTENT_EXTRACTION_WORKERS: int = int(
+    os.environ.get(
+        "CONTENT_EXTRACTION_WORKERS",
+        str(min(max(_available_cpu_count() - 1, 1), 8)),
+    )
+)
+CONTENT_EXTRACTION_MAX_QUEUE: int = int(
+    os.environ.get(
+        "CONTENT_EXTRACTION_MAX_QUEUE", str(max(CONTENT_EXTRACTION_WORKERS, 1) * 4)
+    )
+)
+CONTENT_EXTRACTION_TIMEOUT_SECONDS: float = float(
+    os.environ.get("CONTENT_EXTRACTION_TIMEOUT_SECONDS", "300")
+)
+CONTENT_EXTRACTION_MAX_MEMORY_MB: int = int(
+    os.environ.get("CONTENT_EXTRACTION_MAX_MEMORY_MB", "2048")
+)
+CONTENT_EXTRACTION_MAX_TASKS_PER_CHILD: int = int(
+    os.environ.get("CONTENT_EXTRACTION_MAX_TASKS_PER_CHILD", "50")
+)
+
+
+class ContentExtractionTimeoutError(TimeoutError):
+    """Raised when a document could not be extracted within the timeout."""
+
+
+def _init_worker(max_memory_mb: int, started_workers) -> None:
+    """Worker process initializer: report the process ID and apply the memory limit."""
+    started_workers.put(os.getpid())
+    if max_memory_mb <= 0:
+        return
+    try:
+        import resource
+
+        limit = max_memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ImportError, ValueError, OSError) as err:
+        logger.warning("Could not limit extraction worker memory: %s", err)
+
+
+class ContentExtractionPool:
+    """Runs extraction functions in worker processes with bounded concurrency."""
+
+    def __init__(
+        self,
+        workers: int = CONTENT_EXTRACTION_WORKERS,
+        max_queue: int = CONTENT_EXTRACTION_MAX_QUEUE,
+        timeout_seconds: float = CONTENT_EXTRACTION_TIMEOUT_SECONDS,
+        max_memory_mb: int = CONTENT_EXTRACTION_MAX_MEMORY_MB,
+        max_tasks_per_child: int = CONTENT_EXTRACTION_MAX_TASKS_PER_CHILD,
+    ):
+        self.workers = workers
+        self.timeout_seconds = timeout_seconds
+        self.max_memory_mb = max_memory_mb
+        self.max_tasks_per_child = max_tasks_per_child
+        self._slots = asyncio.Semaphore(max(max_queue, 1))
+        self._executor: ProcessPoolExecutor | None = None
+        # IDs of the worker processes of the current pool, reported by the workers
+        self._started_workers = None
+        self._worker_pids: set[int] = set()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: forking a process that runs an event loop and threads is unsafe
+            mp_context = multiprocessing.get_context("spawn")
+            self._started_workers = mp_context.SimpleQueue()
+            self._worker_pids = set()
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=mp_context,
+                initializer=_init_worker,
+                initargs=(self.max_memory_mb, self._started_workers),
+                max_tasks_per_child=self.max_tasks_per_child or None,
+            )
+            logger.info(
+                "Started content extraction pool with %d worker processes",
+                self.workers,
+            )
+        return self._executor
+
+    def _recycle_executor(self, executor: ProcessPoolExecutor) -> None:
+        """Terminate a pool whose worker is stuck; the next call starts a new one."""
+        if self._executor is not executor:
+            # Already recycled for another document
+            executor.shutdown(wait=False, cancel_futures=True)
+            return
+        self._executor = None
+        # ProcessPoolExecutor cannot cancel a running task, so stop its processes.
+        # Only live children of this process are terminated: reported IDs of
+        # workers that already exited may have been reused.
+        while not self._started_workers.empty():
+            self._worker_pids.add(self._started_workers.get())
+        for process in multiprocessing.active_children():
+            if process.pid in self._worker_pids:
+                process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run a picklable function in a worker process and return its result.
+
+        Raises:
+            ContentExtractionTimeoutError: If the function did not finish in time.
+        """
+        async with self._slots:
+            if self.workers <= 0:
+                try:
+                    return await asyncio.wait_for(
+                        asyncio.to_thread(func, *args, **kwargs), self.timeout_seconds
+                    )
+                except asyncio.TimeoutError:
+                    raise ContentExtractionTimeoutError(
+                        f"Content extraction timed out after {self.timeout_seconds:.0f}s"
+                    ) from None
+
+            for attempt in range(2):
+                executor = self._get_executor()
+                future = asyncio.get_running_loop().run_in_executor(
+                    executor, _call, func, args, kwargs
+                )
+                try:
+                    return await asyncio.wait_for(future, self.timeout_seconds)
+                except asyncio.TimeoutError:
+                    logger.error(
+                        "Content extraction timed out after %.0fs, recycling worker pool",
+                        self.timeout_seconds,
+                    )
+                    self._recycle_executor(executor)
+                    raise ContentExtractionTimeoutError(
+                        f"Content extraction timed out after {self.timeout_seconds:.0f}s"
+                    ) from None
+                except BrokenProcessPool:
+                    # The pool was recycled for another document, or a worker died
+                    # (e.g. hit the memory limit); retry once in a fresh pool
+                    self._recycle_executor(executor)
+                    if attempt:
+                        raise
+                    logger.warning("Content extraction pool broken, retrying")
+            raise RuntimeError("unreachable")
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def _call(func: Callable[..., T], args: tuple, kwargs: dict) -> T:
+    return func(*args, **kwargs)
+
+
+# Global extraction pool — worker processes are started on first use
+content_extraction_pool = ContentExtractionPool()
@@ -183,10 +183,10 @@ async def start_conversation(
         created_at=utc_now(),
     )
     conversation.messages.append(assistant_msg)
-    await conversation_service.update(
-        item_id=str(conversation.id),
-        data=conversation.model_dump(),
-        auto_commit=True,
+    await conversation_service.append_messages(
+        db_session=db_session,
+        conversation_id=conversation.id,
+        messages=[assistant_msg.model_dump()],
     )
 
     return run_result.model_copy(
@@ -262,10 +262,12 @@ async def continue_conversation(
     )
     conversation.messages.append(user_msg)
     conversation.last_user_message_at = now
-    await conversation_service.update(
-        item_id=str(conversation.id),
-        data=conversation.model_dump(),
-        auto_commit=True,
+    await conversation_service.append_messages(
+        db_session=db_session,
+        conversation_id=conversation.id,
+        messages=[user_msg.model_dump()],
+        variables=conversation.variables,
+        last_user_message_at=now,
     )
 
     conversation_id_str = str(conversation.id)
@@ -293,10 +295,10 @@ async def continue_conversation(
         created_at=utc_now(),
     )
     conversation.messages.append(assistant_msg)
-    await conversation_service.update(
-        item_id=str(conversation.id),
-        data=conversation.model_dump(),
-        auto_commit=True,
+    await conversation_service.append_messages(
+        db_session=db_session,
+        conversation_id=conversation.id,
+        messages=[assistant_msg.model_dump()],
     )
 
     trace_id = conversation.trace_id or observability_context.get_current_trace_id()[:8]
@@ -20,7 +20,7 @@ from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.domain.knowledge_graph.services import KnowledgeGraphChunkService
-from open_ai.utils_new import get_embeddings
+from open_ai.utils_new import get_query_embedding
 from services.observability import observability_context, observe
 from services.observability.models import SpanType
 
@@ -87,7 +87,7 @@ async def findChunksBySimilarity(
             "score_threshold": min_score,
         },
     )
-    vec = await get_embeddings(q, embedding_model)
+    vec = await get_query_embedding(q, embedding_model)
     chunks = await KnowledgeGraphChunkService().search_chunks(
         db_session,
         graph_id=graph_id,
@@ -15,7 +15,7 @@ from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.domain.knowledge_graph.services import KnowledgeGraphDocumentService
-from open_ai.utils_new import get_embeddings
+from open_ai.utils_new import get_query_embedding
 from services.observability import observability_context, observe
 from services.observability.models import SpanType
 
@@ -118,7 +118,7 @@ async def findDocumentsBySummarySimilarity(
         },
     )
 
-    vec = await get_embeddings(query, embedding_model)
+    vec = await get_query_embedding(query, embedding_model)
     docs = await KnowledgeGraphDocumentService().search_documents(
         db_session,
         graph_id=graph_id,
@@ -19,7 +19,7 @@ from core.domain.knowledge_graph.services import (
     KnowledgeGraphChunkService,
     KnowledgeGraphDocumentService,
 )
-from open_ai.utils_new import get_embeddings
+from open_ai.utils_new import get_embeddings, get_embeddings_batch
 
 from ..content_config_services import get_graph_embedding_model
 from ..content_split_services import split_content
@@ -104,6 +104,7 @@ class AbstractDataSource(ABC):
         if not chunks or not embedding_model:
             return
 
+        pending_chunks: list[KnowledgeGraphChunk] = []
         for chunk in chunks:
             # Skip if embedding already present and non-empty
             existing_embedding = chunk.content_embedding
@@ -114,17 +115,40 @@ class AbstractDataSource(ABC):
             if not isinstance(embedded_content, str) or not embedded_content.strip():
                 continue
 
-            try:
-                vector = await get_embeddings(
-                    text=embedded_content, model_system_name=embedding_model
-                )
-                chunk.content_embedding = vector
-            except Exception as exc:  # noqa: BLE001
-                logger.warning(
-                    "Failed to create embedding for chunk with model %s: %s",
-                    embedding_model,
-                    exc,
-                )
+            pending_chunks.append(chunk)
+
+        if not pending_chunks:
+            return
+
+        try:
+            vectors = await get_embeddings_batch(
+                texts=[chunk.embedded_content for chunk in pending_chunks],
+                model_system_name=embedding_model,
+            )
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(
+                "Failed to create embeddings for %d chunks with model %s, "
+                "embedding them one by one: %s",
+                len(pending_chunks),
+                embedding_model,
+                exc,
+            )
+            # A single bad chunk should not leave the whole document without vectors
+            for chunk in pending_chunks:
+                try:
+                    chunk.content_embedding = await get_embeddings(
+                        text=chunk.embedded_content, model_system_name=embedding_model
+                    )
+                except Exception as chunk_exc:  # noqa: BLE001
+                    logger.warning(
+                        "Failed to create embedding for chunk with model %s: %s",
+                        embedding_model,
+                        chunk_exc,
+                    )
+            return
+
+        for chunk, vector in zip(pending_chunks, vectors, strict=True):
+            chunk.content_embedding = vector
 
     async def _require_embedding_model(
         self, db_session: AsyncSession, *, graph_id: UUID | None = None
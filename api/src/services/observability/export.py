@@ -0,0 +1,93 @@
+"""
+Streaming writers for the metrics exports.
+
+Rows are encoded while they are read from the database and sent in chunks, so the
+memory used by an export does not depend on the number of exported rows.
+"""
+
+import asyncio
+import csv
+import json
+import tempfile
+import textwrap
+from collections.abc import AsyncIterable, AsyncIterator
+from io import StringIO
+from typing import Any
+
+# Size of the chunks sent to the client
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "json": "application/json",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+async def stream_csv(
+    rows: AsyncIterable[dict[str, Any]], fieldnames: list[str]
+) -> AsyncIterator[bytes]:
+    buffer = StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames)
+    writer.writeheader()
+
+    async for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= EXPORT_CHUNK_SIZE:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue().encode("utf-8")
+
+
+async def stream_json(records: AsyncIterable[dict[str, Any]]) -> AsyncIterator[bytes]:
+    """JSON array of the records (same layout as ``json.dumps(records, indent=4)``)."""
+    buffer = StringIO()
+    buffer.write("[")
+    separator = "\n"
+
+    async for record in records:
+        buffer.write(separator)
+        buffer.write(textwrap.indent(json.dumps(record, indent=4), " " * 4))
+        separator = ",\n"
+        if buffer.tell() >= EXPORT_CHUNK_SIZE:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+
+    buffer.write("]" if separator == "\n" else "\n]")
+    yield buffer.getvalue().encode("utf-8")
+
+
+def _to_cell_value(value: Any) -> Any:
+    from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    if isinstance(value, str):
+        return ILLEGAL_CHARACTERS_RE.sub("", value)
+    return value
+
+
+async def stream_xlsx(
+    rows: AsyncIterable[dict[str, Any]], fieldnames: list[str], sheet_title: str
+) -> AsyncIterator[bytes]:
+    """XLSX workbook with one sheet of the rows.
+
+    The workbook is written in openpyxl's write-only mode (rows are flushed to a
+    temporary file as they are appended) and the saved file is sent in chunks.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title=sheet_title)
+    sheet.append(fieldnames)
+
+    async for row in rows:
+        sheet.append([_to_cell_value(row.get(name)) for name in fieldnames])
+
+    with tempfile.NamedTemporaryFile(suffix=".xlsx") as file:
+        await asyncio.to_thread(workbook.save, file.name)
+        while chunk := await asyncio.to_thread(file.read, EXPORT_CHUNK_SIZE):
+            yield chunk
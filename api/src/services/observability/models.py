@@ -664,6 +664,7 @@ class BaggageParams(TypedDict, total=False):
     consumer_type: str | None
     conversation_id: str | None
     conversation_data: Dict[str, Any] | None
+    x_attributes: Dict[str, Any] | None
 
 
 # region Metrics summary related classes
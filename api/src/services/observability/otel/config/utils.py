@@ -105,7 +105,9 @@ def get_span_processors() -> list[SpanProcessor]:
             case TracesExporterType.INTERNAL:
                 processors.append(
                     BatchSpanProcessor(
-                        SqlAlchemySpanExporter(),
+                        SqlAlchemySpanExporter(
+                            pool_size=observability_settings.TRACES_EXPORT_POOL_SIZE
+                        ),
                         max_export_batch_size=max_export_batch_size,
                     )
                 )
@@ -1,22 +1,28 @@
 import asyncio
 import re
+import threading
 import time
 import traceback
-from dataclasses import dataclass
+import weakref
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from logging import getLogger
 from typing import Any, Sequence
 
 from opentelemetry.sdk.trace import ReadableSpan
 from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
-from opentelemetry.sdk.trace.id_generator import RandomIdGenerator
 from opentelemetry.trace import format_span_id
 from opentelemetry.trace.status import StatusCode
-from sqlalchemy import select, update
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 
 from core.db.models.metric import Metric
-from core.db.models.trace import Trace
+from core.db.models.trace import Trace, TraceSpan
 from services.observability.models import (
     ObservabilityConfig,
     ObservedConversation,
@@ -44,6 +50,19 @@ from services.observability.utils import (
     get_duration,
 )
 
+from .trace_statements import (
+    LATEST_TOP_LEVEL_SPAN_END_SQL,
+    existing_span_ids_statement,
+    get_idle_span,
+    get_latest_top_level_span_end,
+    get_span_rows,
+    is_postgresql,
+    latest_span_row_end_statement,
+    merged_trace_values,
+    span_insert_statement,
+    trace_upsert_statement,
+)
+
 logger = getLogger(__name__)
 
 
@@ -113,11 +132,6 @@ def _safe_max_datetime(dt1: Any, dt2: datetime | None) -> datetime | None:
     return max(dt1_converted, dt2_converted)
 
 
-def _safe_max_span_time(span_time: Any) -> datetime | None:
-    """Safely extract datetime from span data."""
-    return _to_datetime(span_time)
-
-
 @dataclass
 class TraceToSave:
     spans: list[dict[str, Any]]
@@ -141,104 +155,138 @@ TraceAccumulator = dict[str, TraceToSave]
 AnalyticsAccumulator = dict[str, dict[str, Any]]
 
 
+@dataclass
+class _LoopExportState:
+    """Exporter resources bound to one event loop (asyncpg connections are loop-bound)."""
+
+    engine: AsyncEngine
+    session_factory: async_sessionmaker[AsyncSession]
+    pending: list[ReadableSpan] = field(default_factory=list)
+    writer: asyncio.Task | None = None
+
+
 class SqlAlchemySpanExporter(SpanExporter):
-    def __init__(self):
-        pass
+    """Exports spans to the traces and metrics tables.
+
+    The database engine is created once and reused for all exports. When called
+    from an event loop, batches are queued and written by a single background
+    task; batches arriving while a write is in progress are merged into the next
+    write, so each trace is read and updated once per write instead of once per
+    batch.
+    """
+
+    def __init__(self, pool_size: int = 2):
+        self.pool_size = pool_size
+        self._lock = threading.Lock()
+        self._loop_states: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, _LoopExportState
+        ] = weakref.WeakKeyDictionary()
+        self._sync_exporter = None
 
     def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
         logger.info(f"Exporting {len(spans)} spans")
-        start_time = time.time()
 
         try:
             # Try to get the current event loop
             try:
                 loop = asyncio.get_running_loop()
-                # If we're in an async context, schedule the task in background
-                # and return immediately (fire-and-forget)
-                task = loop.create_task(self._export_spans_isolated(spans))
-
-                # Add error handling callback
-                def handle_task_result(task_future):
-                    try:
-                        task_future.result()
-                        end_time = time.time()
-                        logger.info(
-                            f"Exported {len(spans)} spans in {end_time - start_time} seconds"
-                        )
-                    except Exception as e:
-                        logger.error(f"Background span export failed: {e}")
-                        traceback.print_exc()
-
-                task.add_done_callback(handle_task_result)
-
-                # Return success immediately for async context
-                return SpanExportResult.SUCCESS
-
             except RuntimeError:
-                # No event loop running, fall back to synchronous exporter approach
-                logger.info("No event loop found, falling back to sync export")
-                from .sqlalchemy_sync_span_exporter import SqlAlchemySyncSpanExporter
-
-                sync_exporter = SqlAlchemySyncSpanExporter()
-                return sync_exporter.export(spans)
+                # No event loop running (e.g. the batch processor thread),
+                # export synchronously with the shared sync exporter
+                return self._get_sync_exporter().export(spans)
+
+            # In an async context, queue the spans for the background writer
+            # and return immediately (fire-and-forget)
+            state = self._get_loop_state(loop)
+            state.pending.extend(spans)
+            if state.writer is None or state.writer.done():
+                state.writer = loop.create_task(self._write_pending(state))
+            return SpanExportResult.SUCCESS
 
         except Exception as e:
             logger.error(f"Unexpected error during span export: {e}")
             traceback.print_exc()
             return SpanExportResult.FAILURE
 
-    async def _export_spans_isolated(self, spans: Sequence[ReadableSpan]):
+    def _get_sync_exporter(self):
+        with self._lock:
+            if self._sync_exporter is None:
+                from .sqlalchemy_sync_span_exporter import SqlAlchemySyncSpanExporter
+
+                self._sync_exporter = SqlAlchemySyncSpanExporter(
+                    pool_size=self.pool_size
+                )
+            return self._sync_exporter
+
+    def _get_loop_state(self, loop: asyncio.AbstractEventLoop) -> _LoopExportState:
+        with self._lock:
+            state = self._loop_states.get(loop)
+            if state is None:
+                from core.config.app import settings
+
+                # Use a separate engine for span export to avoid conflicts with
+                # the main application's database connections
+                engine = create_async_engine(
+                    url=settings.db.effective_url,
+                    future=True,
+                    pool_pre_ping=True,
+                    pool_recycle=3600,
+                    pool_size=self.pool_size,
+                    max_overflow=0,
+                    echo=False,
+                )
+                state = self._loop_states[loop] = _LoopExportState(
+                    engine=engine,
+                    session_factory=async_sessionmaker(
+                        bind=engine,
+                        class_=AsyncSession,
+                        expire_on_commit=False,
+                    ),
+                )
+            return state
+
+    async def _write_pending(self, state: _LoopExportState):
+        """Write queued spans until the queue is empty."""
+        while state.pending:
+            spans, state.pending = state.pending, []
+            start_time = time.time()
+            try:
+                await self._export_spans_isolated(state, spans)
+                logger.info(
+                    f"Exported {len(spans)} spans in {time.time() - start_time} seconds"
+                )
+            except Exception as e:
+                logger.error(f"Background span export failed: {e}")
+                traceback.print_exc()
+
+    async def _export_spans_isolated(
+        self, state: _LoopExportState, spans: Sequence[ReadableSpan]
+    ):
         """Export spans in the current async context."""
-        from core.config.app import settings
-
-        # Use a separate engine instance for span export to avoid conflicts
-        # with the main application's database connections
-        engine = create_async_engine(
-            url=settings.db.URL,
-            future=True,
-            pool_pre_ping=True,
-            pool_recycle=3600,
-            pool_size=5,  # Smaller pool for background operations
-            echo=False,
-        )
+        async with state.session_factory() as session:
+            try:
+                trace_accumulator: TraceAccumulator = {}
+                analytics_accumulator: AnalyticsAccumulator = {}
 
-        async_session_factory = async_sessionmaker(
-            bind=engine,
-            class_=AsyncSession,
-            expire_on_commit=False,
-        )
+                for span in spans:
+                    await self._export_span(
+                        span, trace_accumulator, analytics_accumulator
+                    )
 
-        try:
-            async with async_session_factory() as session:
-                try:
-                    trace_accumulator: TraceAccumulator = {}
-                    analytics_accumulator: AnalyticsAccumulator = {}
-
-                    for span in spans:
-                        # print(span.to_json())
-                        await self._export_span(
-                            span, trace_accumulator, analytics_accumulator
-                        )
-
-                    for trace_id, trace_patch in trace_accumulator.items():
-                        await self._upsert_trace(
-                            session, trace_id=trace_id, trace_patch=trace_patch
-                        )
-
-                    for analytics_id, analytics_patch in analytics_accumulator.items():
-                        await self._upsert_metrics(
-                            session, analytics_id, analytics_patch
-                        )
-
-                    await session.commit()
-                except Exception:
-                    logger.error("Failed to export spans")
-                    traceback.print_exc()
-                    await session.rollback()
-                    raise
-        finally:
-            # Clean up the engine
-            await engine.dispose()
+                for trace_id, trace_patch in trace_accumulator.items():
+                    await self._upsert_trace(
+                        session, trace_id=trace_id, trace_patch=trace_patch
+                    )
+
+                for analytics_id, analytics_patch in analytics_accumulator.items():
+                    await self._upsert_metrics(session, analytics_id, analytics_patch)
+
+                await session.commit()
+            except Exception:
+                logger.error("Failed to export spans")
+                traceback.print_exc()
+                await session.rollback()
+                raise
 
     async def _export_span(
         self,
@@ -472,159 +520,119 @@ class SqlAlchemySpanExporter(SpanExporter):
                 parent_feature_count += 1
 
     def shutdown(self) -> None:
-        pass
+        self.force_flush()
+
+        with self._lock:
+            loop_states = list(self._loop_states.items())
+            self._loop_states.clear()
+            sync_exporter, self._sync_exporter = self._sync_exporter, None
+
+        for loop, state in loop_states:
+            if loop.is_running() and not _is_loop_thread(loop):
+                future = asyncio.run_coroutine_threadsafe(state.engine.dispose(), loop)
+                try:
+                    future.result(timeout=5)
+                except Exception as e:
+                    logger.warning(f"Failed to dispose span exporter engine: {e}")
+            else:
+                # The loop is gone or is the current one: drop the connections
+                # without awaiting a graceful close
+                state.engine.sync_engine.dispose(close=False)
+
+        if sync_exporter is not None:
+            sync_exporter.shutdown()
 
     def force_flush(self, timeout_millis: int = 30000) -> bool:
-        return True
+        """Wait until the spans queued on all event loops are written."""
+        deadline = time.monotonic() + timeout_millis / 1000
+
+        with self._lock:
+            loop_states = list(self._loop_states.items())
+
+        flushed = True
+        for loop, state in loop_states:
+            if not state.pending and (state.writer is None or state.writer.done()):
+                continue
+            if not loop.is_running() or _is_loop_thread(loop):
+                # Blocking the loop would prevent its writer from running
+                flushed = False
+                continue
+            future = asyncio.run_coroutine_threadsafe(self._flush_loop(state), loop)
+            try:
+                future.result(timeout=max(deadline - time.monotonic(), 0))
+            except Exception as e:
+                logger.warning(f"Failed to flush spans: {e}")
+                future.cancel()
+                flushed = False
+        return flushed
+
+    async def _flush_loop(self, state: _LoopExportState):
+        while state.writer is not None and not state.writer.done():
+            await asyncio.shield(state.writer)
+        if state.pending:
+            await self._write_pending(state)
 
     async def _upsert_trace(
         self, session: AsyncSession, trace_id: str, trace_patch: TraceToSave
     ):
-        # Check if trace exists
-        result = await session.execute(select(Trace).where(Trace.id == trace_id))
-        existing_trace = result.scalar_one_or_none()
-
-        if existing_trace:
-            # Update existing trace
-            trace_start_time = existing_trace.start_time
-            trace_end_time = existing_trace.end_time
-
-            if trace_start_time and trace_patch.start_time:
-                trace_start_time = _safe_min_datetime(
-                    trace_start_time, trace_patch.start_time
+        spans = list(trace_patch.spans)
+        postgresql = is_postgresql(session)
+        existing_trace = None
+        if not postgresql:
+            # Other databases have no upsert: read the trace and merge in Python
+            existing_trace = (
+                await session.execute(select(Trace).where(Trace.id == trace_id))
+            ).scalar_one_or_none()
+
+        # Add idle span if needed
+        if trace_patch.root_span:
+            if postgresql:
+                latest_span_end_time = (
+                    await session.execute(
+                        LATEST_TOP_LEVEL_SPAN_END_SQL, {"trace_id": trace_id}
+                    )
+                ).scalar()
+            else:
+                latest_span_end_time = get_latest_top_level_span_end(
+                    trace_id,
+                    (
+                        await session.execute(latest_span_row_end_statement(trace_id))
+                    ).scalar(),
+                    existing_trace.spans if existing_trace else None,
                 )
-            elif trace_patch.start_time:
-                trace_start_time = trace_patch.start_time
+            idle_span = get_idle_span(
+                trace_id, latest_span_end_time, trace_patch.root_span
+            )
+            if idle_span:
+                spans.insert(0, idle_span)
 
-            if trace_end_time and trace_patch.end_time:
-                trace_end_time = _safe_max_datetime(
-                    trace_end_time, trace_patch.end_time
+        if postgresql:
+            await session.execute(trace_upsert_statement(trace_id, trace_patch))
+            if spans:
+                await session.execute(
+                    span_insert_statement(), get_span_rows(trace_id, spans)
                 )
-            elif trace_patch.end_time:
-                trace_end_time = trace_patch.end_time
-
-            # Merge spans
-            existing_spans = existing_trace.spans or []
-            new_spans = []
-
-            # Add idle span if needed
-            if trace_patch.root_span and existing_spans:
-                latest_existing_root_span_end_time = None
-                for existing_span in existing_spans:
-                    if existing_span.get("parent_id") == trace_id:
-                        if latest_existing_root_span_end_time is None:
-                            latest_existing_root_span_end_time = _safe_max_span_time(
-                                existing_span.get("end_time")
-                            )
-                        else:
-                            span_end_time = _safe_max_span_time(
-                                existing_span.get("end_time")
-                            )
-                            if span_end_time:
-                                latest_existing_root_span_end_time = max(
-                                    latest_existing_root_span_end_time,
-                                    span_end_time,
-                                )
-
-                if latest_existing_root_span_end_time:
-                    latest_existing_root_span_end_time = apply_utc_timezone(
-                        latest_existing_root_span_end_time
-                    )
-
-                    # Convert root span start_time to datetime if it's a string
-                    root_span_start_time = _safe_max_span_time(
-                        trace_patch.root_span.get("start_time")
-                    )
-
-                    idle_span = {
-                        "id": format_span_id(RandomIdGenerator().generate_span_id()),
-                        "parent_id": trace_id,
-                        "type": "idle",
-                        "start_time": latest_existing_root_span_end_time,
-                        "end_time": root_span_start_time,
-                        "latency": get_duration(
-                            latest_existing_root_span_end_time,
-                            root_span_start_time,
-                        ),
-                    }
-                    new_spans.append(idle_span)
-
-            new_spans.extend(trace_patch.spans)
-            all_spans = existing_spans + new_spans
-
-            # Update cost details
-            existing_cost_details = existing_trace.cost_details or {
-                "chat": 0.0,
-                "embed": 0.0,
-                "rerank": 0.0,
-                "total": 0.0,
-            }
-
-            updated_cost_details = {
-                "chat": existing_cost_details.get("chat", 0.0) + trace_patch.chat_cost,
-                "embed": existing_cost_details.get("embed", 0.0)
-                + trace_patch.embed_cost,
-                "rerank": existing_cost_details.get("rerank", 0.0)
-                + trace_patch.rerank_cost,
-                "total": existing_cost_details.get("total", 0.0)
-                + trace_patch.total_cost,
-            }
+            return
 
-            # Update the existing trace
+        values = merged_trace_values(trace_id, trace_patch, existing_trace)
+        if existing_trace:
             await session.execute(
-                update(Trace)
-                .where(Trace.id == trace_id)
-                .values(
-                    name=existing_trace.name or trace_patch.name,
-                    type=existing_trace.type or trace_patch.type,
-                    # Propagate error: if any new span is error, override trace status
-                    status=(
-                        "error"
-                        if trace_patch.status == "error"
-                        else existing_trace.status
-                    ),
-                    channel=existing_trace.channel or trace_patch.channel,
-                    source=existing_trace.source or trace_patch.source,
-                    extra_data=existing_trace.extra_data or trace_patch.extra_data,
-                    user_id=existing_trace.user_id or trace_patch.user_id,
-                    start_time=trace_start_time,
-                    end_time=trace_end_time,
-                    latency=get_duration(
-                        _to_datetime(trace_start_time), _to_datetime(trace_end_time)
-                    ),
-                    cost_details=updated_cost_details,
-                    spans=all_spans if new_spans else existing_trace.spans,
-                )
+                update(Trace).where(Trace.id == trace_id).values(**values)
             )
         else:
-            # Create new trace
-            cost_details = {
-                "chat": trace_patch.chat_cost,
-                "embed": trace_patch.embed_cost,
-                "rerank": trace_patch.rerank_cost,
-                "total": trace_patch.total_cost,
-            }
+            await session.execute(insert(Trace).values(**values))
 
-            spans = []
-            if trace_patch.spans:
-                spans.extend(trace_patch.spans)
-
-            new_trace = Trace(
-                id=trace_id,
-                name=trace_patch.name or "Unknown",
-                type=trace_patch.type or "unknown",
-                status=trace_patch.status or "success",
-                channel=trace_patch.channel,
-                source=trace_patch.source,
-                user_id=trace_patch.user_id,
-                start_time=trace_patch.start_time,
-                end_time=trace_patch.end_time,
-                latency=get_duration(trace_patch.start_time, trace_patch.end_time),
-                cost_details=cost_details,
-                extra_data=trace_patch.extra_data,
-                spans=spans,
-            )
-            session.add(new_trace)
+        span_rows = {row["id"]: row for row in get_span_rows(trace_id, spans)}
+        if span_rows:
+            stored_span_ids = (
+                await session.execute(
+                    existing_span_ids_statement(trace_id, list(span_rows))
+                )
+            ).scalars()
+            for span_id in stored_span_ids:
+                span_rows.pop(span_id, None)
+        if span_rows:
+            await session.execute(insert(TraceSpan), list(span_rows.values()))
 
     async def _upsert_metrics(self, session: AsyncSession, metric_id: str, patch: dict):
         # Filter out None values
@@ -684,6 +692,13 @@ class SqlAlchemySpanExporter(SpanExporter):
             session.add(new_metric)
 
 
+def _is_loop_thread(loop: asyncio.AbstractEventLoop) -> bool:
+    try:
+        return asyncio.get_running_loop() is loop
+    except RuntimeError:
+        return False
+
+
 def _get_error_message(span: ReadableSpan) -> str:
     for event in span.events:
         if event.name == "exception" and event.attributes:
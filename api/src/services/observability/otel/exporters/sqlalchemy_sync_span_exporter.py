@@ -8,14 +8,13 @@ from typing import Any, Sequence
 
 from opentelemetry.sdk.trace import ReadableSpan
 from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
-from opentelemetry.sdk.trace.id_generator import RandomIdGenerator
 from opentelemetry.trace import format_span_id
 from opentelemetry.trace.status import StatusCode
-from sqlalchemy import create_engine, select, update
+from sqlalchemy import create_engine, insert, select, update
 from sqlalchemy.orm import sessionmaker
 
 from core.db.models.metric import Metric
-from core.db.models.trace import Trace
+from core.db.models.trace import Trace, TraceSpan
 from services.observability.models import (
     ObservabilityConfig,
     ObservedConversation,
@@ -43,6 +42,19 @@ from services.observability.utils import (
     get_duration,
 )
 
+from .trace_statements import (
+    LATEST_TOP_LEVEL_SPAN_END_SQL,
+    existing_span_ids_statement,
+    get_idle_span,
+    get_latest_top_level_span_end,
+    get_span_rows,
+    is_postgresql,
+    latest_span_row_end_statement,
+    merged_trace_values,
+    span_insert_statement,
+    trace_upsert_statement,
+)
+
 logger = getLogger(__name__)
 
 
@@ -112,11 +124,6 @@ def _safe_max_datetime(dt1: Any, dt2: datetime | None) -> datetime | None:
     return max(dt1_converted, dt2_converted)
 
 
-def _safe_max_span_time(span_time: Any) -> datetime | None:
-    """Safely extract datetime from span data."""
-    return _to_datetime(span_time)
-
-
 @dataclass
 class TraceToSave:
     spans: list[dict[str, Any]]
@@ -143,7 +150,8 @@ AnalyticsAccumulator = dict[str, dict[str, Any]]
 class SqlAlchemySyncSpanExporter(SpanExporter):
     """Synchronous SQLAlchemy span exporter to avoid async event loop conflicts."""
 
-    def __init__(self):
+    def __init__(self, pool_size: int = 5):
+        self.pool_size = pool_size
         self._engine = None
         self._session_factory = None
         self._initialized = False
@@ -164,6 +172,8 @@ class SqlAlchemySyncSpanExporter(SpanExporter):
                 database_url,
                 pool_pre_ping=True,
                 pool_recycle=3600,
+                pool_size=self.pool_size,
+                max_overflow=0,
                 echo=False,
             )
             self._session_factory = sessionmaker(bind=self._engine)
@@ -438,133 +448,56 @@ class SqlAlchemySyncSpanExporter(SpanExporter):
 
     def _upsert_trace_sync(self, session, trace_id: str, trace_patch: TraceToSave):
         """Synchronous version of _upsert_trace."""
-        # Check if trace exists
-        existing_trace = session.execute(
-            select(Trace).where(Trace.id == trace_id)
-        ).scalar_one_or_none()
-
-        if existing_trace:
-            # Update existing trace
-            trace_start_time = _safe_min_datetime(
-                existing_trace.start_time, trace_patch.start_time
-            )
-            trace_end_time = _safe_max_datetime(
-                existing_trace.end_time, trace_patch.end_time
-            )
-
-            # Merge spans
-            existing_spans = existing_trace.spans or []
-            new_spans = []
-
-            # Add idle span if needed
-            if trace_patch.root_span and existing_spans:
-                latest_existing_root_span_end_time = None
-                for existing_span in existing_spans:
-                    if existing_span.get("parent_id") == trace_id:
-                        span_end_time = _safe_max_span_time(
-                            existing_span.get("end_time")
-                        )
-                        if span_end_time:
-                            if latest_existing_root_span_end_time is None:
-                                latest_existing_root_span_end_time = span_end_time
-                            else:
-                                latest_existing_root_span_end_time = max(
-                                    latest_existing_root_span_end_time,
-                                    span_end_time,
-                                )
-
-                if latest_existing_root_span_end_time:
-                    # Convert root span start_time to datetime if it's a string
-                    root_span_start_time = _safe_max_span_time(
-                        trace_patch.root_span.get("start_time")
+        spans = list(trace_patch.spans)
+        postgresql = is_postgresql(session)
+        existing_trace = None
+        if not postgresql:
+            # Other databases have no upsert: read the trace and merge in Python
+            existing_trace = (
+                session.execute(select(Trace).where(Trace.id == trace_id))
+            ).scalar_one_or_none()
+
+        # Add idle span if needed
+        if trace_patch.root_span:
+            if postgresql:
+                latest_span_end_time = (
+                    session.execute(
+                        LATEST_TOP_LEVEL_SPAN_END_SQL, {"trace_id": trace_id}
                     )
-
-                    idle_span = {
-                        "id": format_span_id(RandomIdGenerator().generate_span_id()),
-                        "parent_id": trace_id,
-                        "type": "idle",
-                        "start_time": latest_existing_root_span_end_time,
-                        "end_time": root_span_start_time,
-                        "latency": get_duration(
-                            latest_existing_root_span_end_time,
-                            root_span_start_time,
-                        ),
-                    }
-                    new_spans.append(_serialize_for_json(idle_span))
-
-            new_spans.extend(trace_patch.spans)
-            all_spans = existing_spans + new_spans
-
-            # Update cost details
-            existing_cost_details = existing_trace.cost_details or {
-                "chat": 0.0,
-                "embed": 0.0,
-                "rerank": 0.0,
-                "total": 0.0,
-            }
-
-            updated_cost_details = {
-                "chat": existing_cost_details.get("chat", 0.0) + trace_patch.chat_cost,
-                "embed": existing_cost_details.get("embed", 0.0)
-                + trace_patch.embed_cost,
-                "rerank": existing_cost_details.get("rerank", 0.0)
-                + trace_patch.rerank_cost,
-                "total": existing_cost_details.get("total", 0.0)
-                + trace_patch.total_cost,
-            }
-
-            # Update the existing trace
-            session.execute(
-                update(Trace)
-                .where(Trace.id == trace_id)
-                .values(
-                    name=existing_trace.name or trace_patch.name,
-                    type=existing_trace.type or trace_patch.type,
-                    status=trace_patch.status or existing_trace.status or "success",
-                    channel=existing_trace.channel or trace_patch.channel,
-                    source=existing_trace.source or trace_patch.source,
-                    extra_data=_serialize_for_json(
-                        existing_trace.extra_data or trace_patch.extra_data
-                    ),
-                    user_id=existing_trace.user_id or trace_patch.user_id,
-                    start_time=trace_start_time,
-                    end_time=trace_end_time,
-                    latency=get_duration(
-                        _to_datetime(trace_start_time), _to_datetime(trace_end_time)
-                    ),
-                    cost_details=updated_cost_details,
-                    spans=all_spans if new_spans else existing_trace.spans,
+                ).scalar()
+            else:
+                latest_span_end_time = get_latest_top_level_span_end(
+                    trace_id,
+                    (session.execute(latest_span_row_end_statement(trace_id))).scalar(),
+                    existing_trace.spans if existing_trace else None,
                 )
+            idle_span = get_idle_span(
+                trace_id, latest_span_end_time, trace_patch.root_span
             )
-        else:
-            # Create new trace
-            cost_details = {
-                "chat": trace_patch.chat_cost,
-                "embed": trace_patch.embed_cost,
-                "rerank": trace_patch.rerank_cost,
-                "total": trace_patch.total_cost,
-            }
+            if idle_span:
+                spans.insert(0, idle_span)
 
-            spans = []
-            if trace_patch.spans:
-                spans.extend(trace_patch.spans)
-
-            new_trace = Trace(
-                id=trace_id,
-                name=trace_patch.name or "Unknown",
-                type=trace_patch.type or "unknown",
-                status=trace_patch.status or "success",
-                channel=trace_patch.channel,
-                source=trace_patch.source,
-                user_id=trace_patch.user_id,
-                start_time=trace_patch.start_time,
-                end_time=trace_patch.end_time,
-                latency=get_duration(trace_patch.start_time, trace_patch.end_time),
-                cost_details=cost_details,
-                extra_data=_serialize_for_json(trace_patch.extra_data),
-                spans=spans,
-            )
-            session.add(new_trace)
+        if postgresql:
+            session.execute(trace_upsert_statement(trace_id, trace_patch))
+            if spans:
+                session.execute(span_insert_statement(), get_span_rows(trace_id, spans))
+            return
+
+        values = merged_trace_values(trace_id, trace_patch, existing_trace)
+        if existing_trace:
+            session.execute(update(Trace).where(Trace.id == trace_id).values(**values))
+        else:
+            session.execute(insert(Trace).values(**values))
+
+        span_rows = {row["id"]: row for row in get_span_rows(trace_id, spans)}
+        if span_rows:
+            stored_span_ids = (
+                session.execute(existing_span_ids_statement(trace_id, list(span_rows)))
+            ).scalars()
+            for span_id in stored_span_ids:
+                span_rows.pop(span_id, None)
+        if span_rows:
+            session.execute(insert(TraceSpan), list(span_rows.values()))
 
     def _upsert_metrics_sync(self, session, metric_id: str, patch: dict):
         """Synchronous version of _upsert_metrics."""
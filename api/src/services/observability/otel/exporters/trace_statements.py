@@ -0,0 +1,245 @@
+"""SQL statements the span exporters use to write traces.
+
+Spans are appended to the ``trace_spans`` table and trace aggregates (times, costs,
+status) are merged by a single ``INSERT ... ON CONFLICT DO UPDATE``, so an export
+never reads or rewrites the spans already stored for a trace.
+
+The upsert statements are PostgreSQL-specific. On other databases the exporters
+read the trace, merge the patch with `merged_trace_values` and skip the spans that
+are already stored (`existing_span_ids_statement`) instead.
+"""
+
+from datetime import datetime, timezone
+from typing import Any
+
+from opentelemetry.sdk.trace.id_generator import RandomIdGenerator
+from opentelemetry.trace import format_span_id
+from sqlalchemy import Float, case, extract, func, literal, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from core.db.models.trace import Trace, TraceSpan
+from services.observability.utils import get_duration
+
+COST_KEYS = ("chat", "embed", "rerank", "total")
+
+# Latest end time of the top-level spans of a trace, including the spans stored
+# in the legacy ``traces.spans`` array
+LATEST_TOP_LEVEL_SPAN_END_SQL = text(
+    """
+    SELECT GREATEST(
+        (
+            SELECT max(end_time)
+            FROM trace_spans
+            WHERE trace_id = :trace_id AND parent_id = :trace_id
+        ),
+        (
+            SELECT max((span->>'end_time')::timestamptz)
+            FROM traces, jsonb_array_elements(coalesce(traces.spans, '[]'::jsonb)) AS span
+            WHERE traces.id = :trace_id AND span->>'parent_id' = :trace_id
+        )
+    )
+    """
+)
+
+
+def is_postgresql(session) -> bool:
+    """Whether a (sync or async) session is bound to PostgreSQL."""
+    return session.get_bind().dialect.name == "postgresql"
+
+
+def _to_datetime(value: Any) -> datetime | None:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _to_json_value(obj: Any) -> Any:
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if isinstance(obj, dict):
+        return {key: _to_json_value(value) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [_to_json_value(item) for item in obj]
+    return obj
+
+
+def get_cost_details(trace_patch) -> dict[str, float]:
+    return {
+        "chat": trace_patch.chat_cost,
+        "embed": trace_patch.embed_cost,
+        "rerank": trace_patch.rerank_cost,
+        "total": trace_patch.total_cost,
+    }
+
+
+def trace_upsert_statement(trace_id: str, trace_patch):
+    """Insert a trace or merge the patch into the stored trace atomically."""
+    start_time = _to_datetime(trace_patch.start_time)
+    end_time = _to_datetime(trace_patch.end_time)
+    cost_details = get_cost_details(trace_patch)
+
+    statement = pg_insert(Trace).values(
+        id=trace_id,
+        name=trace_patch.name or "Unknown",
+        type=trace_patch.type or "unknown",
+        status=trace_patch.status or "success",
+        channel=trace_patch.channel,
+        source=trace_patch.source,
+        user_id=trace_patch.user_id,
+        start_time=start_time,
+        end_time=end_time,
+        latency=get_duration(start_time, end_time),
+        cost_details=cost_details,
+        extra_data=trace_patch.extra_data,
+    )
+
+    table = Trace.__table__
+    excluded = statement.excluded
+    merged_start_time = func.least(table.c.start_time, excluded.start_time)
+    merged_end_time = func.greatest(table.c.end_time, excluded.end_time)
+    merged_cost_details = func.jsonb_build_object(
+        *[
+            item
+            for key in COST_KEYS
+            for item in (
+                literal(key),
+                func.coalesce(table.c.cost_details[key].as_float(), 0.0)
+                + literal(cost_details[key], Float),
+            )
+        ]
+    )
+
+    return statement.on_conflict_do_update(
+        index_elements=[table.c.id],
+        set_={
+            # Once any span is an error, the trace is an error
+            "status": case((excluded.status == "error", "error"), else_=table.c.status),
+            "channel": func.coalesce(table.c.channel, excluded.channel),
+            "source": func.coalesce(table.c.source, excluded.source),
+            "user_id": func.coalesce(table.c.user_id, excluded.user_id),
+            "extra_data": func.coalesce(table.c.extra_data, excluded.extra_data),
+            "start_time": merged_start_time,
+            "end_time": merged_end_time,
+            "latency": extract("epoch", merged_end_time - merged_start_time) * 1000,
+            "cost_details": merged_cost_details,
+            "updated_at": excluded.updated_at,
+        },
+    )
+
+
+def get_idle_span(
+    trace_id: str, latest_span_end_time: Any, root_span: dict[str, Any]
+) -> dict[str, Any] | None:
+    """Span covering the time between the previous and the new root span of a trace."""
+    latest_span_end_time = _to_datetime(latest_span_end_time)
+    if not latest_span_end_time:
+        return None
+
+    root_span_start_time = _to_datetime(root_span.get("start_time"))
+    return {
+        "id": format_span_id(RandomIdGenerator().generate_span_id()),
+        "parent_id": trace_id,
+        "type": "idle",
+        "start_time": latest_span_end_time,
+        "end_time": root_span_start_time,
+        "latency": get_duration(latest_span_end_time, root_span_start_time),
+    }
+
+
+def span_insert_statement():
+    """INSERT of span rows; spans already stored (e.g. re-exported) are skipped."""
+    return pg_insert(TraceSpan).on_conflict_do_nothing(
+        index_elements=[TraceSpan.trace_id, TraceSpan.id]
+    )
+
+
+def get_span_rows(trace_id: str, spans: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    return [
+        {
+            "trace_id": trace_id,
+            "id": span["id"],
+            "parent_id": span.get("parent_id"),
+            "start_time": _to_datetime(span.get("start_time")),
+            "end_time": _to_datetime(span.get("end_time")),
+            "data": _to_json_value(span),
+        }
+        for span in spans
+    ]
+
+
+def latest_span_row_end_statement(trace_id: str):
+    """Latest end time of the top-level span rows of a trace (any database)."""
+    return select(func.max(TraceSpan.end_time)).where(
+        TraceSpan.trace_id == trace_id, TraceSpan.parent_id == trace_id
+    )
+
+
+def get_latest_top_level_span_end(
+    trace_id: str, latest_span_row_end: Any, legacy_spans: list[dict] | None
+) -> datetime | None:
+    """Same as `LATEST_TOP_LEVEL_SPAN_END_SQL`, from the span rows' latest end time
+    and the trace's legacy ``spans`` array."""
+    end_times = [_to_datetime(latest_span_row_end)] + [
+        _to_datetime(span.get("end_time"))
+        for span in legacy_spans or []
+        if span.get("parent_id") == trace_id
+    ]
+    return max((end_time for end_time in end_times if end_time), default=None)
+
+
+def merged_trace_values(
+    trace_id: str, trace_patch, existing_trace: Trace | None
+) -> dict[str, Any]:
+    """Column values of a trace merged with a patch, as `trace_upsert_statement` sets them."""
+    start_time = _to_datetime(trace_patch.start_time)
+    end_time = _to_datetime(trace_patch.end_time)
+    cost_details = get_cost_details(trace_patch)
+
+    if existing_trace is None:
+        return {
+            "id": trace_id,
+            "name": trace_patch.name or "Unknown",
+            "type": trace_patch.type or "unknown",
+            "status": trace_patch.status or "success",
+            "channel": trace_patch.channel,
+            "source": trace_patch.source,
+            "user_id": trace_patch.user_id,
+            "start_time": start_time,
+            "end_time": end_time,
+            "latency": get_duration(start_time, end_time),
+            "cost_details": cost_details,
+            "extra_data": trace_patch.extra_data,
+        }
+
+    start_times = [_to_datetime(existing_trace.start_time), start_time]
+    end_times = [_to_datetime(existing_trace.end_time), end_time]
+    merged_start_time = min((time for time in start_times if time), default=None)
+    merged_end_time = max((time for time in end_times if time), default=None)
+    existing_cost_details = existing_trace.cost_details or {}
+    return {
+        # Once any span is an error, the trace is an error
+        "status": ("error" if trace_patch.status == "error" else existing_trace.status),
+        "channel": existing_trace.channel or trace_patch.channel,
+        "source": existing_trace.source or trace_patch.source,
+        "user_id": existing_trace.user_id or trace_patch.user_id,
+        "extra_data": existing_trace.extra_data or trace_patch.extra_data,
+        "start_time": merged_start_time,
+        "end_time": merged_end_time,
+        "latency": get_duration(merged_start_time, merged_end_time),
+        "cost_details": {
+            key: (existing_cost_details.get(key) or 0.0) + cost_details[key]
+            for key in COST_KEYS
+        },
+    }
+
+
+def existing_span_ids_statement(trace_id: str, span_ids: list[str]):
+    """IDs of spans of a trace that are already stored."""
+    return select(TraceSpan.id).where(
+        TraceSpan.trace_id == trace_id, TraceSpan.id.in_(span_ids)
+    )
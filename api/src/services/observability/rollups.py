@@ -0,0 +1,653 @@
+"""
+Hourly and daily rollups of the ``metrics`` table.
+
+The monitoring summaries (RAG tools, LLM and agents) aggregate metrics over long
+time ranges. Instead of scanning raw metric rows on every request, the rollup job
+pre-aggregates complete hours per feature, channel, status, source and consumer
+into ``metric_rollups`` and derives day buckets from the hour buckets. A bucket
+holds counts, sums, a latency histogram, call counts per value of the
+``extra_data`` / ``conversation_data`` fields the dashboards break down by and a
+HyperLogLog sketch of user IDs, so buckets can be merged into any time range.
+
+Summaries read full days from day buckets and the remaining hours from hour
+buckets; only rows that are not rolled up yet (partial hours at the edges of the
+requested range and the hours since the last run) are aggregated from ``metrics``.
+
+Metrics are updated after they are written (feedback, conversation analysis), so
+each run also re-rolls the hours that contain metrics updated since the previous
+run.
+
+Environment variables
+---------------------
+METRICS_ROLLUP_ENABLED
+    Maintain rollups and serve summaries from them. Default: ``true``
+
+METRICS_ROLLUP_INTERVAL_MINUTES
+    How often (in minutes) the rollup job runs. Default: ``5``
+
+METRICS_ROLLUP_MAX_HOURS_PER_RUN
+    Maximum number of new hours rolled up per run (bounds the initial backfill).
+    Default: ``168``
+
+METRICS_ROLLUP_MAX_TAIL_ROWS
+    Summaries fall back to raw metrics when more rows than this are not rolled up
+    yet. Default: ``50000``
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import delete, func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.db.models.metric import Metric, MetricRollup
+
+logger = logging.getLogger(__name__)
+
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.environ.get(name, default).lower() in ("true", "1", "yes")
+
+
+METRICS_ROLLUP_ENABLED: bool = _env_flag("METRICS_ROLLUP_ENABLED", "true")
+METRICS_ROLLUP_INTERVAL_MINUTES: int = int(
+    os.environ.get("METRICS_ROLLUP_INTERVAL_MINUTES", "5")
+)
+METRICS_ROLLUP_MAX_HOURS_PER_RUN: int = int(
+    os.environ.get("METRICS_ROLLUP_MAX_HOURS_PER_RUN", "168")
+)
+METRICS_ROLLUP_MAX_TAIL_ROWS: int = int(
+    os.environ.get("METRICS_ROLLUP_MAX_TAIL_ROWS", "50000")
+)
+
+HOUR = timedelta(hours=1)
+DAY = timedelta(days=1)
+
+# Metrics updated this long before the previous run started are re-checked, so
+# updates committed while the previous run was reading are not missed
+ROLLUP_OVERLAP = timedelta(minutes=5)
+
+ROLLUP_DIMENSIONS = (
+    "feature_type",
+    "feature_system_name",
+    "channel",
+    "status",
+    "source",
+    "consumer_name",
+)
+
+# Upper bounds (inclusive) of the latency histogram buckets; the last bucket is open
+LATENCY_HISTOGRAM_BOUNDS_MS = (100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+
+# Fields the summaries break down by (call count per value)
+BREAKDOWN_FIELDS = (
+    "channel",
+    "is_answered",
+    "topic",
+    "answer_feedback_type",
+    "language",
+    "resolution_status",
+    "sentiment",
+    "conversation_language",
+)
+
+# Numeric fields the summaries sum or average (NULLs are skipped, as in SQL)
+SUM_FIELDS = ("avg_tool_call_latency", "likes", "dislikes", "messages_count")
+
+USER_SKETCH_PRECISION = 10
+USER_SKETCH_SIZE = 1 << USER_SKETCH_PRECISION
+
+METRIC_ROW_COLUMNS = """
+    feature_type,
+    feature_system_name,
+    channel,
+    status,
+    source,
+    consumer_name,
+    start_time,
+    latency,
+    cost,
+    user_id,
+    extra_data->>'is_answered' AS is_answered,
+    extra_data->>'topic' AS topic,
+    extra_data->'answer_feedback'->>'type' AS answer_feedback_type,
+    extra_data->>'answer_copy' AS answer_copy,
+    extra_data->>'language' AS language,
+    conversation_data->>'resolution_status' AS resolution_status,
+    conversation_data->>'sentiment' AS sentiment,
+    (conversation_data->'topics')::text AS conversation_topics,
+    conversation_data->>'language' AS conversation_language,
+    conversation_data->>'avg_tool_call_latency' AS avg_tool_call_latency,
+    conversation_data->>'likes' AS likes,
+    conversation_data->>'dislikes' AS dislikes,
+    conversation_data->>'messages_count' AS messages_count
+"""
+
+# Serializes rollup runs of concurrent workers (held until the run commits)
+ROLLUP_LOCK_SQL = text("SELECT pg_try_advisory_xact_lock(hashtext('metric_rollups'))")
+
+UPDATED_HOURS_SQL = text(
+    """
+    SELECT DISTINCT date_trunc('hour', start_time AT TIME ZONE 'UTC') AS hour
+    FROM metrics
+    WHERE updated_at >= :since AND start_time < :rolled_through
+    """
+)
+
+
+def as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def floor_time(value: datetime, bucket: timedelta) -> datetime:
+    value = as_utc(value)
+    return value - (value - datetime(1970, 1, 1, tzinfo=timezone.utc)) % bucket
+
+
+def ceil_time(value: datetime, bucket: timedelta) -> datetime:
+    floored = floor_time(value, bucket)
+    return floored if floored == as_utc(value) else floored + bucket
+
+
+def _to_float(value: Any) -> float | None:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_true(value: Any) -> bool:
+    return str(value).lower() in ("true", "t", "yes", "y", "on", "1")
+
+
+def add_to_sketch(sketch: bytearray, value: str) -> None:
+    """Add a value to a HyperLogLog sketch."""
+    hashed = int.from_bytes(
+        hashlib.blake2b(value.encode(), digest_size=8).digest(), "big"
+    )
+    remainder_bits = 64 - USER_SKETCH_PRECISION
+    index = hashed >> remainder_bits
+    rank = remainder_bits - (hashed & ((1 << remainder_bits) - 1)).bit_length() + 1
+    if rank > sketch[index]:
+        sketch[index] = rank
+
+
+def estimate_sketch(sketch: bytes | bytearray) -> int:
+    """Estimated number of distinct values added to a HyperLogLog sketch."""
+    size = len(sketch)
+    zeros = sketch.count(0)
+    if zeros == size:
+        return 0
+    alpha = 0.7213 / (1 + 1.079 / size)
+    estimate = alpha * size * size / sum(2.0**-rank for rank in sketch)
+    if estimate <= 2.5 * size:
+        # Linear counting is more accurate for small cardinalities
+        estimate = size * math.log(size / zeros)
+    return round(estimate)
+
+
+@dataclass
+class MetricsAggregate:
+    """Mergeable aggregate of metric rows (one rollup bucket or any union of them)."""
+
+    call_count: int = 0
+    error_count: int = 0
+    latency_sum: float = 0.0
+    latency_count: int = 0
+    latency_histogram: list[int] = field(
+        default_factory=lambda: [0] * (len(LATENCY_HISTOGRAM_BOUNDS_MS) + 1)
+    )
+    cost_sum: float = 0.0
+    cost_count: int = 0
+    user_sketch: bytearray = field(default_factory=lambda: bytearray(USER_SKETCH_SIZE))
+    # field -> value -> call count
+    breakdowns: dict[str, dict[str | None, int]] = field(default_factory=dict)
+    # field -> [sum, count]
+    sums: dict[str, list[float]] = field(default_factory=dict)
+
+    def _count(self, name: str, value: str | None, count: int = 1) -> None:
+        counts = self.breakdowns.setdefault(name, {})
+        counts[value] = counts.get(value, 0) + count
+
+    def _add(self, name: str, value: float, count: int = 1) -> None:
+        total = self.sums.setdefault(name, [0.0, 0])
+        total[0] += value
+        total[1] += count
+
+    def add_row(self, row: Any) -> None:
+        """Add a metric row selected with ``METRIC_ROW_COLUMNS``."""
+        self.call_count += 1
+        if row.status == "error":
+            self.error_count += 1
+
+        latency = _to_float(row.latency)
+        if latency is not None:
+            self.latency_sum += latency
+            self.latency_count += 1
+            self.latency_histogram[
+                bisect_left(LATENCY_HISTOGRAM_BOUNDS_MS, latency)
+            ] += 1
+
+        cost = _to_float(row.cost)
+        if cost is not None:
+            self.cost_sum += cost
+            self.cost_count += 1
+
+        if row.user_id is not None:
+            add_to_sketch(self.user_sketch, str(row.user_id))
+
+        for name in BREAKDOWN_FIELDS:
+            self._count(name, getattr(row, name))
+
+        if row.conversation_topics:
+            try:
+                topics = json.loads(row.conversation_topics)
+            except ValueError:
+                topics = None
+            if isinstance(topics, list):
+                for topic in topics:
+                    self._count(
+                        "conversation_topics",
+                        topic
+                        if isinstance(topic, str) or topic is None
+                        else json.dumps(topic),
+                    )
+
+        if _is_true(row.answer_copy):
+            self._add("answer_copy", 1)
+
+        feedback_count = 0.0
+        for name in SUM_FIELDS:
+            value = _to_float(getattr(row, name))
+            if value is not None:
+                self._add(name, value)
+                if name in ("likes", "dislikes"):
+                    feedback_count += value
+        if feedback_count > 0:
+            self._add("feedback_given", 1)
+
+    def merge(self, other: "MetricsAggregate") -> None:
+        self.call_count += other.call_count
+        self.error_count += other.error_count
+        self.latency_sum += other.latency_sum
+        self.latency_count += other.latency_count
+        self.latency_histogram = [
+            a + b for a, b in zip(self.latency_histogram, other.latency_histogram)
+        ]
+        self.cost_sum += other.cost_sum
+        self.cost_count += other.cost_count
+        self.user_sketch = bytearray(map(max, self.user_sketch, other.user_sketch))
+        for name, counts in other.breakdowns.items():
+            for value, count in counts.items():
+                self._count(name, value, count)
+        for name, (value, count) in other.sums.items():
+            self._add(name, value, count)
+
+    def to_record(self) -> dict[str, Any]:
+        """Measure columns of a ``metric_rollups`` row."""
+        return {
+            "call_count": self.call_count,
+            "error_count": self.error_count,
+            "latency_sum": self.latency_sum,
+            "latency_count": self.latency_count,
+            "latency_histogram": list(self.latency_histogram),
+            "cost_sum": self.cost_sum,
+            "cost_count": self.cost_count,
+            "user_sketch": bytes(self.user_sketch),
+            # Values may be NULL, so counts are stored as [value, count] pairs
+            "breakdowns": {
+                name: [[value, count] for value, count in counts.items()]
+                for name, counts in self.breakdowns.items()
+            },
+            "sums": {name: list(total) for name, total in self.sums.items()},
+        }
+
+    @classmethod
+    def from_record(cls, record: Any) -> "MetricsAggregate":
+        """Aggregate of a ``metric_rollups`` row."""
+        aggregate = cls(
+            call_count=record.call_count,
+            error_count=record.error_count,
+            latency_sum=record.latency_sum,
+            latency_count=record.latency_count,
+            latency_histogram=list(record.latency_histogram),
+            cost_sum=record.cost_sum,
+            cost_count=record.cost_count,
+            user_sketch=bytearray(record.user_sketch),
+        )
+        for name, pairs in (record.breakdowns or {}).items():
+            for value, count in pairs:
+                aggregate._count(name, value, count)
+        for name, (value, count) in (record.sums or {}).items():
+            aggregate._add(name, value, count)
+        return aggregate
+
+    @property
+    def unique_user_count(self) -> int:
+        return estimate_sketch(self.user_sketch)
+
+    @property
+    def avg_latency(self) -> float | None:
+        return self.latency_sum / self.latency_count if self.latency_count else None
+
+    @property
+    def avg_cost(self) -> float | None:
+        return self.cost_sum / self.cost_count if self.cost_count else None
+
+    @property
+    def total_cost(self) -> float | None:
+        return self.cost_sum if self.cost_count else None
+
+    def total(self, name: str) -> float:
+        return self.sums.get(name, [0.0, 0])[0]
+
+    def average(self, name: str) -> float | None:
+        value, count = self.sums.get(name, [0.0, 0])
+        return value / count if count else None
+
+    def breakdown(self, name: str) -> list[tuple[str | None, int]]:
+        return list(self.breakdowns.get(name, {}).items())
+
+
+def split_rollup_filter(
+    filter_dict: dict,
+) -> tuple[dict, datetime | None, datetime | None] | None:
+    """Split a metrics filter into rollup dimension conditions and a time range.
+
+    Returns the dimension filter and the rollup-aligned lower / upper bounds of
+    ``start_time``, or None if the filter uses fields or operators that rollups
+    cannot answer (e.g. ``extra_data`` fields or ``$or``).
+    """
+    dimension_filters: list[dict] = []
+    lower: datetime | None = None
+    upper: datetime | None = None
+
+    def visit(node: dict) -> bool:
+        nonlocal lower, upper
+        for key, value in node.items():
+            if key == "$and":
+                if not all(isinstance(item, dict) and visit(item) for item in value):
+                    return False
+            elif key == "start_time":
+                if not isinstance(value, dict):
+                    return False
+                for operator, bound in value.items():
+                    if not isinstance(bound, datetime):
+                        return False
+                    bound = as_utc(bound)
+                    if operator in ("$gte", "$gt"):
+                        if operator == "$gt":
+                            bound += timedelta(microseconds=1)
+                        lower = bound if lower is None else max(lower, bound)
+                    elif operator in ("$lte", "$lt"):
+                        upper = bound if upper is None else min(upper, bound)
+                    else:
+                        return False
+            elif (
+                key in ROLLUP_DIMENSIONS
+                and isinstance(value, dict)
+                and set(value) <= {"$eq", "$ne", "$in", "$nin"}
+            ):
+                dimension_filters.append({key: value})
+            else:
+                return False
+        return True
+
+    if not visit(filter_dict):
+        return None
+    return {"$and": dimension_filters}, lower, upper
+
+
+async def get_rollup_window(
+    db_session: AsyncSession, lower: datetime | None, upper: datetime | None
+) -> tuple[datetime | None, datetime] | None:
+    """Hour-aligned part of [lower, upper) covered by rollups, or None if empty."""
+    rolled_through = await db_session.scalar(
+        select(func.max(MetricRollup.bucket_start)).where(
+            MetricRollup.granularity == "hour"
+        )
+    )
+    if rolled_through is None:
+        return None
+
+    window_start = ceil_time(lower, HOUR) if lower else None
+    window_end = as_utc(rolled_through) + HOUR
+    if upper:
+        window_end = min(window_end, floor_time(upper, HOUR))
+    if window_start is not None and window_start >= window_end:
+        return None
+    return window_start, window_end
+
+
+async def load_rollups(
+    db_session: AsyncSession,
+    dimension_where: str,
+    params: dict,
+    window: tuple[datetime | None, datetime],
+) -> MetricsAggregate:
+    """Merge the rollups matching the dimension condition within the window.
+
+    Full days are read from day buckets and the remaining hours from hour buckets.
+    """
+    window_start, window_end = window
+    day_start = ceil_time(window_start, DAY) if window_start else None
+    day_end = floor_time(window_end, DAY)
+
+    days = "bucket_start < :day_end"
+    hours = "bucket_start < :window_end"
+    if window_start is not None:
+        days += " AND bucket_start >= :day_start"
+        hours += " AND bucket_start >= :window_start"
+    bucket_condition = (
+        f"(granularity = 'day' AND {days})"
+        f" OR (granularity = 'hour' AND {hours} AND NOT ({days}))"
+    )
+
+    statement = select(MetricRollup.__table__).where(
+        text(f"({dimension_where or 'TRUE'}) AND ({bucket_condition})")
+    )
+    result = await db_session.execute(
+        statement,
+        {
+            **params,
+            "day_start": day_start,
+            "day_end": day_end,
+            "window_start": window_start,
+            "window_end": window_end,
+        },
+    )
+
+    aggregate = MetricsAggregate()
+    for record in result:
+        aggregate.merge(MetricsAggregate.from_record(record))
+    return aggregate
+
+
+async def aggregate_unrolled_metrics(
+    db_session: AsyncSession,
+    where: str,
+    params: dict,
+    window: tuple[datetime | None, datetime],
+) -> MetricsAggregate | None:
+    """Aggregate the raw metrics matching the filter outside the rollup window.
+
+    Returns None if there are more than ``METRICS_ROLLUP_MAX_TAIL_ROWS`` such rows.
+    """
+    window_start, window_end = window
+    outside_window = "start_time IS NULL OR start_time >= :rollup_window_end"
+    if window_start is not None:
+        outside_window += " OR start_time < :rollup_window_start"
+
+    result = await db_session.execute(
+        text(
+            f"""
+            SELECT {METRIC_ROW_COLUMNS}
+            FROM metrics
+            WHERE ({where or "TRUE"}) AND ({outside_window})
+            LIMIT :rollup_tail_limit
+            """
+        ),
+        {
+            **params,
+            "rollup_window_start": window_start,
+            "rollup_window_end": window_end,
+            "rollup_tail_limit": METRICS_ROLLUP_MAX_TAIL_ROWS + 1,
+        },
+    )
+    rows = result.fetchall()
+    if len(rows) > METRICS_ROLLUP_MAX_TAIL_ROWS:
+        return None
+
+    aggregate = MetricsAggregate()
+    for row in rows:
+        aggregate.add_row(row)
+    return aggregate
+
+
+async def _replace_buckets(
+    session: AsyncSession,
+    granularity: str,
+    bucket_start: datetime,
+    groups: dict[tuple, MetricsAggregate],
+    rolled_at: datetime,
+) -> None:
+    await session.execute(
+        delete(MetricRollup).where(
+            MetricRollup.granularity == granularity,
+            MetricRollup.bucket_start == bucket_start,
+        )
+    )
+    if groups:
+        await session.execute(
+            insert(MetricRollup),
+            [
+                {
+                    "granularity": granularity,
+                    "bucket_start": bucket_start,
+                    **dict(zip(ROLLUP_DIMENSIONS, key)),
+                    **aggregate.to_record(),
+                    # updated_at marks when the bucket was rolled up
+                    "created_at": rolled_at,
+                    "updated_at": rolled_at,
+                }
+                for key, aggregate in groups.items()
+            ],
+        )
+
+
+async def _rollup_hour(
+    session: AsyncSession, hour: datetime, rolled_at: datetime
+) -> None:
+    groups: dict[tuple, MetricsAggregate] = {}
+    result = await session.stream(
+        text(
+            f"""
+            SELECT {METRIC_ROW_COLUMNS}
+            FROM metrics
+            WHERE start_time >= :hour_start AND start_time < :hour_end
+            """
+        ),
+        {"hour_start": hour, "hour_end": hour + HOUR},
+    )
+    async for row in result:
+        key = tuple(getattr(row, name) for name in ROLLUP_DIMENSIONS)
+        groups.setdefault(key, MetricsAggregate()).add_row(row)
+    await _replace_buckets(session, "hour", hour, groups, rolled_at)
+
+
+async def _rollup_day(
+    session: AsyncSession, day: datetime, rolled_at: datetime
+) -> None:
+    groups: dict[tuple, MetricsAggregate] = {}
+    result = await session.execute(
+        select(MetricRollup.__table__).where(
+            MetricRollup.granularity == "hour",
+            MetricRollup.bucket_start >= day,
+            MetricRollup.bucket_start < day + DAY,
+        )
+    )
+    for record in result:
+        key = tuple(getattr(record, name) for name in ROLLUP_DIMENSIONS)
+        groups.setdefault(key, MetricsAggregate()).merge(
+            MetricsAggregate.from_record(record)
+        )
+    await _replace_buckets(session, "day", day, groups, rolled_at)
+
+
+async def _get_new_hours(
+    session: AsyncSession, cursor: datetime | None, complete_before: datetime
+) -> list[datetime]:
+    """Complete hours with metrics starting at the cursor (skipping empty hours)."""
+    hours: list[datetime] = []
+    while len(hours) < METRICS_ROLLUP_MAX_HOURS_PER_RUN:
+        statement = select(func.min(Metric.start_time)).where(
+            Metric.start_time < complete_before
+        )
+        if cursor is not None:
+            statement = statement.where(Metric.start_time >= cursor)
+        next_start_time = await session.scalar(statement)
+        if next_start_time is None:
+            break
+        hour = floor_time(next_start_time, HOUR)
+        hours.append(hour)
+        cursor = hour + HOUR
+    return hours
+
+
+async def rollup_metrics() -> None:
+    """Scheduler job entry point: roll up new hours and re-roll updated hours."""
+    if not METRICS_ROLLUP_ENABLED:
+        return
+
+    from core.config.app import alchemy
+
+    rolled_at = datetime.now(timezone.utc)
+
+    async with alchemy.get_session() as session:
+        if not await session.scalar(ROLLUP_LOCK_SQL):
+            logger.debug("Metrics rollup is already running in another worker")
+            return
+
+        rolled_through, last_rolled_at = (
+            await session.execute(
+                select(
+                    func.max(MetricRollup.bucket_start),
+                    func.max(MetricRollup.updated_at),
+                ).where(MetricRollup.granularity == "hour")
+            )
+        ).one()
+
+        hours: set[datetime] = set()
+        cursor = None
+        if rolled_through is not None:
+            cursor = as_utc(rolled_through) + HOUR
+            result = await session.execute(
+                UPDATED_HOURS_SQL,
+                {"since": last_rolled_at - ROLLUP_OVERLAP, "rolled_through": cursor},
+            )
+            hours.update(as_utc(hour) for hour in result.scalars())
+        hours.update(await _get_new_hours(session, cursor, floor_time(rolled_at, HOUR)))
+
+        days: set[datetime] = set()
+        for hour in sorted(hours):
+            await _rollup_hour(session, hour, rolled_at)
+            days.add(floor_time(hour, DAY))
+
+        for day in sorted(days):
+            await _rollup_day(session, day, rolled_at)
+
+        await session.commit()
+
+    if hours:
+        logger.info("Rolled up metrics of %d hours (%d days)", len(hours), len(days))
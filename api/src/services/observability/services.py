@@ -1,11 +1,8 @@
-import csv
-import json
+from collections.abc import AsyncIterable, AsyncIterator, Callable
 from datetime import datetime
-from io import StringIO
 from logging import getLogger
 from typing import Any
 
-import aiofiles
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -14,6 +11,8 @@ from sqlalchemy.orm.attributes import flag_modified
 
 from core.db.models.metric.metric import Metric
 from services.common.models import EmptyDictionary
+from services.observability import rollups
+from services.observability.export import stream_csv, stream_json, stream_xlsx
 from services.observability.models import (
     AgentMetricSummary,
     AnswerFeedbackSummary,
@@ -41,6 +40,9 @@ logger = getLogger(__name__)
 
 OBSERVABILITY_USAGE_SHOW_USERS = get_observability_settings().USAGE_SHOW_USERS
 
+# Rows fetched per round trip by streamed exports
+METRICS_EXPORT_BATCH_SIZE = 1000
+
 
 def _build_where_clause(filters: FilterObject | None) -> tuple[str, dict]:
     """Build WHERE clause and parameters from filters"""
@@ -191,6 +193,75 @@ def _get_field_expression(key: str) -> str:
     return key
 
 
+RAG_TOOL_SUMMARY_FILTER = {
+    "feature_type": {"$eq": "rag-tool"},
+    "status": {"$eq": "success"},
+    "channel": {"$eq": "production"},
+}
+LLM_SUMMARY_FILTER = {
+    "feature_type": {
+        "$in": [
+            "prompt-template",
+            "chat-completion-api",
+            "embedding-api",
+            "reranking-api",
+        ]
+    },
+}
+AGENT_SUMMARY_FILTER = {
+    "feature_type": {"$eq": "agent"},
+    "status": {"$eq": "success"},
+}
+
+
+async def _get_rollup_aggregate(
+    db_session: AsyncSession, base_filter: dict, filters: FilterObject | None
+) -> rollups.MetricsAggregate | None:
+    """Aggregate metrics from rollups plus the raw rows that are not rolled up yet.
+
+    Returns None when rollups cannot answer the filters (fields other than the
+    rollup dimensions and start_time) or are not available; callers then aggregate
+    raw metrics.
+    """
+    if not rollups.METRICS_ROLLUP_ENABLED:
+        return None
+
+    filter_dict = base_filter
+    if filters:
+        filter_dict = {
+            "$and": [base_filter, filters.model_dump(exclude_none=True, by_alias=True)]
+        }
+
+    split_filter = rollups.split_rollup_filter(filter_dict)
+    if split_filter is None:
+        return None
+    dimension_filter, lower, upper = split_filter
+
+    window = await rollups.get_rollup_window(db_session, lower, upper)
+    if window is None:
+        return None
+
+    where_clause, params = _build_conditions(filter_dict)
+    unrolled = await rollups.aggregate_unrolled_metrics(
+        db_session, where_clause, params, window
+    )
+    if unrolled is None:
+        return None
+
+    dimension_where, dimension_params = _build_conditions(dimension_filter)
+    aggregate = await rollups.load_rollups(
+        db_session, dimension_where, dimension_params, window
+    )
+    aggregate.merge(unrolled)
+    return aggregate
+
+
+def _to_breakdown(
+    items: list[tuple[str | None, int]],
+) -> list[MetricsSummaryBreakdown]:
+    return [MetricsSummaryBreakdown(name=name, count=count) for name, count in items]
+
+
 async def get_options_rag(
     db_session: AsyncSession, filters: FilterObject | None
 ) -> OptionsRagResponse:
@@ -387,7 +458,42 @@ async def summarize_rag_tool_metrics(
     db_session: AsyncSession,
     filters: FilterObject | None,
 ) -> RagMetricsSummary | EmptyDictionary:
-    """Summarize RAG tool metrics using raw SQL"""
+    """Summarize RAG tool metrics from rollups, or using raw SQL"""
+    aggregate = await _get_rollup_aggregate(
+        db_session, RAG_TOOL_SUMMARY_FILTER, filters
+    )
+    if aggregate is not None:
+        if aggregate.call_count == 0:
+            return EmptyDictionary()
+        return RagMetricsSummary(
+            total_calls=aggregate.call_count,
+            avg_latency=aggregate.avg_latency or 0.0,
+            avg_cost=aggregate.avg_cost or 0.0,
+            total_cost=aggregate.total_cost or 0.0,
+            unique_user_count=aggregate.unique_user_count,
+            resolution_summary=ResolutionSummary(
+                breakdown=_to_breakdown(aggregate.breakdown("is_answered")),
+            ),
+            topic_summary=TopicSummary(
+                breakdown=_to_breakdown(aggregate.breakdown("topic")),
+            ),
+            answer_summary=AnswerSummary(
+                feedback=AnswerFeedbackSummary(
+                    breakdown=_to_breakdown(
+                        [
+                            item
+                            for item in aggregate.breakdown("answer_feedback_type")
+                            if item[0] is not None
+                        ]
+                    ),
+                ),
+                copy_rate=(aggregate.total("answer_copy") / aggregate.call_count) * 100,
+            ),
+            language_summary=LanguageSummary(
+                breakdown=_to_breakdown(aggregate.breakdown("language")),
+            ),
+        )
+
     where_clause, params = _build_where_clause(filters)
 
     base_condition = (
@@ -527,7 +633,20 @@ async def summarize_llm_metrics(
     db_session: AsyncSession,
     filters: FilterObject | None,
 ) -> LlmMetricsSummary | EmptyDictionary:
-    """Summarize LLM metrics using raw SQL"""
+    """Summarize LLM metrics from rollups, or using raw SQL"""
+    aggregate = await _get_rollup_aggregate(db_session, LLM_SUMMARY_FILTER, filters)
+    if aggregate is not None:
+        if aggregate.call_count == 0:
+            return EmptyDictionary()
+        return LlmMetricsSummary(
+            total_calls=aggregate.call_count,
+            avg_latency=aggregate.avg_latency or 0.0,
+            avg_cost=aggregate.avg_cost or 0.0,
+            total_cost=aggregate.total_cost or 0.0,
+            unique_user_count=aggregate.unique_user_count,
+            error_rate=(aggregate.error_count / aggregate.call_count) * 100,
+        )
+
     where_clause, params = _build_where_clause(filters)
 
     base_condition = "feature_type IN ('prompt-template', 'chat-completion-api', 'embedding-api', 'reranking-api')"
@@ -572,7 +691,50 @@ async def summarize_agent_metrics(
     db_session: AsyncSession,
     filters: FilterObject | None,
 ) -> AgentMetricSummary | EmptyDictionary:
-    """Summarize Agent metrics using raw SQL"""
+    """Summarize Agent metrics from rollups, or using raw SQL"""
+    aggregate = await _get_rollup_aggregate(db_session, AGENT_SUMMARY_FILTER, filters)
+    if aggregate is not None:
+        if aggregate.call_count == 0:
+            return EmptyDictionary()
+        return AgentMetricSummary(
+            total_conversations=aggregate.call_count,
+            avg_duration=float(aggregate.avg_latency or 0.0),
+            avg_tool_call_latency=float(
+                aggregate.average("avg_tool_call_latency") or 0.0
+            ),
+            avg_cost=float(aggregate.avg_cost or 0.0),
+            total_cost=float(aggregate.total_cost or 0.0),
+            unique_user_count=aggregate.unique_user_count,
+            feedback_rate=aggregate.total("feedback_given") / aggregate.call_count,
+            copy_rate=aggregate.total("answer_copy") / aggregate.call_count,
+            avg_messages_count=float(aggregate.average("messages_count") or 0.0),
+            resolution_summary=ResolutionSummary(
+                breakdown=_to_breakdown(aggregate.breakdown("resolution_status")),
+            ),
+            channel_summary=ChannelSummary(
+                breakdown=_to_breakdown(aggregate.breakdown("channel")),
+            ),
+            sentiment_summary=SentimentSummary(
+                breakdown=_to_breakdown(aggregate.breakdown("sentiment")),
+            ),
+            topics_summary=TopicSummary(
+                breakdown=_to_breakdown(aggregate.breakdown("conversation_topics")),
+            ),
+            feedback_summary=AnswerFeedbackSummary(
+                breakdown=[
+                    MetricsSummaryBreakdown(
+                        name="likes", count=int(aggregate.total("likes"))
+                    ),
+                    MetricsSummaryBreakdown(
+                        name="dislikes", count=int(aggregate.total("dislikes"))
+                    ),
+                ],
+            ),
+            language_summary=LanguageSummary(
+                breakdown=_to_breakdown(aggregate.breakdown("conversation_language")),
+            ),
+        )
+
     where_clause, params = _build_where_clause(filters)
 
     base_condition = "feature_type = 'agent' AND status = 'success'"
@@ -887,12 +1049,11 @@ async def get_top_metrics_rag(
     return metrics
 
 
-async def get_metrics_by_feature_type(
-    db_session: AsyncSession,
+def _build_metrics_list_query(
     feature_types: list[FeatureType] | FeatureType,
     data: OffsetPaginationRequest | None,
-) -> MetricsQueryResult:
-    """Get metrics by feature type using raw SQL"""
+) -> tuple[str, str, dict, int, int]:
+    """Build the WHERE and ORDER BY clauses, parameters, limit and offset of a metrics list"""
     # Handle pagination parameters
     if data is not None and getattr(data, "filters", None) is not None:
         filters = data.filters
@@ -934,21 +1095,15 @@ async def get_metrics_by_feature_type(
         feature_condition = "1=1"
 
     full_where = f"WHERE {feature_condition}{where_clause}"
+    return full_where, f"ORDER BY {sort} {order}", params, limit, skip
 
-    # Get count for pagination
-    count_sql = f"""
-        SELECT COUNT(*) as total_count
-        FROM metrics 
-        {full_where}
-    """
-
-    count_result = await db_session.execute(text(count_sql), params)
-    total_count = count_result.scalar()
 
-    # Get metrics with pagination
+def _build_metrics_list_sql(
+    full_where: str, order_by: str, limit: int, skip: int
+) -> str:
     user_id_field = "user_id," if OBSERVABILITY_USAGE_SHOW_USERS else ""
 
-    metrics_sql = f"""
+    return f"""
         SELECT 
             id,
             feature_name,
@@ -975,44 +1130,68 @@ async def get_metrics_by_feature_type(
             updated_at
         FROM metrics 
         {full_where}
-        ORDER BY {sort} {order}
+        {order_by}
         LIMIT {limit} OFFSET {skip}
     """
 
-    result = await db_session.execute(text(metrics_sql), params)
 
+def _to_metrics_item(row) -> MetricsItem:
     # Convert to dict format for compatibility
-    items = []
-    for row in result.fetchall():
-        item = {
-            "_id": row.id,
-            "name": row.feature_name,
-            "feature_id": row.feature_id,
-            "feature_name": row.feature_name,
-            "feature_system_name": row.feature_system_name,
-            "feature_type": row.feature_type,
-            "feature_variant": row.feature_variant,
-            "variant": row.feature_variant,
-            "status": row.status,
-            "start_time": row.start_time,
-            "end_time": row.end_time,
-            "channel": row.channel,
-            "source": row.source,
-            "latency": row.latency,
-            "extra_data": row.extra_data or {},
-            "conversation_id": row.conversation_id,
-            "conversation_data": row.conversation_data or {},
-            "trace_id": row.trace_id,
-            "cost": row.cost,
-            "consumer_name": row.consumer_name,
-            "consumer_type": row.consumer_type,
-            "x_attributes": row.x_attributes or {},
-        }
+    item = {
+        "_id": row.id,
+        "name": row.feature_name,
+        "feature_id": row.feature_id,
+        "feature_name": row.feature_name,
+        "feature_system_name": row.feature_system_name,
+        "feature_type": row.feature_type,
+        "feature_variant": row.feature_variant,
+        "variant": row.feature_variant,
+        "status": row.status,
+        "start_time": row.start_time,
+        "end_time": row.end_time,
+        "channel": row.channel,
+        "source": row.source,
+        "latency": row.latency,
+        "extra_data": row.extra_data or {},
+        "conversation_id": row.conversation_id,
+        "conversation_data": row.conversation_data or {},
+        "trace_id": row.trace_id,
+        "cost": row.cost,
+        "consumer_name": row.consumer_name,
+        "consumer_type": row.consumer_type,
+        "x_attributes": row.x_attributes or {},
+    }
+
+    if OBSERVABILITY_USAGE_SHOW_USERS:
+        item["user_id"] = row.user_id
+
+    return item
+
+
+async def get_metrics_by_feature_type(
+    db_session: AsyncSession,
+    feature_types: list[FeatureType] | FeatureType,
+    data: OffsetPaginationRequest | None,
+) -> MetricsQueryResult:
+    """Get metrics by feature type using raw SQL"""
+    full_where, order_by, params, limit, skip = _build_metrics_list_query(
+        feature_types, data
+    )
 
-        if OBSERVABILITY_USAGE_SHOW_USERS:
-            item["user_id"] = row.user_id
+    # Get count for pagination
+    count_sql = f"""
+        SELECT COUNT(*) as total_count
+        FROM metrics 
+        {full_where}
+    """
+
+    count_result = await db_session.execute(text(count_sql), params)
+    total_count = count_result.scalar()
 
-        items.append(item)
+    # Get metrics with pagination
+    metrics_sql = _build_metrics_list_sql(full_where, order_by, limit, skip)
+    result = await db_session.execute(text(metrics_sql), params)
+    items = [_to_metrics_item(row) for row in result.fetchall()]
 
     return {
         "items": items,
@@ -1022,6 +1201,31 @@ async def get_metrics_by_feature_type(
     }
 
 
+async def stream_metrics_by_feature_type(
+    feature_types: list[FeatureType] | FeatureType,
+    data: OffsetPaginationRequest | None,
+) -> AsyncIterator[MetricsItem]:
+    """Yield the metrics of a list request, read in batches with a server-side cursor.
+
+    Opens its own session: streamed responses outlive the request's session.
+    """
+    from core.config.app import alchemy
+
+    full_where, order_by, params, limit, skip = _build_metrics_list_query(
+        feature_types, data
+    )
+    metrics_sql = _build_metrics_list_sql(full_where, order_by, limit, skip)
+
+    async with alchemy.get_session() as session:
+        result = await session.stream(
+            text(metrics_sql).execution_options(yield_per=METRICS_EXPORT_BATCH_SIZE),
+            params,
+        )
+        async for rows in result.partitions():
+            for row in rows:
+                yield _to_metrics_item(row)
+
+
 async def update_analytics_extra_data(
     db_session: AsyncSession,
     analytics_id: str,
@@ -1236,324 +1440,200 @@ async def get_analytics_by_id(
         return None
 
 
-# Export functions remain the same as they work with the dict format returned by get_metrics_by_feature_type
-async def create_file_with_rag_metrics_for_export(
-    metrics: list[MetricsItem],
-    format: str = "csv",
-) -> str:
-    """Create file with RAG metrics for export - same implementation as original"""
-    if format == "csv":
-        output = StringIO()
-        writer = csv.DictWriter(
-            output,
-            fieldnames=[
-                "name",
-                "variant",
-                "consumer_type",
-                "consumer_name",
-                "start_time",
-                "end_time",
-                "latency",
-                "cost",
-                "question",
-                "question_topic",
-                "answer",
-                "is_answered",
-                "answer_feedback_type",
-                "answer_feedback_reason",
-                "answer_feedback_comment",
-                "answer_copied",
-                "language",
-                "organization",
-                "substandart_result_reason",
-                "substandart_result_comment",
-                *(["user_id"] if OBSERVABILITY_USAGE_SHOW_USERS else []),
-            ],
-        )
-        writer.writeheader()
-
-        for item in metrics:
-            writer.writerow(
-                {
-                    "name": item["feature_system_name"],
-                    "variant": item.get("variant"),
-                    "consumer_type": item.get("consumer_type"),
-                    "consumer_name": item.get("consumer_name"),
-                    "start_time": item["start_time"].strftime("%Y-%m-%d %H:%M:%S")
-                    if item["start_time"]
-                    else None,
-                    "end_time": item["end_time"].strftime("%Y-%m-%d %H:%M:%S")
-                    if item["end_time"]
-                    else None,
-                    "latency": item["latency"],
-                    "cost": item["cost"],
-                    "question": item.get("extra_data", {}).get("question"),
-                    "question_topic": item.get("extra_data", {}).get("topic"),
-                    "answer": item.get("extra_data", {}).get("answer"),
-                    "is_answered": item.get("extra_data", {}).get("is_answered"),
-                    "answer_feedback_type": item.get("extra_data", {})
-                    .get("answer_feedback", {})
-                    .get("type"),
-                    "answer_feedback_reason": item.get("extra_data", {})
-                    .get("answer_feedback", {})
-                    .get("reason"),
-                    "answer_feedback_comment": item.get("extra_data", {})
-                    .get("answer_feedback", {})
-                    .get("comment"),
-                    "answer_copied": (item.get("extra_data") or {}).get("answer_copy")
-                    or False,
-                    "language": item.get("extra_data", {}).get("language"),
-                    "organization": (item.get("x_attributes") or {}).get("org-id"),
-                    "substandart_result_reason": item.get("extra_data", {}).get(
-                        "substandart_result_reason"
-                    ),
-                    "substandart_result_comment": item.get("extra_data", {}).get(
-                        "comment"
-                    ),
-                    **(
-                        {"user_id": item.get("user_id")}
-                        if OBSERVABILITY_USAGE_SHOW_USERS
-                        else {}
-                    ),
+# Metrics exports stream the metric rows of a filter as CSV, JSON or XLSX records
+RAG_METRICS_EXPORT_FIELDS = [
+    "name",
+    "variant",
+    "consumer_type",
+    "consumer_name",
+    "start_time",
+    "end_time",
+    "latency",
+    "cost",
+    "question",
+    "question_topic",
+    "answer",
+    "is_answered",
+    "answer_feedback_type",
+    "answer_feedback_reason",
+    "answer_feedback_comment",
+    "answer_copied",
+    "language",
+    "organization",
+    "substandart_result_reason",
+    "substandart_result_comment",
+    *(["user_id"] if OBSERVABILITY_USAGE_SHOW_USERS else []),
+]
+
+AGENT_METRICS_EXPORT_FIELDS = [
+    "name",
+    "variant",
+    "consumer_type",
+    "consumer_name",
+    "start_time",
+    "end_time",
+    "status",
+    "avg_latency",
+    "total_cost",
+    "agent_topics",
+    "resolution_status",
+    "total_likes",
+    "total_dislikes",
+    "avg_response_time",
+    "answer_copied",
+    "language",
+    "sentiment",
+    "substandart_result_reason",
+    "substandart_result_comment",
+    "organization",
+    *(["user_id"] if OBSERVABILITY_USAGE_SHOW_USERS else []),
+    "conversation_id",
+]
+
+
+def _format_export_time(value: datetime | None) -> str | None:
+    return value.strftime("%Y-%m-%d %H:%M:%S") if value else None
+
+
+def _to_rag_metrics_export_record(item: MetricsItem, format: str) -> dict:
+    """Export record of a RAG metric (nested in JSON, flat in CSV / XLSX)"""
+    extra_data = item.get("extra_data") or {}
+    answer_feedback = extra_data.get("answer_feedback", {})
+
+    record = {
+        "name": item["feature_system_name"],
+        "variant": item.get("variant"),
+        **(
+            {
+                "consumer": {
+                    "type": item.get("consumer_type"),
+                    "name": item.get("consumer_name"),
                 }
-            )
-
-        # Generate filename for rag metrics
-        filename = f"/tmp/rag_metrics_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+            }
+            if format == "json"
+            else {
+                "consumer_type": item.get("consumer_type"),
+                "consumer_name": item.get("consumer_name"),
+            }
+        ),
+        "start_time": _format_export_time(item["start_time"]),
+        "end_time": _format_export_time(item["end_time"]),
+        "latency": item["latency"],
+        "cost": item["cost"],
+        "question": extra_data.get("question"),
+        "question_topic": extra_data.get("topic"),
+        "answer": extra_data.get("answer"),
+        "is_answered": extra_data.get("is_answered"),
+        **(
+            {"answer_feedback": answer_feedback}
+            if format == "json"
+            else {
+                "answer_feedback_type": answer_feedback.get("type"),
+                "answer_feedback_reason": answer_feedback.get("reason"),
+                "answer_feedback_comment": answer_feedback.get("comment"),
+            }
+        ),
+        "answer_copied": extra_data.get("answer_copy") or False,
+        "language": extra_data.get("language"),
+        "organization": (item.get("x_attributes") or {}).get("org-id"),
+        "substandart_result_reason": extra_data.get("substandart_result_reason"),
+        "substandart_result_comment": extra_data.get("comment"),
+    }
+    if OBSERVABILITY_USAGE_SHOW_USERS:
+        record["user_id"] = item.get("user_id")
+    return record
 
-        # Write rag metrics to file
-        async with aiofiles.open(filename, "w", encoding="utf-8", newline="") as f:
-            await f.write(output.getvalue())
 
-        return filename
+def _to_agent_metrics_export_record(item: MetricsItem, format: str) -> dict:
+    """Export record of an Agent metric (nested in JSON, flat in CSV / XLSX)"""
+    extra_data = item.get("extra_data") or {}
+    conversation_data = item.get("conversation_data") or {}
 
-    if format == "json":
-        rag_metrics = []
-        for item in metrics:
-            rag_metrics.append(
-                {
-                    "name": item["feature_system_name"],
-                    "variant": item.get("variant"),
-                    "consumer": {
-                        "type": item.get("consumer_type"),
-                        "name": item.get("consumer_name"),
-                    },
-                    "start_time": item["start_time"].strftime("%Y-%m-%d %H:%M:%S")
-                    if item["start_time"]
-                    else None,
-                    "end_time": item["end_time"].strftime("%Y-%m-%d %H:%M:%S")
-                    if item["end_time"]
-                    else None,
-                    "latency": item["latency"],
-                    "cost": item["cost"],
-                    "question": item.get("extra_data", {}).get("question"),
-                    "question_topic": item.get("extra_data", {}).get("topic"),
-                    "answer": item.get("extra_data", {}).get("answer"),
-                    "is_answered": item.get("extra_data", {}).get("is_answered"),
-                    "answer_feedback": item.get("extra_data", {}).get(
-                        "answer_feedback",
-                        {},
-                    ),
-                    "answer_copied": (item.get("extra_data") or {}).get("answer_copy")
-                    or False,
-                    "language": item.get("extra_data", {}).get("language"),
-                    "organization": (item.get("x_attributes") or {}).get("org-id"),
-                    "substandart_result_reason": item.get("extra_data", {}).get(
-                        "substandart_result_reason"
-                    ),
-                    "substandart_result_comment": item.get("extra_data", {}).get(
-                        "comment"
-                    ),
-                    **(
-                        {"user_id": item.get("user_id")}
-                        if OBSERVABILITY_USAGE_SHOW_USERS
-                        else {}
-                    ),
+    record = {
+        "name": item["feature_system_name"],
+        "variant": item.get("variant"),
+        **(
+            {
+                "consumer": {
+                    "type": item.get("consumer_type"),
+                    "name": item.get("consumer_name"),
                 }
-            )
+            }
+            if format == "json"
+            else {
+                "consumer_type": item.get("consumer_type"),
+                "consumer_name": item.get("consumer_name"),
+            }
+        ),
+        "start_time": _format_export_time(item["start_time"]),
+        "end_time": _format_export_time(item["end_time"]),
+        "status": item.get("status"),
+        "avg_latency": conversation_data.get("avg_tool_call_latency"),
+        "total_cost": item.get("cost"),
+        "agent_topics": ",".join(conversation_data.get("topics") or []),
+        "resolution_status": conversation_data.get("resolution_status"),
+        "total_likes": conversation_data.get("likes"),
+        "total_dislikes": conversation_data.get("dislikes"),
+        "avg_response_time": conversation_data.get("avg_tool_call_latency"),
+        "answer_copied": extra_data.get("answer_copy") or False,
+        "language": conversation_data.get("language"),
+        "sentiment": conversation_data.get("sentiment"),
+        "substandart_result_reason": conversation_data.get("substandart_result_reason"),
+        "substandart_result_comment": conversation_data.get("comment"),
+        "organization": (item.get("x_attributes") or {}).get("org-id"),
+    }
+    if OBSERVABILITY_USAGE_SHOW_USERS:
+        record["user_id"] = item.get("user_id")
+    record["conversation_id"] = extra_data.get("conversation_id") or item.get(
+        "conversation_id"
+    )
+    return record
 
-        # Generate filename
-        filename = f"/tmp/rag_metrics_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
 
-        # Write export data to file
-        async with aiofiles.open(filename, "w", encoding="utf-8") as f:
-            await f.write(json.dumps(rag_metrics, indent=4))
+def _stream_metrics_export(
+    metrics: AsyncIterable[MetricsItem],
+    to_record: Callable[[MetricsItem, str], dict],
+    fieldnames: list[str],
+    sheet_title: str,
+    format: str,
+) -> AsyncIterator[bytes]:
+    async def records() -> AsyncIterator[dict]:
+        async for item in metrics:
+            yield to_record(item, format)
 
-        return filename
+    if format == "csv":
+        return stream_csv(records(), fieldnames)
+    if format == "json":
+        return stream_json(records())
+    if format == "xlsx":
+        return stream_xlsx(records(), fieldnames, sheet_title)
 
     raise Exception("Invalid export format")
 
 
-async def create_file_with_agent_metrics_for_export(
-    metrics: list[MetricsItem],
+def stream_rag_metrics_export(
+    metrics: AsyncIterable[MetricsItem],
     format: str = "csv",
-) -> str:
-    """Create file with Agent metrics for export - simplified version for SQL"""
-    # This is a simplified version - in a full implementation you would need to
-    # query the agent_conversations table as well
-    if format == "csv":
-        output = StringIO()
-        writer = csv.DictWriter(
-            output,
-            fieldnames=[
-                "name",
-                "variant",
-                "consumer_type",
-                "consumer_name",
-                "start_time",
-                "end_time",
-                "status",
-                "avg_latency",
-                "total_cost",
-                "agent_topics",
-                "resolution_status",
-                "total_likes",
-                "total_dislikes",
-                "avg_response_time",
-                "answer_copied",
-                "language",
-                "sentiment",
-                "substandart_result_reason",
-                "substandart_result_comment",
-                "organization",
-                *(["user_id"] if OBSERVABILITY_USAGE_SHOW_USERS else []),
-                "conversation_id",
-            ],
-        )
-        writer.writeheader()
-
-        for item in metrics:
-            conversation_id = (item.get("extra_data") or {}).get(
-                "conversation_id"
-            ) or item.get("conversation_id")
-
-            writer.writerow(
-                {
-                    "name": item["feature_system_name"],
-                    "variant": item.get("variant"),
-                    "consumer_type": item.get("consumer_type"),
-                    "consumer_name": item.get("consumer_name"),
-                    "start_time": item["start_time"].strftime("%Y-%m-%d %H:%M:%S")
-                    if item["start_time"]
-                    else None,
-                    "end_time": item["end_time"].strftime("%Y-%m-%d %H:%M:%S")
-                    if item["end_time"]
-                    else None,
-                    "status": item.get("status"),
-                    "avg_latency": item.get("conversation_data", {}).get(
-                        "avg_tool_call_latency"
-                    ),
-                    "total_cost": item.get("cost"),
-                    "agent_topics": ",".join(
-                        (item.get("conversation_data") or {}).get("topics") or []
-                    ),
-                    "resolution_status": item.get("conversation_data", {}).get(
-                        "resolution_status",
-                    ),
-                    "total_likes": item.get("conversation_data", {}).get("likes"),
-                    "total_dislikes": item.get("conversation_data", {}).get("dislikes"),
-                    "avg_response_time": item.get("conversation_data", {}).get(
-                        "avg_tool_call_latency"
-                    ),
-                    "answer_copied": (item.get("extra_data") or {}).get("answer_copy")
-                    or False,
-                    "language": item.get("conversation_data", {}).get("language"),
-                    "sentiment": item.get("conversation_data", {}).get("sentiment"),
-                    "substandart_result_reason": item.get("conversation_data", {}).get(
-                        "substandart_result_reason"
-                    ),
-                    "substandart_result_comment": item.get("conversation_data", {}).get(
-                        "comment"
-                    ),
-                    "organization": (item.get("x_attributes") or {}).get("org-id"),
-                    **(
-                        {"user_id": item.get("user_id")}
-                        if OBSERVABILITY_USAGE_SHOW_USERS
-                        else {}
-                    ),
-                    "conversation_id": conversation_id,
-                },
-            )
-
-        # Generate filename for agent metrics
-        agent_data_filename = (
-            f"/tmp/agent_metrics_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        )
-
-        # Write agent metrics to file
-        async with aiofiles.open(
-            agent_data_filename, "w", encoding="utf-8", newline=""
-        ) as f:
-            await f.write(output.getvalue())
-
-        return agent_data_filename
-
-    if format == "json":
-        agent_metrics = []
-        for item in metrics:
-            conversation_id = (item.get("extra_data") or {}).get(
-                "conversation_id"
-            ) or item.get("conversation_id")
-
-            agent_metrics.append(
-                {
-                    "name": item["feature_system_name"],
-                    "variant": item.get("variant"),
-                    "consumer": {
-                        "type": item.get("consumer_type"),
-                        "name": item.get("consumer_name"),
-                    },
-                    "start_time": item["start_time"].strftime("%Y-%m-%d %H:%M:%S")
-                    if item["start_time"]
-                    else None,
-                    "end_time": item["end_time"].strftime("%Y-%m-%d %H:%M:%S")
-                    if item["end_time"]
-                    else None,
-                    "status": item.get("status"),
-                    "avg_latency": item.get("conversation_data", {}).get(
-                        "avg_tool_call_latency"
-                    ),
-                    "total_cost": item.get("cost"),
-                    "agent_topics": ",".join(
-                        (item.get("conversation_data") or {}).get("topics") or []
-                    ),
-                    "resolution_status": item.get("conversation_data", {}).get(
-                        "resolution_status",
-                    ),
-                    "total_likes": item.get("conversation_data", {}).get("likes"),
-                    "total_dislikes": item.get("conversation_data", {}).get("dislikes"),
-                    "avg_response_time": item.get("conversation_data", {}).get(
-                        "avg_tool_call_latency"
-                    ),
-                    "answer_copied": (item.get("extra_data") or {}).get("answer_copy")
-                    or False,
-                    "language": item.get("conversation_data", {}).get("language"),
-                    "sentiment": item.get("conversation_data", {}).get("sentiment"),
-                    "substandart_result_reason": item.get("conversation_data", {}).get(
-                        "substandart_result_reason"
-                    ),
-                    "substandart_result_comment": item.get("conversation_data", {}).get(
-                        "comment"
-                    ),
-                    "organization": (item.get("x_attributes") or {}).get("org-id"),
-                    **(
-                        {"user_id": item.get("user_id")}
-                        if OBSERVABILITY_USAGE_SHOW_USERS
-                        else {}
-                    ),
-                    "conversation_id": conversation_id,
-                },
-            )
-
-        # Generate filename
-        agent_data_filename = (
-            f"/tmp/agent_metrics_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        )
-
-        # Write export data to file
-        async with aiofiles.open(agent_data_filename, "w", encoding="utf-8") as f:
-            await f.write(json.dumps(agent_metrics, indent=4))
+) -> AsyncIterator[bytes]:
+    """Encode RAG metrics for export as a stream of CSV, JSON or XLSX chunks"""
+    return _stream_metrics_export(
+        metrics,
+        _to_rag_metrics_export_record,
+        RAG_METRICS_EXPORT_FIELDS,
+        "RAG metrics",
+        format,
+    )
 
-        return agent_data_filename
 
-    raise Exception("Invalid export format")
+def stream_agent_metrics_export(
+    metrics: AsyncIterable[MetricsItem],
+    format: str = "csv",
+) -> AsyncIterator[bytes]:
+    """Encode Agent metrics for export as a stream of CSV, JSON or XLSX chunks"""
+    return _stream_metrics_export(
+        metrics,
+        _to_agent_metrics_export_record,
+        AGENT_METRICS_EXPORT_FIELDS,
+        "Agent metrics",
+        format,
+    )
@@ -1,6 +1,13 @@
 from .services import (
     execute_rag_tool,
     get_rag_by_system_name_flat,
+    stream_rag_tool,
+    stream_rag_tool_execution,
 )
 
-__all__ = ["execute_rag_tool", "get_rag_by_system_name_flat"]
+__all__ = [
+    "execute_rag_tool",
+    "get_rag_by_system_name_flat",
+    "stream_rag_tool",
+    "stream_rag_tool_execution",
+]
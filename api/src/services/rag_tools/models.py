@@ -1,3 +1,5 @@
+from enum import StrEnum
+
 from pydantic import BaseModel
 
 
@@ -13,6 +15,37 @@ class RagToolTestResult(BaseModel):
     analytics_id: str | None = None
 
 
+class RagToolStreamEventType(StrEnum):
+    RESULTS = "results"
+    ANSWER_DELTA = "answer_delta"
+    ANSWER = "answer"
+    ERROR = "error"
+
+
+class RagToolStreamResults(BaseModel):
+    results: list
+    trace_id: str | None = None
+    analytics_id: str | None = None
+
+
+class RagToolStreamAnswerDelta(BaseModel):
+    content: str
+
+
+class RagToolStreamError(BaseModel):
+    message: str
+
+
+class RagToolStreamEvent(BaseModel):
+    event: RagToolStreamEventType
+    data: (
+        RagToolStreamResults
+        | RagToolStreamAnswerDelta
+        | RagToolTestResult
+        | RagToolStreamError
+    )
+
+
 class MultilanguageContext(BaseModel):
     user_message_language: str
     user_message_original: str
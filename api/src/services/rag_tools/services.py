@@ -1,13 +1,19 @@
+import asyncio
 import json
 import os
+from collections.abc import AsyncIterator, Awaitable, Callable
 from logging import getLogger
 
+from litestar.connection import Request
+from litestar.response import ServerSentEvent, ServerSentEventMessage
+
 from open_ai.utils_new import create_chat_completion_from_prompt_template
 from prompt_templates.prompt_templates import (
     get_prompt_template_by_system_name_flat,
     transform_to_flat,
 )
-from services.generate import generate
+from services.config_cache import ConfigNamespace, config_cache
+from services.generate import _convert_scores_to_float, generate, generate_stream
 from services.language import (
     TextTranslation,
     detect_language_and_translate_text,
@@ -15,8 +21,14 @@ from services.language import (
 )
 from services.observability import observability_context, observe
 from services.observability.models import FeatureType, ObservedFeature
+from services.observability.utils import extract_x_attributes_from_request
 from services.rag_tools.models import (
     MultilanguageContext,
+    RagToolStreamAnswerDelta,
+    RagToolStreamError,
+    RagToolStreamEvent,
+    RagToolStreamEventType,
+    RagToolStreamResults,
     RagToolTestResult,
     RagToolTestResultVerboseDetails,
 )
@@ -34,6 +46,10 @@ from validation.rag_tools import (
 env = os.environ
 logger = getLogger(__name__)
 
+# Keeps references to the executions of streamed RAG tool calls, which continue
+# with post-processing after their stream is closed
+_stream_tasks: set[asyncio.Task] = set()
+
 
 async def execute_rag_tool(
     *,
@@ -42,7 +58,13 @@ async def execute_rag_tool(
     metadata_filter: FilterObject | None = None,
     config_override: RagToolsBase | None = None,
     verbose: bool = False,
+    on_event: Callable[[RagToolStreamEvent], None] | None = None,
 ) -> RagToolTestResult:
+    """Retrieve, generate and post-process the answer of a RAG tool.
+
+    When `on_event` is given, the retrieval results and the answer deltas are
+    emitted as they are available, and the result is emitted before post-processing.
+    """
     # Get RAG Tool config
     if isinstance(system_name_or_config, str):
         rag_tool_config = await get_rag_by_system_name_flat(system_name_or_config)
@@ -112,14 +134,47 @@ async def execute_rag_tool(
                 top_n=retrieve_config.max_chunks_retrieved,
             )
 
+        if on_event:
+            _convert_scores_to_float(results)
+            on_event(
+                RagToolStreamEvent(
+                    event=RagToolStreamEventType.RESULTS,
+                    data=RagToolStreamResults(
+                        results=results,
+                        trace_id=observability_context.get_current_trace_id(),
+                        analytics_id=instance_id,
+                    ),
+                )
+            )
+
         # Step 2: Generate
-        generate_result = await generate(
-            user_message,
-            results,
-            retrieve_config.chunk_context_window_expansion_size,
-            generate_config.prompt_template,
-        )
-        answer = generate_result.answer
+        # The answer must be translated before it is shown, so it is only streamed
+        # when multilanguage support is not active
+        if on_event and not multilanguage_context:
+            generate_result = await generate_stream(
+                user_message,
+                results,
+                retrieve_config.chunk_context_window_expansion_size,
+                generate_config.prompt_template,
+            )
+            answer_parts = []
+            async for delta in generate_result.answer_deltas:
+                answer_parts.append(delta)
+                on_event(
+                    RagToolStreamEvent(
+                        event=RagToolStreamEventType.ANSWER_DELTA,
+                        data=RagToolStreamAnswerDelta(content=delta),
+                    )
+                )
+            answer = "".join(answer_parts)
+        else:
+            generate_result = await generate(
+                user_message,
+                results,
+                retrieve_config.chunk_context_window_expansion_size,
+                generate_config.prompt_template,
+            )
+            answer = generate_result.answer
 
         # TODO - refactor
         if multilanguage_context:
@@ -131,6 +186,37 @@ async def execute_rag_tool(
             )
             answer = answer_translation
 
+            if on_event:
+                on_event(
+                    RagToolStreamEvent(
+                        event=RagToolStreamEventType.ANSWER_DELTA,
+                        data=RagToolStreamAnswerDelta(content=answer),
+                    )
+                )
+
+        verbose_details = (
+            RagToolTestResultVerboseDetails(
+                resulting_prompt=generate_result.resulting_prompt,
+            )
+            if verbose
+            else None
+        )
+
+        rag_tool_result = RagToolTestResult(
+            answer=answer,
+            results=results,
+            verbose_details=verbose_details,
+            trace_id=observability_context.get_current_trace_id(),
+            analytics_id=instance_id,
+        )
+
+        if on_event:
+            on_event(
+                RagToolStreamEvent(
+                    event=RagToolStreamEventType.ANSWER, data=rag_tool_result
+                )
+            )
+
         # Step 3: Post-process
         if post_process_config and post_process_config.enabled:
             post_process_result = await _post_process(
@@ -141,14 +227,6 @@ async def execute_rag_tool(
             observability_context.update_current_span(extra_data=post_process_result)
 
         # Step 5: Return the response
-        verbose_details = (
-            RagToolTestResultVerboseDetails(
-                resulting_prompt=generate_result.resulting_prompt,
-            )
-            if verbose
-            else None
-        )
-
         observability_context.update_current_span(extra_data={"answer": answer})
 
         # Update trace metadata
@@ -156,14 +234,91 @@ async def execute_rag_tool(
             extra_data={"chunks_retrieved": len(results), "answer": answer}
         )
 
-        return RagToolTestResult(
-            answer=answer,
-            results=results,
-            verbose_details=verbose_details,
-            trace_id=observability_context.get_current_trace_id(),
-            analytics_id=instance_id,
+        return rag_tool_result
+
+
+def stream_rag_tool(
+    execute: Callable[[Callable[[RagToolStreamEvent], None]], Awaitable[object]],
+) -> AsyncIterator[ServerSentEventMessage]:
+    """Start a RAG tool execution and return its events as server-sent events.
+
+    `execute` is called with the event callback to pass to `execute_rag_tool`. It
+    runs in a separate task, so the stream can be closed after the answer event
+    while the execution continues with post-processing, and a client disconnect
+    does not cancel it.
+    """
+    events: asyncio.Queue[RagToolStreamEvent | None] = asyncio.Queue()
+
+    async def run() -> None:
+        try:
+            await execute(events.put_nowait)
+        except Exception as err:
+            logger.exception("Failed to execute streamed RAG tool: %s", err)
+            events.put_nowait(
+                RagToolStreamEvent(
+                    event=RagToolStreamEventType.ERROR,
+                    data=RagToolStreamError(message="Failed to execute RAG tool"),
+                )
+            )
+        finally:
+            events.put_nowait(None)
+
+    task = asyncio.create_task(run())
+    _stream_tasks.add(task)
+    task.add_done_callback(_stream_tasks.discard)
+
+    async def messages() -> AsyncIterator[ServerSentEventMessage]:
+        while (event := await events.get()) is not None:
+            yield ServerSentEventMessage(
+                event=event.event.value, data=event.data.model_dump_json()
+            )
+            if event.event in (
+                RagToolStreamEventType.ANSWER,
+                RagToolStreamEventType.ERROR,
+            ):
+                return
+
+    return messages()
+
+
+def stream_rag_tool_execution(
+    *,
+    rag_tool_config: dict,
+    user_message: str,
+    user_id: str | None,
+    request: Request,
+    metadata_filter: FilterObject | None = None,
+    default_source: str | None = None,
+) -> ServerSentEvent:
+    """Execute a RAG tool in production channel as a server-sent event response."""
+
+    # Observed here instead of on the route, the trace lasts until the answer is generated
+    @observe(name="Executing RAG Tool", channel="production")
+    async def execute(on_event):
+        observability_context.update_current_baggage(
+            source=request.headers.get("x-source") or default_source,
+            consumer_type=request.headers.get("x-consumer-type") or "rag",
+            consumer_name=(
+                request.headers.get("x-consumer-name")
+                or rag_tool_config.get("system_name")
+            ),
+            user_id=user_id,
+            x_attributes=extract_x_attributes_from_request((request,), {}),
+        )
+
+        observability_context.update_current_trace(
+            name=rag_tool_config.get("name"), type="rag", user_id=user_id
+        )
+
+        return await execute_rag_tool(
+            system_name_or_config=rag_tool_config,
+            user_message=user_message,
+            metadata_filter=metadata_filter,
+            on_event=on_event,
         )
 
+    return ServerSentEvent(stream_rag_tool(execute))
+
 
 async def create_multilanguage_context(
     user_message: str,
@@ -205,6 +360,15 @@ async def get_rag_by_system_name_flat(
     system_name: str,
     variant: str | None = None,
 ) -> dict:
+    config = await config_cache.get_or_load(
+        ConfigNamespace.RAG_TOOLS,
+        system_name,
+        lambda: _load_rag_by_system_name(system_name),
+    )
+    return transform_to_flat(config, variant)
+
+
+async def _load_rag_by_system_name(system_name: str) -> dict:
     try:
         from core.config.app import alchemy
         from core.domain.rag_tools.schemas import RagTool
@@ -213,14 +377,12 @@ async def get_rag_by_system_name_flat(
         async with alchemy.get_session() as session:
             service = RagToolsService(session=session)
             rag_tool = await service.get_one_or_none(system_name=system_name)
-            print(rag_tool)
             if not rag_tool:
                 raise LookupError(
                     f"RAG Tool with system name '{system_name}' not found"
                 )
             config = service.to_schema(rag_tool, schema_type=RagTool)
-            print(config)
-            return transform_to_flat(config.model_dump(), variant)
+            return config.model_dump()
     except Exception as e:
         logger.warning("Failed to get rag tool: '%s': %s", system_name, e)
         raise
@@ -21,11 +21,13 @@ async def record_tool_response_feedback(
             # Convert feedback to JSON string to ensure proper type handling
             feedback_json = json.dumps(feedback.model_dump())
 
-            # Update the extra_data JSONB field with the feedback information
+            # Update the extra_data JSONB field with the feedback information;
+            # updated_at makes the metrics rollup job re-roll the metric's hour
             sql = """
                 UPDATE metrics 
                 SET extra_data = COALESCE(extra_data, '{}'::jsonb) || 
-                    jsonb_build_object('answer_feedback', CAST(:feedback AS jsonb))
+                    jsonb_build_object('answer_feedback', CAST(:feedback AS jsonb)),
+                    updated_at = now()
                 WHERE id = :analytics_id
             """
 
@@ -54,7 +56,8 @@ async def record_tool_response_copy(
             sql = """
                 UPDATE metrics 
                 SET extra_data = COALESCE(extra_data, '{}'::jsonb) || 
-                    jsonb_build_object('answer_copy', true)
+                    jsonb_build_object('answer_copy', true),
+                    updated_at = now()
                 WHERE id = :analytics_id
             """
 
@@ -1,8 +1,8 @@
 from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.config.base import get_settings
+from core.config.app import alchemy
 from core.db.models.collection.collection import Collection
+from services.config_cache import ConfigNamespace, config_cache
 
 
 async def get_ids_by_system_names(system_name_list_or_str, collection_name):
@@ -28,19 +28,11 @@ async def get_ids_by_system_names(system_name_list_or_str, collection_name):
         raise ValueError(f"Unsupported collection_name: {collection_name}")
 
     try:
-        # Create database session
-        settings = get_settings()
-        engine = settings.db.get_engine()
-
-        async with AsyncSession(engine) as session:
-            # Use SQLAlchemy query with IN clause for efficient batch lookup
-            stmt = select(Collection.id).where(
-                Collection.system_name.in_(system_name_list)
-            )
-            result = await session.execute(stmt)
-            entities = result.scalars().all()
-
-            ids = [str(entity) for entity in entities]
+        ids = await config_cache.get_or_load(
+            ConfigNamespace.COLLECTIONS,
+            tuple(system_name_list),
+            lambda: _load_collection_ids(system_name_list),
+        )
     except Exception:
         # Handle/log exception as needed
         ids = []
@@ -48,3 +40,13 @@ async def get_ids_by_system_names(system_name_list_or_str, collection_name):
     if return_single:
         return ids[0] if ids else None
     return ids
+
+
+async def _load_collection_ids(system_name_list: list[str]) -> list[str]:
+    async with alchemy.get_session() as session:
+        # Use SQLAlchemy query with IN clause for efficient batch lookup
+        stmt = select(Collection.id).where(Collection.system_name.in_(system_name_list))
+        result = await session.execute(stmt)
+        entities = result.scalars().all()
+
+        return [str(entity) for entity in entities]
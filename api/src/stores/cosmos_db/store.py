@@ -13,7 +13,7 @@ from models import (
     DocumentSearchResultItem,
     QueryChunksByCollectionBySource,
 )
-from open_ai.utils_new import get_embeddings
+from open_ai.utils_new import get_embeddings, get_embeddings_batch
 from services.observability import observability_context, observe
 from services.observability.models import SpanType
 from stores.cosmos_db.client import CosmosDbClient
@@ -259,16 +259,26 @@ class CosmosDbStore(DocumentStore):
         self,
         documents: list[DocumentData],
         collection_id: str,
+        embeddings: list[list[float]] | None = None,
     ) -> list[str]:
         if not documents:
             logger.info("No documents to create for collection '%s'", collection_id)
             return []
 
-        persisted_documents = []
-        for document in documents:
-            persisted_documents.append(
-                await self.__create_persisted_document(document, collection_id),
+        if embeddings is None:
+            collection_metadata = await self.get_collection_metadata(collection_id)
+            embeddings = await get_embeddings_batch(
+                texts=[document.content for document in documents],
+                model_system_name=collection_metadata.get("model"),
             )
+        persisted_documents = [
+            {
+                "content": document.content,
+                "metadata": document.metadata,
+                "embedding": embedding,
+            }
+            for document, embedding in zip(documents, embeddings, strict=True)
+        ]
 
         collection = await self.__get_documents_collection(collection_id)
         result = await collection.insert_many(persisted_documents)
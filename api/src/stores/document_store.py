@@ -1,5 +1,6 @@
 # Async compatibility check: True
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
 from typing import Any
 
 from models import (
@@ -38,6 +39,31 @@ class DocumentStore(ABC):
         query: dict | None = None,
     ) -> list[dict]: ...
 
+    # Chunk metadata needed to compare a collection with its source
+    MANIFEST_METADATA_KEYS = ("sourceId", "modifiedTime", "title")
+
+    async def iterate_document_manifest(
+        self,
+        collection_id: str,
+    ) -> AsyncIterator[dict]:
+        """
+        Iterate over the IDs and source metadata (`MANIFEST_METADATA_KEYS`) of the
+        chunks of a collection, without their content.
+
+        Stores that can project the metadata in the database override this; the
+        default lists the full documents.
+        """
+        for document in await self.list_documents(collection_id):
+            metadata = document.get("metadata") or {}
+            yield {
+                "id": document.get("id"),
+                "metadata": {
+                    key: metadata.get(key)
+                    for key in self.MANIFEST_METADATA_KEYS
+                    if key in metadata
+                },
+            }
+
     @abstractmethod
     async def create_document(
         self,
@@ -50,7 +76,19 @@ class DocumentStore(ABC):
         self,
         documents: list[DocumentData],
         collection_id: str,
-    ) -> list[str]: ...
+        embeddings: list[list[float]] | None = None,
+    ) -> list[str]:
+        """
+        Create documents in a collection, in one transaction where the store has them.
+
+        `embeddings` (one vector per document, from the collection's embedding model)
+        are computed with `get_embeddings_batch` when not given.
+        """
+
+    async def get_collection_embedding_model(self, collection_id: str) -> str | None:
+        """System name of the embedding model of a collection."""
+        collection_metadata = await self.get_collection_metadata(collection_id)
+        return collection_metadata.get("model")
 
     @abstractmethod
     async def get_document(self, document_id, collection_id) -> dict: ...
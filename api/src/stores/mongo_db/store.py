@@ -18,7 +18,7 @@ from models import (
 )
 
 # Assume get_embeddings is now async
-from open_ai.utils_new import get_embeddings
+from open_ai.utils_new import get_embeddings, get_embeddings_batch
 from services.observability import observability_context, observe
 from services.observability.models import SpanType
 from stores.document_store import DocumentStore
@@ -175,15 +175,27 @@ class MongoDbStore(DocumentStore):
         self,
         documents: list[DocumentData],
         collection_id: str,
+        embeddings: list[list[float]] | None = None,
     ) -> list[str]:
         logger.info("Calling create_documents")
         logger.info("Creating documents in collection '%s'", collection_id)
         if not documents:
             logger.info("No documents to create for collection '%s'", collection_id)
             return []
+        if embeddings is None:
+            collection_metadata = await self.get_collection_metadata(collection_id)
+            embeddings = await get_embeddings_batch(
+                texts=[document.content for document in documents],
+                model_system_name=collection_metadata.get("model"),
+            )
         persisted_documents = [
-            await self.__create_persisted_document(document, collection_id)
-            for document in documents
+            {
+                "vector_id": str(uuid.uuid4()),
+                "content": document.content,
+                "metadata": document.metadata,
+                "embedding": embedding,
+            }
+            for document, embedding in zip(documents, embeddings, strict=True)
         ]
         collection_name = self.__get_documents_collection_name(collection_id)
         collection = await self.__get_documents_collection(collection_id)
@@ -38,4 +38,7 @@ if db_type == "ORACLE":
         mongo_connection_string=mongo_connection_string,
     )
 
-    oracle_db_store = OracleDbStore(client=oracle_db_client)
+    oracle_db_store = OracleDbStore(
+        client=oracle_db_client,
+        insert_batch_size=db_settings.ORACLE_INSERT_BATCH_SIZE,
+    )
@@ -10,6 +10,21 @@ from stores.database_client import DatabaseClient
 logger = getLogger(__name__)
 
 
+# LOB types and the types they are fetched as when fetched inline
+INLINE_LOB_TYPES = {
+    oracledb.DB_TYPE_CLOB: oracledb.DB_TYPE_LONG,
+    oracledb.DB_TYPE_NCLOB: oracledb.DB_TYPE_LONG_NVARCHAR,
+    oracledb.DB_TYPE_BLOB: oracledb.DB_TYPE_LONG_RAW,
+}
+
+
+def fetch_lobs_inline(cursor, metadata):
+    """Output type handler that fetches LOB columns as str/bytes with the rows."""
+    inline_type = INLINE_LOB_TYPES.get(metadata.type_code)
+    if inline_type is not None:
+        return cursor.var(inline_type, arraysize=cursor.arraysize)
+
+
 class OracleDbClient(DatabaseClient):
     _local = threading.local()
 
@@ -45,7 +60,22 @@ class OracleDbClient(DatabaseClient):
         return self.database[name]
 
     @asynccontextmanager
-    async def execute(self, sql: str, params: dict | None = None):
+    async def execute(
+        self,
+        sql: str,
+        params: dict | None = None,
+        fetch_lobs: bool = True,
+        arraysize: int | None = None,
+    ):
+        """Execute SQL and yield the cursor.
+
+        Args:
+            fetch_lobs: Fetch CLOB/BLOB columns as LOB locators. When False they are
+                fetched inline as str/bytes with the rows, without a round-trip per
+                LOB; use it for results of bounded size.
+            arraysize: Rows fetched per round-trip, e.g. the number of results of a
+                top-k query so that it is fetched at once.
+        """
         logger.debug(f"Executing SQL: {sql} with params: {params}")
         if self._pool is None:
             raise RuntimeError(
@@ -57,6 +87,12 @@ class OracleDbClient(DatabaseClient):
                     f"execute 2, pool: opened {self._pool.opened}, busy {self._pool.busy}",
                 )
                 assert cursor is not None, "Cursor is not initialized after connect."
+                if not fetch_lobs:
+                    cursor.outputtypehandler = fetch_lobs_inline
+                if arraysize:
+                    cursor.arraysize = arraysize
+                    # One more row lets the first round-trip also detect the end
+                    cursor.prefetchrows = arraysize + 1
                 try:
                     if params is not None:
                         await cursor.execute(sql, params)
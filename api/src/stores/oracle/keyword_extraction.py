@@ -0,0 +1,93 @@
+"""
+Keyword extraction of Oracle keyword (full text) search queries.
+
+Keywords of a query are extracted with YAKE and turned into a ``CONTAINS`` query.
+Creating a YAKE extractor reads its stopword list from disk and extraction is CPU
+work, so extractors are created once per language and reused (extraction only reads
+their state and is safe from several threads), extraction runs in a worker thread
+instead of on the event loop, and keywords of recent queries are cached (up to
+``ORACLE_KEYWORD_EXTRACTION_CACHE_SIZE`` of the vector database settings).
+"""
+
+import asyncio
+import threading
+
+import yake
+from cachetools import LRUCache
+
+from core.config.base import get_vector_database_settings
+
+# YAKE settings of query keywords
+MAX_NGRAM_SIZE = 2
+WINDOW_SIZE = 1
+
+Keywords = tuple[tuple[str, float], ...]
+
+
+class KeywordExtractionService:
+    """Thread-safe YAKE keyword extraction with cached extractors and results."""
+
+    def __init__(self, cache_size: int = 1024):
+        self._extractors: dict[tuple[str, int], yake.KeywordExtractor] = {}
+        self._extractors_lock = threading.Lock()
+        self._cache: LRUCache[tuple[str, int, str], Keywords] = LRUCache(
+            maxsize=max(1, cache_size)
+        )
+        self._cache_lock = threading.Lock()
+
+    def _get_extractor(self, language: str, top: int) -> yake.KeywordExtractor:
+        key = (language, top)
+        with self._extractors_lock:
+            extractor = self._extractors.get(key)
+            if extractor is None:
+                extractor = self._extractors[key] = yake.KeywordExtractor(
+                    lan=language,
+                    n=MAX_NGRAM_SIZE,
+                    windowsSize=WINDOW_SIZE,
+                    top=top,
+                    features=None,
+                )
+            return extractor
+
+    def _get_cached(self, key: tuple[str, int, str]) -> Keywords | None:
+        with self._cache_lock:
+            return self._cache.get(key)
+
+    def extract_keywords_sync(
+        self, text: str, top: int = 4, language: str = "en"
+    ) -> Keywords:
+        """Keywords of a text with their YAKE scores, most relevant (lowest score) first."""
+        normalized_text = text.strip().lower()
+        key = (language, top, normalized_text)
+        keywords = self._get_cached(key)
+        if keywords is None:
+            keywords = tuple(
+                sorted(
+                    self._get_extractor(language, top).extract_keywords(
+                        normalized_text
+                    ),
+                    key=lambda keyword: keyword[1],
+                )
+            )
+            with self._cache_lock:
+                self._cache[key] = keywords
+        return keywords
+
+    async def extract_keywords(
+        self, text: str, top: int = 4, language: str = "en"
+    ) -> Keywords:
+        """Same as `extract_keywords_sync`, extracting in a worker thread on cache misses."""
+        keywords = self._get_cached((language, top, text.strip().lower()))
+        if keywords is not None:
+            return keywords
+        return await asyncio.to_thread(self.extract_keywords_sync, text, top, language)
+
+    def clear(self) -> None:
+        with self._cache_lock:
+            self._cache.clear()
+
+
+# Global keyword extraction service — shared by the keyword searches of the worker
+keyword_extraction = KeywordExtractionService(
+    cache_size=get_vector_database_settings().ORACLE_KEYWORD_EXTRACTION_CACHE_SIZE
+)
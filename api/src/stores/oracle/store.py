@@ -6,7 +6,6 @@ from typing import Any, override
 
 import oracledb
 import regex
-import yake
 
 from models import (
     ChunksByCollection,
@@ -15,16 +14,21 @@ from models import (
     DocumentSearchResultItem,
     QueryChunksByCollectionBySource,
 )
-from open_ai.utils_new import get_embeddings
+from open_ai.utils_new import (
+    get_embeddings,
+    get_embeddings_batch,
+    get_query_embedding,
+)
 from services.observability import observability_context, observe
 from services.observability.models import SpanType
 from stores.document_store import DocumentStore
 from stores.oracle.client import OracleDbClient
+from stores.oracle.keyword_extraction import keyword_extraction
 from stores.oracle.metadata_filter_builder import OracleMetadataFilterBuilder
 from type_defs.pagination import FilterObject, OffsetPaginationRequest
 from utils.pagination_utils import paginate_collection
 from utils.search_utils import reciprocal_rank_fusion
-from utils.serializer import OracleDbSerializer
+from utils.serializer import convert_oracle_json
 from validation.rag_tools import RetrieveConfig
 
 logger = getLogger(__name__)
@@ -69,8 +73,10 @@ class OracleDbStore(DocumentStore):
     DOCUMENTS_TABLE = "documents"
     METADATA_FILTER_BUILDER = OracleMetadataFilterBuilder()
 
-    def __init__(self, client: OracleDbClient):
+    def __init__(self, client: OracleDbClient, insert_batch_size: int = 500):
         self.client = client
+        # Rows inserted with one executemany and committed together
+        self.insert_batch_size = max(1, insert_batch_size)
 
     async def list_collections(self, query: dict | None = None) -> list[dict]:
         logger.debug(f"Listing collections with query {query}.")
@@ -233,11 +239,8 @@ class OracleDbStore(DocumentStore):
         self,
         model_system_name: str,
         text: str,
-        **kwargs,
     ) -> list[float]:
-        return await get_embeddings(
-            text=text, model_system_name=model_system_name, **kwargs
-        )
+        return await get_query_embedding(text, model_system_name)
 
     async def create_document(self, document: DocumentData, collection_id: str) -> str:
         logger.debug(
@@ -288,6 +291,7 @@ class OracleDbStore(DocumentStore):
         self,
         documents: list[DocumentData],
         collection_id: str,
+        embeddings: list[list[float]] | None = None,
     ) -> list[str]:
         logger.debug(f"Creating multiple documents in collection_id: {collection_id}")
 
@@ -295,56 +299,91 @@ class OracleDbStore(DocumentStore):
             logger.info(f"No documents to create for collection '{collection_id}'")
             return []
 
-        collection_config = await self.get_collection_metadata(collection_id)
-        embedding_model = collection_config.get("model")
+        if embeddings is None:
+            collection_config = await self.get_collection_metadata(collection_id)
+            embedding_model = collection_config.get("model")
 
-        if not embedding_model:
-            raise ValueError("Embedding model is not set for collection")
+            if not embedding_model:
+                raise ValueError("Embedding model is not set for collection")
 
-        document_ids = []
+            embeddings = await get_embeddings_batch(
+                [document.content for document in documents], embedding_model
+            )
 
         sql = f"INSERT INTO {self.DOCUMENTS_TABLE} (collection_id, content, metadata, embedding) VALUES (:collection_id, :content, :metadata, :embedding) RETURNING id INTO :id_out"
+        document_ids = []
         async with await self.client._pool.acquire() as connection:
-            for document in documents:
-                logger.debug(
-                    f"Processing document: {document.metadata.get('sourceId')}"
-                )
-
-                embeddings = await get_embeddings(document.content, embedding_model)
-                semantic_dense_vector = array.array("d", embeddings)
-
-                async with connection.cursor() as cursor:
-                    id_out = cursor.var(oracledb.STRING)
-                    # Sanitize metadata: convert all non-string keys to strings recursively
-                    sanitized_metadata = sanitize_metadata_keys(document.metadata)
-
-                    bind_vars = {
-                        "collection_id": collection_id,
-                        "content": document.content,
-                        "metadata": sanitized_metadata,
-                        "embedding": semantic_dense_vector,
-                        "id_out": id_out,
-                    }
-                    cursor.setinputsizes(
-                        collection_id=oracledb.STRING,
-                        content=oracledb.CLOB,
-                        metadata=oracledb.DB_TYPE_JSON,
-                        embedding=oracledb.DB_TYPE_BINARY_DOUBLE,
-                        id_out=oracledb.STRING,
+            try:
+                # Array binds: one round-trip and one commit per batch of rows
+                for start in range(0, len(documents), self.insert_batch_size):
+                    batch = list(
+                        zip(
+                            documents[start : start + self.insert_batch_size],
+                            embeddings[start : start + self.insert_batch_size],
+                            strict=True,
+                        )
                     )
-                    await cursor.execute(sql, bind_vars)
-                    document_id = id_out.getvalue()
-                    document_ids.append(document_id)
-
-            # Commit all rows at once, because we need to rollback all of them if any of them fails.
-            await connection.commit()
+                    async with connection.cursor() as cursor:
+                        id_out = cursor.var(oracledb.STRING, arraysize=len(batch))
+                        cursor.setinputsizes(
+                            collection_id=oracledb.STRING,
+                            content=oracledb.CLOB,
+                            metadata=oracledb.DB_TYPE_JSON,
+                            embedding=oracledb.DB_TYPE_BINARY_DOUBLE,
+                            id_out=id_out,
+                        )
+                        await cursor.executemany(
+                            sql,
+                            [
+                                {
+                                    "collection_id": collection_id,
+                                    "content": document.content,
+                                    # Sanitize metadata: convert all non-string keys to strings recursively
+                                    "metadata": sanitize_metadata_keys(
+                                        document.metadata
+                                    ),
+                                    "embedding": array.array("d", embedding),
+                                }
+                                for document, embedding in batch
+                            ],
+                        )
+                        await connection.commit()
+                        # Returned values of each row are a list with one ID
+                        document_ids.extend(
+                            id_out.getvalue(index)[0] for index in range(len(batch))
+                        )
+            except Exception:
+                # Keep all-or-nothing: remove the batches committed before the failure
+                try:
+                    await connection.rollback()
+                    if document_ids:
+                        await self.__delete_inserted_documents(
+                            connection, document_ids, collection_id
+                        )
+                except Exception as cleanup_err:
+                    logger.error(
+                        f"Failed to remove {len(document_ids)} documents created in collection '{collection_id}' before the insert failed: {cleanup_err}",
+                    )
+                raise
 
         logger.info(
             f"Created {len(document_ids)} documents in collection '{collection_id}'",
         )
-        logger.info(document_ids)
         return document_ids
 
+    async def __delete_inserted_documents(
+        self, connection, document_ids: list[str], collection_id: str
+    ):
+        async with connection.cursor() as cursor:
+            await cursor.executemany(
+                f"DELETE FROM {self.DOCUMENTS_TABLE} D WHERE D.id = :id AND D.collection_id = :collection_id",
+                [
+                    {"id": document_id, "collection_id": collection_id}
+                    for document_id in document_ids
+                ],
+            )
+        await connection.commit()
+
     async def get_document(self, document_id, collection_id) -> dict:
         logger.debug(
             f"Fetching document with id: {document_id} from collection '{collection_id}'",
@@ -565,11 +604,13 @@ class OracleDbStore(DocumentStore):
         logger.debug(f"Executing vector search: {sql}")
 
         result = []
-        async with self.client.execute(sql, params) as cursor:
+        async with self.client.execute(
+            sql, params, fetch_lobs=False, arraysize=num_results
+        ) as cursor:
             async for row in cursor:
                 id = row[0]
-                content = await row[1].read()  # to convert it to a string
-                metadata = json.loads(json.dumps(row[2], cls=OracleDbSerializer))
+                content = row[1]
+                metadata = convert_oracle_json(row[2])
                 vector_similarity_score = (1 - Decimal(row[3])).quantize(
                     Decimal("0.0000"), rounding=ROUND_HALF_UP
                 )
@@ -615,20 +656,7 @@ class OracleDbStore(DocumentStore):
             }
         )
 
-        def extract_keywords(query: str, num_results: int):
-            max_ngram_size = 2
-            windowSize = 1
-
-            kw_extractor = yake.KeywordExtractor(
-                n=max_ngram_size,
-                windowsSize=windowSize,
-                top=num_results,
-                features=None,
-            )
-            keywords = kw_extractor.extract_keywords(query.strip().lower())
-            return sorted(keywords, key=lambda kw: kw[1])
-
-        keywords = extract_keywords(query, 4)
+        keywords = await keyword_extraction.extract_keywords(query, top=4)
         if len(keywords) == 0:
             return []
 
@@ -649,12 +677,14 @@ class OracleDbStore(DocumentStore):
             "collection_id": collection_id,
             "query_keywords": ",".join(stemmed_keywords),
         }
-        async with self.client.execute(sql, params) as cursor:
+        async with self.client.execute(
+            sql, params, fetch_lobs=False, arraysize=num_results
+        ) as cursor:
             result = []
             async for row in cursor:
                 id = row[0]
-                content = await row[1].read()  # to convert it to a string
-                metadata = json.loads(json.dumps(row[2], cls=OracleDbSerializer))
+                content = row[1]
+                metadata = convert_oracle_json(row[2])
                 score = Decimal(row[3]).quantize(
                     Decimal("0.0000"), rounding=ROUND_HALF_UP
                 )
@@ -686,7 +716,7 @@ class OracleDbStore(DocumentStore):
         if not embedding_model:
             raise ValueError("Embedding model is not set for collection")
 
-        vector = await get_embeddings(query, embedding_model)
+        vector = await get_query_embedding(query, embedding_model)
         return await self.__vector_search(collection_id, query, vector, num_results)
 
     @override
@@ -34,7 +34,13 @@ if db_type == "PGVECTOR":
         pool_size=pool_size,
     )
 
-    pgvector_store = PgVectorStore(client=pgvector_client)
+    pgvector_store = PgVectorStore(
+        client=pgvector_client,
+        collection_cache_ttl_seconds=db_settings.PGVECTOR_COLLECTION_CACHE_TTL_SECONDS,
+        bulk_insert_min_rows=db_settings.PGVECTOR_BULK_INSERT_MIN_ROWS,
+        bulk_rebuild_index_min_rows=db_settings.PGVECTOR_BULK_REBUILD_INDEX_MIN_ROWS,
+        multi_collection_single_query=db_settings.PGVECTOR_MULTI_COLLECTION_SINGLE_QUERY,
+    )
 
     # Export initialized instances
     __all__.extend(["pgvector_client", "pgvector_store"])
@@ -3,6 +3,7 @@
 import asyncio
 import json
 import logging
+from collections.abc import AsyncIterator
 from typing import Any
 
 import asyncpg
@@ -127,6 +128,31 @@ class PgVectorClient:
             logger.error("Error executing query: %s", e)
             raise
 
+    async def execute_query_with_settings(
+        self, query: str, *args, settings: dict[str, str] | None = None
+    ) -> Any:
+        """Execute a query with transaction-local session settings (e.g. hnsw.ef_search)."""
+        if not settings:
+            return await self.execute_query(query, *args)
+
+        await self._ensure_pool_initialized()
+        if not self.pool:
+            raise RuntimeError("Connection pool is not initialized")
+        try:
+            async with self.pool.acquire() as connection:
+                async with connection.transaction():
+                    for name, value in settings.items():
+                        await connection.execute(
+                            "SELECT set_config($1, $2, true)", name, value
+                        )
+                    return await connection.fetch(query, *args)
+        except asyncio.CancelledError:
+            logger.debug("Query execution was cancelled")
+            raise
+        except Exception as e:
+            logger.error("Error executing query: %s", e)
+            raise
+
     async def execute_command(self, command: str, *args) -> Any:
         """Execute a command (INSERT, UPDATE, DELETE) and return the result."""
         await self._ensure_pool_initialized()
@@ -142,6 +168,29 @@ class PgVectorClient:
             logger.error("Error executing command: %s", e)
             raise
 
+    async def iterate_query(
+        self, query: str, *args, prefetch: int = 1000
+    ) -> AsyncIterator[Any]:
+        """Iterate over the rows of a query with a server-side cursor.
+
+        Rows are fetched `prefetch` at a time instead of loading the whole result.
+        """
+        await self._ensure_pool_initialized()
+        if not self.pool:
+            raise RuntimeError("Connection pool is not initialized")
+        try:
+            async with self.pool.acquire() as connection:
+                # Cursors only exist within a transaction
+                async with connection.transaction():
+                    async for row in connection.cursor(query, *args, prefetch=prefetch):
+                        yield row
+        except asyncio.CancelledError:
+            logger.debug("Query iteration was cancelled")
+            raise
+        except Exception as e:
+            logger.error("Error iterating query: %s", e)
+            raise
+
     async def fetchrow(self, query: str, *args) -> Any:
         """Fetch a single row."""
         await self._ensure_pool_initialized()
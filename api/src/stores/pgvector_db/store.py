@@ -1,11 +1,19 @@
 """PostgreSQL store with pgvector support for document storage and search."""
 
 import asyncio
+import copy
 import json
 import logging
-from decimal import Decimal
+import time
+import uuid
+from collections.abc import AsyncIterator, Coroutine
+from dataclasses import dataclass
+from decimal import ROUND_HALF_UP, Decimal
 from typing import Any, override
 
+from asyncpg import Connection
+from cachetools import TTLCache
+
 from models import (
     ChunksByCollection,
     DocumentData,
@@ -13,33 +21,88 @@ from models import (
     DocumentSearchResultItem,
     QueryChunksByCollectionBySource,
 )
-from open_ai.utils_new import get_embeddings
+from open_ai.utils_new import (
+    get_embeddings,
+    get_embeddings_batch,
+    get_query_embedding,
+)
 from openai_model.utils import get_model_by_system_name
 from services.observability import observability_context, observe
 from services.observability.models import SpanType
 from stores.document_store import DocumentStore
 from stores.pgvector_db.client import PgVectorClient
 from stores.pgvector_db.metadata_filter_builder import PgVectorMetadataFilterBuilder
+from stores.pgvector_db.vector_index import VectorIndexConfig
 from type_defs.pagination import FilterObject, OffsetPaginationRequest
 from validation.rag_tools import RetrieveConfig
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class CollectionDescriptor:
+    """Cached per-collection state that every search or write would otherwise re-query."""
+
+    metadata: dict
+    table_ready: bool = False
+    vector_size: int | None = None
+    fulltext_ready: bool = False
+
+
 class PgVectorStore(DocumentStore):
     """Document store implementation using PostgreSQL with pgvector extension."""
 
     COLLECTIONS_TABLE = "collections"
     DOCUMENTS_TABLE_PREFIX = "documents_"
     METADATA_FILTER_BUILDER = PgVectorMetadataFilterBuilder()
-
-    def __init__(self, client: PgVectorClient):
+    # Text search configuration of the tsvector column (language-agnostic)
+    FULLTEXT_SEARCH_CONFIG = "simple"
+    # Rows whose tsvector is computed per statement when full-text search is enabled
+    FULLTEXT_SEARCH_BACKFILL_BATCH_SIZE = 1000
+    # Same constant as utils.search_utils.reciprocal_rank_fusion uses for Oracle
+    RRF_K = 2
+    # Index builds on large tables take far longer than the pool's command timeout
+    VECTOR_INDEX_BUILD_TIMEOUT_SECONDS = 6 * 60 * 60
+    VECTOR_INDEX_PROGRESS_INTERVAL_SECONDS = 10
+
+    def __init__(
+        self,
+        client: PgVectorClient,
+        collection_cache_ttl_seconds: int = 60,
+        bulk_insert_min_rows: int = 100,
+        bulk_rebuild_index_min_rows: int = 10000,
+        multi_collection_single_query: bool = True,
+    ):
         """Initialize the PgVector store.
 
         Args:
             client: PgVectorClient instance
+            collection_cache_ttl_seconds: Time-to-live of cached collection descriptors.
+                Local changes invalidate entries immediately; the TTL bounds how long
+                changes made by other workers may go unnoticed.
+            bulk_insert_min_rows: Minimum batch size loaded with COPY by `create_documents`.
+            bulk_rebuild_index_min_rows: Minimum size of a load into an empty table for
+                which the vector index is dropped and rebuilt automatically.
+            multi_collection_single_query: Search all collections that share an
+                embedding model with a single statement and a global top-k.
         """
         self.client = client
+        self.bulk_insert_min_rows = bulk_insert_min_rows
+        self.bulk_rebuild_index_min_rows = bulk_rebuild_index_min_rows
+        self.multi_collection_single_query = multi_collection_single_query
+        # Background index builds: vector indexes by collection ID, others by name
+        self._index_builds: dict[str, asyncio.Task] = {}
+        # Builds run one at a time: each holds a pool connection until its index is
+        # ready, so several at once would starve searches and writes of connections
+        self._index_build_slot = asyncio.Semaphore(1)
+        self._iterative_scan_supported: bool | None = None
+        self._collection_descriptors: TTLCache[str, CollectionDescriptor] = TTLCache(
+            maxsize=1024, ttl=collection_cache_ttl_seconds
+        )
+
+    def _invalidate_collection(self, collection_id: str) -> None:
+        """Drop the cached descriptor of a collection."""
+        self._collection_descriptors.pop(collection_id, None)
 
     async def _ensure_tables_exist(self) -> None:
         """Ensure required tables exist - This assumes migrations have been run."""
@@ -172,39 +235,285 @@ class PgVectorStore(DocumentStore):
         """)
 
         # Create vector index for similarity search
-        if vector_size <= 2000:
-            # Use HNSW for vectors up to 2000 dimensions
-            await self.client.execute_command(f"""
-                CREATE INDEX IF NOT EXISTS idx_{table_name}_embedding_cosine
-                ON {table_name} USING hnsw (embedding vector_cosine_ops) 
-                WITH (m = 16, ef_construction = 64)
-            """)
-            logger.info(
-                "Created HNSW index for collection %s with %d dimensions",
+        await self._create_vector_index(collection_id, vector_size)
+
+        # Create GIN index for metadata
+        await self.client.execute_command(f"""
+            CREATE INDEX IF NOT EXISTS idx_{table_name}_metadata_gin
+            ON {table_name} USING GIN (metadata)
+        """)
+
+        # The new table is empty, building the index without CONCURRENTLY is instant
+        await self.client.execute_command(self._source_id_index_ddl(table_name))
+
+        logger.info("Created documents table %s with indexes", table_name)
+
+    async def _get_vector_index_config(
+        self, collection_id: str, vector_size: int
+    ) -> VectorIndexConfig:
+        """Get the effective ANN index settings of a collection."""
+        collection_metadata = await self.get_collection_metadata(collection_id)
+        return VectorIndexConfig.from_collection_metadata(
+            collection_metadata, vector_size
+        )
+
+    async def _create_vector_index(
+        self,
+        collection_id: str,
+        vector_size: int,
+        connection: Connection | None = None,
+    ) -> None:
+        """Create the vector similarity index of a collection's documents table.
+
+        Args:
+            collection_id: Collection ID
+            vector_size: Size of the embedding vector
+            connection: Connection to run the statement on (e.g. inside a transaction),
+                defaults to the client pool
+        """
+        table_name = self._get_documents_table_name(collection_id)
+        config = await self._get_vector_index_config(collection_id, vector_size)
+
+        if not config.can_index(vector_size):
+            logger.warning(
+                "No vector index for collection %s with %d dimensions (index type '%s', quantization '%s'). "
+                "Queries will use sequential scan which may be slower.",
                 collection_id,
                 vector_size,
+                config.type,
+                config.quantization,
+            )
+            return
+
+        ddl = config.index_ddl(table_name, vector_size)
+        if connection:
+            await connection.execute(
+                ddl, timeout=self.VECTOR_INDEX_BUILD_TIMEOUT_SECONDS
             )
         else:
-            # For vectors > 2000 dimensions, pgvector does not support indexes
-            # Both HNSW and IVFFlat have a 2000 dimension limit
+            await self.client.execute_command(ddl)
+        logger.info(
+            "Created %s index (quantization '%s') for collection %s with %d dimensions",
+            config.type,
+            config.quantization,
+            collection_id,
+            vector_size,
+        )
+
+    async def _supports_iterative_scan(self) -> bool:
+        """Whether the installed pgvector (0.8+) supports iterative index scans."""
+        if self._iterative_scan_supported is None:
+            try:
+                version = await self.client.fetchval(
+                    "SELECT extversion FROM pg_extension WHERE extname = 'vector'"
+                )
+                self._iterative_scan_supported = tuple(
+                    int(part) for part in (version or "0").split(".")[:2]
+                ) >= (0, 8)
+            except Exception as e:
+                logger.warning("Could not read the pgvector version: %s", e)
+                self._iterative_scan_supported = False
+        return self._iterative_scan_supported
+
+    async def _ensure_vector_index(self, collection_id: str, vector_size: int) -> None:
+        """Start a background rebuild if the vector index does not match the settings."""
+        if collection_id in self._index_builds:
+            return
+
+        table_name = self._get_documents_table_name(collection_id)
+        config = await self._get_vector_index_config(collection_id, vector_size)
+        if not config.can_index(vector_size):
+            return
+
+        # An interrupted CREATE INDEX CONCURRENTLY leaves an invalid index behind
+        if await self._is_index_valid(config.index_name(table_name)):
+            return
+
+        self._start_index_build(collection_id, self.rebuild_vector_index(collection_id))
+
+    def _start_index_build(self, key: str, build: Coroutine[Any, Any, None]) -> None:
+        """Queue an index build in the background, at most one per key."""
+        task = asyncio.create_task(self._run_index_build(build))
+        self._index_builds[key] = task
+        task.add_done_callback(lambda done: self._on_index_build_done(key, done))
+
+    async def _run_index_build(self, build: Coroutine[Any, Any, None]) -> None:
+        """Run a queued index build once no other build of the worker is running."""
+        try:
+            async with self._index_build_slot:
+                await build
+        finally:
+            build.close()  # Not started if cancelled while queued
+
+    def _on_index_build_done(self, key: str, task: asyncio.Task) -> None:
+        """Forget a finished background index build and log its failure."""
+        self._index_builds.pop(key, None)
+        if task.cancelled():
+            return
+        if exc := task.exception():
+            logger.error(
+                "Background index build %s failed: %s",
+                key,
+                exc,
+                exc_info=exc,
+            )
+
+    async def _is_index_valid(self, index_name: str) -> bool:
+        """Whether an index exists and is usable (not left over from a failed build)."""
+        return bool(
+            await self.client.fetchval(
+                """
+                SELECT pg_index.indisvalid
+                FROM pg_class
+                JOIN pg_index ON pg_index.indexrelid = pg_class.oid
+                WHERE pg_class.relname = $1
+            """,
+                index_name,
+            )
+        )
+
+    async def rebuild_vector_index(self, collection_id: str) -> None:
+        """Build the vector index for the current settings without blocking writes.
+
+        The new index is created with CREATE INDEX CONCURRENTLY while progress is
+        logged from pg_stat_progress_create_index; vector indexes built with other
+        settings are dropped (concurrently) once the new one is ready. An advisory
+        lock on the table makes sure only one worker process builds at a time.
+        """
+        table_name = self._get_documents_table_name(collection_id)
+        vector_size = await self._get_current_vector_size(table_name)
+        if not vector_size:
             logger.warning(
-                "Cannot create index for collection %s with %d dimensions (exceeds pgvector limit of 2000). "
-                "Queries will use sequential scan which may be slower.",
+                "Cannot rebuild vector index of collection %s: unknown vector size",
                 collection_id,
-                vector_size,
             )
+            return
 
-        # Create GIN index for metadata
-        await self.client.execute_command(f"""
-            CREATE INDEX IF NOT EXISTS idx_{table_name}_metadata_gin
-            ON {table_name} USING GIN (metadata)
-        """)
+        config = await self._get_vector_index_config(collection_id, vector_size)
 
-        logger.info("Created documents table %s with indexes", table_name)
+        await self.client._ensure_pool_initialized()
+        if not self.client.pool:
+            raise RuntimeError("Connection pool is not initialized")
+
+        async with self.client.pool.acquire() as connection:
+            lock_key = f"vector_index:{table_name}"
+            if not await connection.fetchval(
+                "SELECT pg_try_advisory_lock(hashtext($1))", lock_key
+            ):
+                logger.info(
+                    "Vector index of collection %s is being built by another worker",
+                    collection_id,
+                )
+                return
+            try:
+                await self._build_vector_index(
+                    connection, collection_id, table_name, config, vector_size
+                )
+            finally:
+                await connection.execute(
+                    "SELECT pg_advisory_unlock(hashtext($1))", lock_key
+                )
+
+    async def _build_vector_index(
+        self,
+        connection: Connection,
+        collection_id: str,
+        table_name: str,
+        config: VectorIndexConfig,
+        vector_size: int,
+    ) -> None:
+        """Build the vector index concurrently and drop stale ones, holding the build lock."""
+        index_name = config.index_name(table_name)
+        start_time = time.perf_counter()
+        logger.info(
+            "Building %s index %s for collection %s",
+            config.type,
+            index_name,
+            collection_id,
+        )
+        progress_task = asyncio.create_task(
+            self._log_index_build_progress(table_name, index_name)
+        )
+        try:
+            if config.can_index(vector_size):
+                if not await self._is_index_valid(index_name):
+                    # IF NOT EXISTS would keep an invalid index of a failed build
+                    await connection.execute(
+                        f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}",
+                        timeout=self.VECTOR_INDEX_BUILD_TIMEOUT_SECONDS,
+                    )
+                await connection.execute(
+                    config.index_ddl(table_name, vector_size, concurrently=True),
+                    timeout=self.VECTOR_INDEX_BUILD_TIMEOUT_SECONDS,
+                )
+
+            stale_indexes = await connection.fetch(
+                """
+                SELECT indexname FROM pg_indexes
+                WHERE tablename = $1
+                AND indexdef ~ 'USING (hnsw|ivfflat)'
+                AND indexname <> $2
+            """,
+                table_name,
+                index_name,
+            )
+            for row in stale_indexes:
+                await connection.execute(
+                    f"DROP INDEX CONCURRENTLY IF EXISTS {row['indexname']}",
+                    timeout=self.VECTOR_INDEX_BUILD_TIMEOUT_SECONDS,
+                )
+                logger.info("Dropped stale vector index %s", row["indexname"])
+        except Exception as e:
+            logger.error(
+                "Failed to rebuild vector index for collection %s: %s", collection_id, e
+            )
+            raise
+        finally:
+            progress_task.cancel()
+
+        logger.info(
+            "Vector index %s for collection %s ready in %.1fs",
+            index_name,
+            collection_id,
+            time.perf_counter() - start_time,
+        )
+
+    async def _log_index_build_progress(self, table_name: str, index_name: str) -> None:
+        """Periodically log the progress of an index build on a table."""
+        while True:
+            await asyncio.sleep(self.VECTOR_INDEX_PROGRESS_INTERVAL_SECONDS)
+            try:
+                row = await self.client.fetchrow(
+                    """
+                    SELECT phase, blocks_done, blocks_total, tuples_done, tuples_total
+                    FROM pg_stat_progress_create_index
+                    WHERE relid = $1::regclass
+                """,
+                    table_name,
+                )
+            except Exception as e:
+                logger.debug("Could not read index build progress: %s", e)
+                continue
+            if not row:
+                continue
+            done, total = row["blocks_done"], row["blocks_total"]
+            if not total:
+                done, total = row["tuples_done"], row["tuples_total"]
+            logger.info(
+                "Building %s: %s (%s%%)",
+                index_name,
+                row["phase"],
+                round(100 * done / total, 1) if total else "?",
+            )
 
     async def _ensure_documents_table_exists(self, collection_id: str) -> None:
         """Ensure documents table exists for a collection."""
+        descriptor = self._collection_descriptors.get(collection_id)
+        if descriptor and descriptor.table_ready:
+            return
+
         table_name = self._get_documents_table_name(collection_id)
+        vector_size: int | None = None
 
         # Check if table exists
         table_exists = await self.client.fetchval(
@@ -235,7 +544,9 @@ class PgVectorStore(DocumentStore):
                 )
                 vector_size = 1536
             await self._create_documents_table(collection_id, vector_size)
+            table_ready = True
         else:
+            table_ready = False
             # Table exists, check if vector size matches current model
             try:
                 collection_metadata = await self.get_collection_metadata(collection_id)
@@ -268,6 +579,9 @@ class PgVectorStore(DocumentStore):
                             "Could not determine current vector size for collection %s, assuming it's correct",
                             collection_id,
                         )
+                    vector_size = expected_vector_size
+                    await self._ensure_vector_index(collection_id, vector_size)
+                table_ready = True
             except Exception as e:
                 logger.warning(
                     "Could not check vector size for collection %s: %s",
@@ -275,10 +589,224 @@ class PgVectorStore(DocumentStore):
                     e,
                 )
 
+        descriptor = self._collection_descriptors.get(collection_id)
+        if descriptor and table_ready:
+            await self._ensure_source_id_index(collection_id)
+            if self._is_fulltext_search_enabled(descriptor.metadata):
+                # The GIN index is built last, once every row has its tsvector
+                descriptor.fulltext_ready = await self._is_index_valid(
+                    f"idx_{table_name}_content_tsv"
+                )
+            descriptor.table_ready = True
+            descriptor.vector_size = vector_size
+
+    @staticmethod
+    def _is_fulltext_search_enabled(collection_metadata: dict) -> bool:
+        """Check whether keyword search is enabled in the collection's indexing settings."""
+        indexing = collection_metadata.get("indexing") or {}
+        return bool(indexing.get("fulltext_search_supported"))
+
+    async def _is_fulltext_search_ready(self, collection_id: str) -> bool:
+        """Check (from the collection descriptor) whether keyword search can run."""
+        await self._ensure_documents_table_exists(collection_id)
+        descriptor = self._collection_descriptors.get(collection_id)
+        return bool(descriptor and descriptor.fulltext_ready)
+
+    async def enable_fulltext_search(self, collection_id: str) -> None:
+        """Start a background build of the full-text search of a documents table.
+
+        Run when a collection is created or its indexing settings are saved, never
+        from searches. Keyword search is used once the build has finished.
+        """
+        await self._ensure_documents_table_exists(collection_id)
+        index_name = f"idx_{self._get_documents_table_name(collection_id)}_content_tsv"
+        if index_name in self._index_builds or await self._is_index_valid(index_name):
+            return
+
+        self._start_index_build(index_name, self.build_fulltext_search(collection_id))
+
+    async def build_fulltext_search(self, collection_id: str) -> None:
+        """Add the tsvector column and its GIN index without blocking the table.
+
+        The column is added as a nullable column, which does not rewrite the table,
+        and kept up to date by a trigger. Existing rows are then backfilled in
+        batches and the GIN index is built with CREATE INDEX CONCURRENTLY. An
+        advisory lock on the table makes sure only one worker process builds it at
+        a time. Tables that already have a generated column only get the index.
+        """
+        table_name = self._get_documents_table_name(collection_id)
+        index_name = f"idx_{table_name}_content_tsv"
+        text_search_config = f"pg_catalog.{self.FULLTEXT_SEARCH_CONFIG}"
+
+        await self.client._ensure_pool_initialized()
+        if not self.client.pool:
+            raise RuntimeError("Connection pool is not initialized")
+
+        async with self.client.pool.acquire() as connection:
+            lock_key = f"fulltext_search:{table_name}"
+            if not await connection.fetchval(
+                "SELECT pg_try_advisory_lock(hashtext($1))", lock_key
+            ):
+                return
+            try:
+                # Built by another worker while this build was queued
+                if await connection.fetchval(
+                    """
+                    SELECT pg_index.indisvalid
+                    FROM pg_class
+                    JOIN pg_index ON pg_index.indexrelid = pg_class.oid
+                    WHERE pg_class.relname = $1
+                """,
+                    index_name,
+                ):
+                    return
+                is_generated = await connection.fetchval(
+                    """
+                    SELECT is_generated
+                    FROM information_schema.columns
+                    WHERE table_name = $1 AND column_name = 'content_tsv'
+                """,
+                    table_name,
+                )
+                if is_generated != "ALWAYS":
+                    async with connection.transaction():
+                        await connection.execute(f"""
+                            ALTER TABLE {table_name}
+                            ADD COLUMN IF NOT EXISTS content_tsv tsvector
+                        """)
+                        await connection.execute(
+                            f"DROP TRIGGER IF EXISTS trg_{table_name}_content_tsv "
+                            f"ON {table_name}"
+                        )
+                        await connection.execute(f"""
+                            CREATE TRIGGER trg_{table_name}_content_tsv
+                            BEFORE INSERT OR UPDATE ON {table_name}
+                            FOR EACH ROW EXECUTE FUNCTION tsvector_update_trigger(
+                                content_tsv, '{text_search_config}', content
+                            )
+                        """)
+                    await self._backfill_fulltext_search_column(connection, table_name)
+
+                # IF NOT EXISTS would keep an invalid index of a failed build
+                await connection.execute(
+                    f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}",
+                    timeout=self.VECTOR_INDEX_BUILD_TIMEOUT_SECONDS,
+                )
+                await connection.execute(
+                    f"""
+                    CREATE INDEX CONCURRENTLY {index_name}
+                    ON {table_name} USING GIN (content_tsv)
+                """,
+                    timeout=self.VECTOR_INDEX_BUILD_TIMEOUT_SECONDS,
+                )
+                logger.info("Enabled full-text search on %s", table_name)
+            finally:
+                await connection.execute(
+                    "SELECT pg_advisory_unlock(hashtext($1))", lock_key
+                )
+        self._invalidate_collection(collection_id)
+
+    async def _backfill_fulltext_search_column(
+        self, connection: Any, table_name: str
+    ) -> None:
+        """Compute the tsvector of existing rows in short transactions, in ID order."""
+        last_id = None
+        backfilled = 0
+        while True:
+            ids = [
+                row["id"]
+                for row in await connection.fetch(
+                    f"""
+                    SELECT id FROM {table_name}
+                    WHERE $1::uuid IS NULL OR id > $1::uuid
+                    ORDER BY id
+                    LIMIT $2
+                """,
+                    last_id,
+                    self.FULLTEXT_SEARCH_BACKFILL_BATCH_SIZE,
+                )
+            ]
+            if not ids:
+                break
+            # The trigger computes the tsvector of every updated row
+            result = await connection.execute(
+                f"""
+                UPDATE {table_name} SET content = content
+                WHERE id = ANY($1::uuid[]) AND content_tsv IS NULL
+            """,
+                ids,
+            )
+            backfilled += int(result.split()[-1])
+            last_id = ids[-1]
+        logger.info(
+            "Backfilled full-text search column of %d rows in %s",
+            backfilled,
+            table_name,
+        )
+
+    @staticmethod
+    def _source_id_index_ddl(table_name: str, concurrently: bool = False) -> str:
+        """DDL of the expression index on the chunks' source ID of a documents table.
+
+        Used by chunk context queries and by the source manifest of collection syncs.
+        """
+        return f"""
+            CREATE INDEX {"CONCURRENTLY " if concurrently else ""}IF NOT EXISTS idx_{table_name}_source_id
+            ON {table_name} ((metadata->>'sourceId'), (metadata->>'modifiedTime'))
+        """
+
+    async def _ensure_source_id_index(self, collection_id: str) -> None:
+        """Start a background build of the source ID index if a documents table lacks it."""
+        index_name = f"idx_{self._get_documents_table_name(collection_id)}_source_id"
+        if index_name in self._index_builds or await self._is_index_valid(index_name):
+            return
+
+        self._start_index_build(index_name, self.create_source_id_index(collection_id))
+
+    async def create_source_id_index(self, collection_id: str) -> None:
+        """Add the source ID index to an existing documents table without blocking writes.
+
+        Tables created before the index was introduced get it from a background build
+        started when the collection is first used. The index is built with CREATE
+        INDEX CONCURRENTLY; an advisory lock on the table makes sure only one worker
+        process builds it at a time.
+        """
+        table_name = self._get_documents_table_name(collection_id)
+        index_name = f"idx_{table_name}_source_id"
+
+        await self.client._ensure_pool_initialized()
+        if not self.client.pool:
+            raise RuntimeError("Connection pool is not initialized")
+
+        async with self.client.pool.acquire() as connection:
+            lock_key = f"source_id_index:{table_name}"
+            if not await connection.fetchval(
+                "SELECT pg_try_advisory_lock(hashtext($1))", lock_key
+            ):
+                return
+            try:
+                if await self._is_index_valid(index_name):
+                    return
+                # IF NOT EXISTS would keep an invalid index of a failed build
+                await connection.execute(
+                    f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}",
+                    timeout=self.VECTOR_INDEX_BUILD_TIMEOUT_SECONDS,
+                )
+                await connection.execute(
+                    self._source_id_index_ddl(table_name, concurrently=True),
+                    timeout=self.VECTOR_INDEX_BUILD_TIMEOUT_SECONDS,
+                )
+                logger.info("Created source ID index %s", index_name)
+            finally:
+                await connection.execute(
+                    "SELECT pg_advisory_unlock(hashtext($1))", lock_key
+                )
+
     async def _drop_documents_table(self, collection_id: str) -> None:
         """Drop documents table for a collection."""
         table_name = self._get_documents_table_name(collection_id)
         await self.client.execute_command(f"DROP TABLE IF EXISTS {table_name}")
+        self._invalidate_collection(collection_id)
         logger.info("Dropped documents table %s", table_name)
 
     async def list_collections(self, query: dict | None = None) -> list[dict]:
@@ -372,11 +900,6 @@ class PgVectorStore(DocumentStore):
         """Create a new collection."""
         logger.info("Creating collection")
 
-        if metadata.get("indexing", {}).get("fulltext_search_supported"):
-            logger.warning(
-                "Fulltext search support noted but not implemented in pgvector"
-            )
-
         await self._ensure_tables_exist()
 
         # Insert collection metadata using the new schema
@@ -456,12 +979,18 @@ class PgVectorStore(DocumentStore):
             vector_size = 1536  # Default
 
         await self._create_documents_table(collection_id, vector_size)
+        if self._is_fulltext_search_enabled(metadata):
+            await self.enable_fulltext_search(collection_id)
 
         logger.info("Collection created completely, id: '%s'", collection_id)
         return collection_id
 
     async def get_collection_metadata(self, collection_id: str) -> dict:
-        """Get collection metadata."""
+        """Get collection metadata (served from the collection descriptor cache)."""
+        descriptor = self._collection_descriptors.get(collection_id)
+        if descriptor is not None:
+            return copy.deepcopy(descriptor.metadata)
+
         row = await self.client.fetchrow(
             f"""
             SELECT 
@@ -514,6 +1043,9 @@ class PgVectorStore(DocumentStore):
             "updated_by": row["updated_by"],
         }
         metadata["id"] = collection_id
+        self._collection_descriptors[collection_id] = CollectionDescriptor(
+            metadata=copy.deepcopy(metadata)
+        )
         return metadata
 
     async def update_collection_metadata(self, collection_id: str, metadata: dict):
@@ -574,10 +1106,14 @@ class PgVectorStore(DocumentStore):
         """,
             *params,
         )
+        self._invalidate_collection(collection_id)
 
         if result == "UPDATE 0":
             raise LookupError("Nothing was updated")
 
+        if self._is_fulltext_search_enabled(metadata):
+            await self.enable_fulltext_search(collection_id)
+
         logger.info("Updated metadata for collection '%s'", collection_id)
 
     async def replace_collection_metadata(self, collection_id: str, metadata: dict):
@@ -624,10 +1160,14 @@ class PgVectorStore(DocumentStore):
             metadata.get("updated_by"),
             collection_id,
         )
+        self._invalidate_collection(collection_id)
 
         if result == "UPDATE 0":
             raise LookupError("Nothing was replaced")
 
+        if self._is_fulltext_search_enabled(metadata):
+            await self.enable_fulltext_search(collection_id)
+
         logger.info("Replaced metadata for collection '%s'", collection_id)
 
     async def delete_collection(self, collection_id: str):
@@ -639,6 +1179,7 @@ class PgVectorStore(DocumentStore):
         """,
             collection_id,
         )
+        self._invalidate_collection(collection_id)
 
         if result == "DELETE 0":
             raise LookupError("Nothing was deleted")
@@ -694,6 +1235,33 @@ class PgVectorStore(DocumentStore):
 
         return result
 
+    @override
+    async def iterate_document_manifest(
+        self,
+        collection_id: str,
+    ) -> AsyncIterator[dict]:
+        """Stream the IDs and source metadata of the chunks, projected in the database."""
+        table_name = self._get_documents_table_name(collection_id)
+
+        # Ensure the documents table exists before querying
+        await self._ensure_documents_table_exists(collection_id)
+
+        projection = ", ".join(
+            f"metadata->>'{key}' AS \"{key}\"" for key in self.MANIFEST_METADATA_KEYS
+        )
+        rows = self.client.iterate_query(
+            f"SELECT id::text, {projection} FROM {table_name}"
+        )
+        async for row in rows:
+            yield {
+                "id": row["id"],
+                "metadata": {
+                    key: row[key]
+                    for key in self.MANIFEST_METADATA_KEYS
+                    if row[key] is not None
+                },
+            }
+
     async def list_document_with_offset(
         self,
         collection_id: str,
@@ -773,19 +1341,21 @@ class PgVectorStore(DocumentStore):
         )
         return embeddings
 
+    async def _get_query_embedding(self, collection_id: str, query: str):
+        """Get the (memoized) embedding of a search query using the collection's model."""
+        collection_metadata = await self.get_collection_metadata(collection_id)
+        model_name = collection_metadata.get("ai_model")
+        if not model_name:
+            raise ValueError(f"No model specified for collection {collection_id}")
+        return await get_query_embedding(query, model_name)
+
     async def _get_embedding_by_model(
         self,
         model_system_name: str,
         text: str,
-        **kwargs,
     ):
-        """Get embedding for text using a specific model."""
-        embeddings = await get_embeddings(
-            text=text,
-            model_system_name=model_system_name,
-            **kwargs,
-        )
-        return embeddings
+        """Get the (memoized) embedding of a search query using a specific model."""
+        return await get_query_embedding(text, model_system_name)
 
     async def create_document(self, document: DocumentData, collection_id: str) -> str:
         """Create a single document."""
@@ -812,40 +1382,51 @@ class PgVectorStore(DocumentStore):
         logger.info("Created document in collection '%s'", collection_id)
         return document_id
 
+    @override
+    async def get_collection_embedding_model(self, collection_id: str) -> str | None:
+        collection_metadata = await self.get_collection_metadata(collection_id)
+        return collection_metadata.get("ai_model")
+
+    async def _get_documents_embeddings(
+        self, documents: list[DocumentData], collection_id: str
+    ) -> list[list[float]]:
+        """Embed documents with the collection's model using batched provider requests."""
+        model_name = await self.get_collection_embedding_model(collection_id)
+        if not model_name:
+            raise ValueError(f"No model specified for collection {collection_id}")
+
+        return await get_embeddings_batch(
+            texts=[doc.content for doc in documents],
+            model_system_name=model_name,
+        )
+
     async def create_documents(
         self,
         documents: list[DocumentData],
         collection_id: str,
+        embeddings: list[list[float]] | None = None,
     ) -> list[str]:
-        """Create multiple documents."""
+        """Create multiple documents.
+
+        Batches of at least `bulk_insert_min_rows` documents are loaded with COPY
+        (see `bulk_load_documents`); smaller batches are inserted row by row.
+        """
         if not documents:
             logger.info("No documents to create for collection '%s'", collection_id)
             return []
 
+        if len(documents) >= self.bulk_insert_min_rows:
+            return await self.bulk_load_documents(
+                documents, collection_id, embeddings=embeddings
+            )
+
         table_name = self._get_documents_table_name(collection_id)
 
         # Ensure the documents table exists before creating documents
         await self._ensure_documents_table_exists(collection_id)
 
-        # Pre-fetch collection metadata once to avoid multiple DB calls
-        collection_metadata = await self.get_collection_metadata(collection_id)
-        model_name = collection_metadata.get("ai_model")
-        if not model_name:
-            raise ValueError(f"No model specified for collection {collection_id}")
-
-        # Get embeddings for all documents with reduced concurrency
-        # Process in smaller batches to avoid overwhelming the connection pool
-        batch_size = 10  # Process 10 embeddings at a time
-        embeddings = []
-
-        for i in range(0, len(documents), batch_size):
-            batch_docs = documents[i : i + batch_size]
-            batch_tasks = [
-                self._get_embedding_by_model(model_name, doc.content)
-                for doc in batch_docs
-            ]
-            batch_embeddings = await asyncio.gather(*batch_tasks)
-            embeddings.extend(batch_embeddings)
+        if embeddings is None:
+            embeddings = await self._get_documents_embeddings(documents, collection_id)
 
         # Use executemany approach by inserting documents one by one in a transaction
         # This avoids the asyncpg parameter type confusion with bulk operations
@@ -880,6 +1461,117 @@ class PgVectorStore(DocumentStore):
 
         return inserted_ids
 
+    async def bulk_load_documents(
+        self,
+        documents: list[DocumentData],
+        collection_id: str,
+        rebuild_index: bool | None = None,
+        embeddings: list[list[float]] | None = None,
+    ) -> list[str]:
+        """Load many documents with a single COPY.
+
+        Rows get client-generated UUIDs and binary-encoded vectors and are streamed
+        into a temporary staging table with COPY, then moved into the documents
+        table with one INSERT ... SELECT, all in one transaction.
+
+        Args:
+            documents: Documents to create
+            collection_id: Collection ID
+            rebuild_index: Drop the vector index before loading and rebuild it once
+                afterwards, which is much faster than maintaining the index row by
+                row on full re-syncs. Dropping the index locks the table until the
+                load commits, blocking searches of the collection, so it is only
+                done for loads into an empty table, which searches cannot miss
+                anything in. By default the load must also have at least
+                `bulk_rebuild_index_min_rows` documents; `True` skips that check and
+                `False` never drops the index.
+            embeddings: Vectors of the documents, computed when not given.
+
+        Returns:
+            IDs of the created documents, in the order of `documents`.
+        """
+        if not documents:
+            return []
+
+        table_name = self._get_documents_table_name(collection_id)
+        await self._ensure_documents_table_exists(collection_id)
+
+        if embeddings is None:
+            embeddings = await self._get_documents_embeddings(documents, collection_id)
+
+        document_ids = [uuid.uuid4() for _ in documents]
+        records = [
+            (
+                document_id,
+                doc.content,
+                json.dumps(doc.metadata) if doc.metadata is not None else None,
+                embedding,
+            )
+            for document_id, doc, embedding in zip(document_ids, documents, embeddings)
+        ]
+
+        await self.client._ensure_pool_initialized()
+        if not self.client.pool:
+            raise RuntimeError("Connection pool is not initialized")
+
+        start_time = time.perf_counter()
+        async with self.client.pool.acquire() as connection:
+            async with connection.transaction():
+                if rebuild_index is None:
+                    rebuild_index = len(documents) >= self.bulk_rebuild_index_min_rows
+                if rebuild_index:
+                    # Never drop the index of a table that is already searched
+                    table_has_rows = await connection.fetchval(
+                        f"SELECT EXISTS (SELECT 1 FROM {table_name})"
+                    )
+                    rebuild_index = not table_has_rows
+                if rebuild_index:
+                    index_config = await self._get_vector_index_config(
+                        collection_id, len(embeddings[0])
+                    )
+                    # Holds an exclusive lock on the table until the load commits
+                    await connection.execute(
+                        f"DROP INDEX IF EXISTS {index_config.index_name(table_name)}"
+                    )
+
+                # Staging table keeps metadata as text: asyncpg's COPY needs binary
+                # codecs and jsonb is registered with a text codec
+                await connection.execute("""
+                    CREATE TEMP TABLE pgvector_bulk_load (
+                        id UUID,
+                        content TEXT,
+                        metadata TEXT,
+                        embedding vector
+                    ) ON COMMIT DROP
+                """)
+                await connection.copy_records_to_table(
+                    "pgvector_bulk_load",
+                    records=records,
+                    columns=["id", "content", "metadata", "embedding"],
+                )
+                await connection.execute(f"""
+                    INSERT INTO {table_name} (id, content, metadata, embedding)
+                    SELECT id, content, metadata::jsonb, embedding
+                    FROM pgvector_bulk_load
+                """)
+
+                if rebuild_index:
+                    await self._create_vector_index(
+                        collection_id, len(embeddings[0]), connection=connection
+                    )
+
+        duration = time.perf_counter() - start_time
+        logger.info(
+            "Bulk loaded %d documents into collection '%s' in %.2fs (%.0f rows/s%s)",
+            len(records),
+            collection_id,
+            duration,
+            len(records) / duration if duration > 0 else float(len(records)),
+            ", vector index rebuilt" if rebuild_index else "",
+        )
+
+        return [str(document_id) for document_id in document_ids]
+
     async def get_document(self, document_id: str, collection_id: str) -> dict:
         """Get a single document."""
         table_name = self._get_documents_table_name(collection_id)
@@ -1178,15 +1870,13 @@ class PgVectorStore(DocumentStore):
             f"Performing vector search in collection_id: {collection_id} with num_results: {num_results}",
         )
 
-        await self._assert_collection_exist(collection_id)
+        # Raises LookupError if the collection does not exist
+        collection_metadata = await self.get_collection_metadata(collection_id)
         table_name = self._get_documents_table_name(collection_id)
 
         # Ensure the documents table exists before querying
         await self._ensure_documents_table_exists(collection_id)
 
-        # Get collection metadata for filter building
-        collection_metadata = await self.get_collection_metadata(collection_id)
-
         observability_context.update_current_span(
             description=f"Performing vector search in PostgreSQL with pgvector and taking only {num_results} first results.",
             extra_data={
@@ -1210,24 +1900,37 @@ class PgVectorStore(DocumentStore):
         )
         logger.debug(f"Metadata filter: {metadata_filter}")
 
-        where_clause = "WHERE embedding IS NOT NULL"
+        where_condition = "embedding IS NOT NULL"
         if metadata_filter:
-            where_clause += f" AND ({metadata_filter})"
+            where_condition += f" AND ({metadata_filter})"
 
-        # Perform cosine similarity search
+        # Perform cosine similarity search; ordering by the distance operator itself
+        # lets PostgreSQL use the ANN index
+        index_config = VectorIndexConfig.from_collection_metadata(
+            collection_metadata, len(vector)
+        )
+        nearest_sql = index_config.nearest_sql(table_name, len(vector), where_condition)
         sql = f"""
             SELECT 
-                id::text,
-                content,
-                metadata,
-                1 - (embedding <=> $1) as similarity_score
-            FROM {table_name}
-            {where_clause}
-            ORDER BY similarity_score DESC
-            LIMIT $2
+                d.id::text,
+                d.content,
+                d.metadata,
+                1 - nearest.distance as similarity_score
+            FROM ({nearest_sql}) nearest
+            JOIN {table_name} d ON d.id = nearest.id
+            ORDER BY nearest.distance
         """
         logger.debug(f"Executing vector search query: {sql.strip()}")
-        rows = await self.client.execute_query(sql, vector, num_results)
+        rows = await self.client.execute_query_with_settings(
+            sql,
+            vector,
+            num_results,
+            settings=index_config.search_settings(
+                num_results,
+                iterative_scan=bool(metadata_filter)
+                and await self._supports_iterative_scan(),
+            ),
+        )
 
         result: DocumentSearchResult = []
         for row in rows:
@@ -1251,6 +1954,228 @@ class PgVectorStore(DocumentStore):
 
         return result
 
+    @observe(
+        name="Hybrid search",
+        type=SpanType.SEARCH,
+        capture_input=True,
+        capture_output=True,
+    )
+    async def _hybrid_search(
+        self,
+        *,
+        collection_id: str,
+        query: str,
+        vector: list[float],
+        num_results: int,
+        filter: FilterObject | None = None,
+    ) -> DocumentSearchResult:
+        """Perform vector and keyword search fused with reciprocal rank fusion in one query."""
+        logger.debug(
+            f"Performing hybrid search in collection_id: {collection_id} with num_results: {num_results}",
+        )
+
+        collection_metadata = await self.get_collection_metadata(collection_id)
+        table_name = self._get_documents_table_name(collection_id)
+        await self._ensure_documents_table_exists(collection_id)
+
+        observability_context.update_current_span(
+            description=f"Performing vector and keyword search in PostgreSQL, fusing both rankings with reciprocal rank fusion and taking only {num_results} first results.",
+            extra_data={
+                "table_name": table_name,
+                "store": "pgvector",
+            },
+            input={
+                "collection_id": collection_id,
+                "collection_name": collection_metadata.get("name"),
+                "query": query,
+                "filter": filter.model_dump(exclude_none=True, by_alias=True)
+                if filter
+                else None,
+                "num_results": num_results,
+            },
+        )
+
+        metadata_filter = self.METADATA_FILTER_BUILDER.build(
+            collection_metadata, filter
+        )
+        filter_condition = f" AND ({metadata_filter})" if metadata_filter else ""
+        index_config = VectorIndexConfig.from_collection_metadata(
+            collection_metadata, len(vector)
+        )
+        nearest_sql = index_config.nearest_sql(
+            table_name, len(vector), f"embedding IS NOT NULL{filter_condition}"
+        )
+
+        # Both rankings are limited to num_results, as in the Oracle hybrid search;
+        # RRF score = sum(1 / (k + rank - 1)) over the rankings a document appears in
+        sql = f"""
+            WITH semantic AS (
+                SELECT id, row_number() OVER (ORDER BY distance) AS rank
+                FROM ({nearest_sql}) nearest
+            ),
+            keyword AS (
+                SELECT id, row_number() OVER (ORDER BY text_rank DESC) AS rank
+                FROM (
+                    SELECT id, ts_rank_cd(content_tsv, tsq) AS text_rank
+                    FROM {table_name},
+                        websearch_to_tsquery('{self.FULLTEXT_SEARCH_CONFIG}', $3) tsq
+                    WHERE content_tsv @@ tsq{filter_condition}
+                    ORDER BY text_rank DESC
+                    LIMIT $2
+                ) matched
+            ),
+            fused AS (
+                SELECT id, SUM(1.0 / ($4 + rank - 1)) AS score
+                FROM (
+                    SELECT id, rank FROM semantic
+                    UNION ALL
+                    SELECT id, rank FROM keyword
+                ) rankings
+                GROUP BY id
+            )
+            SELECT d.id::text, d.content, d.metadata, fused.score
+            FROM fused
+            JOIN {table_name} d ON d.id = fused.id
+            ORDER BY fused.score DESC
+            LIMIT $2
+        """
+        logger.debug(f"Executing hybrid search query: {sql.strip()}")
+        rows = await self.client.execute_query_with_settings(
+            sql,
+            vector,
+            num_results,
+            query,
+            self.RRF_K,
+            settings=index_config.search_settings(
+                num_results,
+                iterative_scan=bool(metadata_filter)
+                and await self._supports_iterative_scan(),
+            ),
+        )
+
+        result: DocumentSearchResult = [
+            DocumentSearchResultItem(
+                id=row["id"],
+                score=Decimal(str(row["score"])).quantize(
+                    Decimal("0.0000"), rounding=ROUND_HALF_UP
+                ),
+                content=row["content"],
+                collection_id=collection_id,
+                metadata=row["metadata"] if row["metadata"] else {},
+            )
+            for row in rows
+        ]
+        logger.debug(
+            f"Hybrid search found {len(result)} results in collection '{collection_id}'",
+        )
+
+        return result
+
+    @observe(
+        name="Multi-collection vector search",
+        type=SpanType.SEARCH,
+        capture_input=True,
+        capture_output=True,
+    )
+    async def _multi_collection_vector_search(
+        self,
+        *,
+        collection_ids: list[str],
+        query: str,
+        vector: list[float],
+        num_results: int,
+        filter: FilterObject | None = None,
+    ) -> DocumentSearchResult:
+        """Vector search over collections of one embedding model in a single statement.
+
+        Each collection contributes its own index-ordered top-k branch to a
+        UNION ALL, so the results are those of one search per collection while
+        only one pool connection is used regardless of the number of collections.
+        """
+        branches = []
+        search_settings: dict[str, str] = {}
+        for collection_id in collection_ids:
+            collection_metadata = await self.get_collection_metadata(collection_id)
+            await self._ensure_documents_table_exists(collection_id)
+            table_name = self._get_documents_table_name(collection_id)
+
+            where_condition = "embedding IS NOT NULL"
+            metadata_filter = self.METADATA_FILTER_BUILDER.build(
+                collection_metadata, filter
+            )
+            if metadata_filter:
+                where_condition += f" AND ({metadata_filter})"
+
+            index_config = VectorIndexConfig.from_collection_metadata(
+                collection_metadata, len(vector)
+            )
+            nearest_sql = index_config.nearest_sql(
+                table_name, len(vector), where_condition
+            )
+            collection_literal = collection_id.replace("'", "''")
+            branches.append(f"""
+                (
+                    SELECT
+                        '{collection_literal}' AS collection_id,
+                        d.id::text AS id,
+                        d.content,
+                        d.metadata,
+                        nearest.distance
+                    FROM ({nearest_sql}) nearest
+                    JOIN {table_name} d ON d.id = nearest.id
+                )
+            """)
+            # The strictest setting of any collection applies to the whole statement
+            collection_settings = index_config.search_settings(
+                num_results,
+                iterative_scan=bool(metadata_filter)
+                and await self._supports_iterative_scan(),
+            )
+            for name, value in collection_settings.items():
+                if not value.isdigit() or int(value) > int(
+                    search_settings.get(name, 0)
+                ):
+                    search_settings[name] = value
+
+        observability_context.update_current_span(
+            description=f"Performing vector search in {len(collection_ids)} PostgreSQL collections with one statement and taking only {num_results} first results of each.",
+            extra_data={"store": "pgvector"},
+            input={
+                "collection_ids": collection_ids,
+                "query": query,
+                "filter": filter.model_dump(exclude_none=True, by_alias=True)
+                if filter
+                else None,
+                "num_results": num_results,
+            },
+        )
+
+        sql = f"""
+            SELECT
+                collection_id,
+                id,
+                content,
+                metadata,
+                1 - distance AS similarity_score
+            FROM ({" UNION ALL ".join(branches)}) candidates
+            ORDER BY distance
+        """
+        logger.debug(f"Executing multi-collection vector search query: {sql.strip()}")
+        rows = await self.client.execute_query_with_settings(
+            sql, vector, num_results, settings=search_settings
+        )
+
+        return [
+            DocumentSearchResultItem(
+                id=row["id"],
+                score=Decimal(str(row["similarity_score"])),
+                content=row["content"],
+                collection_id=row["collection_id"],
+                metadata=row["metadata"] if row["metadata"] else {},
+            )
+            for row in rows
+        ]
+
     async def document_collection_similarity_search(
         self,
         collection_id: str,
@@ -1263,7 +2188,7 @@ class PgVectorStore(DocumentStore):
             f"Performing similarity search on collection_id: {collection_id} with query: {query}",
         )
 
-        vector = await self._get_embedding(collection_id, query)
+        vector = await self._get_query_embedding(collection_id, query)
         return await self._vector_search(
             collection_id=collection_id,
             query=query,
@@ -1332,52 +2257,45 @@ class PgVectorStore(DocumentStore):
         async def _search_in_collection(cid: str):
             try:
                 collection_config = await self.get_collection_metadata(cid)
-                indexing = collection_config.get("indexing", {})
-                semantic_search_needed = True
-                keyword_search_needed = use_keyword_search and indexing.get(
-                    "fulltext_search_supported"
+                keyword_search_needed = (
+                    use_keyword_search
+                    and self._is_fulltext_search_enabled(collection_config)
                 )
-
-                semantic_search_task = asyncio.sleep(0)
-                if semantic_search_needed:
-                    model_name = collection_model_map[cid]
-                    vector_for_collection = embedding_cache.get(model_name)
-
-                    if vector_for_collection:
-                        semantic_search_task = self._vector_search(
-                            collection_id=cid,
-                            query=query,
-                            vector=vector_for_collection,
-                            num_results=num_results,
-                            filter=filter,
-                        )
-                    else:
-                        logger.error(
-                            f"Skipping collection {cid} due to missing embedding for model {model_name}"
-                        )
-
-                # Note: PgVector doesn't support full-text search like Oracle
-                # For now, we only implement semantic search
-                # If keyword search is needed, it would require additional implementation
-                keyword_search_task = asyncio.sleep(0)
-                if keyword_search_needed:
+                if keyword_search_needed and not await self._is_fulltext_search_ready(
+                    cid
+                ):
                     logger.warning(
-                        f"Full-text search requested for collection {cid} but not implemented in PgVector store"
+                        "Collection %s has no full-text search index yet (it is "
+                        "built after its indexing settings are saved), using vector "
+                        "search",
+                        cid,
                     )
+                    keyword_search_needed = False
 
-                semantic_search_result, keyword_search_result = await asyncio.gather(
-                    semantic_search_task, keyword_search_task
-                )
-
-                if semantic_search_needed and keyword_search_needed:
-                    # For now, just return semantic search results since keyword search isn't implemented
-                    return semantic_search_result or []
-                if semantic_search_needed:
-                    return semantic_search_result or []
-                if keyword_search_needed:
-                    return keyword_search_result or []
+                model_name = collection_model_map[cid]
+                vector_for_collection = embedding_cache.get(model_name)
+                if not vector_for_collection:
+                    logger.error(
+                        f"Skipping collection {cid} due to missing embedding for model {model_name}"
+                    )
+                    return []
 
-                return []
+                # Keyword and semantic rankings are fused in a single statement
+                search = (
+                    self._hybrid_search
+                    if keyword_search_needed
+                    else self._vector_search
+                )
+                return (
+                    await search(
+                        collection_id=cid,
+                        query=query,
+                        vector=vector_for_collection,
+                        num_results=num_results,
+                        filter=filter,
+                    )
+                    or []
+                )
             except Exception as e:
                 logger.error(
                     "Exception in _search_in_collection for collection %s: %s",
@@ -1387,8 +2305,54 @@ class PgVectorStore(DocumentStore):
                 )
                 return []
 
+        async def _search_in_model_group(model_name: str, cids: list[str]):
+            vector_for_model = embedding_cache.get(model_name)
+            if not vector_for_model:
+                logger.error(
+                    f"Skipping collections {cids} due to missing embedding for model {model_name}"
+                )
+                return []
+            try:
+                return await self._multi_collection_vector_search(
+                    collection_ids=cids,
+                    query=query,
+                    vector=vector_for_model,
+                    num_results=num_results,
+                    filter=filter,
+                )
+            except Exception as e:
+                logger.error(
+                    "Exception in multi-collection search for collections %s, "
+                    "searching them one by one: %s",
+                    cids,
+                    e,
+                    exc_info=True,
+                )
+                results = await asyncio.gather(
+                    *(_search_in_collection(cid) for cid in cids)
+                )
+                return [item for result in results for item in result]
+
         # Execute searches in parallel
-        search_tasks = [_search_in_collection(cid) for cid in collection_ids]
+        if self.multi_collection_single_query:
+            # Vector-only collections sharing a model are searched with one statement,
+            # hybrid searches keep their per-collection rank fusion
+            search_tasks = []
+            collections_by_model: dict[str, list[str]] = {}
+            for cid, model_name in collection_model_map.items():
+                collection_config = await self.get_collection_metadata(cid)
+                if use_keyword_search and self._is_fulltext_search_enabled(
+                    collection_config
+                ):
+                    search_tasks.append(_search_in_collection(cid))
+                else:
+                    collections_by_model.setdefault(model_name, []).append(cid)
+            search_tasks.extend(
+                _search_in_model_group(model_name, cids)
+                for model_name, cids in collections_by_model.items()
+            )
+        else:
+            search_tasks = [_search_in_collection(cid) for cid in collection_ids]
         all_results_nested = await asyncio.gather(*search_tasks)
 
         # Flatten results
@@ -0,0 +1,234 @@
+"""ANN index settings of pgvector collections.
+
+Settings are read from the collection's ``indexing.vector_index`` object::
+
+    {
+        "type": "hnsw",            # "hnsw" | "ivfflat" | "none"
+        "quantization": "auto",    # "auto" | "none" | "halfvec" | "binary"
+        "m": 16,                   # HNSW graph degree
+        "ef_construction": 64,     # HNSW build-time candidate list size
+        "ef_search": 40,           # HNSW search-time candidate list size
+        "lists": 100,              # IVFFlat number of lists
+        "probes": 1,               # IVFFlat lists scanned per query
+        "rerank_factor": 4         # candidates per result re-ranked with full vectors
+    }
+
+pgvector can index ``vector`` columns of up to 2000 dimensions only. With
+``quantization: auto`` larger embeddings are indexed as ``halfvec`` (up to 4000
+dimensions) or binary-quantized ``bit`` (up to 64000 dimensions) expression
+indexes; the candidates found through the quantized index are re-ranked against
+the full-precision vectors.
+"""
+
+import hashlib
+import json
+from dataclasses import asdict, dataclass
+from logging import getLogger
+
+logger = getLogger(__name__)
+
+VECTOR_MAX_INDEX_DIMENSIONS = 2000
+HALFVEC_MAX_INDEX_DIMENSIONS = 4000
+BIT_MAX_INDEX_DIMENSIONS = 64000
+
+# hnsw.ef_search server default and maximum
+HNSW_DEFAULT_EF_SEARCH = 40
+HNSW_MAX_EF_SEARCH = 1000
+
+INDEX_TYPES = ("hnsw", "ivfflat", "none")
+QUANTIZATIONS = ("auto", "none", "halfvec", "binary")
+
+
+@dataclass(frozen=True)
+class VectorIndexConfig:
+    type: str = "hnsw"
+    quantization: str = "none"
+    m: int = 16
+    ef_construction: int = 64
+    ef_search: int | None = None
+    lists: int = 100
+    probes: int | None = None
+    rerank_factor: int = 4
+
+    @classmethod
+    def from_collection_metadata(
+        cls, collection_metadata: dict, vector_size: int
+    ) -> "VectorIndexConfig":
+        """Build the effective index settings of a collection.
+
+        Unknown values fall back to the defaults; ``auto`` quantization is resolved
+        from the vector size.
+        """
+        indexing = collection_metadata.get("indexing") or {}
+        settings = indexing.get("vector_index") or {}
+
+        index_type = settings.get("type", "hnsw")
+        if index_type not in INDEX_TYPES:
+            logger.warning("Unknown vector index type '%s', using hnsw", index_type)
+            index_type = "hnsw"
+
+        quantization = settings.get("quantization", "auto")
+        if quantization not in QUANTIZATIONS:
+            logger.warning("Unknown quantization '%s', using auto", quantization)
+            quantization = "auto"
+        if quantization == "auto":
+            if vector_size <= VECTOR_MAX_INDEX_DIMENSIONS:
+                quantization = "none"
+            elif vector_size <= HALFVEC_MAX_INDEX_DIMENSIONS:
+                quantization = "halfvec"
+            else:
+                quantization = "binary"
+
+        return cls(
+            type=index_type,
+            quantization=quantization,
+            m=int(settings.get("m", cls.m)),
+            ef_construction=int(settings.get("ef_construction", cls.ef_construction)),
+            ef_search=_optional_int(settings.get("ef_search")),
+            lists=int(settings.get("lists", cls.lists)),
+            probes=_optional_int(settings.get("probes")),
+            rerank_factor=max(int(settings.get("rerank_factor", cls.rerank_factor)), 1),
+        )
+
+    @property
+    def is_default(self) -> bool:
+        """Whether these are the settings collections were indexed with historically."""
+        return (self.type, self.quantization, self.m, self.ef_construction) == (
+            "hnsw",
+            "none",
+            16,
+            64,
+        )
+
+    @property
+    def uses_quantization(self) -> bool:
+        return self.quantization != "none"
+
+    def can_index(self, vector_size: int) -> bool:
+        """Whether pgvector supports an index with these settings for the vector size."""
+        if self.type == "none":
+            return False
+        max_dimensions = {
+            "none": VECTOR_MAX_INDEX_DIMENSIONS,
+            "halfvec": HALFVEC_MAX_INDEX_DIMENSIONS,
+            "binary": BIT_MAX_INDEX_DIMENSIONS,
+        }[self.quantization]
+        return vector_size <= max_dimensions
+
+    def index_name(self, table_name: str) -> str:
+        """Name of the vector index; it changes whenever the build settings change."""
+        if self.is_default:
+            # Name used before index settings became configurable
+            # (PostgreSQL truncates identifiers to 63 characters)
+            return f"idx_{table_name}_embedding_cosine"[:63]
+        build_settings = json.dumps(
+            {
+                key: value
+                for key, value in asdict(self).items()
+                if key in ("type", "quantization", "m", "ef_construction", "lists")
+            },
+            sort_keys=True,
+        )
+        digest = hashlib.sha256(build_settings.encode("utf-8")).hexdigest()[:8]
+        return f"idx_{table_name}_emb_{digest}"[:63]
+
+    def indexed_expression(self, vector_size: int) -> str:
+        """Indexed expression with its operator class."""
+        if self.quantization == "halfvec":
+            return f"(embedding::halfvec({vector_size})) halfvec_cosine_ops"
+        if self.quantization == "binary":
+            return f"(binary_quantize(embedding)::bit({vector_size})) bit_hamming_ops"
+        return "embedding vector_cosine_ops"
+
+    def index_ddl(
+        self, table_name: str, vector_size: int, concurrently: bool = False
+    ) -> str:
+        """CREATE INDEX statement for these settings."""
+        if self.type == "ivfflat":
+            with_clause = f"WITH (lists = {self.lists})"
+        else:
+            with_clause = (
+                f"WITH (m = {self.m}, ef_construction = {self.ef_construction})"
+            )
+        return f"""
+            CREATE INDEX {"CONCURRENTLY " if concurrently else ""}IF NOT EXISTS {self.index_name(table_name)}
+            ON {table_name} USING {self.type} ({self.indexed_expression(vector_size)})
+            {with_clause}
+        """
+
+    def candidate_distance(self, vector_size: int, vector_param: str = "$1") -> str:
+        """Distance expression matching the index, used to find candidates."""
+        if self.quantization == "halfvec":
+            return (
+                f"embedding::halfvec({vector_size}) <=> "
+                f"{vector_param}::vector::halfvec({vector_size})"
+            )
+        if self.quantization == "binary":
+            return (
+                f"binary_quantize(embedding)::bit({vector_size}) <~> "
+                f"binary_quantize({vector_param}::vector)::bit({vector_size})"
+            )
+        return f"embedding <=> {vector_param}"
+
+    def nearest_sql(
+        self,
+        table_name: str,
+        vector_size: int,
+        where: str,
+        vector_param: str = "$1",
+        limit_param: str = "$2",
+    ) -> str:
+        """SELECT of (id, distance) of the nearest rows, ordered by exact cosine distance.
+
+        With quantization, ``limit * rerank_factor`` candidates are taken from the
+        quantized index and re-ranked by their full-precision distance.
+        """
+        if not self.uses_quantization:
+            return f"""
+                SELECT id, embedding <=> {vector_param} AS distance
+                FROM {table_name}
+                WHERE {where}
+                ORDER BY distance
+                LIMIT {limit_param}
+            """
+        return f"""
+            SELECT id, embedding <=> {vector_param} AS distance
+            FROM {table_name}
+            WHERE id IN (
+                SELECT id
+                FROM {table_name}
+                WHERE {where}
+                ORDER BY {self.candidate_distance(vector_size, vector_param)}
+                LIMIT {limit_param} * {self.rerank_factor}
+            )
+            ORDER BY distance
+            LIMIT {limit_param}
+        """
+
+    def search_settings(
+        self, num_results: int, iterative_scan: bool = False
+    ) -> dict[str, str]:
+        """Session settings applied (transaction-local) to a search query.
+
+        Returns no settings when the server defaults suffice, so the query does not
+        need a transaction of its own. ``iterative_scan`` (pgvector 0.8+) lets HNSW
+        scans of filtered searches go on until enough rows pass the filter.
+        """
+        settings: dict[str, str] = {}
+        if self.type == "hnsw":
+            # HNSW returns at most ef_search rows, so it must cover all candidates
+            candidates = num_results * (
+                self.rerank_factor if self.uses_quantization else 1
+            )
+            if self.ef_search is not None or candidates > HNSW_DEFAULT_EF_SEARCH:
+                ef_search = max(self.ef_search or HNSW_DEFAULT_EF_SEARCH, candidates)
+                settings["hnsw.ef_search"] = str(min(ef_search, HNSW_MAX_EF_SEARCH))
+            if iterative_scan:
+                settings["hnsw.iterative_scan"] = "strict_order"
+        elif self.type == "ivfflat" and self.probes:
+            settings["ivfflat.probes"] = str(self.probes)
+        return settings
+
+
+def _optional_int(value) -> int | None:
+    return int(value) if value is not None else None
@@ -33,3 +33,20 @@ class OracleDbSerializer(JSONEncoder):
                 return int(obj)
             return float(obj)
         return super().default(obj)
+
+
+def convert_oracle_json(obj: Any) -> Any:
+    """Convert a JSON value fetched from Oracle to plain Python values.
+
+    Same result as a `json.dumps` / `json.loads` round-trip with `OracleDbSerializer`,
+    in one pass over the value. One difference: values the round-trip cannot encode,
+    like the `datetime` and `bytes` of Oracle JSON dates and raw values, raised
+    `TypeError` there and are returned unchanged here.
+    """
+    if isinstance(obj, dict):
+        return {str(key): convert_oracle_json(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [convert_oracle_json(value) for value in obj]
+    if isinstance(obj, Decimal):
+        return int(obj) if int(obj) == float(obj) else float(obj)
+    return obj
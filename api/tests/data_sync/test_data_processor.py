@@ -0,0 +1,44 @@
+import pytest
+
+from data_sources.types.basic_metadata import SourceBasicMetadata
+from data_sync.data_processor import DataProcessor
+
+SOURCE_BASIC_METADATA = [
+    SourceBasicMetadata(title="Unchanged", modified_date="t1", source_id="unchanged"),
+    SourceBasicMetadata(title="Modified", modified_date="t3", source_id="modified"),
+    SourceBasicMetadata(title="New", modified_date="t1", source_id="new"),
+]
+
+EXISTING_DOCUMENTS = [
+    {"id": "doc-1", "metadata": {"sourceId": "unchanged", "modifiedTime": "t1"}},
+    {"id": "doc-2", "metadata": {"sourceId": "modified", "modifiedTime": "t2"}},
+    {"id": "doc-3", "metadata": {"sourceId": "unchanged", "modifiedTime": "t1"}},
+    {"id": "doc-4", "metadata": {"sourceId": "deleted", "modifiedTime": "t1"}},
+    {"id": "doc-5", "metadata": {}},
+]
+
+
+async def _manifest(documents: list[dict]):
+    for document in documents:
+        yield document
+
+
+@pytest.mark.asyncio
+async def test_streamed_manifest_gives_the_same_update_as_documents_list():
+    data_processor = DataProcessor()
+
+    from_list = data_processor.get_incremental_update_data(
+        SOURCE_BASIC_METADATA, EXISTING_DOCUMENTS
+    )
+    from_manifest = await data_processor.get_incremental_update_data_from_manifest(
+        SOURCE_BASIC_METADATA, _manifest(EXISTING_DOCUMENTS)
+    )
+
+    assert sorted(from_manifest.source_record_ids_to_add) == ["modified", "new"]
+    assert sorted(from_manifest.document_ids_to_delete) == ["doc-2", "doc-4", "doc-5"]
+    assert sorted(from_list.source_record_ids_to_add) == sorted(
+        from_manifest.source_record_ids_to_add
+    )
+    assert sorted(from_list.document_ids_to_delete) == sorted(
+        from_manifest.document_ids_to_delete
+    )
@@ -0,0 +1,57 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from pytest_mock import MockerFixture
+
+import data_sync.synchronizer as synchronizer_module
+from data_sources.types.incremental_update_data import IncrementalUpdateData
+from data_sync.synchronizer import Synchronizer
+from models import DocumentData
+
+
+@pytest.mark.asyncio
+async def test_documents_are_embedded_in_batches_and_saved_one_by_one(
+    mocker: MockerFixture,
+):
+    async def create_chunks_from_doc(doc_id):
+        if doc_id == "broken":
+            raise ValueError("download failed")
+        return [
+            DocumentData(content=f"{doc_id} {index}", metadata={"sourceId": doc_id})
+            for index in range(2)
+        ]
+
+    async def get_embeddings_batch(texts, model_system_name):
+        return [[float(len(text))] for text in texts]
+
+    embed = mocker.patch.object(
+        synchronizer_module,
+        "get_embeddings_batch",
+        AsyncMock(side_effect=get_embeddings_batch),
+    )
+    data_processor = MagicMock()
+    data_processor.create_chunks_from_doc = AsyncMock(
+        side_effect=create_chunks_from_doc
+    )
+    data_store = MagicMock()
+    data_store.get_collection_embedding_model = AsyncMock(return_value="embedding")
+    data_store.create_documents = AsyncMock()
+    data_store.delete_documents = AsyncMock()
+
+    synchronizer = Synchronizer(data_processor=data_processor, data_store=data_store)
+    await synchronizer._Synchronizer__sync_incremental(
+        collection_id="collection",
+        incremental_update_data=IncrementalUpdateData(
+            ["first", "broken", "second", "third"], ["old-chunk"]
+        ),
+    )
+
+    saved = {
+        call.args[0][0].metadata["sourceId"]: (call.args[0], call.kwargs["embeddings"])
+        for call in data_store.create_documents.await_args_list
+    }
+    assert set(saved) == {"first", "second", "third"}
+    for chunks, embeddings in saved.values():
+        assert embeddings == [[float(len(chunk.content))] for chunk in chunks]
+    assert sum(len(call.kwargs["texts"]) for call in embed.await_args_list) == 6
+    data_store.delete_documents.assert_awaited_once()
@@ -0,0 +1,30 @@
+from open_ai.utils_new import split_into_embedding_batches
+
+
+def test_split_into_embedding_batches_respects_max_inputs():
+    texts = [f"text {i}" for i in range(7)]
+
+    batches = split_into_embedding_batches(texts, max_inputs=3, max_tokens=10_000)
+
+    assert batches == [texts[0:3], texts[3:6], texts[6:7]]
+
+
+def test_split_into_embedding_batches_respects_max_tokens():
+    # ~4 characters per token: each text is estimated at 26 tokens
+    texts = ["x" * 100, "y" * 100, "z" * 100]
+
+    batches = split_into_embedding_batches(texts, max_inputs=100, max_tokens=60)
+
+    assert batches == [texts[0:2], texts[2:3]]
+
+
+def test_split_into_embedding_batches_keeps_oversized_text_alone():
+    texts = ["short", "x" * 1_000, "short again"]
+
+    batches = split_into_embedding_batches(texts, max_inputs=100, max_tokens=50)
+
+    assert batches == [["short"], ["x" * 1_000], ["short again"]]
+
+
+def test_split_into_embedding_batches_empty():
+    assert split_into_embedding_batches([], max_inputs=10, max_tokens=100) == []
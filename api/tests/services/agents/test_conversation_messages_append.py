@@ -0,0 +1,71 @@
+import uuid
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from core.db.models.agent_conversation import AgentConversation
+from core.domain.agent_conversation.service import AgentConversationService
+
+
+def _message(index: int) -> dict:
+    return {"id": str(uuid.uuid4()), "role": "user", "content": f"message {index}"}
+
+
+@pytest.mark.asyncio
+async def test_append_and_page_messages_without_jsonb():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as connection:
+        await connection.run_sync(
+            AgentConversation.metadata.create_all,
+            tables=[AgentConversation.__table__],
+        )
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        conversation = AgentConversation(agent="agent", messages=[_message(0)])
+        session.add(conversation)
+        await session.commit()
+
+        service = AgentConversationService(session=session)
+        appended = await service.append_messages(
+            db_session=session,
+            conversation_id=conversation.id,
+            messages=[_message(1), _message(2)],
+            message_processing_status="completed",
+        )
+        messages, total_count, status = await service.get_messages_page(
+            db_session=session,
+            conversation_id=conversation.id,
+            offset=1,
+            limit=1,
+        )
+        missing = await service.append_messages(
+            db_session=session, conversation_id=uuid.uuid4(), messages=[]
+        )
+
+    await engine.dispose()
+
+    assert appended is True
+    assert [message["content"] for message in messages] == ["message 1"]
+    assert total_count == 3
+    assert status == "completed"
+    assert missing is False
+
+
+@pytest.mark.asyncio
+async def test_postgres_append_sends_only_new_messages(mocker):
+    session = mocker.AsyncMock()
+    session.bind.dialect.name = "postgresql"
+    session.execute.return_value.rowcount = 1
+    service = AgentConversationService(session=session)
+
+    await service.append_messages(
+        db_session=session,
+        conversation_id=uuid.uuid4(),
+        messages=[_message(1)],
+    )
+
+    statement = session.execute.call_args.args[0]
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert "coalesce(agent_conversations.messages, '[]'::jsonb) ||" in sql
+    session.get.assert_not_called()
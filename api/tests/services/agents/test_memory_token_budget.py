@@ -0,0 +1,123 @@
+import uuid
+from datetime import datetime
+
+import pytest
+
+from services.agents.memory import (
+    OMITTED_TOOL_OUTPUT,
+    SUMMARY_MESSAGE_PREFIX,
+    TokenBudgetStrategy,
+    create_memory_strategy,
+)
+from services.agents.models import (
+    AgentActionCallRequest,
+    AgentActionCallResponse,
+    AgentActionType,
+    AgentConversationMessageAssistant,
+    AgentConversationMessageUser,
+    AgentConversationRun,
+    AgentConversationRunStepTopicActionCall,
+    AgentTopicActionCall,
+    MemoryStrategyType,
+)
+
+
+def _text(tokens: int) -> str:
+    return "word " * tokens
+
+
+def _user(tokens: int = 100) -> AgentConversationMessageUser:
+    return AgentConversationMessageUser(id=uuid.uuid4(), content=_text(tokens))
+
+
+def _assistant(tokens: int = 100) -> AgentConversationMessageAssistant:
+    return AgentConversationMessageAssistant(id=uuid.uuid4(), content=_text(tokens))
+
+
+def _assistant_with_tool_output(tokens: int) -> AgentConversationMessageAssistant:
+    step = AgentConversationRunStepTopicActionCall(
+        started_at=datetime(2026, 1, 1),
+        details=AgentTopicActionCall(
+            request=AgentActionCallRequest(
+                id="call_1",
+                function_name="search",
+                arguments={},
+                action_type=AgentActionType.RAG,
+                action_system_name="search",
+                action_tool_system_name="search",
+                action_display_name="Search",
+            ),
+            response=AgentActionCallResponse(content=_text(tokens)),
+        ),
+    )
+    return AgentConversationMessageAssistant(
+        id=uuid.uuid4(), run=AgentConversationRun(steps=[step])
+    )
+
+
+def test_create_token_budget_strategy():
+    strategy = create_memory_strategy(MemoryStrategyType.TOKEN_BUDGET, max_tokens=2000)
+
+    assert isinstance(strategy, TokenBudgetStrategy)
+    assert strategy.max_tokens == 2000
+
+
+def test_oversized_tool_outputs_are_dropped_before_turns():
+    messages = [
+        _user(),
+        _assistant_with_tool_output(800),
+        _user(),
+        _assistant(),
+        _user(),
+    ]
+    strategy = TokenBudgetStrategy(max_tokens=1000)
+
+    selected = strategy.select_messages(messages)
+
+    assert [message.id for message in selected] == [message.id for message in messages]
+    assert (
+        selected[1]
+        .run.steps[0]
+        .details.response.content.startswith(OMITTED_TOOL_OUTPUT.split("(")[0])
+    )
+    # The conversation itself is left untouched
+    assert messages[1].run.steps[0].details.response.content == _text(800)
+
+
+@pytest.mark.asyncio
+async def test_evicted_turns_are_summarized_incrementally():
+    calls = []
+
+    async def summarize(summary, messages):
+        calls.append((summary, [message.id for message in messages]))
+        return f"summary {len(calls)}"
+
+    messages = [
+        _user(),
+        _assistant(),
+        _user(),
+        _assistant(),
+        _user(),
+        _assistant(),
+        _user(),
+    ]
+    strategy = TokenBudgetStrategy(max_tokens=600, summarize=summarize)
+
+    summary = await strategy.prepare(messages)
+    selected = strategy.select_messages(messages)
+
+    assert calls == [(None, [message.id for message in messages[:4]])]
+    assert summary.last_message_id == messages[3].id
+    assert selected[0].content == SUMMARY_MESSAGE_PREFIX + "summary 1"
+    assert [message.id for message in selected[1:]] == [
+        message.id for message in messages[4:]
+    ]
+
+    # The next turn starts from the cached summary
+    messages[5].memory_summary = summary
+    messages += [_assistant(), _user()]
+    strategy = TokenBudgetStrategy(max_tokens=600, summarize=summarize)
+    await strategy.prepare(messages)
+
+    assert calls[1] == ("summary 1", [messages[4].id, messages[5].id])
+    assert strategy.summary.last_message_id == messages[5].id
@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+from pytest_mock import MockerFixture
+
+from services.agents import topic_execution
+from services.agents.models import (
+    AgentActionCallRequest,
+    AgentActionCallResponse,
+    AgentActionType,
+)
+
+
+def _request(id: str) -> AgentActionCallRequest:
+    return AgentActionCallRequest(
+        id=id,
+        function_name="test_function",
+        arguments={},
+        action_type=AgentActionType.RAG,
+        action_system_name="test_action",
+        action_tool_system_name="test_tool",
+        action_display_name="Test Action",
+    )
+
+
+@pytest.mark.asyncio
+async def test_action_calls_run_concurrently_with_ordered_steps(
+    mocker: MockerFixture,
+):
+    running = 0
+    max_running = 0
+
+    async def execute(request):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        # Later calls finish first
+        await asyncio.sleep(0.01 * (5 - int(request.id)))
+        running -= 1
+        if request.id == "3":
+            raise RuntimeError("internal details")
+        return AgentActionCallResponse(content=f"response {request.id}")
+
+    mocker.patch.object(topic_execution, "execute_agent_action", side_effect=execute)
+
+    semaphore = asyncio.Semaphore(2)
+    steps = await asyncio.gather(
+        *(
+            topic_execution._execute_action_call(_request(str(i)), semaphore)
+            for i in range(5)
+        )
+    )
+
+    assert max_running == 2
+    assert [step.details.request.id for step in steps] == ["0", "1", "2", "3", "4"]
+    assert steps[0].details.response.content == "response 0"
+    assert "internal details" not in steps[3].details.response.content
+
+
+@pytest.mark.asyncio
+async def test_action_call_timeout_is_reported_as_response(mocker: MockerFixture):
+    async def execute(request):
+        await asyncio.sleep(1)
+
+    mocker.patch.object(topic_execution, "execute_agent_action", side_effect=execute)
+    mocker.patch.object(topic_execution, "EXECUTE_ACTION_TIMEOUT_SECONDS", 0.01)
+
+    step = await topic_execution._execute_action_call(
+        _request("1"), asyncio.Semaphore(1)
+    )
+
+    assert step.details.response.content == topic_execution._sanitize_action_error(
+        TimeoutError()
+    )
@@ -1,5 +1,6 @@
 """Tests for content_load_services (sync and async loaders)."""
 
+import time
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -8,6 +9,10 @@ from services.knowledge_graph.content_load_services import (
     load_content_from_bytes,
     load_content_from_bytes_async,
 )
+from services.knowledge_graph.extraction_pool import (
+    ContentExtractionPool,
+    ContentExtractionTimeoutError,
+)
 from services.knowledge_graph.models import ContentConfig, ContentReaderName
 
 
@@ -137,3 +142,43 @@ class TestLoadContentFromBytesAsync:
 
             call_kwargs = fake_reader.extract_from_bytes.call_args
             assert call_kwargs[1]["mime_type"] == "text/html"
+
+    @pytest.mark.asyncio
+    async def test_pdf_runs_in_extraction_pool(self):
+        config = ContentConfig(
+            name="pdf",
+            enabled=True,
+            glob_pattern="*.pdf",
+            reader={"name": ContentReaderName.PDF, "options": {}},
+            chunker={"strategy": "recursive", "options": {}},
+        )
+        extracted = {"raw_text": "pdf", "text": "pdf", "metadata": {}}
+
+        with patch(
+            "services.knowledge_graph.content_load_services.content_extraction_pool"
+        ) as pool:
+            pool.run = AsyncMock(return_value=extracted)
+            result = await load_content_from_bytes_async(b"fake-pdf", config)
+
+        assert result == extracted
+        pool.run.assert_awaited_once_with(
+            load_content_from_bytes, b"fake-pdf", config, context=None
+        )
+
+
+# ---------------------------------------------------------------------------
+# Extraction pool
+# ---------------------------------------------------------------------------
+
+
+class TestContentExtractionPool:
+    @pytest.mark.asyncio
+    async def test_runs_in_thread_without_workers(self):
+        pool = ContentExtractionPool(workers=0, max_queue=2)
+        assert await pool.run(sum, [1, 2, 3]) == 6
+
+    @pytest.mark.asyncio
+    async def test_timeout(self):
+        pool = ContentExtractionPool(workers=0, timeout_seconds=0.01)
+        with pytest.raises(ContentExtractionTimeoutError):
+            await pool.run(time.sleep, 0.2)
@@ -0,0 +1,36 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from pytest_mock import MockerFixture
+
+import core.domain.knowledge_graph  # noqa: F401 - resolves the sources import cycle
+from services.knowledge_graph.sources import abstract_source
+from services.knowledge_graph.sources.abstract_source import AbstractDataSource
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_falls_back_to_embedding_chunks_one_by_one(
+    mocker: MockerFixture,
+):
+    async def get_embeddings(text, model_system_name):
+        if text == "bad":
+            raise ValueError("input rejected")
+        return [float(len(text))]
+
+    mocker.patch.object(
+        abstract_source,
+        "get_embeddings_batch",
+        AsyncMock(side_effect=ValueError("input rejected")),
+    )
+    mocker.patch.object(
+        abstract_source, "get_embeddings", AsyncMock(side_effect=get_embeddings)
+    )
+    chunks = [
+        SimpleNamespace(embedded_content=content, content_embedding=None)
+        for content in ["good", "bad", "fine!"]
+    ]
+
+    await AbstractDataSource._add_embeddings_to_chunks(MagicMock(), chunks, "model")
+
+    assert [chunk.content_embedding for chunk in chunks] == [[4.0], None, [5.0]]
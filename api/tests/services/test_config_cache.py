@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+from pytest_mock import MockerFixture
+
+from services.config_cache import ConfigCache, ConfigNamespace
+
+
+def _cache(mocker: MockerFixture, versions: dict[str, int]) -> ConfigCache:
+    cache = ConfigCache(version_check_seconds=0)
+    mocker.patch.object(cache, "_read_versions", side_effect=lambda: dict(versions))
+    mocker.patch.object(cache, "_publish_invalidation")
+    return cache
+
+
+@pytest.mark.asyncio
+async def test_values_are_loaded_once_and_copied(mocker: MockerFixture):
+    cache = _cache(mocker, {})
+    loads = 0
+
+    async def load():
+        nonlocal loads
+        loads += 1
+        await asyncio.sleep(0.01)
+        return {"system_name": "agent", "variants": []}
+
+    first, second, _ = await asyncio.gather(
+        *(cache.get_or_load(ConfigNamespace.AGENTS, "agent", load) for _ in range(3))
+    )
+    first["variants"].append("changed")
+    cached = await cache.get_or_load(ConfigNamespace.AGENTS, "agent", load)
+
+    assert loads == 1
+    assert second == {"system_name": "agent", "variants": []}
+    assert cached == {"system_name": "agent", "variants": []}
+
+
+@pytest.mark.asyncio
+async def test_errors_are_not_cached(mocker: MockerFixture):
+    cache = _cache(mocker, {})
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        raise LookupError("not found")
+
+    for _ in range(2):
+        with pytest.raises(LookupError):
+            await cache.get_or_load(ConfigNamespace.AGENTS, "missing", load)
+
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_version_change_in_another_worker_reloads_entries(
+    mocker: MockerFixture,
+):
+    versions = {"agents": 1}
+    cache = _cache(mocker, versions)
+    values = iter(["v1", "v2", "v3"])
+
+    async def load():
+        return next(values)
+
+    async def get():
+        return await cache.get_or_load(ConfigNamespace.AGENTS, "agent", load)
+
+    assert await get() == "v1"
+    assert await get() == "v1"
+
+    versions["agents"] = 2  # Bumped by another worker
+    assert await get() == "v2"
+
+    await cache.invalidate(ConfigNamespace.AGENTS)
+    cache._publish_invalidation.assert_called_once_with(ConfigNamespace.AGENTS)
+    versions["agents"] = 3
+    assert await get() == "v3"
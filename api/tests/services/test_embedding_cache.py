@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+from services.ai_services.embedding_cache import (
+    EmbeddingCache,
+    QueryEmbeddingMemo,
+    get_model_fingerprint,
+    hash_text,
+)
+
+
+def test_model_fingerprint_changes_with_vector_settings():
+    config = {
+        "ai_model": "text-embedding-3-small",
+        "provider_system_name": "openai",
+        "configs": {"vector_size": 1536},
+    }
+    resized = {**config, "configs": {"vector_size": 512}}
+
+    assert get_model_fingerprint(config) == get_model_fingerprint(dict(config))
+    assert get_model_fingerprint(config) != get_model_fingerprint(resized)
+
+
+@pytest.mark.asyncio
+async def test_memory_tier_hit_and_invalidate():
+    cache = EmbeddingCache(persistent_enabled=False)
+    text_hash = hash_text("hello")
+
+    assert await cache.get_many("emb", "fp", {text_hash}) == {}
+    await cache.set_many("emb", "fp", {text_hash: [0.1, 0.2]})
+    hit = await cache.get_many("emb", "fp", {text_hash})
+    other_fingerprint = await cache.get_many("emb", "fp2", {text_hash})
+    await cache.invalidate_model("emb")
+    after_invalidate = await cache.get_many("emb", "fp", {text_hash})
+
+    assert hit == {text_hash: [0.1, 0.2]}
+    assert other_fingerprint == {}
+    assert after_invalidate == {}
+    assert cache.stats.memory_hits == 1
+    assert cache.stats.misses == 3
+
+
+@pytest.mark.asyncio
+async def test_query_memo_single_flight_and_hit():
+    memo = QueryEmbeddingMemo()
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return [1.0, 2.0]
+
+    concurrent = await asyncio.gather(
+        *[memo.get_or_compute("emb", "what is rag?", compute) for _ in range(5)]
+    )
+    repeated = await memo.get_or_compute("emb", "  what is   rag? ", compute)
+
+    assert calls == 1
+    assert concurrent == [[1.0, 2.0]] * 5
+    assert repeated == [1.0, 2.0]
+    assert memo.stats.misses == 1
+    assert memo.stats.coalesced == 4
+    assert memo.stats.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_query_memo_does_not_cache_failures():
+    memo = QueryEmbeddingMemo()
+
+    async def failing():
+        raise RuntimeError("provider down")
+
+    with pytest.raises(RuntimeError):
+        await memo.get_or_compute("emb", "q", failing)
+
+    retried = await memo.get_or_compute("emb", "q", lambda: asyncio.sleep(0, [3.0]))
+
+    assert retried == [3.0]
+    assert memo.stats.errors == 1
@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+
+from services.evaluation.concurrency import (
+    AdaptiveConcurrencyLimiter,
+    is_rate_limit_error,
+)
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+@pytest.mark.asyncio
+async def test_slots_are_limited():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=2)
+    peak = 0
+
+    async def call():
+        nonlocal peak
+        async with limiter.slot():
+            peak = max(peak, limiter.in_flight)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(call() for _ in range(6)))
+
+    assert peak == 2
+
+
+def test_limit_grows_additively_on_successful_calls():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=4)
+
+    for _ in range(3):  # 2 + 1/2 + 1/2.5 + 1/2.9
+        limiter.on_success(1.0)
+
+    assert limiter.limit == 3
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_halves_limit_and_pauses_dispatch():
+    limiter = AdaptiveConcurrencyLimiter(
+        initial_limit=8, rate_limit_backoff_seconds=0.05
+    )
+    with pytest.raises(RateLimitError):
+        async with limiter.slot():
+            raise RateLimitError()
+
+    assert limiter.limit == 4
+
+    loop = asyncio.get_running_loop()
+    started_at = loop.time()
+    async with limiter.slot():
+        pass
+
+    assert loop.time() - started_at >= 0.04
+
+
+def test_latency_increase_decreases_limit():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=8, latency_tolerance=2.0)
+
+    limiter.on_success(1.0)
+    limiter.on_success(5.0)
+    limiter.on_success(5.0)  # Same congestion, no second decrease
+
+    assert limiter.limit == 6
+
+
+def test_is_rate_limit_error():
+    assert is_rate_limit_error(RateLimitError())
+    assert not is_rate_limit_error(ValueError("bad request"))
@@ -0,0 +1,139 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from core.db.models.evaluation import Evaluation, EvaluationResult
+from services.evaluation.services import (
+    append_evaluation_results,
+    claim_interrupted_evaluation,
+    finish_evaluation,
+    get_evaluation_results,
+    list_evaluations_with_aggregations,
+    renew_evaluation_lease,
+    update_evaluation_score,
+)
+
+
+def _result(latency: float, usage: dict | None = None, **values) -> dict:
+    return {"id": str(uuid.uuid4()), "latency": latency, "usage": usage, **values}
+
+
+@pytest.mark.asyncio
+async def test_results_are_appended_and_summarized():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as connection:
+        await connection.run_sync(
+            Evaluation.metadata.create_all,
+            tables=[Evaluation.__table__, EvaluationResult.__table__],
+        )
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        evaluation = Evaluation(job_id="job", status="in_progress")
+        session.add(evaluation)
+        await session.commit()
+
+        first_batch = [
+            _result(100, {"completion_tokens": 10, "prompt_tokens": 30}),
+            _result(0, {"completion_tokens": 20, "prompt_tokens": 50}),
+        ]
+        second_batch = [_result(300, score=4)]
+        await append_evaluation_results(session, str(evaluation.id), first_batch)
+        await append_evaluation_results(
+            session, str(evaluation.id), second_batch, errors=["timeout"]
+        )
+        updates = (
+            await update_evaluation_score(
+                session, str(evaluation.id), first_batch[0]["id"], 2, "ok"
+            ),
+            await update_evaluation_score(
+                session, str(evaluation.id), second_batch[0]["id"], 5
+            ),
+            await update_evaluation_score(session, str(evaluation.id), "unknown", 1),
+        )
+
+        listed = await list_evaluations_with_aggregations(session)
+        results = await get_evaluation_results(session, [evaluation.id])
+
+    await engine.dispose()
+    appended = first_batch + second_batch
+
+    assert updates == (True, True, False)
+    assert [result["id"] for result in results[evaluation.id]] == [
+        result["id"] for result in appended
+    ]
+    assert results[evaluation.id][0]["score_comment"] == "ok"
+
+    (summary,) = listed
+    assert summary["errors"] == ["timeout"]
+    assert summary["records_count"] == 3
+    assert summary["average_latency"] == 200  # Latency of 0 is not counted
+    assert summary["average_score"] == 3.5
+    assert summary["results_with_score"] == 2
+    assert summary["average_completion_tokens"] == 15
+    assert summary["average_prompt_tokens"] == 40
+    assert summary["average_cached_tokens"] == 0
+
+
+@pytest.mark.asyncio
+async def test_only_evaluations_with_an_expired_lease_are_claimed():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as connection:
+        await connection.run_sync(
+            Evaluation.metadata.create_all,
+            tables=[Evaluation.__table__, EvaluationResult.__table__],
+        )
+
+    now = datetime.now(timezone.utc)
+    tool = {"system_name": "rag", "variant_name": "variant_1"}
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        running = Evaluation(
+            job_id="running",
+            status="in_progress",
+            tool=tool,
+            owner="run-1",
+            heartbeat_at=now,
+        )
+        stopped = Evaluation(
+            job_id="stopped",
+            status="in_progress",
+            tool=tool,
+            owner="run-2",
+            heartbeat_at=now - timedelta(hours=1),
+        )
+        session.add_all([running, stopped])
+        await session.commit()
+
+        async def claim(job_id, owner):
+            return await claim_interrupted_evaluation(
+                session, job_id, "rag", "variant_1", owner, lease_seconds=600
+            )
+
+        assert await claim("running", "run-3") is None
+        claimed = await claim("stopped", "run-3")
+        assert claimed.id == stopped.id
+        assert await claim("stopped", "run-4") is None  # Lease renewed by the claim
+
+        # The stopped run can no longer write to the evaluation
+        await append_evaluation_results(
+            session, str(stopped.id), [_result(100)], owner="run-2"
+        )
+        assert not await renew_evaluation_lease(session, str(stopped.id), "run-2")
+        assert not await finish_evaluation(
+            session, str(stopped.id), "run-2", "failed", now, []
+        )
+        await append_evaluation_results(
+            session, str(stopped.id), [_result(100)], owner="run-3"
+        )
+        assert await finish_evaluation(
+            session, str(stopped.id), "run-3", "completed", now, []
+        )
+
+        results = await get_evaluation_results(session, [stopped.id])
+        await session.refresh(stopped)
+
+    await engine.dispose()
+
+    assert len(results[stopped.id]) == 1
+    assert (stopped.status, stopped.records_count) == ("completed", 1)
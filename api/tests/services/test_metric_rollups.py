@@ -0,0 +1,207 @@
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from pytest_mock import MockerFixture
+from sqlalchemy.sql.dml import Delete, Insert
+
+from services.common.models import LlmResponseFeedback
+from services.observability.rollups import (
+    ROLLUP_LOCK_SQL,
+    UPDATED_HOURS_SQL,
+    MetricsAggregate,
+    add_to_sketch,
+    estimate_sketch,
+    rollup_metrics,
+    split_rollup_filter,
+)
+from services.telemetry.services import (
+    record_tool_response_copy,
+    record_tool_response_feedback,
+)
+
+
+def _row(**values):
+    row = {
+        "status": "success",
+        "channel": "production",
+        "latency": None,
+        "cost": None,
+        "user_id": None,
+        "is_answered": None,
+        "topic": None,
+        "answer_feedback_type": None,
+        "answer_copy": None,
+        "language": None,
+        "resolution_status": None,
+        "sentiment": None,
+        "conversation_topics": None,
+        "conversation_language": None,
+        "avg_tool_call_latency": None,
+        "likes": None,
+        "dislikes": None,
+        "messages_count": None,
+    }
+    row.update(values)
+    return SimpleNamespace(**row)
+
+
+def test_user_sketch_estimates_distinct_values():
+    sketch = bytearray(1024)
+    for i in range(5000):
+        add_to_sketch(sketch, f"user-{i % 2000}")
+
+    assert abs(estimate_sketch(sketch) - 2000) < 2000 * 0.1
+    assert estimate_sketch(bytearray(1024)) == 0
+
+
+def test_aggregate_survives_record_round_trip_and_merge():
+    first = MetricsAggregate()
+    first.add_row(_row(latency=120, cost=0.5, user_id="a", topic="billing"))
+    first.add_row(
+        _row(
+            status="error",
+            latency=None,
+            user_id="b",
+            answer_copy="true",
+            conversation_topics='["billing", "refunds"]',
+            likes="2",
+        )
+    )
+    second = MetricsAggregate()
+    second.add_row(_row(latency=80, cost=1.5, user_id="a", topic="billing"))
+
+    merged = MetricsAggregate.from_record(SimpleNamespace(**first.to_record()))
+    merged.merge(MetricsAggregate.from_record(SimpleNamespace(**second.to_record())))
+
+    assert merged.call_count == 3
+    assert merged.error_count == 1
+    assert merged.avg_latency == 100
+    assert merged.total_cost == 2.0
+    assert merged.unique_user_count == 2
+    assert dict(merged.breakdown("topic")) == {"billing": 2, None: 1}
+    assert dict(merged.breakdown("conversation_topics")) == {"billing": 1, "refunds": 1}
+    assert merged.total("answer_copy") == 1
+    assert merged.total("likes") == 2
+    assert merged.total("feedback_given") == 1
+    assert merged.latency_histogram[1] == 1  # 120 ms
+
+
+def test_split_rollup_filter():
+    start = datetime(2026, 1, 1, 10, 30, tzinfo=timezone.utc)
+    dimension_filter, lower, upper = split_rollup_filter(
+        {
+            "$and": [
+                {"feature_type": {"$eq": "agent"}},
+                {"start_time": {"$gte": start}},
+                {"channel": {"$in": ["production"]}},
+            ]
+        }
+    )
+
+    assert dimension_filter == {
+        "$and": [
+            {"feature_type": {"$eq": "agent"}},
+            {"channel": {"$in": ["production"]}},
+        ]
+    }
+    assert lower == start
+    assert upper is None
+    assert split_rollup_filter({"extra_data.topic": {"$eq": "billing"}}) is None
+    assert split_rollup_filter({"$or": [{"channel": {"$eq": "a"}}]}) is None
+
+
+async def _yield(value):
+    yield value
+
+
+class _RollupSession:
+    """Session of one rollup run over already rolled-up metrics (no new hours)."""
+
+    def __init__(self, rolled_through: datetime, updated_hour: datetime, rows):
+        self.rolled_through = rolled_through
+        self.updated_hour = updated_hour
+        self.rows = rows
+        self.buckets: dict[str, list[dict]] = {}
+
+    async def scalar(self, statement):
+        if statement is ROLLUP_LOCK_SQL:
+            return True
+        return None  # Start time of the next new hour
+
+    async def execute(self, statement, params=None):
+        result = MagicMock()
+        if statement is UPDATED_HOURS_SQL:
+            result.scalars.return_value = [self.updated_hour]
+        elif isinstance(statement, Insert):
+            self.buckets[params[0]["granularity"]] = params
+        elif isinstance(statement, Delete):
+            pass
+        elif "max" in str(statement):
+            result.one.return_value = (self.rolled_through, self.rolled_through)
+        else:  # Hour buckets of the day
+            result.__iter__.return_value = [
+                SimpleNamespace(**bucket) for bucket in self.buckets["hour"]
+            ]
+        return result
+
+    async def stream(self, statement, params):
+        async def rows():
+            for row in self.rows:
+                yield row
+
+        return rows()
+
+    async def commit(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_feedback_on_rolled_up_hour_is_rerolled(mocker: MockerFixture):
+    hour = datetime(2026, 1, 1, 10, tzinfo=timezone.utc)
+    # The metric got feedback after its hour was rolled up
+    session = _RollupSession(
+        rolled_through=hour + timedelta(hours=1),
+        updated_hour=hour,
+        rows=[
+            _row(
+                feature_type="rag",
+                feature_system_name="docs",
+                source=None,
+                consumer_name=None,
+                answer_feedback_type="like",
+            )
+        ],
+    )
+    alchemy = MagicMock()
+    alchemy.get_session = asynccontextmanager(lambda: _yield(session))
+    mocker.patch("core.config.app.alchemy", alchemy)
+
+    await rollup_metrics()
+
+    [hour_bucket] = session.buckets["hour"]
+    [day_bucket] = session.buckets["day"]
+    assert hour_bucket["bucket_start"] == hour
+    assert MetricsAggregate.from_record(SimpleNamespace(**day_bucket)).breakdown(
+        "answer_feedback_type"
+    ) == [("like", 1)]
+
+
+@pytest.mark.asyncio
+async def test_tool_response_feedback_marks_metric_updated(mocker: MockerFixture):
+    session = MagicMock(execute=AsyncMock(), commit=AsyncMock())
+    alchemy = mocker.patch("services.telemetry.services.alchemy")
+    alchemy.get_session = asynccontextmanager(lambda: _yield(session))
+
+    await record_tool_response_feedback(
+        trace_id=None,
+        analytics_id="metric-1",
+        feedback=LlmResponseFeedback(type="like"),
+    )
+    await record_tool_response_copy(trace_id=None, analytics_id="metric-1")
+
+    # The rollup job finds the hours to re-roll by updated_at
+    for call in session.execute.await_args_list:
+        assert "updated_at = now()" in str(call.args[0])
@@ -0,0 +1,80 @@
+import csv
+import json
+from datetime import datetime
+from io import BytesIO, StringIO
+
+import pytest
+from openpyxl import load_workbook
+
+from services.observability import export
+from services.observability.services import (
+    RAG_METRICS_EXPORT_FIELDS,
+    stream_rag_metrics_export,
+)
+
+
+def _metric(i: int) -> dict:
+    return {
+        "feature_system_name": f"rag_{i}",
+        "variant": "variant_1",
+        "consumer_type": "api",
+        "consumer_name": "portal",
+        "start_time": datetime(2026, 1, 1, 12, 0, i),
+        "end_time": None,
+        "latency": 100.0 + i,
+        "cost": 0.01,
+        "extra_data": {
+            "question": "What is\x01 new?",
+            "answer_feedback": {"type": "like"},
+            "answer_copy": True,
+        },
+        "x_attributes": {"org-id": "org"},
+    }
+
+
+async def _metrics(count: int):
+    for i in range(count):
+        yield _metric(i)
+
+
+async def _export_chunks(format: str, count: int) -> list[bytes]:
+    return [chunk async for chunk in stream_rag_metrics_export(_metrics(count), format)]
+
+
+async def _export(format: str, count: int) -> bytes:
+    return b"".join(await _export_chunks(format, count))
+
+
+@pytest.mark.asyncio
+async def test_csv_export_is_streamed_in_chunks(monkeypatch):
+    monkeypatch.setattr(export, "EXPORT_CHUNK_SIZE", 256)
+
+    chunks = await _export_chunks("csv", 20)
+    rows = list(csv.DictReader(StringIO(b"".join(chunks).decode())))
+
+    assert len(chunks) > 1
+    assert len(rows) == 20
+    assert rows[3]["name"] == "rag_3"
+    assert rows[3]["start_time"] == "2026-01-01 12:00:03"
+    assert rows[3]["answer_feedback_type"] == "like"
+
+
+@pytest.mark.asyncio
+async def test_json_export_matches_json_dumps():
+    records = json.loads(await _export("json", 3))
+
+    assert len(records) == 3
+    assert records[0]["consumer"] == {"type": "api", "name": "portal"}
+    assert records[0]["answer_feedback"] == {"type": "like"}
+    assert json.loads(await _export("json", 0)) == []
+
+
+@pytest.mark.asyncio
+async def test_xlsx_export():
+    workbook = load_workbook(BytesIO(await _export("xlsx", 5)), read_only=True)
+    rows = list(workbook.active.iter_rows(values_only=True))
+
+    assert list(rows[0]) == RAG_METRICS_EXPORT_FIELDS
+    assert len(rows) == 6
+    assert rows[1][0] == "rag_0"
+    assert rows[1][RAG_METRICS_EXPORT_FIELDS.index("question")] == "What is new?"
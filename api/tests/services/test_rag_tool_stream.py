@@ -0,0 +1,115 @@
+import asyncio
+import json
+from decimal import Decimal
+
+import pytest
+from pytest_mock import MockerFixture
+
+import services.rag_tools.services as rag_tools_services
+from models import DocumentSearchResultItem
+from services.get_chat_completion_answer import ChatCompletionStreamResult
+from services.rag_tools import execute_rag_tool, stream_rag_tool
+from services.rag_tools.models import RagToolStreamEventType
+
+RAG_TOOL_CONFIG = {
+    "id": "rag-id",
+    "system_name": "rag",
+    "name": "RAG",
+    "language": {
+        "multilanguage": {
+            "enabled": False,
+            "source_language": "English",
+            "prompt_template_translation": "TRANSLATION",
+        },
+    },
+    "retrieve": {
+        "collection_system_names": ["docs"],
+        "similarity_score_threshold": 0.5,
+    },
+    "generate": {"prompt_template": "QA_SYSTEM_PROMPT_TEMPLATE"},
+}
+
+
+def _result() -> DocumentSearchResultItem:
+    return DocumentSearchResultItem(
+        id="chunk-1",
+        content="content",
+        metadata={"title": "Doc"},
+        score=Decimal("0.5"),
+        collection_id="docs",
+    )
+
+
+async def _deltas(*deltas: str):
+    for delta in deltas:
+        yield delta
+
+
+@pytest.mark.asyncio
+async def test_execute_rag_tool_emits_results_and_answer_deltas(
+    mocker: MockerFixture,
+):
+    mocker.patch.object(rag_tools_services, "retrieve", return_value=[_result()])
+    mocker.patch.object(
+        rag_tools_services,
+        "generate_stream",
+        return_value=ChatCompletionStreamResult(answer_deltas=_deltas("Hel", "lo")),
+    )
+    generate = mocker.patch.object(rag_tools_services, "generate")
+    events = []
+
+    result = await execute_rag_tool(
+        system_name_or_config=RAG_TOOL_CONFIG,
+        user_message="Hi",
+        on_event=events.append,
+    )
+
+    assert [event.event for event in events] == [
+        RagToolStreamEventType.RESULTS,
+        RagToolStreamEventType.ANSWER_DELTA,
+        RagToolStreamEventType.ANSWER_DELTA,
+        RagToolStreamEventType.ANSWER,
+    ]
+    assert events[0].data.results[0].score == 0.5
+    assert result.answer == "Hello"
+    assert events[-1].data is result
+    generate.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_stream_closes_after_answer_while_execution_continues():
+    post_processed = asyncio.Event()
+
+    async def execute(on_event):
+        on_event(
+            rag_tools_services.RagToolStreamEvent(
+                event=RagToolStreamEventType.ANSWER_DELTA,
+                data=rag_tools_services.RagToolStreamAnswerDelta(content="Hello"),
+            )
+        )
+        on_event(
+            rag_tools_services.RagToolStreamEvent(
+                event=RagToolStreamEventType.ANSWER,
+                data=rag_tools_services.RagToolTestResult(answer="Hello", results=[]),
+            )
+        )
+        await asyncio.sleep(0.01)  # Post-processing
+        post_processed.set()
+
+    messages = [message async for message in stream_rag_tool(execute)]
+    closed_before_post_processing = not post_processed.is_set()
+    await asyncio.wait_for(post_processed.wait(), timeout=1)
+
+    assert [message.event for message in messages] == ["answer_delta", "answer"]
+    assert json.loads(messages[1].data)["answer"] == "Hello"
+    assert closed_before_post_processing
+
+
+@pytest.mark.asyncio
+async def test_stream_reports_errors():
+    async def execute(on_event):
+        raise RuntimeError("retrieval failed")
+
+    messages = [message async for message in stream_rag_tool(execute)]
+
+    assert [message.event for message in messages] == ["error"]
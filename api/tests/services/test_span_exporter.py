@@ -0,0 +1,168 @@
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import pytest
+from opentelemetry.sdk.trace.export import SpanExportResult
+from pytest_mock import MockerFixture
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+
+from core.db.models.trace import Trace, TraceSpan
+from core.domain.traces.service import TracesService
+
+from services.observability.otel.exporters.sqlalchemy_span_exporter import (
+    SqlAlchemySpanExporter,
+    _LoopExportState,
+)
+from services.observability.otel.exporters.sqlalchemy_sync_span_exporter import (
+    SqlAlchemySyncSpanExporter,
+    TraceToSave,
+)
+from services.observability.otel.exporters.trace_statements import (
+    get_idle_span,
+    get_span_rows,
+)
+
+
+def _exporter_with_recorded_writes(mocker: MockerFixture):
+    exporter = SqlAlchemySpanExporter()
+    state = _LoopExportState(engine=MagicMock(), session_factory=MagicMock())
+    mocker.patch.object(exporter, "_get_loop_state", return_value=state)
+
+    writes = []
+
+    async def record_write(_state, spans):
+        await asyncio.sleep(0.01)
+        writes.append(list(spans))
+
+    mocker.patch.object(exporter, "_export_spans_isolated", side_effect=record_write)
+    return exporter, writes
+
+
+@pytest.mark.asyncio
+async def test_batches_queued_during_a_write_are_coalesced(mocker: MockerFixture):
+    exporter, writes = _exporter_with_recorded_writes(mocker)
+
+    assert exporter.export(["a"]) == SpanExportResult.SUCCESS
+    await asyncio.sleep(0)  # first write starts
+    exporter.export(["b"])
+    exporter.export(["c"])
+    await exporter._flush_loop(exporter._get_loop_state(None))
+
+    assert writes == [["a"], ["b", "c"]]
+
+
+@pytest.mark.asyncio
+async def test_force_flush_waits_for_queued_spans(mocker: MockerFixture):
+    exporter, writes = _exporter_with_recorded_writes(mocker)
+    exporter._loop_states[asyncio.get_running_loop()] = exporter._get_loop_state(None)
+
+    exporter.export(["a"])
+    # Blocking on the loop's own thread would deadlock
+    assert exporter.force_flush() is False
+    assert await asyncio.to_thread(exporter.force_flush) is True
+    assert writes == [["a"]]
+
+
+def test_span_rows_and_idle_span():
+    start = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+    previous_end = "2026-01-01T11:59:00+00:00"
+
+    idle_span = get_idle_span("trace", previous_end, {"start_time": start})
+    rows = get_span_rows("trace", [idle_span])
+
+    assert idle_span["type"] == "idle"
+    assert idle_span["latency"] == 60000
+    assert rows[0]["parent_id"] == "trace"
+    assert rows[0]["start_time"] == datetime(2026, 1, 1, 11, 59, tzinfo=timezone.utc)
+    assert rows[0]["data"]["end_time"] == start.isoformat()
+    assert get_idle_span("trace", None, {"start_time": start}) is None
+
+
+def _create_trace_tables(connection):
+    Trace.__table__.create(connection)
+    TraceSpan.__table__.create(connection)
+
+
+def test_traces_are_merged_without_postgresql_upserts():
+    engine = create_engine("sqlite://")
+    _create_trace_tables(engine)
+    first_turn = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+    second_turn = datetime(2026, 1, 1, 12, 5, tzinfo=timezone.utc)
+
+    def export(patch: TraceToSave):
+        with Session(engine) as session:
+            SqlAlchemySyncSpanExporter._upsert_trace_sync(
+                MagicMock(), session, "trace", patch
+            )
+            session.commit()
+
+    root_span = {"id": "root-1", "parent_id": "trace", "end_time": first_turn}
+    export(
+        TraceToSave(
+            spans=[root_span],
+            start_time=first_turn,
+            end_time=first_turn,
+            total_cost=1.0,
+        )
+    )
+    # Re-exported span and a second turn with an error
+    second_root_span = {"id": "root-2", "parent_id": "trace", "start_time": second_turn}
+    export(
+        TraceToSave(
+            spans=[root_span, second_root_span],
+            root_span=second_root_span,
+            start_time=second_turn,
+            end_time=second_turn,
+            status="error",
+            total_cost=0.5,
+        )
+    )
+
+    with Session(engine) as session:
+        trace = session.get(Trace, "trace")
+        spans = {span.id: span.data for span in session.query(TraceSpan)}
+    idle_spans = [
+        span for span_id, span in spans.items() if span_id not in ("root-1", "root-2")
+    ]
+
+    assert trace.status == "error"
+    assert trace.latency == 300000
+    assert trace.cost_details["total"] == 1.5
+    assert len(spans) == 3
+    assert idle_spans[0]["type"] == "idle"
+    assert idle_spans[0]["latency"] == 300000
+
+
+@pytest.mark.asyncio
+async def test_trace_spans_are_paged_without_postgresql_json_functions():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as connection:
+        await connection.run_sync(_create_trace_tables)
+
+    async with AsyncSession(engine) as session:
+        session.add(
+            Trace(id="trace", name="t", type="t", status="success", spans=[{"id": "a"}])
+        )
+        await session.flush()
+        session.add_all(
+            TraceSpan(trace_id="trace", id=span_id, data={"id": span_id})
+            for span_id in ("b", "c")
+        )
+        await session.commit()
+
+        service = TracesService(session=session)
+
+        assert await service.count_spans("trace") == 3
+        assert await service.get_spans("trace") == [
+            {"id": "a"},
+            {"id": "b"},
+            {"id": "c"},
+        ]
+        assert await service.get_spans("trace", limit=2, offset=1) == [
+            {"id": "b"},
+            {"id": "c"},
+        ]
+    await engine.dispose()
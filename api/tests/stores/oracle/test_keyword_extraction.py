@@ -0,0 +1,28 @@
+import asyncio
+
+import pytest
+from pytest_mock import MockerFixture
+
+from stores.oracle.keyword_extraction import KeywordExtractionService
+
+
+@pytest.mark.asyncio
+async def test_keywords_are_extracted_off_loop_and_cached(mocker: MockerFixture):
+    service = KeywordExtractionService(cache_size=10)
+    to_thread = mocker.spy(asyncio, "to_thread")
+
+    first = await service.extract_keywords("How to reset the VPN password?")
+    second = await service.extract_keywords("  how to reset the vpn password?")
+
+    assert first and first == second
+    assert [score for _, score in first] == sorted(score for _, score in first)
+    assert to_thread.call_count == 1
+
+
+def test_extractor_is_reused_per_language():
+    service = KeywordExtractionService()
+
+    service.extract_keywords_sync("reset the vpn password")
+    service.extract_keywords_sync("configure the mail client")
+
+    assert list(service._extractors) == [("en", 4)]
@@ -0,0 +1,35 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import oracledb
+import pytest
+
+from stores.oracle.client import fetch_lobs_inline
+
+
+@pytest.mark.parametrize(
+    ("type_code", "inline_type"),
+    [
+        (oracledb.DB_TYPE_CLOB, oracledb.DB_TYPE_LONG),
+        (oracledb.DB_TYPE_NCLOB, oracledb.DB_TYPE_LONG_NVARCHAR),
+        (oracledb.DB_TYPE_BLOB, oracledb.DB_TYPE_LONG_RAW),
+    ],
+)
+def test_lobs_are_fetched_inline(type_code, inline_type):
+    cursor = MagicMock(arraysize=25)
+
+    var = fetch_lobs_inline(cursor, SimpleNamespace(type_code=type_code))
+
+    assert var is cursor.var.return_value
+    cursor.var.assert_called_once_with(inline_type, arraysize=25)
+
+
+@pytest.mark.parametrize(
+    "type_code",
+    [oracledb.DB_TYPE_VARCHAR, oracledb.DB_TYPE_NUMBER, oracledb.DB_TYPE_JSON],
+)
+def test_other_columns_use_default_fetch(type_code):
+    cursor = MagicMock()
+
+    assert fetch_lobs_inline(cursor, SimpleNamespace(type_code=type_code)) is None
+    cursor.var.assert_not_called()
@@ -0,0 +1,115 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from models import DocumentData
+from stores.oracle.store import OracleDbStore
+
+COLLECTION_ID = "collection"
+
+
+class _IdOut:
+    """Returned IDs of one executemany: a list with one ID per row."""
+
+    def __init__(self, ids: list[str]):
+        self._ids = ids
+
+    def getvalue(self, index: int) -> list[str]:
+        return [self._ids[index]]
+
+
+@pytest.fixture
+def mock_cursor():
+    cursor = MagicMock()
+    inserted_rows = 0
+
+    def var(type, arraysize):
+        nonlocal inserted_rows
+        ids = [f"id-{inserted_rows + index}" for index in range(arraysize)]
+        inserted_rows += arraysize
+        return _IdOut(ids)
+
+    cursor.var.side_effect = var
+    cursor.executemany = AsyncMock()
+    return cursor
+
+
+@pytest.fixture
+def mock_connection(mock_cursor):
+    connection = MagicMock()
+    connection.__aenter__ = AsyncMock(return_value=connection)
+    connection.__aexit__ = AsyncMock(return_value=False)
+    connection.cursor.return_value.__aenter__ = AsyncMock(return_value=mock_cursor)
+    connection.cursor.return_value.__aexit__ = AsyncMock(return_value=False)
+    connection.commit = AsyncMock()
+    connection.rollback = AsyncMock()
+    return connection
+
+
+@pytest.fixture
+def oracle_db_store(mock_connection) -> OracleDbStore:
+    client = MagicMock()
+    client._pool.acquire = AsyncMock(return_value=mock_connection)
+    return OracleDbStore(client=client, insert_batch_size=2)
+
+
+def _documents(count: int) -> list[DocumentData]:
+    return [
+        DocumentData(content=f"content {index}", metadata={1: "one"})
+        for index in range(count)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_documents_are_inserted_in_batches(
+    oracle_db_store: OracleDbStore, mock_cursor, mock_connection
+):
+    ids = await oracle_db_store.create_documents(
+        _documents(5), COLLECTION_ID, embeddings=[[0.1]] * 5
+    )
+
+    batches = [call.args[1] for call in mock_cursor.executemany.await_args_list]
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert batches[2][0]["content"] == "content 4"
+    assert batches[0][0]["metadata"] == {"1": "one"}
+    assert ids == ["id-0", "id-1", "id-2", "id-3", "id-4"]
+    assert mock_connection.commit.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_committed_batches_are_deleted_when_a_later_batch_fails(
+    oracle_db_store: OracleDbStore, mock_cursor, mock_connection
+):
+    mock_cursor.executemany.side_effect = [None, RuntimeError("ORA-01653"), None]
+
+    with pytest.raises(RuntimeError, match="ORA-01653"):
+        await oracle_db_store.create_documents(
+            _documents(3), COLLECTION_ID, embeddings=[[0.1]] * 3
+        )
+
+    mock_connection.rollback.assert_awaited_once()
+    delete_sql, deleted = mock_cursor.executemany.await_args.args
+    assert delete_sql.startswith("DELETE FROM documents")
+    assert deleted == [
+        {"id": "id-0", "collection_id": COLLECTION_ID},
+        {"id": "id-1", "collection_id": COLLECTION_ID},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_insert_error_is_raised_when_the_compensating_delete_fails(
+    oracle_db_store: OracleDbStore, mock_cursor, caplog
+):
+    mock_cursor.executemany.side_effect = [
+        None,
+        RuntimeError("ORA-01653"),
+        RuntimeError("ORA-03113"),
+    ]
+
+    with pytest.raises(RuntimeError, match="ORA-01653"):
+        await oracle_db_store.create_documents(
+            _documents(3), COLLECTION_ID, embeddings=[[0.1]] * 3
+        )
+
+    assert "Failed to remove 2 documents" in caplog.text
+    assert "ORA-03113" in caplog.text
@@ -0,0 +1,370 @@
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from pytest_mock import MockerFixture
+
+from models import DocumentData
+from stores.pgvector_db.store import PgVectorStore
+
+COLLECTION_ID = "0b0f5c1e-1111-2222-3333-444455556666"
+
+
+@pytest.fixture
+def collection_row():
+    return {
+        "id": COLLECTION_ID,
+        "name": "Docs",
+        "description": None,
+        "system_name": "docs",
+        "category": None,
+        "provider_system_name": None,
+        "type": None,
+        "ai_model": "embedding-model",
+        "source": {"source_type": "Confluence"},
+        "chunking": None,
+        "indexing": None,
+        "metadata_config": None,
+        "last_synced": None,
+        "created_at": datetime.now(timezone.utc),
+        "updated_at": None,
+        "created_by": None,
+        "updated_by": None,
+    }
+
+
+@pytest.fixture
+def mock_pgvector_client(collection_row):
+    mock = MagicMock()
+    mock.fetchrow = AsyncMock(return_value=collection_row)
+    mock.execute_command = AsyncMock(return_value="UPDATE 1")
+
+    return mock
+
+
+@pytest.fixture
+def pgvector_store(mock_pgvector_client) -> PgVectorStore:
+    return PgVectorStore(client=mock_pgvector_client)
+
+
+@pytest.mark.asyncio
+async def test_get_collection_metadata_is_cached(pgvector_store, mock_pgvector_client):
+    first = await pgvector_store.get_collection_metadata(COLLECTION_ID)
+    first["source"]["source_type"] = "mutated by caller"
+    second = await pgvector_store.get_collection_metadata(COLLECTION_ID)
+
+    assert mock_pgvector_client.fetchrow.await_count == 1
+    assert second["source"] == {"source_type": "Confluence"}
+
+
+@pytest.mark.asyncio
+async def test_update_collection_metadata_invalidates_cache(
+    pgvector_store, mock_pgvector_client
+):
+    await pgvector_store.get_collection_metadata(COLLECTION_ID)
+    await pgvector_store.update_collection_metadata(COLLECTION_ID, {"name": "Renamed"})
+    await pgvector_store.get_collection_metadata(COLLECTION_ID)
+
+    assert mock_pgvector_client.fetchrow.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_create_documents_uses_copy_for_large_batches(
+    pgvector_store, mock_pgvector_client, mocker: MockerFixture
+):
+    mocker.patch(
+        "stores.pgvector_db.store.get_embeddings_batch",
+        AsyncMock(side_effect=lambda texts, model_system_name: [[0.1]] * len(texts)),
+    )
+    pgvector_store.bulk_insert_min_rows = 2
+    pgvector_store._ensure_documents_table_exists = AsyncMock()
+
+    connection = MagicMock()
+    connection.transaction.return_value.__aenter__ = AsyncMock()
+    connection.transaction.return_value.__aexit__ = AsyncMock(return_value=False)
+    connection.execute = AsyncMock()
+    connection.fetchval = AsyncMock()
+    connection.copy_records_to_table = AsyncMock()
+    mock_pgvector_client._ensure_pool_initialized = AsyncMock()
+    mock_pgvector_client.pool.acquire.return_value.__aenter__ = AsyncMock(
+        return_value=connection
+    )
+    mock_pgvector_client.pool.acquire.return_value.__aexit__ = AsyncMock(
+        return_value=False
+    )
+
+    documents = [
+        DocumentData(content="first", metadata={"sourceId": "1"}),
+        DocumentData(content="second", metadata={"sourceId": "2"}),
+    ]
+    ids = await pgvector_store.create_documents(documents, COLLECTION_ID)
+
+    records = connection.copy_records_to_table.await_args.kwargs["records"]
+    assert [str(record[0]) for record in records] == ids
+    assert [record[1] for record in records] == ["first", "second"]
+    assert records[0][2] == '{"sourceId": "1"}'
+    connection.fetchval.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_keyword_search_uses_single_hybrid_query(
+    pgvector_store, mock_pgvector_client, collection_row, mocker: MockerFixture
+):
+    collection_row["indexing"] = {"fulltext_search_supported": True}
+    mocker.patch(
+        "stores.pgvector_db.store.get_query_embedding",
+        AsyncMock(return_value=[0.1, 0.2]),
+    )
+    pgvector_store._ensure_documents_table_exists = AsyncMock()
+    pgvector_store._is_fulltext_search_ready = AsyncMock(return_value=True)
+    mock_pgvector_client.execute_query_with_settings = AsyncMock(
+        return_value=[
+            {"id": "doc-1", "content": "hello", "metadata": {}, "score": 1.0},
+        ]
+    )
+    retrieve_config = MagicMock(use_keyword_search=True)
+
+    results = await pgvector_store.document_collections_similarity_search(
+        [COLLECTION_ID], retrieve_config, "hello", 5
+    )
+
+    query_call = mock_pgvector_client.execute_query_with_settings
+    assert query_call.await_count == 1
+    sql, *params = query_call.await_args.args
+    assert "websearch_to_tsquery" in sql and "UNION ALL" in sql
+    assert params == [[0.1, 0.2], 5, "hello", PgVectorStore.RRF_K]
+    # Server defaults cover 5 results, the query runs without a settings transaction
+    assert query_call.await_args.kwargs["settings"] == {}
+    assert [(item.id, str(item.score)) for item in results] == [("doc-1", "1.0000")]
+
+
+@pytest.mark.asyncio
+async def test_keyword_search_without_fulltext_column_falls_back_to_vector_search(
+    pgvector_store, mock_pgvector_client, collection_row, mocker: MockerFixture
+):
+    collection_row["indexing"] = {"fulltext_search_supported": True}
+    mocker.patch(
+        "stores.pgvector_db.store.get_query_embedding",
+        AsyncMock(return_value=[0.1, 0.2]),
+    )
+    # Table checks found no content_tsv index: the descriptor flag stays unset
+    pgvector_store._ensure_documents_table_exists = AsyncMock()
+    mock_pgvector_client.execute_query_with_settings = AsyncMock(return_value=[])
+    retrieve_config = MagicMock(use_keyword_search=True)
+
+    await pgvector_store.document_collections_similarity_search(
+        [COLLECTION_ID], retrieve_config, "hello", 5
+    )
+
+    sql = mock_pgvector_client.execute_query_with_settings.await_args.args[0]
+    assert "websearch_to_tsquery" not in sql
+    mock_pgvector_client.execute_command.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_collections_of_one_model_are_searched_in_one_statement(
+    pgvector_store, mock_pgvector_client, mocker: MockerFixture
+):
+    mocker.patch(
+        "stores.pgvector_db.store.get_query_embedding",
+        AsyncMock(return_value=[0.1, 0.2]),
+    )
+    pgvector_store._ensure_documents_table_exists = AsyncMock()
+    mock_pgvector_client.execute_query_with_settings = AsyncMock(
+        return_value=[
+            {
+                "collection_id": "second",
+                "id": "doc-2",
+                "content": "b",
+                "metadata": None,
+                "similarity_score": 0.9,
+            },
+        ]
+    )
+    retrieve_config = MagicMock(use_keyword_search=False)
+
+    results = await pgvector_store.document_collections_similarity_search(
+        ["first", "second"], retrieve_config, "query", 3
+    )
+
+    query_call = mock_pgvector_client.execute_query_with_settings
+    assert query_call.await_count == 1
+    sql = query_call.await_args.args[0]
+    assert sql.count("UNION ALL") == 1
+    assert "documents_first" in sql and "documents_second" in sql
+    # Each collection keeps its own top-k, as with one search per collection
+    assert sql.count("LIMIT $2") == 2
+    assert [(item.collection_id, item.id) for item in results] == [("second", "doc-2")]
+
+
+@pytest.mark.asyncio
+async def test_failed_multi_collection_statement_falls_back_to_per_collection_search(
+    pgvector_store, mock_pgvector_client, mocker: MockerFixture
+):
+    mocker.patch(
+        "stores.pgvector_db.store.get_query_embedding",
+        AsyncMock(return_value=[0.1, 0.2]),
+    )
+    pgvector_store._ensure_documents_table_exists = AsyncMock()
+    row = {"id": "doc", "content": "a", "metadata": None, "similarity_score": 0.5}
+    mock_pgvector_client.execute_query_with_settings = AsyncMock(
+        side_effect=[RuntimeError("statement failed"), [row], [row]]
+    )
+    retrieve_config = MagicMock(use_keyword_search=False)
+
+    results = await pgvector_store.document_collections_similarity_search(
+        ["first", "second"], retrieve_config, "query", 3
+    )
+
+    assert mock_pgvector_client.execute_query_with_settings.await_count == 3
+    assert sorted(item.collection_id for item in results) == ["first", "second"]
+
+
+@pytest.mark.asyncio
+async def test_document_manifest_streams_projected_source_metadata(
+    pgvector_store, mock_pgvector_client
+):
+    async def rows(query, *args):
+        yield {"id": "doc-1", "sourceId": "page-1", "modifiedTime": "t1", "title": None}
+
+    pgvector_store._ensure_documents_table_exists = AsyncMock()
+    mock_pgvector_client.iterate_query = MagicMock(side_effect=rows)
+
+    manifest = [
+        document
+        async for document in pgvector_store.iterate_document_manifest(COLLECTION_ID)
+    ]
+
+    sql = mock_pgvector_client.iterate_query.call_args.args[0]
+    assert "content" not in sql
+    assert "metadata->>'sourceId'" in sql
+    assert manifest == [
+        {"id": "doc-1", "metadata": {"sourceId": "page-1", "modifiedTime": "t1"}}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_vector_index_rebuild_is_skipped_while_another_worker_builds(
+    pgvector_store, mock_pgvector_client
+):
+    connection = MagicMock()
+    connection.fetchval = AsyncMock(return_value=False)
+    connection.execute = AsyncMock()
+    mock_pgvector_client._ensure_pool_initialized = AsyncMock()
+    mock_pgvector_client.pool.acquire.return_value.__aenter__ = AsyncMock(
+        return_value=connection
+    )
+    mock_pgvector_client.pool.acquire.return_value.__aexit__ = AsyncMock(
+        return_value=False
+    )
+    pgvector_store._get_current_vector_size = AsyncMock(return_value=1536)
+
+    await pgvector_store.rebuild_vector_index(COLLECTION_ID)
+
+    assert "pg_try_advisory_lock" in connection.fetchval.await_args.args[0]
+    connection.execute.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_invalid_vector_index_is_rebuilt_and_build_failures_are_logged(
+    pgvector_store, mock_pgvector_client, caplog
+):
+    # pg_index.indisvalid of an index left behind by an interrupted build
+    mock_pgvector_client.fetchval = AsyncMock(return_value=False)
+    pgvector_store.rebuild_vector_index = AsyncMock(
+        side_effect=RuntimeError("canceling statement due to statement timeout")
+    )
+
+    await pgvector_store._ensure_vector_index(COLLECTION_ID, 1536)
+    await asyncio.gather(*pgvector_store._index_builds.values(), return_exceptions=True)
+    await asyncio.sleep(0)
+
+    pgvector_store.rebuild_vector_index.assert_awaited_once_with(COLLECTION_ID)
+    assert pgvector_store._index_builds == {}
+    assert f"Background index build {COLLECTION_ID} failed" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_source_id_index_of_existing_table_is_built_concurrently(
+    pgvector_store, mock_pgvector_client
+):
+    connection = MagicMock()
+    connection.fetchval = AsyncMock(return_value=True)  # Advisory lock acquired
+    connection.execute = AsyncMock()
+    mock_pgvector_client._ensure_pool_initialized = AsyncMock()
+    mock_pgvector_client.pool.acquire.return_value.__aenter__ = AsyncMock(
+        return_value=connection
+    )
+    mock_pgvector_client.pool.acquire.return_value.__aexit__ = AsyncMock(
+        return_value=False
+    )
+    mock_pgvector_client.fetchval = AsyncMock(return_value=None)  # No index yet
+
+    await pgvector_store._ensure_source_id_index(COLLECTION_ID)
+    await asyncio.gather(*pgvector_store._index_builds.values())
+
+    statements = [call.args[0] for call in connection.execute.await_args_list]
+    assert any("CREATE INDEX CONCURRENTLY" in sql for sql in statements)
+    assert "pg_advisory_unlock" in statements[-1]
+    mock_pgvector_client.execute_command.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_fulltext_search_is_backfilled_in_batches_in_the_background(
+    pgvector_store, mock_pgvector_client
+):
+    connection = MagicMock()
+    # Advisory lock acquired, no content_tsv index nor column yet
+    connection.fetchval = AsyncMock(side_effect=[True, None, None])
+    connection.fetch = AsyncMock(side_effect=[[{"id": "a"}, {"id": "b"}], []])
+    connection.execute = AsyncMock(return_value="UPDATE 2")
+    connection.transaction.return_value.__aenter__ = AsyncMock()
+    connection.transaction.return_value.__aexit__ = AsyncMock(return_value=False)
+    mock_pgvector_client._ensure_pool_initialized = AsyncMock()
+    mock_pgvector_client.pool.acquire.return_value.__aenter__ = AsyncMock(
+        return_value=connection
+    )
+    mock_pgvector_client.pool.acquire.return_value.__aexit__ = AsyncMock(
+        return_value=False
+    )
+    pgvector_store._ensure_documents_table_exists = AsyncMock()
+    mock_pgvector_client.fetchval = AsyncMock(return_value=None)  # No index yet
+
+    await pgvector_store.enable_fulltext_search(COLLECTION_ID)
+    connection.execute.assert_not_awaited()
+    await asyncio.gather(*pgvector_store._index_builds.values())
+
+    statements = [call.args[0] for call in connection.execute.await_args_list]
+    assert "ADD COLUMN IF NOT EXISTS content_tsv tsvector" in statements[0]
+    assert "GENERATED" not in statements[0]
+    assert any("CREATE TRIGGER" in sql for sql in statements)
+    backfill = [
+        call
+        for call in connection.execute.await_args_list
+        if "SET content = content" in call.args[0]
+    ]
+    assert [call.args[1] for call in backfill] == [["a", "b"]]
+    assert any("CREATE INDEX CONCURRENTLY" in sql for sql in statements)
+    assert "pg_advisory_unlock" in statements[-1]
+    mock_pgvector_client.execute_command.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_background_index_builds_run_one_at_a_time(pgvector_store):
+    running = 0
+    max_running = 0
+
+    async def build():
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    for index in range(3):
+        pgvector_store._start_index_build(f"idx_{index}", build())
+    await asyncio.gather(*pgvector_store._index_builds.values())
+
+    assert max_running == 1
+    assert pgvector_store._index_builds == {}
@@ -0,0 +1,47 @@
+from stores.pgvector_db.vector_index import VectorIndexConfig
+
+TABLE_NAME = "documents_0b0f5c1e_1111_2222_3333_444455556666"
+
+
+def test_default_settings_keep_legacy_index_name():
+    config = VectorIndexConfig.from_collection_metadata({"indexing": {}}, 1536)
+
+    assert config.is_default
+    assert config.index_name(TABLE_NAME) == f"idx_{TABLE_NAME}_embedding_cosine"[:63]
+    assert "embedding vector_cosine_ops" in config.index_ddl(TABLE_NAME, 1536)
+
+
+def test_large_vectors_use_quantized_index_with_rerank():
+    config = VectorIndexConfig.from_collection_metadata({"indexing": {}}, 3072)
+
+    assert config.quantization == "halfvec"
+    assert config.can_index(3072)
+    assert "halfvec(3072)" in config.index_ddl(TABLE_NAME, 3072, concurrently=True)
+    nearest_sql = config.nearest_sql(TABLE_NAME, 3072, "embedding IS NOT NULL")
+    assert "LIMIT $2 * 4" in nearest_sql
+    assert "ORDER BY distance" in nearest_sql
+    # ef_search must cover all re-ranked candidates
+    assert config.search_settings(num_results=20) == {"hnsw.ef_search": "80"}
+
+
+def test_ivfflat_settings():
+    config = VectorIndexConfig.from_collection_metadata(
+        {"indexing": {"vector_index": {"type": "ivfflat", "lists": 200, "probes": 8}}},
+        1536,
+    )
+
+    assert not config.is_default
+    assert len(config.index_name(TABLE_NAME)) <= 63
+    assert "USING ivfflat" in config.index_ddl(TABLE_NAME, 1536)
+    assert "lists = 200" in config.index_ddl(TABLE_NAME, 1536)
+    assert config.search_settings(num_results=5) == {"ivfflat.probes": "8"}
+
+
+def test_default_hnsw_search_needs_no_session_settings():
+    config = VectorIndexConfig.from_collection_metadata({"indexing": {}}, 1536)
+
+    assert config.search_settings(num_results=40) == {}
+    assert config.search_settings(num_results=100) == {"hnsw.ef_search": "100"}
+    assert config.search_settings(num_results=5, iterative_scan=True) == {
+        "hnsw.iterative_scan": "strict_order"
+    }
@@ -0,0 +1,37 @@
+import json
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from utils.serializer import OracleDbSerializer, convert_oracle_json
+
+
+def _round_trip(value):
+    return json.loads(json.dumps(value, cls=OracleDbSerializer))
+
+
+def test_convert_oracle_json_matches_serializer_round_trip():
+    value = {
+        "sourceId": "page-1",
+        "score": Decimal("0.25"),
+        "count": Decimal("3"),
+        "tags": ["a", Decimal("2.0"), {"weight": Decimal("-1.5")}],
+        "nested": {"pages": (Decimal("1"), Decimal("2")), "empty": {}, "none": None},
+        "flag": True,
+    }
+
+    converted = convert_oracle_json(value)
+
+    assert converted == _round_trip(value)
+    assert type(converted["count"]) is int
+    assert type(converted["tags"][1]) is int
+    assert type(converted["score"]) is float
+
+
+def test_convert_oracle_json_keeps_values_the_round_trip_rejects():
+    value = {"modified": datetime(2026, 1, 1), "raw": b"\x00"}
+
+    with pytest.raises(TypeError):
+        _round_trip(value)
+    assert convert_oracle_json(value) == value